@@ -83,19 +83,12 @@ def mypage(request):
 
     # 받은 쪽지(일정 알림) 카운트
     from notifications.models import Notification
-    received_notices_count = Notification.objects.filter(
-        user=user, type=Notification.Type.SCHEDULE_NOTICE
-    ).count()
-    unread_notices_count = Notification.objects.filter(
-        user=user, type=Notification.Type.SCHEDULE_NOTICE, is_read=False
-    ).count()
-    # 보낸 쪽지(내가 발송한 일정 알림) 그룹 수 — 동시 발송분은 하나로 집계
-    from django.db.models.functions import TruncSecond
-    sent_notices_count = Notification.objects.filter(
-        actor=user, type=Notification.Type.SCHEDULE_NOTICE
-    ).annotate(sec=TruncSecond("created_at")).values(
-        "sec", "message", "related_band_schedule"
-    ).distinct().count()
+    from notifications.unread import received_count, unread_count
+    received_notices_count = received_count(user.pk, Notification.Type.SCHEDULE_NOTICE)
+    unread_notices_count = unread_count(user.pk, Notification.Type.SCHEDULE_NOTICE)
+    # 보낸 쪽지(내가 발송한 일정 알림) 발송 건 수
+    from notifications.models import NoticeBatch
+    sent_notices_count = NoticeBatch.objects.filter(sender=user).count()
 
     return render(request, "accounts/mypage.html", {
         "profile": profile,
@@ -268,6 +261,7 @@ def mypage_schedule_applications(request):
 def mypage_schedule_notices(request):
     """받은 쪽지(일정 알림) 목록"""
     from notifications.models import Notification
+    from notifications.unread import mark_all_read
     user = request.user
     per_page = 20
     page = request.GET.get('page', 1)
@@ -282,9 +276,7 @@ def mypage_schedule_notices(request):
     notices_page = paginator.get_page(page)
 
     # 페이지 노출 시점에 읽음 처리
-    Notification.objects.filter(
-        user=user, type=Notification.Type.SCHEDULE_NOTICE, is_read=False,
-    ).update(is_read=True)
+    mark_all_read(user, type=Notification.Type.SCHEDULE_NOTICE)
 
     return render(request, "accounts/mypage_schedule_notices.html", {
         "notices_page": notices_page,
@@ -294,39 +286,16 @@ def mypage_schedule_notices(request):
 
 @login_required
 def mypage_sent_notices(request):
-    """보낸 쪽지(내가 발송한 일정 알림) 목록. 동시 발송분은 하나로 묶어 수신자 표기."""
-    from notifications.models import Notification
-    from collections import OrderedDict
+    """보낸 쪽지(내가 발송한 일정 알림) 목록. 발송 건 단위로 수신자 표기."""
+    from notifications.models import NoticeBatch
     user = request.user
     per_page = 20
     page = request.GET.get('page', 1)
 
-    sent = Notification.objects.filter(
-        actor=user, type=Notification.Type.SCHEDULE_NOTICE,
-    ).select_related(
-        "user", "related_band", "related_band_schedule",
-    ).order_by("-created_at")
-
-    # (초 단위 시각, 메시지, 일정) 기준으로 묶어 수신자 목록 집계
-    groups = OrderedDict()
-    for n in sent:
-        key = (n.created_at.replace(microsecond=0), n.message, n.related_band_schedule_id)
-        g = groups.get(key)
-        if g is None:
-            g = {
-                "message": n.message,
-                "created_at": n.created_at,
-                "band": n.related_band,
-                "schedule": n.related_band_schedule,
-                "recipients": [],
-            }
-            groups[key] = g
-        if n.user:
-            g["recipients"].append(n.user)
-
-    grouped = list(groups.values())
-    paginator = Paginator(grouped, per_page)
+    batches = NoticeBatch.objects.filter(sender=user).select_related("band", "schedule")
+    paginator = Paginator(batches, per_page)
     notices_page = paginator.get_page(page)
+    NoticeBatch.load_recipients(notices_page)
 
     return render(request, "accounts/mypage_sent_notices.html", {
         "notices_page": notices_page,
@@ -0,0 +1,40 @@
+"""이미지 축소본(srcset) 직렬화.
+
+WebPImageField 는 WebP 로 바꿀 때 폭별 WebP 축소본을 함께 저장한다 (badmintok.fields.save_variants).
+목록 화면은 원본 대신 화면 폭에 맞는 축소본을 받도록 기존 *_url 옆에 {폭: URL} 맵을 내려준다.
+축소본이 실제로 있는 폭만 싣는다 — 폭 목록은 축소본을 만들 때 공유 캐시에 기록되고,
+캐시에 없을 때만 저장소에서 확인한다 (fields.existing_variant_widths).
+업로드 직후 변환 작업(run_image_worker)이 끝나기 전에는 None 이고 *_url 은 원본을 가리킨다.
+
+사용:
+    class BandListSerializer(serializers.ModelSerializer):
+        cover_image_srcset = ImageSrcsetField(source="cover_image")
+
+응답 예: "cover_image_srcset": {"320": "https://…/a_w320.webp", "640": "…", "1280": "…"}
+"""
+from rest_framework import serializers
+
+
+def image_srcset(file, request=None):
+    """{"폭": URL} — 파일이 없거나 축소본을 만들지 않는 필드면 None"""
+    srcset = getattr(file, "srcset", None) if file else None
+    if not srcset:
+        return None
+    if request is None:
+        return {str(width): url for width, url in srcset.items()}
+    return {str(width): request.build_absolute_uri(url) for width, url in srcset.items()}
+
+
+class ImageSrcsetField(serializers.Field):
+    """WebPImageField 값을 {"폭": 절대 URL} 로 내보내는 읽기 전용 필드"""
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return image_srcset(value, self.context.get("request"))
+
+    def get_attribute(self, instance):
+        # 빈 FileField 도 None 응답이 되도록 값 그대로 넘김
+        return super().get_attribute(instance) or None
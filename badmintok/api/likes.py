@@ -0,0 +1,100 @@
+"""목록 직렬화용 "내가 좋아요 눌렀는지(is_liked)" 일괄 조회.
+
+get_is_liked 가 행마다 obj.likes.filter(id=user.id).exists() 를 돌리면 목록 N 건에 쿼리 N 개,
+'likes' 를 prefetch 하면 인기 글의 좋아요 누른 사용자 전체를 읽어온다.
+여기서는 페이지에 나온 객체 pk 들 중 현재 사용자가 좋아요한 pk 만 한 번에 조회해
+serializer context 에 넣어 두고, 각 행은 set 조회로 끝낸다.
+
+좋아요 관계는 모델의 "likes" 이름으로 찾는다.
+- Post / Comment / Contest: ManyToManyField(User) → through 테이블 조회
+- BandPost / BandComment: BandPostLike / BandCommentLike 역참조(related_name="likes") → user FK 조회
+
+사용:
+    class PostListSerializer(LikedByUserMixin, serializers.ModelSerializer):
+        is_liked = serializers.SerializerMethodField()
+
+        class Meta:
+            list_serializer_class = LikedListSerializer
+"""
+from django.db import models
+from rest_framework import serializers
+
+
+CONTEXT_KEY = "liked_ids"
+
+
+def liked_ids(user, model, pks, *, relation="likes", user_field="user"):
+    """pks 중 user 가 좋아요한 pk 집합 (쿼리 1회)"""
+    pks = [pk for pk in pks if pk is not None]
+    if not pks or user is None or not user.is_authenticated:
+        return set()
+    field = model._meta.get_field(relation)
+    if field.many_to_many:
+        through = field.remote_field.through
+        object_field, user_field = field.m2m_field_name(), field.m2m_reverse_field_name()
+    else:
+        through, object_field = field.related_model, field.field.name
+    return set(
+        through.objects.filter(**{f"{object_field}_id__in": pks, f"{user_field}_id": user.pk})
+        .values_list(f"{object_field}_id", flat=True)
+    )
+
+
+class LikedByUserMixin:
+    """get_is_liked 를 context 의 일괄 조회 결과로 답하는 serializer mixin.
+
+    LikedListSerializer 로 여러 건을 직렬화하면 미리 채워지고,
+    단건 직렬화처럼 미리 조회되지 않은 객체는 그 객체 하나만 조회한다.
+    """
+
+    like_relation = "likes"
+
+    def liked_children(self, obj):
+        """같은 serializer 로 이어서 직렬화할 하위 객체 (대댓글 등) — 함께 조회해 둔다"""
+        return ()
+
+    def _liked_state(self):
+        model = self.Meta.model
+        return self.context.setdefault(CONTEXT_KEY, {}).setdefault(
+            model._meta.label_lower, {"checked": set(), "liked": set()}
+        )
+
+    def _request_user(self):
+        request = self.context.get("request")
+        user = getattr(request, "user", None)
+        return user if user is not None and user.is_authenticated else None
+
+    def prime_liked(self, objects):
+        user = self._request_user()
+        if user is None:
+            return
+        objects = list(objects)
+        for obj in list(objects):
+            objects.extend(self.liked_children(obj))
+        state = self._liked_state()
+        # build_comment_tree 등이 liked_by_user 를 이미 붙인 객체는 제외
+        pks = {obj.pk for obj in objects if not hasattr(obj, "liked_by_user")} - state["checked"]
+        if not pks:
+            return
+        state["liked"] |= liked_ids(user, self.Meta.model, pks, relation=self.like_relation)
+        state["checked"] |= pks
+
+    def get_is_liked(self, obj):
+        """현재 사용자가 좋아요를 눌렀는지 확인"""
+        if self._request_user() is None:
+            return False
+        if hasattr(obj, "liked_by_user"):
+            return obj.liked_by_user
+        state = self._liked_state()
+        if obj.pk not in state["checked"]:
+            self.prime_liked([obj])
+        return obj.pk in state["liked"]
+
+
+class LikedListSerializer(serializers.ListSerializer):
+    """직렬화 전에 페이지 객체 전체의 좋아요 여부를 한 번에 조회"""
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        self.child.prime_liked(items)
+        return super().to_representation(items)
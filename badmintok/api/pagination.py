@@ -0,0 +1,172 @@
+"""목록 API 용 키셋(cursor) 페이지네이션.
+
+Paginator 는 페이지마다 필터된(.distinct() 포함) queryset 의 COUNT(*) 를 돌리고
+깊은 페이지일수록 OFFSET 만큼 행을 읽고 버린다. 앱 무한 스크롤은 총 개수가 필요 없으므로
+?cursor= 를 보내면 이 모드로 바꿔:
+- 현재 정렬 키(예: is_pinned, created_at) + pk 로 "마지막 항목 다음" 조건을 만들어
+  인덱스에서 바로 이어 읽고 (page_size + 1 건만 조회)
+- COUNT 없이 다음 페이지용 next_cursor 만 돌려준다.
+1페이지와 500페이지 비용이 같다. 기존 ?page= 응답은 그대로 유지된다.
+
+사용:
+    if cursor_requested(request):
+        return cursor_response(request, posts, page_size, PostListSerializer)
+
+NULL 은 MySQL/SQLite 규칙(오름차순에서 가장 앞)을 따른다고 가정한다.
+"""
+import base64
+import datetime
+import decimal
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class InvalidCursor(ValueError):
+    """디코딩할 수 없거나 현재 정렬과 맞지 않는 cursor"""
+
+
+class UnsupportedOrdering(ValueError):
+    """키셋으로 이어 읽을 수 없는 정렬 (식, 관계 필드 경유 "__", 무작위 "?")"""
+
+
+def _ordering(queryset):
+    """queryset 정렬 필드 목록 (+ 마지막에 pk 동순위 정렬)"""
+    query = queryset.query
+    ordering = list(query.order_by) or (list(query.get_meta().ordering) if query.default_ordering else [])
+    names = []
+    for item in ordering:
+        if not isinstance(item, str) or "__" in item or item.lstrip("-") == "?":
+            raise UnsupportedOrdering(f"키셋 페이지네이션은 단순 필드 정렬만 지원합니다: {item!r}")
+        names.append(item)
+    if not any(name.lstrip("-") in ("pk", "id") for name in names):
+        last_desc = bool(names) and names[-1].startswith("-")
+        names.append("-pk" if last_desc else "pk")
+    return [(name.lstrip("-"), name.startswith("-")) for name in names]
+
+
+def _model_field(model, name):
+    if name == "pk":
+        return model._meta.pk
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        # annotate 로 만든 값 (search_rank, member_count_annotated 등)
+        return None
+
+
+def _value_of(obj, model, name):
+    field = _model_field(model, name)
+    return getattr(obj, field.attname if field is not None else name)
+
+
+def _jsonable(value):
+    # DjangoJSONEncoder 는 마이크로초를 밀리초로 자르므로 동순위 비교가 어긋난다 → isoformat 그대로
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(values):
+    raw = json.dumps([_jsonable(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, model, keys):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise InvalidCursor(cursor)
+    decoded = []
+    for (name, _), value in zip(keys, values):
+        field = _model_field(model, name)
+        if field is not None and value is not None:
+            try:
+                value = field.to_python(value)
+            except ValidationError:
+                raise InvalidCursor(cursor)
+        decoded.append(value)
+    return decoded
+
+
+def _after(model, name, value, desc):
+    """정렬 방향으로 value 보다 뒤에 오는 행 조건 (NULL 은 가장 작은 값)"""
+    field = _model_field(model, name)
+    nullable = field is not None and field.null
+    if desc:
+        if value is None:
+            return None
+        q = Q(**{f"{name}__lt": value})
+        return q | Q(**{f"{name}__isnull": True}) if nullable else q
+    if value is None:
+        return Q(**{f"{name}__isnull": False})
+    return Q(**{f"{name}__gt": value})
+
+
+def _equal(name, value):
+    if value is None:
+        return Q(**{f"{name}__isnull": True})
+    return Q(**{name: value})
+
+
+def _seek(model, keys, values):
+    """(k1, k2, ...) 가 cursor 값보다 뒤인 조건: k1 > v1 OR (k1 = v1 AND k2 > v2) OR ..."""
+    condition = None
+    prefix = Q()
+    for (name, desc), value in zip(keys, values):
+        after = _after(model, name, value, desc)
+        if after is not None:
+            term = prefix & after
+            condition = term if condition is None else condition | term
+        prefix &= _equal(name, value)
+    # 모든 키가 내림차순 NULL 이면 뒤에 올 행이 없다
+    return condition if condition is not None else Q(pk__in=[])
+
+
+def cursor_paginate(queryset, cursor, page_size):
+    """(이번 페이지 항목 목록, 다음 cursor 또는 None)"""
+    model = queryset.model
+    keys = _ordering(queryset)
+    queryset = queryset.order_by(*[f"-{name}" if desc else name for name, desc in keys])
+    if cursor:
+        queryset = queryset.filter(_seek(model, keys, decode_cursor(cursor, model, keys)))
+
+    items = list(queryset[:page_size + 1])
+    if len(items) <= page_size:
+        return items, None
+    items = items[:page_size]
+    last = items[-1]
+    return items, encode_cursor([_value_of(last, model, name) for name, _ in keys])
+
+
+def cursor_requested(request):
+    """?cursor= 파라미터가 있으면 (값이 비어 있어도) 키셋 모드"""
+    return "cursor" in request.GET
+
+
+def cursor_response(request, queryset, page_size, serializer_class, **extra):
+    """키셋 모드 목록 응답: {page_size, results, next_cursor, **extra}"""
+    try:
+        items, next_cursor = cursor_paginate(queryset, request.GET.get("cursor", ""), page_size)
+    except InvalidCursor:
+        return Response({"error": "cursor 값이 올바르지 않습니다."}, status=status.HTTP_400_BAD_REQUEST)
+    except UnsupportedOrdering:
+        return Response(
+            {"error": "이 정렬에서는 cursor 페이지네이션을 쓸 수 없습니다. page 파라미터를 사용하세요."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    serializer = serializer_class(items, many=True, context={"request": request})
+    return Response({
+        "page_size": page_size,
+        "results": serializer.data,
+        "next_cursor": next_cursor,
+        **extra,
+    }, status=status.HTTP_200_OK)
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from badmintok.api.images import ImageSrcsetField
+from badmintok.api.likes import LikedByUserMixin, LikedListSerializer
 from badmintok.models import BadmintokBanner, Banner, Notice, Promotion, YoutubeVideo
 from community.models import Post, PostImage
 from accounts.models import User
@@ -44,7 +46,7 @@ class PostImageSerializer(serializers.ModelSerializer):
         return None
 
 
-class PostListSerializer(serializers.ModelSerializer):
+class PostListSerializer(LikedByUserMixin, serializers.ModelSerializer):
     """게시물 목록 Serializer"""
     author = UserSerializer(read_only=True)
     category_name = serializers.CharField(source='get_category_display', read_only=True)
@@ -52,70 +54,31 @@ class PostListSerializer(serializers.ModelSerializer):
     excerpt = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
     thumbnail_url = serializers.SerializerMethodField()
+    thumbnail_srcset = ImageSrcsetField(source='thumbnail')
 
     class Meta:
         model = Post
+        list_serializer_class = LikedListSerializer
         fields = [
             'id', 'title', 'slug', 'author', 'category_name', 'source',
             'created_at', 'updated_at', 'view_count', 'like_count', 'comment_count',
-            'is_pinned', 'first_image', 'excerpt', 'is_liked', 'thumbnail_url'
+            'is_pinned', 'first_image', 'excerpt', 'is_liked', 'thumbnail_url', 'thumbnail_srcset'
         ]
 
     def get_first_image(self, obj):
+        """저장된 대표 이미지 URL (첫 첨부 이미지, 없으면 본문 첫 이미지)"""
+        url = obj.first_image_url
+        if not url:
+            return None
         request = self.context.get('request')
-        first_image = obj.images.first()
-        if first_image and first_image.image:
-            if request:
-                return request.build_absolute_uri(first_image.image.url)
-            return first_image.image.url
-        # HTML 콘텐츠에서 첫 번째 이미지 URL 추출
-        if obj.content:
-            import re
-            match = re.search(r'<img\s+[^>]*src="([^"]*)"', obj.content)
-            if match:
-                img_url = match.group(1)
-                if request and img_url.startswith('/'):
-                    return request.build_absolute_uri(img_url)
-                return img_url
-        return None
+        if request and url.startswith('/'):
+            return request.build_absolute_uri(url)
+        return url
 
     def get_excerpt(self, obj):
-        """본문에서 발췌문 생성 (100자)"""
-        if obj.content:
-            import re, json
-            content = obj.content.strip()
-            # Editor.js JSON 형식인 경우 텍스트 추출
-            if content.startswith('{') and '"blocks"' in content:
-                try:
-                    data = json.loads(content)
-                    blocks = data.get('blocks', [])
-                    parts = []
-                    for block in blocks:
-                        btype = block.get('type', '')
-                        bdata = block.get('data', {})
-                        if btype in ('paragraph', 'header', 'h2', 'h3', 'h4', 'quote'):
-                            t = re.sub(r'<[^>]+>', '', bdata.get('text', '')).replace('&nbsp;', ' ').strip()
-                            if t:
-                                parts.append(t)
-                        elif btype == 'list':
-                            for item in bdata.get('items', []):
-                                t = re.sub(r'<[^>]+>', '', str(item)).strip()
-                                if t:
-                                    parts.append(t)
-                    text = ' '.join(parts)
-                except (json.JSONDecodeError, KeyError):
-                    text = re.sub(r'<[^>]+>', '', content)
-            else:
-                text = re.sub(r'<[^>]+>', '', content)
-            text = text.strip()
-            return text[:100] + '...' if len(text) > 100 else text
-        return ''
-
-    def get_is_liked(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.likes.filter(id=request.user.id).exists()
-        return False
+        """저장된 발췌문 (100자)"""
+        text = obj.excerpt
+        return text[:100] + '...' if obj.text_length > 100 else text
 
     def get_thumbnail_url(self, obj):
         request = self.context.get('request')
@@ -126,7 +89,7 @@ class PostListSerializer(serializers.ModelSerializer):
         return None
 
 
-class PostDetailSerializer(serializers.ModelSerializer):
+class PostDetailSerializer(LikedByUserMixin, serializers.ModelSerializer):
     """게시물 상세 Serializer"""
     author = UserSerializer(read_only=True)
     category_name = serializers.CharField(source='get_category_display', read_only=True)
@@ -136,6 +99,7 @@ class PostDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Post
+        list_serializer_class = LikedListSerializer
         fields = [
             'id', 'title', 'slug', 'content', 'author', 'category_name',
             'source', 'created_at', 'updated_at',
@@ -143,12 +107,6 @@ class PostDetailSerializer(serializers.ModelSerializer):
             'published_at', 'images', 'is_liked', 'thumbnail_url'
         ]
 
-    def get_is_liked(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.likes.filter(id=request.user.id).exists()
-        return False
-
     def get_thumbnail_url(self, obj):
         request = self.context.get('request')
         if obj.thumbnail and hasattr(obj.thumbnail, 'url'):
@@ -2,13 +2,17 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from django.db.models import Q, F, Case, When, ExpressionWrapper, FloatField, Count
+from django.db.models import Q, Count
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
-from datetime import timedelta
 from django.core.paginator import Paginator
 
+from badmintok.api.pagination import cursor_requested, cursor_response
+from badmintok.view_counts import viewer_key
 from badmintok.models import BadmintokBanner, Banner, Notice, Promotion, YoutubeVideo
+from community.categories import category_tree
+from community.hot import top_hot_posts
+from community.search import search_posts
 from community.models import Post, Category
 from community.api.serializers import CategorySerializer
 from badmintok.api.serializers import (
@@ -27,7 +31,7 @@ def home(request):
         is_deleted=False,
         is_draft=False,
         published_at__lte=now
-    ).select_related('author', 'category').prefetch_related('images').order_by('-created_at')[:5]
+    ).select_related('author', 'category').defer('content').order_by('-created_at')[:5]
     
     serializer = PostListSerializer(latest_posts, many=True, context={'request': request})
     return Response({
@@ -48,7 +52,7 @@ def post_list(request):
         source=Post.Source.BADMINTOK
     ).filter(
         Q(published_at__lte=now) | Q(published_at__isnull=True)
-    ).select_related("author", "category").prefetch_related("images", "categories")
+    ).select_related("author", "category").prefetch_related("categories").defer("content")
     
     # 탭 필터링
     tab = request.GET.get('tab', '')
@@ -88,18 +92,10 @@ def post_list(request):
                 posts = posts.filter(Q(category__slug=category) | Q(categories__slug=category)).distinct()
         # 기타 탭
         else:
-            current_tab = Category.objects.filter(
-                slug=tab,
-                source=Category.Source.BADMINTOK,
-                parent__isnull=True,
-                is_active=True
-            ).first()
+            # 탭 + 하위 카테고리 slug (카테고리 트리 캐시, 쿼리 없음)
+            category_slugs = category_tree().tab_slugs(Category.Source.BADMINTOK, tab)
             
-            if current_tab:
-                category_slugs = [current_tab.slug]
-                child_categories = Category.objects.filter(parent=current_tab, is_active=True)
-                category_slugs.extend([cat.slug for cat in child_categories])
-                
+            if category_slugs:
                 posts = posts.filter(
                     Q(category__slug__in=category_slugs) | Q(categories__slug__in=category_slugs)
                 ).distinct()
@@ -107,15 +103,12 @@ def post_list(request):
                 if category:
                     posts = posts.filter(Q(category__slug=category) | Q(categories__slug=category)).distinct()
     
-    # 검색
+    # 검색 (검색 색인 순위순), 없으면 고정글 → 최신순
     search = request.GET.get('search', '')
     if search:
-        posts = posts.filter(
-            Q(title__icontains=search) | Q(content__icontains=search)
-        )
-    
-    # 정렬
-    posts = posts.order_by("-is_pinned", "-created_at")
+        posts = search_posts(posts, search)
+    else:
+        posts = posts.order_by("-is_pinned", "-created_at")
     
     # 페이지네이션
     page_number = request.GET.get('page', 1)
@@ -129,6 +122,10 @@ def post_list(request):
     except (ValueError, TypeError):
         page_size = 10
     
+    # ?cursor= 키셋 모드: COUNT/OFFSET 없이 다음 cursor 만 반환
+    if cursor_requested(request):
+        return cursor_response(request, posts, page_size, PostListSerializer)
+
     paginator = Paginator(posts, page_size)
     page_obj = paginator.get_page(page_number)
     
@@ -163,11 +160,11 @@ def post_detail(request, slug):
     post = get_object_or_404(
         Post.objects.filter(base_filter)
         .select_related("author", "category")
-        .prefetch_related("images", "likes", "categories"),
+        .prefetch_related("images", "categories"),
     )
     
-    # 조회수 증가 (API에서는 단순 증가, 세션 체크 없음)
-    post.increase_view_count()
+    # 조회수 증가 (같은 사용자 3시간 내 재조회 제외)
+    post.increase_view_count(viewer_key(request))
     
     serializer = PostDetailSerializer(post, context={'request': request})
     return Response(serializer.data, status=status.HTTP_200_OK)
@@ -187,42 +184,30 @@ def post_like(request, slug):
 
     if post.likes.filter(id=request.user.id).exists():
         post.likes.remove(request.user)
-        post.update_like_count()
+        post.refresh_from_db(fields=['like_count'])
         return Response({'message': '좋아요가 취소되었습니다.', 'is_liked': False, 'like_count': post.like_count}, status=status.HTTP_200_OK)
     else:
         post.likes.add(request.user)
-        post.update_like_count()
+        post.refresh_from_db(fields=['like_count'])
         return Response({'message': '좋아요가 추가되었습니다.', 'is_liked': True, 'like_count': post.like_count}, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def hot_posts(request):
-    """인기 게시글 API (Hot 글 - 최근 30일 내)"""
+    """인기 게시글 API (Hot 글 - 최근 30일 내, 저장된 hot_score 순)"""
     now = timezone.now()
-    recent_30_days = now - timedelta(days=30)
-    recent_7_days = now - timedelta(days=7)
-    
-    hot_posts_qs = Post.objects.filter(
-        is_deleted=False,
-        is_draft=False,
-        source=Post.Source.BADMINTOK
-    ).filter(
-        Q(published_at__lte=now) | Q(published_at__isnull=True)
-    ).filter(
-        Q(published_at__gte=recent_30_days) | Q(published_at__isnull=True, created_at__gte=recent_30_days)
-    ).select_related("author", "category").prefetch_related("categories").annotate(
-        time_weight=Case(
-            When(published_at__gte=recent_7_days, then=1.5),
-            When(published_at__isnull=True, created_at__gte=recent_7_days, then=1.5),
-            default=1.0,
-            output_field=FloatField()
-        ),
-        hot_score=ExpressionWrapper(
-            (F('view_count') * 1 + F('like_count') * 2 + F('comment_count') * 3) * F('time_weight'),
-            output_field=FloatField()
-        )
-    ).order_by('-hot_score')[:10]
+    hot_posts_qs = top_hot_posts(
+        Post.objects.filter(
+            is_deleted=False,
+            is_draft=False,
+            source=Post.Source.BADMINTOK
+        ).filter(
+            Q(published_at__lte=now) | Q(published_at__isnull=True)
+        ).select_related("author", "category").defer("content"),
+        10,
+        cache_key="badmintok",
+    )
     
     serializer = PostListSerializer(hot_posts_qs, many=True, context={'request': request})
     return Response({
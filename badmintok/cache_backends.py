@@ -0,0 +1,166 @@
+"""외부 서비스 없이 gunicorn 워커끼리 공유되는 SQLite 캐시 백엔드.
+
+Django 기본값(LocMemCache)은 워커 프로세스마다 따로라서 방문 dedupe 가
+워커 사이에서 새고, 같은 키가 워커 수만큼 메모리에 중복된다.
+이 백엔드는 같은 호스트의 모든 프로세스(워커·관리 명령·cron)가 하나의
+SQLite 파일(WAL 모드)을 공유한다.
+
+- add(): INSERT ... ON CONFLICT 한 문장 → 프로세스 간에도 원자적 (dedupe 용)
+- incr(): 정수 값은 INTEGER 컬럼 그대로 저장해 UPDATE value = value + n 으로 원자 증가
+- 만료된 행은 쓰기 CULL_EVERY 회마다 한 번씩 일괄 삭제
+
+settings.CACHES 예:
+    "default": {
+        "BACKEND": "badmintok.cache_backends.SQLiteCache",
+        "LOCATION": "/tmp/badmintok-cache.sqlite3",
+        "OPTIONS": {"CULL_EVERY": 500},
+    }
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+class SQLiteCache(BaseCache):
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = location
+        options = params.get("OPTIONS") or {}
+        self._cull_every = int(options.get("CULL_EVERY", 500))
+        self._busy_timeout = float(options.get("BUSY_TIMEOUT", 5))
+        self._local = threading.local()
+        self._writes = 0
+
+    # ── 연결 ──
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        # fork(gunicorn preload) 이후 부모 연결을 재사용하지 않도록 pid 확인
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self._path, timeout=self._busy_timeout, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " expires REAL"
+            ")"
+        )
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    # ── 직렬화: 정수는 그대로 저장해야 SQL 에서 원자 증가 가능 ──
+
+    def _encode(self, value):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        return pickle.dumps(value, self.pickle_protocol)
+
+    @staticmethod
+    def _decode(raw):
+        if isinstance(raw, int):
+            return raw
+        return pickle.loads(raw)
+
+    def _maybe_cull(self, conn):
+        self._writes += 1
+        if self._cull_every and self._writes % self._cull_every == 0:
+            conn.execute("DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?", (time.time(),))
+
+    # ── BaseCache API ──
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._conn()
+        now = time.time()
+        cur = conn.execute(
+            "INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires = excluded.expires "
+            "WHERE cache.expires IS NOT NULL AND cache.expires <= ?",
+            (key, self._encode(value), self.get_backend_timeout(timeout), now),
+        )
+        self._maybe_cull(conn)
+        return cur.rowcount > 0
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._conn().execute(
+            "SELECT value, expires FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return default
+        raw, expires = row
+        if expires is not None and expires <= time.time():
+            return default
+        try:
+            return self._decode(raw)
+        except (pickle.PickleError, EOFError, AttributeError, ImportError):
+            return default
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, self._encode(value), self.get_backend_timeout(timeout)),
+        )
+        self._maybe_cull(conn)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cur = self._conn().execute(
+            "UPDATE cache SET expires = ? WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (self.get_backend_timeout(timeout), key, time.time()),
+        )
+        return cur.rowcount > 0
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cur = self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+        return cur.rowcount > 0
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._conn().execute(
+            "SELECT 1 FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return row is not None
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cur = conn.execute(
+                "UPDATE cache SET value = value + ? "
+                "WHERE key = ? AND typeof(value) = 'integer' AND (expires IS NULL OR expires > ?)",
+                (delta, key, time.time()),
+            )
+            if cur.rowcount == 0:
+                raise ValueError("Key '%s' not found" % key)
+            (value,) = conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return value
+
+    def clear(self):
+        self._conn().execute("DELETE FROM cache")
+
+    def close(self, **kwargs):
+        # 요청마다 닫지 않고 스레드별 연결을 재사용 (request_finished 시그널에서 호출됨)
+        pass
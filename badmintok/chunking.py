@@ -0,0 +1,149 @@
+"""대용량 테이블을 PK 구간 단위로 나눠 훑는 관리 명령 공용 유틸.
+
+VisitorLog 처럼 수천만 행인 테이블에서 전체 queryset 을 한 번에 돌리면
+결과를 메모리에 다 올리거나 긴 단일 트랜잭션이 생긴다. 여기서는
+- PK 구간 (lo, hi] 단위로 잘라 각 구간을 짧은 쿼리로 처리하고 (인덱스 range scan)
+- 구간 안의 행은 iterator(chunk_size=...) 로 흘려 읽으며
+- 진행률/ETA 를 출력하고, 마지막 처리 PK 를 체크포인트 파일에 남겨 이어서 실행할 수 있게 한다.
+
+사용 예:
+    walker = IdRangeWalker(VisitorLog.objects.all(), chunk_size=5000,
+                           checkpoint=Checkpoint(path), stdout=self.stdout)
+    for chunk in walker:
+        chunk.queryset.filter(...).delete()
+"""
+import json
+import os
+import time
+
+from django.db.models import Max, Min
+
+
+def id_bounds(queryset):
+    """queryset 의 (최소 PK, 최대 PK). 비어 있으면 (None, None)"""
+    agg = queryset.aggregate(lo=Min("pk"), hi=Max("pk"))
+    return agg["lo"], agg["hi"]
+
+
+class Checkpoint:
+    """마지막으로 처리 완료한 PK 를 JSON 파일에 기록 (중단 후 재개용)"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f).get("last_id")
+        except (OSError, ValueError):
+            return None
+
+    def save(self, last_id):
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"last_id": last_id, "saved_at": time.time()}, f)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class IdChunk:
+    """PK 구간 (lo, hi] 하나"""
+
+    def __init__(self, base_queryset, lo, hi, iterator_chunk_size):
+        self.lo = lo
+        self.hi = hi
+        # 모델 기본 ordering(-visited_at 등)은 구간 스캔에 불필요한 정렬만 유발
+        self.queryset = base_queryset.filter(pk__gt=lo, pk__lte=hi).order_by()
+        self._iterator_chunk_size = iterator_chunk_size
+
+    def iter_values(self, *fields):
+        """구간 안의 행을 values_list 로 스트리밍"""
+        return self.queryset.values_list(*fields).iterator(chunk_size=self._iterator_chunk_size)
+
+
+class IdRangeWalker:
+    """queryset 을 PK 오름차순 구간으로 나눠 순회하며 진행률/ETA 출력.
+
+    Args:
+        queryset: 대상 queryset (필터 포함 가능)
+        chunk_size: 구간 하나의 PK 폭
+        bounds_queryset: PK 최소/최대를 구할 queryset (기본 queryset).
+            필터가 인덱스를 못 타는 경우 전체 테이블을 넘기면 PK 로만 경계를 구한다.
+        start_after: 이 PK 이후부터 시작 (재개). 체크포인트가 있으면 그 값 우선.
+        checkpoint: Checkpoint — 구간 하나가 끝날 때마다 저장
+        sleep: 구간 사이 대기 초 (운영 피크 시간대 부하 완화)
+        stdout: 진행률 출력 대상 (관리 명령의 self.stdout)
+        report_every: 진행률 출력 최소 간격(초)
+    """
+
+    def __init__(self, queryset, chunk_size=5000, *, bounds_queryset=None, start_after=None,
+                 checkpoint=None, sleep=0, stdout=None, report_every=2.0):
+        self.queryset = queryset
+        self.chunk_size = max(int(chunk_size), 1)
+        self.bounds_queryset = bounds_queryset if bounds_queryset is not None else queryset
+        self.checkpoint = checkpoint
+        self.sleep = sleep
+        self.stdout = stdout
+        self.report_every = report_every
+        self.rows = 0
+
+        resumed = checkpoint.load() if checkpoint else None
+        self.start_after = resumed if resumed is not None else start_after
+        self.resumed = resumed is not None
+
+    def add_rows(self, n):
+        """진행률 표시에 쓸 처리 행 수 누적"""
+        self.rows += n
+
+    def __iter__(self):
+        lo, hi = id_bounds(self.bounds_queryset)
+        if lo is None:
+            return
+
+        cursor = lo - 1
+        if self.start_after is not None:
+            cursor = max(cursor, self.start_after)
+        first = cursor
+        span = max(hi - first, 1)
+
+        started = time.monotonic()
+        last_report = 0.0
+        while cursor < hi:
+            upper = min(cursor + self.chunk_size, hi)
+            yield IdChunk(self.queryset, cursor, upper, min(self.chunk_size, 2000))
+            cursor = upper
+
+            if self.checkpoint:
+                self.checkpoint.save(cursor)
+
+            now = time.monotonic()
+            if self.stdout and (now - last_report >= self.report_every or cursor >= hi):
+                last_report = now
+                self._report(cursor, cursor - first, span, hi, now - started)
+
+            if self.sleep and cursor < hi:
+                time.sleep(self.sleep)
+
+    def _report(self, cursor, done, span, hi, elapsed):
+        ratio = done / span
+        eta = (elapsed / ratio - elapsed) if ratio > 0 else 0
+        self.stdout.write(
+            f"  [{ratio * 100:5.1f}%] id {cursor:,} / {hi:,} · "
+            f"{self.rows:,}행 · 경과 {_fmt_seconds(elapsed)} · 남은 시간 ~{_fmt_seconds(eta)}"
+        )
+
+
+def _fmt_seconds(seconds):
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
@@ -0,0 +1,50 @@
+"""게시글 댓글(2단계: 댓글 → 대댓글) 트리를 쿼리 1회 + 좋아요 1회로 구성.
+
+최상위 댓글을 읽고 replies 를 prefetch 하거나 댓글마다 obj.replies.filter(...) 를
+다시 돌리면 댓글 수만큼 쿼리가 늘어난다. 여기서는 한 글의 댓글 전체를 한 번에 읽어
+메모리에서 부모별로 묶는다.
+
+- 최상위 댓글 목록을 반환하고, 각 댓글에 replies_list (작성순 대댓글 list) 를 붙인다.
+  대댓글의 대댓글은 최상위 조상 아래로 모은다.
+- 부모가 목록에 없는(삭제 등) 대댓글은 버린다.
+- user 를 주면 모든 댓글의 좋아요 여부를 한 번에 조회해 liked_by_user 로 붙인다
+  (LikedByUserMixin.get_is_liked 와 템플릿이 그대로 사용).
+
+사용:
+    comments = build_comment_tree(
+        Comment.objects.filter(post=post, is_deleted=False).select_related("author"),
+        request.user,
+    )
+"""
+from .api.likes import liked_ids
+
+
+def build_comment_tree(queryset, user=None):
+    """queryset(한 글의 댓글 전체) → 최상위 댓글 list (replies_list / liked_by_user 부착)"""
+    comments = list(queryset.order_by("created_at", "pk"))
+    by_pk = {comment.pk: comment for comment in comments}
+
+    roots = []
+    for comment in comments:
+        comment.replies_list = []
+        if comment.parent_id is None:
+            roots.append(comment)
+
+    for comment in comments:
+        if comment.parent_id is None:
+            continue
+        root = by_pk.get(comment.parent_id)
+        # 대댓글의 대댓글 → 최상위 조상 (경로 중간이 빠졌으면 버림)
+        seen = set()
+        while root is not None and root.parent_id is not None and root.pk not in seen:
+            seen.add(root.pk)
+            root = by_pk.get(root.parent_id)
+        if root is not None and root.parent_id is None:
+            root.replies_list.append(comment)
+
+    if user is not None:
+        model = queryset.model
+        liked = liked_ids(user, model, list(by_pk))
+        for comment in comments:
+            comment.liked_by_user = comment.pk in liked
+    return roots
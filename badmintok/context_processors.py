@@ -1,9 +1,10 @@
-from community.models import Category
+from django.utils.functional import SimpleLazyObject
+
+from community.categories import category_tree
 
 
 def community_categories(request):
-    """커뮤니티 카테고리를 모든 템플릿에 제공"""
+    """커뮤니티 카테고리를 모든 템플릿에 제공 (카테고리 트리 캐시, 템플릿이 쓸 때만 조회)"""
     return {
-        'community_categories': Category.objects.filter(is_active=True).order_by('display_order', 'name'),
+        'community_categories': SimpleLazyObject(lambda: category_tree().all()),
     }
-
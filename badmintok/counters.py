@@ -0,0 +1,94 @@
+"""좋아요/댓글 수 같은 비정규화 카운터를 원자적으로 증감.
+
+좋아요·댓글이 바뀔 때마다 likes.count() / comments.filter(...).count() 로 전체를 다시
+세면 인기 글일수록 느려지고, 동시에 센 요청끼리 서로의 결과를 덮어쓴다.
+여기서는 UPDATE ... SET like_count = like_count + n 한 줄로 증감만 반영한다.
+좋아요/댓글 행을 쓰는 쪽과 같은 트랜잭션에서 호출하면 롤백 시 카운터도 함께 되돌아간다.
+
+- 감소는 0 아래로 내려가지 않게 막는다 (PositiveIntegerField, 과거 drift 방지)
+- 부모(게시글 등) 삭제에 딸려 지워지는 행은 deleted_with 로 걸러 불필요한 UPDATE 를 건너뛴다
+- 어긋난 값은 reconcile_counters 명령이 주기적으로 실제 개수로 맞춘다 (reconcile_range)
+
+사용:
+    adjust_counters(BandPost, post_id, like_count=1)
+    adjust_counters(Post, post_id, comment_count=-1)
+"""
+from django.db.models import Case, Count, F, Model, Value, When
+
+
+def counter_delta(field, delta):
+    """field 를 delta 만큼 바꾸는 UPDATE 식 (감소는 0 에서 멈춤)"""
+    if delta >= 0:
+        return F(field) + delta
+    return Case(
+        When(**{f"{field}__gte": -delta}, then=F(field) + delta),
+        default=Value(0),
+    )
+
+
+def adjust_counters(model, pk, **deltas):
+    """model 의 pk 행 카운터들을 한 번의 UPDATE 로 증감. Returns: 바뀐 행 수 (0 또는 1)"""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if pk is None or not deltas:
+        return 0
+    return model._default_manager.filter(pk=pk).update(
+        **{field: counter_delta(field, delta) for field, delta in deltas.items()}
+    )
+
+
+def deleted_with(origin, *models):
+    """post_delete 의 origin(삭제 출발점)이 models 중 하나의 인스턴스/queryset 인지.
+
+    True 면 카운터를 가진 행도 같은 삭제로 지워지므로 증감할 필요가 없다.
+    """
+    model = type(origin) if isinstance(origin, Model) else getattr(origin, "model", None)
+    return model is not None and issubclass(model, models)
+
+
+def reconcile_range(queryset, counters, *, apply=True):
+    """queryset (보통 PK 구간 하나) 행들의 카운터를 실제 개수와 비교해 어긋난 행만 고친다.
+
+    Args:
+        queryset: 카운터를 가진 모델의 queryset
+        counters: {카운터 필드: (세어야 할 행 queryset, 대상 FK 필드명)}
+            예) {"like_count": (BandPostLike.objects.all(), "post")}
+        apply: False 면 고치지 않고 어긋난 행만 반환
+    Returns:
+        {pk: {필드: (이전 값, 실제 값)}} — 고친(apply=False 면 어긋난) 행만
+    """
+    fields = list(counters)
+    # 현재 값을 먼저 읽고 나서 센다: 그 사이 생긴 좋아요는 현재 값이 달라져 아래 조건부 UPDATE 가 건너뛴다
+    current = {row[0]: row[1:] for row in queryset.order_by().values_list("pk", *fields)}
+    if not current:
+        return {}
+    pks = list(current)
+
+    actual = {}
+    for field, (source, fk) in counters.items():
+        actual[field] = dict(
+            source.filter(**{f"{fk}_id__in": pks})
+            .order_by()
+            .values_list(f"{fk}_id")
+            .annotate(n=Count("pk"))
+            .values_list(f"{fk}_id", "n")
+        )
+
+    fixed = {}
+    for pk, values in current.items():
+        changes = {}
+        for field, value in zip(fields, values):
+            real = actual[field].get(pk, 0)
+            if value != real:
+                changes[field] = (value, real)
+        if not changes:
+            continue
+        if not apply:
+            fixed[pk] = changes
+            continue
+        # 읽은 뒤 다른 요청이 증감했으면 덮어쓰지 않음 (다음 실행에서 다시 확인)
+        matched = queryset.model._default_manager.filter(
+            pk=pk, **{field: before for field, (before, _) in changes.items()}
+        ).update(**{field: real for field, (_, real) in changes.items()})
+        if matched:
+            fixed[pk] = changes
+    return fixed
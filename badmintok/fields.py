@@ -1,16 +1,40 @@
+import hashlib
 import os
+from contextlib import contextmanager
 from io import BytesIO
 
+import logging
+
 from PIL import Image
+from django.conf import settings
+from django.core.cache import cache
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
-from django.db.models import ImageField
+from django.db.models import CharField, ImageField
+from django.db.models.signals import post_save
+from django.db.models.fields.files import ImageFieldFile
 
+logger = logging.getLogger(__name__)
 
 # WebP 변환 대상이 아닌 확장자
 WEBP_EXTENSION = '.webp'
 CONVERTIBLE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff'}
 
+# 목록 화면용 축소본 폭 (px). settings.IMAGE_VARIANT_WIDTHS 로 조정
+VARIANT_WIDTHS = tuple(getattr(settings, 'IMAGE_VARIANT_WIDTHS', (320, 640, 1280)))
+# 이미지별 "축소본이 있는 폭" 캐시 유지 시간 (축소본을 만들거나 지울 때는 바로 갱신)
+VARIANTS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def conversion_is_async():
+    """업로드 변환을 작업 대기열로 미룰지 (settings.IMAGE_CONVERSION_ASYNC, 기본 True)"""
+    return getattr(settings, 'IMAGE_CONVERSION_ASYNC', True)
+
+
+def keep_original():
+    """WebP 로 바꾼 뒤에도 원본 파일을 남길지 (settings.IMAGE_KEEP_ORIGINAL, 기본 True)"""
+    return getattr(settings, 'IMAGE_KEEP_ORIGINAL', True)
+
 
 def is_webp(filename):
     """파일이 WebP인지 확인"""
@@ -27,93 +51,244 @@ def is_convertible(filename):
     return ext in CONVERTIBLE_EXTENSIONS
 
 
+def variant_name(name, width):
+    """원본 경로 → 폭별 축소본 경로 (항상 같은 이름): band/covers/a.png → band/covers/a_w320.webp"""
+    return f"{os.path.splitext(name)[0]}_w{width}.webp"
+
+
+def _variants_cache_key(name):
+    # 파일 이름에 한글/공백이 들어가 memcached 키로 바로 쓸 수 없음
+    return f"image:variants:{hashlib.md5(name.encode('utf-8')).hexdigest()}"
+
+
+def remember_variants(name, widths):
+    """name 의 축소본이 있는 폭 목록을 공유 캐시에 기록 (save_variants 가 호출)"""
+    cache.set(_variants_cache_key(name), sorted(widths), VARIANTS_CACHE_TIMEOUT)
+
+
+def existing_variant_widths(storage, name, widths=VARIANT_WIDTHS):
+    """widths 중 축소본 파일이 실제로 있는 폭 (오름차순).
+
+    캐시에 없으면 (축소본 도입 전 파일, 캐시 만료) 저장소에서 폭마다 확인해 채운다.
+    """
+    key = _variants_cache_key(name)
+    found = cache.get(key)
+    if found is None:
+        found = [width for width in sorted(set(widths)) if storage.exists(variant_name(name, width))]
+        cache.set(key, found, VARIANTS_CACHE_TIMEOUT)
+    return [width for width in found if width in widths]
+
+
+def _to_web_mode(img):
+    """WebP 로 저장할 수 있는 모드(RGB / RGBA)로 변환"""
+    if img.mode == 'P':
+        return img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+    if img.mode == 'LA':
+        return img.convert('RGBA')
+    if img.mode not in ('RGB', 'RGBA'):
+        return img.convert('RGB')
+    return img
+
+
+def save_variants(storage, name, widths=VARIANT_WIDTHS, quality=85):
+    """저장된 원본(name)에서 폭별 WebP 축소본을 만들어 variant_name 경로에 저장.
+
+    원본보다 넓은 폭은 늘리지 않고 원본 크기로 저장한다 (어떤 폭을 요청해도 파일이 있도록).
+    같은 이름의 파일이 있으면 덮어쓴다.
+    Returns: {폭: 저장 경로}
+    """
+    with storage.open(name, 'rb') as source:
+        img = Image.open(source)
+        img.load()
+    img = _to_web_mode(img)
+
+    saved = {}
+    for width in sorted(set(widths)):
+        resized = img
+        if img.width > width:
+            height = max(1, round(img.height * width / img.width))
+            resized = img.resize((width, height), Image.LANCZOS)
+        output = BytesIO()
+        resized.save(output, format='WEBP', quality=quality, method=4)
+        target = variant_name(name, width)
+        if storage.exists(target):
+            storage.delete(target)
+        saved[width] = storage.save(target, ContentFile(output.getvalue()))
+    remember_variants(name, saved)
+    return saved
+
+
+def convert_file(storage, name, quality=85):
+    """저장된 이미지(name)를 같은 폴더에 WebP 로 저장.
+
+    Returns: 저장된 WebP 경로 (같은 이름이 있으면 storage 가 바꾼 이름)
+    """
+    with storage.open(name, 'rb') as source:
+        img = Image.open(source)
+        img.load()
+    output = BytesIO()
+    _to_web_mode(img).save(output, format='WEBP', quality=quality, method=4)
+    return storage.save(f"{os.path.splitext(name)[0]}{WEBP_EXTENSION}", ContentFile(output.getvalue()))
+
+
+def process_image(storage, name, quality=85, widths=VARIANT_WIDTHS):
+    """원본을 WebP 로 변환(이미 WebP 면 그대로)하고 폭별 축소본 생성. Returns: WebP 경로"""
+    webp_name = name if is_webp(name) else convert_file(storage, name, quality)
+    if widths:
+        save_variants(storage, webp_name, widths, quality)
+    return webp_name
+
+
+def delete_quietly(storage, name):
+    try:
+        if storage.exists(name):
+            storage.delete(name)
+    except Exception as e:
+        logger.warning(f"파일 삭제 실패 ({name}): {e}")
+
+
+def delete_variants(storage, name, widths=VARIANT_WIDTHS):
+    for width in widths:
+        delete_quietly(storage, variant_name(name, width))
+    cache.delete(_variants_cache_key(name))
+
+
+class WebPFieldFile(ImageFieldFile):
+    """축소본 URL 을 함께 제공하는 FieldFile"""
+
+    def variant_widths(self):
+        """축소본 파일이 실제로 있는 폭 목록 — 파일이 없거나 아직 WebP 로 바뀌기 전이면 빈 목록"""
+        if not self.name or not is_webp(self.name) or not self.field.variant_widths:
+            return []
+        return existing_variant_widths(self.storage, self.name, self.field.variant_widths)
+
+    @property
+    def srcset(self):
+        """{폭: URL} — 축소본이 있는 폭만 (variant_widths)"""
+        return {width: self.storage.url(variant_name(self.name, width)) for width in self.variant_widths()}
+
+    def variant_url(self, width):
+        """width 이상인 가장 작은 축소본 URL (없거나 아직 변환 전이면 원본 URL)"""
+        for candidate in self.variant_widths():
+            if candidate >= width:
+                return self.storage.url(variant_name(self.name, candidate))
+        return self.url
+
+    def delete(self, save=True):
+        if self.name:
+            delete_variants(self.storage, self.name, self.field.variant_widths)
+        super().delete(save=save)
+
+    delete.alters_data = True
+
+
 class WebPImageField(ImageField):
     """
     이미지를 자동으로 WebP 형식으로 변환하는 커스텀 ImageField.
-    PNG, JPG, JPEG 등의 이미지가 업로드되면 WebP로 변환하여 저장합니다.
+    PNG, JPG, JPEG 등의 이미지가 업로드되면 원본을 그대로 저장하고 변환 작업(ImageConversionJob)을 등록합니다.
+    run_image_worker 명령이 WebP 와 variant_widths 폭별 축소본(variant_name)을 만든 뒤 필드를 WebP 로 바꾸고,
+    그때부터 obj.<필드>.srcset 이 {폭: URL} 을 돌려줍니다 (기존 파일은 generate_image_variants 명령).
+    settings.IMAGE_CONVERSION_ASYNC = False 면 저장 중에 바로 변환합니다.
+    save() 가 저장 뒤 파일을 더 손보는 모델은 deferred_conversion 블록 안에서 저장하고 손봐야 합니다.
     """
 
-    def __init__(self, *args, quality=85, **kwargs):
+    attr_class = WebPFieldFile
+
+    def __init__(self, *args, quality=85, variant_widths=None, **kwargs):
         """
         Args:
             quality: WebP 압축 품질 (1-100, 기본값 85)
+            variant_widths: 축소본 폭 목록 (기본 VARIANT_WIDTHS, 빈 튜플이면 만들지 않음)
         """
         self.quality = quality
+        self.variant_widths = tuple(VARIANT_WIDTHS if variant_widths is None else variant_widths)
         super().__init__(*args, **kwargs)
 
     def deconstruct(self):
         name, path, args, kwargs = super().deconstruct()
         if self.quality != 85:
             kwargs['quality'] = self.quality
+        if self.variant_widths != VARIANT_WIDTHS:
+            kwargs['variant_widths'] = self.variant_widths
         return name, path, args, kwargs
 
+    def contribute_to_class(self, cls, name, **kwargs):
+        super().contribute_to_class(cls, name, **kwargs)
+        if not cls._meta.abstract:
+            post_save.connect(self._enqueue_conversion, sender=cls)
+
     def pre_save(self, model_instance, add):
+        current = getattr(model_instance, self.attname)
+        uploading = bool(current) and not getattr(current, '_committed', True)
+        # 업로드된 원본을 먼저 그대로 저장 (저장 경로 확정)
         file = super().pre_save(model_instance, add)
 
-        if not file:
+        if not file or not uploading:
             return file
 
-        # 이미 WebP인 경우 변환하지 않음
-        if file.name and file.name.lower().endswith('.webp'):
+        if conversion_is_async():
+            # pk 가 정해진 뒤 post_save 에서 같은 트랜잭션에 변환 작업 등록 (_enqueue_conversion)
+            model_instance.__dict__.setdefault('_webp_uploads', {})[self.name] = file.name
+            return file
+
+        original = file.name
+        try:
+            file.name = process_image(file.storage, original, self.quality, self.variant_widths)
+        except Exception as e:
+            # 변환 실패 시 원본 그대로 저장
+            logger.warning(f"WebP 변환 실패 ({original}): {e}")
             return file
+        # FieldFile.save 가 인스턴스 속성을 원본 이름 문자열로 바꿔 두었으므로 WebP 이름으로 다시 지정
+        setattr(model_instance, self.attname, file.name)
+        if file.name != original and not keep_original():
+            delete_quietly(file.storage, original)
+        return file
 
-        # 새로 업로드된 파일인지 확인 (committed=False인 경우 새 파일)
-        # FieldFile의 경우 _committed 속성으로 확인
-        is_new_upload = hasattr(file, '_committed') and not file._committed
+    def _enqueue_conversion(self, sender, instance, raw=False, **kwargs):
+        uploads = instance.__dict__.get('_webp_uploads')
+        if raw or not uploads or self.name not in uploads or instance.__dict__.get('_webp_deferred'):
+            return
+        from badmintok.models import ImageConversionJob
 
-        # InMemoryUploadedFile 또는 TemporaryUploadedFile인 경우도 새 파일
-        if not is_new_upload:
-            from django.core.files.uploadedfile import UploadedFile
-            is_new_upload = isinstance(file, UploadedFile)
+        ImageConversionJob.enqueue(instance, self.name, uploads.pop(self.name))
 
-        # 새 파일이 아니면 변환하지 않음 (이미 저장된 파일)
-        if not is_new_upload:
-            return file
 
-        try:
-            # 파일 포지션을 처음으로 이동
-            if hasattr(file, 'seek'):
-                file.seek(0)
+class BinaryCharField(CharField):
+    """MySQL 에서 utf8mb4_bin 으로 비교하는 CharField.
 
-            # 이미지 열기
-            img = Image.open(file)
-            img.load()  # 이미지 데이터를 메모리에 완전히 로드
+    서버 기본 collation(utf8mb4_unicode_ci)은 대소문자 · 악센트를 무시해 "fé" 와 "fe" 처럼
+    파이썬에서 다른 값이 같은 값이 된다 (unique 제약 충돌). 다른 DB 의 기본 비교는 이미 바이트 단위라 그대로 둔다.
+    """
 
-            # 모드 변환: 팔레트 모드(P)는 RGBA로, 기타는 RGB로
-            if img.mode == 'P':
-                # 팔레트 모드: 투명도 정보가 있으면 RGBA로, 없으면 RGB로
-                if 'transparency' in img.info:
-                    img = img.convert('RGBA')
-                else:
-                    img = img.convert('RGB')
-            elif img.mode == 'LA':
-                img = img.convert('RGBA')
-            elif img.mode not in ('RGB', 'RGBA'):
-                img = img.convert('RGB')
+    def db_parameters(self, connection):
+        params = super().db_parameters(connection)
+        if connection.vendor == 'mysql':
+            params['collation'] = 'utf8mb4_bin'
+        return params
 
-            # WebP로 변환
-            output = BytesIO()
-            img.save(output, format='WEBP', quality=self.quality, optimize=True)
-            output.seek(0)
 
-            # 파일명 변경 (.webp로)
-            # 경로에서 파일명만 추출하여 처리
-            basename = os.path.basename(file.name)
-            name_without_ext = os.path.splitext(basename)[0]
-            new_name = f"{name_without_ext}.webp"
+def enqueue_conversions(instance):
+    """instance 에 저장만 되고 아직 변환 작업이 없는 업로드의 작업 등록"""
+    from badmintok.models import ImageConversionJob
 
-            # 새 파일로 저장
-            new_file = ContentFile(output.read(), name=new_name)
-            setattr(model_instance, self.attname, new_file)
+    uploads = instance.__dict__.pop('_webp_uploads', None) or {}
+    for field_name, source_name in uploads.items():
+        ImageConversionJob.enqueue(instance, field_name, source_name)
 
-            return new_file
-        except Exception as e:
-            # 변환 실패 시 원본 그대로 저장
-            import logging
-            logging.getLogger(__name__).warning(f"WebP 변환 실패: {e}")
-            return file
 
-        return file
+@contextmanager
+def deferred_conversion(instance):
+    """블록 안의 저장에서는 변환 작업을 등록하지 않고 블록이 끝난 뒤 한꺼번에 등록.
+
+    save() 가 저장 뒤 파일을 더 손보는 모델(밴드 커버 자르기)이 손본 파일을 작업자가 읽도록
+    손보기까지 이 블록 안에서 한다.
+    """
+    instance.__dict__['_webp_deferred'] = True
+    try:
+        yield
+    finally:
+        instance.__dict__.pop('_webp_deferred', None)
+    enqueue_conversions(instance)
 
 
 def convert_to_webp(image_file, quality=85):
@@ -0,0 +1,191 @@
+"""이미지 WebP 변환 대기열(ImageConversionJob) 처리.
+
+WebPImageField 가 요청 안에서 WebP 변환과 축소본 생성을 하면 큰 사진 몇 장에 요청이 수 초씩 묶였다.
+이제 요청에서는 원본만 저장하고 같은 트랜잭션에 작업 행을 쓰며, run_image_worker 명령이
+- 처리할 때가 된 행을 SELECT ... FOR UPDATE SKIP LOCKED 로 잡아 RUNNING 으로 바꾸고 (claim)
+  — 작업자 여러 개가 겹쳐 돌아도 같은 행을 두 번 잡지 않는다
+- 원본을 WebP 로 변환해 새 이름으로 저장하고 폭별 축소본을 만든 뒤 (fields.process_image)
+- 객체의 필드 값이 아직 그 원본일 때만 UPDATE 한 번으로 WebP 경로로 바꾼다.
+  그 사이 다른 이미지로 바뀌었거나 객체가 지워졌으면 만든 파일을 지우고 SKIPPED 로 남긴다.
+- 오류가 난 행은 지수 백오프로 다시 대기시키고 MAX_ATTEMPTS 번 실패하면 FAILED 로 남긴다.
+
+바뀌기 전까지 필드는 원본을 가리키므로 API 는 원본 URL 을 내려주고, srcset 은 WebP 로 바뀐 뒤에만 나온다.
+"""
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from .fields import delete_quietly, delete_variants, process_image
+from .models import ImageConversionJob
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 잡는 행 수 (이미지 하나에 수백 ms 가 걸리므로 작게)
+BATCH_SIZE = 20
+# 잡은 행을 이 시간 안에 처리하지 못하면 다른 작업자가 다시 잡는다
+LEASE = timedelta(minutes=10)
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = timedelta(minutes=1)
+BACKOFF_MAX = timedelta(hours=1)
+
+
+@dataclass
+class BatchStats:
+    """run_once 한 번의 결과 (처리량/지연 측정용)"""
+
+    claimed: int = 0
+    done: int = 0
+    skipped: int = 0
+    retried: int = 0
+    failed: int = 0
+    # 행이 대기열에 들어온 뒤 처리 시작까지 걸린 시간 (초)
+    lags: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def max_lag(self):
+        return max(self.lags, default=0.0)
+
+    @property
+    def avg_lag(self):
+        return sum(self.lags) / len(self.lags) if self.lags else 0.0
+
+
+def backoff(attempts):
+    """attempts 번째 실패 뒤 다음 시도까지 대기 시간"""
+    return min(BACKOFF_BASE * (2 ** max(attempts - 1, 0)), BACKOFF_MAX)
+
+
+def _due(now):
+    return Q(status=ImageConversionJob.Status.PENDING, next_attempt_at__lte=now) | Q(
+        status=ImageConversionJob.Status.RUNNING, locked_until__lt=now
+    )
+
+
+def claim(limit=BATCH_SIZE, now=None):
+    """처리할 때가 된 행을 최대 limit 개 잡아 RUNNING 으로 바꿈 (다른 작업자가 잠근 행은 건너뜀)"""
+    now = now or timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            ImageConversionJob.objects.select_for_update(skip_locked=True)
+            .filter(_due(now))
+            .order_by("pk")[:limit]
+        )
+        if jobs:
+            ImageConversionJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                status=ImageConversionJob.Status.RUNNING,
+                locked_until=now + LEASE,
+                attempts=F("attempts") + 1,
+            )
+    for job in jobs:
+        job.status = ImageConversionJob.Status.RUNNING
+        job.attempts += 1
+    return jobs
+
+
+def convert(job):
+    """작업 하나 변환 후 필드 값 교체. Returns: 바꾼 WebP 경로 (건너뛰면 빈 문자열)"""
+    model = apps.get_model(job.model_label)
+    image_field = model._meta.get_field(job.field_name)
+    storage = image_field.storage
+    # 기본 manager 가 걸러내는 행(숨김 처리 등)도 바꿔야 하므로 _base_manager
+    current = model._base_manager.filter(pk=job.object_id, **{image_field.attname: job.source_name})
+    if not current.exists() or not storage.exists(job.source_name):
+        return ""
+
+    webp_name = process_image(storage, job.source_name, image_field.quality, image_field.variant_widths)
+    if webp_name == job.source_name:
+        # 처음부터 WebP 로 올라온 이미지 — 축소본만 만들면 끝
+        return webp_name
+
+    with transaction.atomic():
+        swapped = current.update(**{image_field.attname: webp_name})
+        if swapped and job.delete_source:
+            transaction.on_commit(lambda: delete_quietly(storage, job.source_name))
+    if not swapped:
+        # 변환하는 사이 다른 이미지로 바뀜 — 만든 파일 정리
+        delete_variants(storage, webp_name, image_field.variant_widths)
+        delete_quietly(storage, webp_name)
+        return ""
+    return webp_name
+
+
+def process(jobs, now=None):
+    """잡은 행들을 변환하고 결과(완료 / 건너뜀 / 재시도 대기 / 실패)를 기록"""
+    now = now or timezone.now()
+    stats = BatchStats(claimed=len(jobs), lags=[(now - job.created_at).total_seconds() for job in jobs])
+    for job in jobs:
+        try:
+            webp_name = convert(job)
+        except Exception as e:
+            if job.attempts >= MAX_ATTEMPTS:
+                changes = {"status": ImageConversionJob.Status.FAILED}
+                stats.failed += 1
+                logger.warning("이미지 변환 포기 (작업 %s, %d회 실패): %s", job.pk, job.attempts, e)
+            else:
+                changes = {
+                    "status": ImageConversionJob.Status.PENDING,
+                    "next_attempt_at": timezone.now() + backoff(job.attempts),
+                }
+                stats.retried += 1
+            ImageConversionJob.objects.filter(pk=job.pk).update(
+                locked_until=None, last_error=str(e)[:1000], **changes
+            )
+            continue
+
+        if webp_name:
+            status = ImageConversionJob.Status.DONE
+            stats.done += 1
+        else:
+            status = ImageConversionJob.Status.SKIPPED
+            stats.skipped += 1
+        ImageConversionJob.objects.filter(pk=job.pk).update(
+            status=status, result_name=webp_name, finished_at=timezone.now(), locked_until=None, last_error=""
+        )
+    return stats
+
+
+def run_once(batch_size=BATCH_SIZE, now=None):
+    """한 묶음 잡아 변환. 잡을 행이 없으면 claimed == 0"""
+    started = time.monotonic()
+    stats = process(claim(batch_size, now), now)
+    stats.elapsed = time.monotonic() - started
+    return stats
+
+
+def backlog(now=None):
+    """대기열 현황: 처리할 때가 된 행 수, 가장 오래 기다린 행의 대기 시간(초), 재시도 대기, 실패 수"""
+    now = now or timezone.now()
+    due = ImageConversionJob.objects.filter(_due(now)).aggregate(n=Count("pk"), oldest=Min("created_at"))
+    return {
+        "due": due["n"],
+        "oldest_lag": (now - due["oldest"]).total_seconds() if due["oldest"] else 0.0,
+        "waiting_retry": ImageConversionJob.objects.filter(
+            status=ImageConversionJob.Status.PENDING, next_attempt_at__gt=now, attempts__gt=0
+        ).count(),
+        "failed": ImageConversionJob.objects.filter(status=ImageConversionJob.Status.FAILED).count(),
+    }
+
+
+def purge_finished(days, *, chunk_size=5000):
+    """days 일 지난 완료/건너뜀 행 삭제 (청크 단위). Returns: 삭제한 행 수"""
+    cutoff = timezone.now() - timedelta(days=days)
+    total = 0
+    while True:
+        pks = list(
+            ImageConversionJob.objects.filter(
+                status__in=[ImageConversionJob.Status.DONE, ImageConversionJob.Status.SKIPPED],
+                finished_at__lt=cutoff,
+            )
+            .order_by("pk")
+            .values_list("pk", flat=True)[:chunk_size]
+        )
+        if not pks:
+            return total
+        total += ImageConversionJob.objects.filter(pk__in=pks).delete()[0]
@@ -6,17 +6,23 @@
     3) url_path가 명백한 비-콘텐츠 경로 (/sw.js, /manifest.json, /ads.txt, /.well-known/*)
 
 cron이 아닌 일회성 명령. --dry-run 으로 영향 범위 먼저 확인 권장.
+테이블 전체를 PK 구간 단위로 훑으며 구간마다 짧은 DELETE 만 실행하므로
+운영 피크 시간에도 돌릴 수 있다 (--sleep 으로 추가 완화). 중단돼도
+--checkpoint 파일에 마지막 PK 가 남아 같은 명령으로 이어서 실행된다.
 
 사용 예:
     python manage.py cleanup_inflated_visitor_logs --dry-run
     python manage.py cleanup_inflated_visitor_logs           # 실제 삭제
-    python manage.py cleanup_inflated_visitor_logs --batch 5000
+    python manage.py cleanup_inflated_visitor_logs --batch 5000 --sleep 0.2
+    python manage.py cleanup_inflated_visitor_logs --checkpoint /tmp/vlog_cleanup.json
 """
 
 from django.core.management.base import BaseCommand
 from django.db.models import Q
 
+from badmintok.chunking import Checkpoint, IdRangeWalker
 from badmintok.models import VisitorLog
+from badmintok.stats import invalidate_statistics_cache
 
 
 NON_CONTENT_PREFIXES = (
@@ -41,61 +47,96 @@ class Command(BaseCommand):
             "--batch",
             type=int,
             default=10000,
-            help="한 번에 삭제할 행 수 (기본 10000)",
+            help="한 번에 훑을 PK 구간 폭 (기본 10000)",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="구간 사이 대기 초 (운영 부하 완화, 기본 0)",
+        )
+        parser.add_argument(
+            "--start-id",
+            type=int,
+            default=None,
+            help="이 PK 이후부터 처리 (체크포인트가 있으면 체크포인트 우선)",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            default="",
+            help="마지막 처리 PK를 기록할 JSON 파일 경로 (중단 후 재개용)",
         )
 
     def handle(self, *args, **options):
         dry_run = options["dry_run"]
-        batch = options["batch"]
 
         # 1) /api/ 등 비-콘텐츠 경로
         path_q = Q()
         for prefix in NON_CONTENT_PREFIXES:
             path_q |= Q(url_path__startswith=prefix)
-
-        path_qs = VisitorLog.objects.filter(path_q)
-        path_count = path_qs.count()
-
         # 2) device_type='bot'
-        bot_qs = VisitorLog.objects.filter(device_type="bot")
-        bot_count = bot_qs.count()
-
-        # 두 조건 합쳤을 때 중복 제거된 총 영향 행 수
-        total_qs = VisitorLog.objects.filter(path_q | Q(device_type="bot"))
-        total_count = total_qs.count()
-
-        before_total = VisitorLog.objects.count()
+        target_q = path_q | Q(device_type="bot")
+
+        # dry-run 은 체크포인트를 남기지 않음 (실제 삭제 진행 위치와 섞이지 않도록)
+        checkpoint = Checkpoint(options["checkpoint"]) if options["checkpoint"] and not dry_run else None
+        walker = IdRangeWalker(
+            VisitorLog.objects.filter(target_q),
+            chunk_size=options["batch"],
+            # 경계는 PK 인덱스로만 구함 (target_q 로 MIN/MAX 를 구하면 풀스캔)
+            bounds_queryset=VisitorLog.objects.all(),
+            start_after=options["start_id"],
+            checkpoint=checkpoint,
+            sleep=options["sleep"],
+            stdout=self.stdout,
+        )
 
         self.stdout.write("=" * 60)
         self.stdout.write(self.style.NOTICE("VisitorLog 인플레이션 정리"))
         self.stdout.write("=" * 60)
-        self.stdout.write(f"전체 VisitorLog : {before_total:>10,}건")
-        self.stdout.write(f"비-콘텐츠 경로  : {path_count:>10,}건  ({', '.join(NON_CONTENT_PREFIXES)})")
-        self.stdout.write(f"봇 트래픽       : {bot_count:>10,}건  (device_type='bot')")
-        self.stdout.write(f"삭제 대상(합산) : {total_count:>10,}건  (중복 제외)")
-        self.stdout.write(f"남게 될 행 수   : {before_total - total_count:>10,}건")
+        self.stdout.write(f"비-콘텐츠 경로 : {', '.join(NON_CONTENT_PREFIXES)}")
+        self.stdout.write("봇 트래픽      : device_type='bot'")
+        if walker.start_after is not None:
+            origin = "체크포인트" if walker.resumed else "--start-id"
+            self.stdout.write(f"시작 위치      : id > {walker.start_after:,} ({origin})")
         self.stdout.write("=" * 60)
 
+        path_count = bot_count = deleted = 0
+        for chunk in walker:
+            if dry_run:
+                n = 0
+                for url_path, device_type in chunk.iter_values("url_path", "device_type"):
+                    n += 1
+                    if device_type == "bot":
+                        bot_count += 1
+                    if url_path.startswith(NON_CONTENT_PREFIXES):
+                        path_count += 1
+                walker.add_rows(n)
+            else:
+                # 구간 안의 대상 PK 만 골라 삭제 → 트랜잭션/락이 구간 단위로 짧게 끝남
+                ids = [pk for (pk,) in chunk.iter_values("pk")]
+                if ids:
+                    n, _ = VisitorLog.objects.filter(pk__in=ids).delete()
+                    deleted += n
+                    walker.add_rows(n)
+
         if dry_run:
+            self.stdout.write("")
+            self.stdout.write(f"비-콘텐츠 경로  : {path_count:>10,}건")
+            self.stdout.write(f"봇 트래픽       : {bot_count:>10,}건")
+            self.stdout.write(f"삭제 대상(합산) : {walker.rows:>10,}건  (중복 제외)")
             self.stdout.write(self.style.WARNING("--dry-run: 실제 삭제하지 않았습니다."))
             return
 
-        if total_count == 0:
+        if checkpoint:
+            checkpoint.clear()
+
+        if deleted == 0:
             self.stdout.write(self.style.SUCCESS("삭제할 행이 없습니다."))
             return
 
-        # 배치 단위 삭제 (테이블 큰 경우 락 최소화)
-        deleted = 0
-        while True:
-            ids = list(total_qs.values_list("id", flat=True)[:batch])
-            if not ids:
-                break
-            n, _ = VisitorLog.objects.filter(id__in=ids).delete()
-            deleted += n
-            self.stdout.write(f"  ... {deleted:,}건 삭제 진행")
-
-        after_total = VisitorLog.objects.count()
+        # 이미 끝난 기간의 통계는 만료 없이 캐시되므로 삭제 후 전체 무효화
+        invalidate_statistics_cache()
+
         self.stdout.write("")
-        self.stdout.write(self.style.SUCCESS(
-            f"완료: {deleted:,}건 삭제. {before_total:,} → {after_total:,}"
-        ))
+        self.stdout.write(self.style.SUCCESS(f"완료: {deleted:,}건 삭제."))
@@ -0,0 +1,27 @@
+"""공용 조회수 카운터(badmintok.view_counts)에 쌓인 조회를 DB 에 반영.
+
+게시글·대회·밴드 게시글 상세 조회는 캐시 분 버킷에만 기록되고, 이 명령이 닫힌 버킷을
+모아 모델별로 UPDATE ... SET view_count = view_count + n 을 실행한다.
+동호인톡/배드민톡 글은 반영 후 hot 점수도 같이 갱신된다.
+겹쳐 실행돼도 버킷마다 처리권을 잡으므로 같은 조회가 두 번 반영되지 않는다.
+
+운영(docker-compose.prod.yml)에서는 view-count-worker 컨테이너가 web 과 같은 캐시 파일을 보며 1분마다 실행한다.
+컨테이너 없이 돌릴 때는 cron으로 1분마다 실행:
+    * * * * * python manage.py flush_view_counts
+"""
+from django.core.management.base import BaseCommand
+
+from badmintok.view_counts import flush_all
+
+
+class Command(BaseCommand):
+    help = "캐시에 쌓인 게시글/대회/밴드 게시글 조회수를 DB 에 일괄 반영"
+
+    def handle(self, *args, **options):
+        results = flush_all()
+        total = 0
+        for label, (buckets, views) in results.items():
+            total += views
+            if views:
+                self.stdout.write(f"{label}: 버킷 {buckets}개, 조회 {views:,}건 반영")
+        self.stdout.write(self.style.SUCCESS(f"완료: 조회 {total:,}건 반영"))
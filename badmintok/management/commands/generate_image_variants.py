@@ -0,0 +1,128 @@
+"""기존 이미지의 폭별 WebP 축소본(badmintok.fields.save_variants) 일괄 생성.
+
+새로 올라오는 이미지는 변환 작업(run_image_worker)이 WebP 로 바꿀 때 축소본을 만들므로
+도입 직후 (또는 settings.IMAGE_VARIANT_WIDTHS 를 바꾼 뒤) 한 번 실행하면 된다.
+WebPImageField 를 쓰는 모든 모델/필드를 PK 구간 단위로 훑으며, 축소본이 모두 있는 파일은 건너뛴다.
+아직 WebP 가 아닌 파일은 직접 만들지 않고 변환 작업(ImageConversionJob, 원본 보관)으로 등록하며,
+이미 대기 중인 작업이 있으면 다시 등록하지 않는다. 등록한 작업은 run_image_worker 가 처리한다.
+
+사용 예:
+    python manage.py generate_image_variants
+    python manage.py generate_image_variants --field band.band.cover_image --batch 200
+    python manage.py generate_image_variants --force --checkpoint /tmp/image_variants.json
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from badmintok.chunking import Checkpoint, IdRangeWalker
+from badmintok.fields import WebPImageField, is_webp, save_variants, variant_name
+from badmintok.models import ImageConversionJob
+
+
+def variant_targets():
+    """{"앱.모델.필드": (모델, 필드)} — 축소본을 만드는 WebPImageField 전체"""
+    targets = {}
+    for model in apps.get_models():
+        for field in model._meta.fields:
+            if isinstance(field, WebPImageField) and field.variant_widths:
+                targets[f"{model._meta.label_lower}.{field.name}"] = (model, field)
+    return targets
+
+
+class Command(BaseCommand):
+    help = "기존 이미지의 폭별 WebP 축소본 생성"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--field",
+            action="append",
+            help="처리할 필드 (앱.모델.필드, 여러 번 지정 가능, 기본 전체)",
+        )
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=200,
+            help="한 번에 처리할 PK 구간 폭 (기본 200)",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="구간 사이 대기 초 (운영 부하 완화, 기본 0)",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            default="",
+            help="마지막 처리 PK를 기록할 JSON 파일 경로 (필드별로 .{label} 이 붙음, 중단 후 재개용)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="축소본이 이미 있어도 다시 생성",
+        )
+
+    def handle(self, *args, **options):
+        targets = variant_targets()
+        labels = options["field"] or list(targets)
+        unknown = [label for label in labels if label not in targets]
+        if unknown:
+            self.stderr.write(f"알 수 없는 필드: {', '.join(unknown)} (가능: {', '.join(targets)})")
+            return
+
+        total = queued_total = 0
+        for label in labels:
+            model, field = targets[label]
+            checkpoint = Checkpoint(f"{options['checkpoint']}.{label}") if options["checkpoint"] else None
+            self.stdout.write(f"{label}: {', '.join(map(str, field.variant_widths))}px")
+            walker = IdRangeWalker(
+                model.objects.exclude(Q(**{f"{field.name}__isnull": True}) | Q(**{field.name: ""})),
+                chunk_size=options["batch"],
+                checkpoint=checkpoint,
+                sleep=options["sleep"],
+                stdout=self.stdout,
+            )
+
+            created = queued = 0
+            for chunk in walker:
+                rows = list(chunk.queryset.values_list("pk", field.attname))
+                pending = set(
+                    ImageConversionJob.objects.filter(
+                        model_label=model._meta.label_lower,
+                        field_name=field.name,
+                        object_id__in=[pk for pk, _name in rows],
+                        status__in=[ImageConversionJob.Status.PENDING, ImageConversionJob.Status.RUNNING],
+                    ).values_list("object_id", "source_name")
+                )
+                for pk, name in rows:
+                    if not name:
+                        continue
+                    if not is_webp(name):
+                        # 변환 작업이 WebP 로 바꾸면서 축소본도 만듦
+                        if (pk, name) not in pending:
+                            ImageConversionJob.enqueue(model(pk=pk), field.name, name, delete_source=False)
+                            queued += 1
+                            walker.add_rows(1)
+                        continue
+                    if not options["force"] and all(
+                        field.storage.exists(variant_name(name, width)) for width in field.variant_widths
+                    ):
+                        continue
+                    try:
+                        save_variants(field.storage, name, field.variant_widths, field.quality)
+                    except Exception as e:
+                        self.stderr.write(f"  {label} {name}: {e}")
+                        continue
+                    created += 1
+                    walker.add_rows(1)
+
+            if checkpoint:
+                checkpoint.clear()
+            total += created
+            queued_total += queued
+            self.stdout.write(f"{label}: {created:,}개 파일, 변환 작업 {queued:,}개 등록")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"완료: 원본 {total:,}개의 축소본 생성, 변환 작업 {queued_total:,}개 등록 (run_image_worker 가 처리)"
+        ))
@@ -0,0 +1,121 @@
+"""좋아요/댓글 수 카운터를 실제 행 개수 기준으로 보정.
+
+좋아요·댓글 카운터는 생성/삭제 때 F() 로 증감만 하므로 (badmintok.counters)
+bulk 작업, 수동 DB 수정, 시그널을 거치지 않는 삭제 등으로 조금씩 어긋날 수 있다.
+이 명령은 PK 구간 단위로 카운터와 실제 개수(GROUP BY 1회)를 비교해 어긋난 행만 고친다.
+동호인톡/배드민톡 글은 고친 글의 hot 점수도 다시 계산한다.
+
+대상:
+    community.post      like_count, comment_count (소프트 삭제 제외)
+    community.comment   like_count
+    band.bandpost       like_count, comment_count
+    band.bandcomment    like_count
+
+cron으로 하루 한 번 새벽에 실행:
+    30 4 * * * python manage.py reconcile_counters --sleep 0.05
+
+사용 예:
+    python manage.py reconcile_counters
+    python manage.py reconcile_counters --model community.post --batch 2000
+    python manage.py reconcile_counters --dry-run
+    python manage.py reconcile_counters --checkpoint /tmp/reconcile_counters.json
+"""
+from django.core.management.base import BaseCommand
+
+from band.models import BandComment, BandCommentLike, BandPost, BandPostLike
+from badmintok.chunking import Checkpoint, IdRangeWalker
+from badmintok.counters import reconcile_range
+from community.hot import refresh_hot_scores
+from community.models import Comment, Post
+
+
+def counter_targets():
+    """{모델 label: (모델, {카운터 필드: (세어야 할 행 queryset, FK 필드명)})}"""
+    return {
+        "community.post": (Post, {
+            "like_count": (Post.likes.through.objects.all(), "post"),
+            "comment_count": (Comment.objects.filter(is_deleted=False), "post"),
+        }),
+        "community.comment": (Comment, {
+            "like_count": (Comment.likes.through.objects.all(), "comment"),
+        }),
+        "band.bandpost": (BandPost, {
+            "like_count": (BandPostLike.objects.all(), "post"),
+            "comment_count": (BandComment.objects.all(), "post"),
+        }),
+        "band.bandcomment": (BandComment, {
+            "like_count": (BandCommentLike.objects.all(), "comment"),
+        }),
+    }
+
+
+class Command(BaseCommand):
+    help = "좋아요/댓글 수 카운터를 실제 개수와 비교해 어긋난 행만 보정"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            choices=list(counter_targets()),
+            help="보정할 모델 (여러 번 지정 가능, 기본 전체)",
+        )
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=1000,
+            help="한 번에 처리할 PK 구간 폭 (기본 1000)",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="구간 사이 대기 초 (운영 부하 완화, 기본 0)",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            default="",
+            help="마지막 처리 PK를 기록할 JSON 파일 경로 (모델별로 .{label} 이 붙음, 중단 후 재개용)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="고치지 않고 어긋난 행만 출력",
+        )
+
+    def handle(self, *args, **options):
+        targets = counter_targets()
+        labels = options["model"] or list(targets)
+        dry_run = options["dry_run"]
+
+        total = 0
+        for label in labels:
+            model, counters = targets[label]
+            checkpoint = Checkpoint(f"{options['checkpoint']}.{label}") if options["checkpoint"] else None
+            self.stdout.write(f"{label}: {', '.join(counters)}")
+            walker = IdRangeWalker(
+                model.objects.all(),
+                chunk_size=options["batch"],
+                checkpoint=checkpoint,
+                sleep=options["sleep"],
+                stdout=self.stdout,
+            )
+
+            fixed_rows = 0
+            for chunk in walker:
+                fixed = reconcile_range(chunk.queryset, counters, apply=not dry_run)
+                if fixed and model is Post and not dry_run:
+                    refresh_hot_scores(Post.objects.filter(pk__in=list(fixed)))
+                for pk, changes in fixed.items():
+                    detail = ", ".join(f"{field} {before} → {real}" for field, (before, real) in changes.items())
+                    self.stdout.write(f"  {label} #{pk}: {detail}")
+                fixed_rows += len(fixed)
+                walker.add_rows(len(fixed))
+
+            if checkpoint:
+                checkpoint.clear()
+            total += fixed_rows
+            self.stdout.write(f"{label}: {fixed_rows:,}건 {'어긋남' if dry_run else '보정'}")
+
+        verb = "어긋난 행" if dry_run else "보정"
+        self.stdout.write(self.style.SUCCESS(f"완료: {verb} {total:,}건"))
@@ -0,0 +1,80 @@
+"""관리자 대시보드 실시간 방문 카운터를 DB 기준으로 보정.
+
+VisitorTrackingMiddleware / 앱 추적 API 가 캐시에 올리는 "오늘 페이지뷰·순방문자"
+카운터는 캐시 재시작·만료·경합으로 조금씩 어긋날 수 있다. 이 명령은 VisitorLog 로
+해당 날짜를 다시 세어 일 합계를 덮어쓰고, 순방문자 마커도 다시 채워 이후 재방문이
+중복 집계되지 않게 한다.
+
+cron으로 10분마다 실행 (자정 직후 어제 값도 한 번 확정):
+    */10 * * * * python manage.py reconcile_visitor_counters
+    5 0 * * * python manage.py reconcile_visitor_counters --days 2
+
+사용 예:
+    python manage.py reconcile_visitor_counters
+    python manage.py reconcile_visitor_counters --days 2     # 오늘·어제
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from badmintok.tracking import (
+    DAY_COUNTER_TTL,
+    counted_visits,
+    pageview_day_key,
+    visitor_day_key,
+    visitor_marker_key,
+)
+
+
+MARKER_BATCH = 1000
+
+
+class Command(BaseCommand):
+    help = "오늘 방문자/페이지뷰 실시간 카운터를 VisitorLog 기준으로 보정"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=1,
+            help="오늘부터 과거 N일 보정 (기본 1: 오늘만)",
+        )
+
+    def handle(self, *args, **options):
+        today_start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        for offset in range(max(options["days"], 1)):
+            start = today_start - timedelta(days=offset)
+            end = start + timedelta(days=1)
+            day = start.strftime("%Y%m%d")
+            qs = counted_visits(start, end)
+
+            pageviews = qs.count()
+
+            # 순방문자 마커 재생성 (캐시가 비었던 동안 방문한 세션의 재방문 중복 방지)
+            visitors = 0
+            batch = {}
+            for session_key in qs.order_by().values_list("session_key", flat=True).distinct().iterator():
+                visitors += 1
+                batch[visitor_marker_key(day, session_key)] = 1
+                if len(batch) >= MARKER_BATCH:
+                    cache.set_many(batch, timeout=DAY_COUNTER_TTL)
+                    batch = {}
+            if batch:
+                cache.set_many(batch, timeout=DAY_COUNTER_TTL)
+
+            before_visitors = cache.get(visitor_day_key(day))
+            before_pageviews = cache.get(pageview_day_key(day))
+            cache.set_many(
+                {visitor_day_key(day): visitors, pageview_day_key(day): pageviews},
+                timeout=DAY_COUNTER_TTL,
+            )
+
+            self.stdout.write(
+                f"{start:%Y-%m-%d}: 방문자 {before_visitors} → {visitors:,} · "
+                f"페이지뷰 {before_pageviews} → {pageviews:,}"
+            )
+
+        self.stdout.write(self.style.SUCCESS("보정 완료"))
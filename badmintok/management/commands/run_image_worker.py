@@ -0,0 +1,107 @@
+"""이미지 WebP 변환 대기열(ImageConversionJob)을 처리한다.
+
+WebPImageField 에 이미지가 올라오면 원본만 저장되고 같은 트랜잭션에 변환 작업이 쌓인다.
+이 명령이 SKIP LOCKED 로 작업을 나눠 잡아 WebP 와 폭별 축소본을 만들고, 필드가 아직 그 원본을
+가리킬 때만 WebP 경로로 바꾼다. 바뀌기 전까지 API 는 원본 URL 을 그대로 내려준다.
+오류는 지수 백오프로 재시도하고 4번 실패하면 관리자 "이미지 변환 대기열"에 실패로 남는다 (원본은 계속 서비스).
+여러 개를 겹쳐 실행해도 같은 작업을 두 번 처리하지 않는다.
+
+운영(docker-compose.prod.yml)에서는 image-worker 컨테이너가 --max-seconds 55 로 끊임없이 반복 실행한다.
+컨테이너 없이 돌릴 때는 cron으로 1분마다, 다음 실행 직전까지 대기열을 계속 비우도록 실행:
+    * * * * * python manage.py run_image_worker --max-seconds 55
+
+사용 예:
+    python manage.py run_image_worker                 # 대기열을 비우고 종료
+    python manage.py run_image_worker --batch 10 --max-seconds 55 --idle-sleep 2
+    python manage.py run_image_worker --stats         # 대기열 현황만 출력
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from badmintok.image_jobs import BATCH_SIZE, backlog, purge_finished, run_once
+
+
+class Command(BaseCommand):
+    help = "이미지 WebP 변환 대기열 처리 (SKIP LOCKED 로 나눠 잡아 변환 후 필드 교체, 실패 시 백오프 재시도)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=BATCH_SIZE,
+            help=f"한 번에 잡아 처리할 작업 수 (기본 {BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--max-seconds",
+            type=float,
+            default=0,
+            help="이 시간 동안 대기열이 비어도 기다리며 계속 처리 (기본 0: 비면 바로 종료)",
+        )
+        parser.add_argument(
+            "--idle-sleep",
+            type=float,
+            default=1.0,
+            help="대기열이 비었을 때 다시 확인하기까지 대기 초 (기본 1)",
+        )
+        parser.add_argument(
+            "--purge-days",
+            type=int,
+            default=7,
+            help="종료 전에 이 일수가 지난 완료 작업 삭제 (기본 7, 0이면 삭제 안 함)",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="변환하지 않고 대기열 현황만 출력",
+        )
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self._write_backlog()
+            return
+
+        started = time.monotonic()
+        deadline = started + options["max_seconds"]
+        claimed = done = skipped = retried = failed = 0
+        max_lag = 0.0
+        while True:
+            stats = run_once(max(options["batch"], 1))
+            if not stats.claimed:
+                if time.monotonic() + options["idle_sleep"] >= deadline:
+                    break
+                time.sleep(options["idle_sleep"])
+                continue
+
+            claimed += stats.claimed
+            done += stats.done
+            skipped += stats.skipped
+            retried += stats.retried
+            failed += stats.failed
+            max_lag = max(max_lag, stats.max_lag)
+            rate = stats.claimed / stats.elapsed if stats.elapsed else 0
+            self.stdout.write(
+                f"  {stats.claimed:,}건: 완료 {stats.done:,} / 건너뜀 {stats.skipped:,} / "
+                f"재시도 {stats.retried:,} / 실패 {stats.failed:,}, {rate:,.1f}건/초, "
+                f"지연 평균 {stats.avg_lag:.1f}초 · 최대 {stats.max_lag:.1f}초"
+            )
+            if options["max_seconds"] and time.monotonic() >= deadline:
+                break
+
+        if options["purge_days"]:
+            purged = purge_finished(options["purge_days"])
+            if purged:
+                self.stdout.write(f"완료 작업 {purged:,}건 삭제 ({options['purge_days']}일 경과)")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"완료: {claimed:,}건 처리 (변환 {done:,} / 건너뜀 {skipped:,} / 재시도 대기 {retried:,} / 실패 {failed:,}), "
+            f"{elapsed:.1f}초, 최대 지연 {max_lag:.1f}초"
+        ))
+
+    def _write_backlog(self):
+        stats = backlog()
+        self.stdout.write(
+            f"처리할 차례 {stats['due']:,}건 (가장 오래된 것 {stats['oldest_lag']:.0f}초 전), "
+            f"재시도 대기 {stats['waiting_retry']:,}건, 실패 {stats['failed']:,}건"
+        )
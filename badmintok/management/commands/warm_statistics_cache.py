@@ -0,0 +1,79 @@
+"""관리자 통계 대시보드 캐시 예열.
+
+자주 보는 프리셋(일/주/월/년 × 전체/웹/앱)을 미리 계산해 캐시에 채운다.
+- 오늘이 포함된 기간: 매번 다시 계산 (짧은 TTL 갱신)
+- 이미 끝난 기간(어제 등): 캐시에 없을 때만 계산 (만료 없이 보관됨)
+
+cron으로 5분마다 실행:
+    */5 * * * * python manage.py warm_statistics_cache
+
+사용 예:
+    python manage.py warm_statistics_cache
+    python manage.py warm_statistics_cache --days 7          # 최근 7일치 종료일 기준까지 예열
+    python manage.py warm_statistics_cache --period day --source all
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from badmintok.stats import (
+    PERIOD_DAYS,
+    SOURCES,
+    get_statistics_context,
+    is_closed_period,
+    period_range,
+)
+
+
+class Command(BaseCommand):
+    help = "관리자 통계 대시보드 캐시를 자주 보는 프리셋 기준으로 미리 채움"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=2,
+            help="오늘부터 과거 N일을 기간 종료일로 예열 (기본 2: 오늘·어제)",
+        )
+        parser.add_argument(
+            "--period",
+            choices=list(PERIOD_DAYS),
+            action="append",
+            help="예열할 기간 (여러 번 지정 가능, 기본 전체)",
+        )
+        parser.add_argument(
+            "--source",
+            choices=list(SOURCES),
+            action="append",
+            help="예열할 출처 필터 (여러 번 지정 가능, 기본 전체)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="이미 끝난 기간도 캐시를 무시하고 다시 계산",
+        )
+
+    def handle(self, *args, **options):
+        periods = options["period"] or list(PERIOD_DAYS)
+        sources = options["source"] or list(SOURCES)
+        days = max(options["days"], 1)
+
+        now = timezone.localtime()
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        computed = 0
+        for offset in range(days):
+            selected_date = today - timedelta(days=offset)
+            for period in periods:
+                _, period_end, _ = period_range(period, selected_date)
+                force = options["force"] or not is_closed_period(period_end, now)
+                for source in sources:
+                    get_statistics_context(period, selected_date, source, force=force)
+                    computed += 1
+                    self.stdout.write(
+                        f"  {selected_date:%Y-%m-%d} {period:<5} {source:<3} "
+                        f"{'계산' if force else '확인'}"
+                    )
+
+        self.stdout.write(self.style.SUCCESS(f"완료: {computed}개 프리셋 예열"))
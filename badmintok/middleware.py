@@ -1,10 +1,11 @@
 """방문자 추적 미들웨어"""
-import hashlib
 import re
 from urllib.parse import urlparse
 
 from django.utils import timezone
 
+from .tracking import anon_session_key, is_counted_visit, record_pageview, seen_recently
+
 
 class VisitorTrackingMiddleware:
     """방문자 로그를 기록하는 미들웨어 - 젯팩 스타일 통계"""
@@ -89,21 +90,11 @@ class VisitorTrackingMiddleware:
         """동일 세션이 같은 url을 짧은 시간 안에 다시 요청한 경우 True 반환.
 
         - 세션이 있으면 session_key 기반
-        - 없으면 IP+UA 해시 기반 (미들웨어 _log_visit 합성 키와 동일 로직)
-        - 캐시 백엔드(LocMem/Redis) 사용 — DB 추가 쿼리 없이 가벼움
+        - 없으면 IP+UA 해시 기반 (_log_visit 합성 키와 동일)
+        - 공유 캐시의 원자적 add 사용 — 워커가 달라도 한 번만 통과, DB 추가 쿼리 없음
         """
-        from django.core.cache import cache
-
-        session_key = request.session.session_key
-        if not session_key:
-            fingerprint = f"{ip_address or 'unknown'}|{(user_agent or '')[:200]}"
-            session_key = 'anon_' + hashlib.md5(fingerprint.encode('utf-8')).hexdigest()[:30]
-
-        cache_key = f"vlog_dedupe:{session_key}:{request.path}"
-        if cache.get(cache_key):
-            return True
-        cache.set(cache_key, 1, timeout=seconds)
-        return False
+        session_key = request.session.session_key or anon_session_key(ip_address, user_agent)
+        return seen_recently("vd", session_key, request.path, seconds=seconds)
 
     def _log_visit(self, request, response=None):
         """방문 로그 기록"""
@@ -118,10 +109,7 @@ class VisitorTrackingMiddleware:
         # 세션 키: 이미 있으면 사용, 없으면 IP+UA 기반 합성 키 사용
         # (세션을 강제 생성하면 익명 사용자가 매 요청마다 새 unique visitor로 잡혀
         #  인플레이션이 크고 django_session 테이블도 무의미하게 부풀어 오름)
-        session_key = request.session.session_key
-        if not session_key:
-            fingerprint = f"{ip_address or 'unknown'}|{user_agent[:200]}"
-            session_key = 'anon_' + hashlib.md5(fingerprint.encode('utf-8')).hexdigest()[:30]
+        session_key = request.session.session_key or anon_session_key(ip_address, user_agent)
 
         # URL 경로
         url_path = request.path
@@ -154,6 +142,10 @@ class VisitorTrackingMiddleware:
         except Exception as e:
             # 로그 기록 실패 시 무시 (애플리케이션 동작에 영향 없도록)
             pass
+        else:
+            # 관리자 대시보드 "오늘" 타일용 캐시 카운터
+            if is_counted_visit(user, device_type):
+                record_pageview(session_key)
 
     def _get_client_ip(self, request):
         """클라이언트 IP 주소 추출"""
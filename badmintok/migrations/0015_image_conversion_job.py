@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:31
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('badmintok', '0014_promotion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageConversionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(help_text='앱.모델 (예: band.band)', max_length=100, verbose_name='모델')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='객체 ID')),
+                ('field_name', models.CharField(max_length=100, verbose_name='필드')),
+                ('source_name', models.CharField(max_length=255, verbose_name='원본 경로')),
+                ('delete_source', models.BooleanField(default=False, verbose_name='변환 후 원본 삭제')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '변환 중'), ('done', '완료'), ('skipped', '건너뜀'), ('failed', '실패')], default='pending', max_length=10, verbose_name='상태')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='다음 시도')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='처리 기한')),
+                ('result_name', models.CharField(blank=True, max_length=255, verbose_name='WebP 경로')),
+                ('last_error', models.TextField(blank=True, verbose_name='최근 오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='완료일')),
+            ],
+            options={
+                'verbose_name': '이미지 변환 대기열',
+                'verbose_name_plural': '이미지 변환 대기열',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='badmintok_i_status_0eed4f_idx')],
+            },
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 import os
 import uuid
@@ -392,3 +393,62 @@ class AppDownloadClick(models.Model):
 
     def __str__(self):
         return f"{self.get_os_display()} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
+
+
+class ImageConversionJob(models.Model):
+    """이미지 WebP 변환 대기열.
+
+    WebPImageField 에 이미지가 올라오면 원본만 저장하고 같은 트랜잭션에 한 행씩 기록된다.
+    run_image_worker 명령이 SELECT ... FOR UPDATE SKIP LOCKED 로 행을 나눠 잡아
+    WebP 와 축소본을 만들고 필드 값을 WebP 경로로 바꾼다 (badmintok.image_jobs).
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("대기")
+        RUNNING = "running", _("변환 중")
+        DONE = "done", _("완료")
+        SKIPPED = "skipped", _("건너뜀")
+        FAILED = "failed", _("실패")
+
+    model_label = models.CharField(_("모델"), max_length=100, help_text="앱.모델 (예: band.band)")
+    object_id = models.PositiveBigIntegerField(_("객체 ID"))
+    field_name = models.CharField(_("필드"), max_length=100)
+    source_name = models.CharField(_("원본 경로"), max_length=255)
+    delete_source = models.BooleanField(_("변환 후 원본 삭제"), default=False)
+
+    status = models.CharField(_("상태"), max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(_("시도 횟수"), default=0)
+    next_attempt_at = models.DateTimeField(_("다음 시도"), default=timezone.now)
+    # 작업자가 잡은 행의 처리 기한 — 지나면 작업자가 죽은 것으로 보고 다시 잡는다
+    locked_until = models.DateTimeField(_("처리 기한"), null=True, blank=True)
+    result_name = models.CharField(_("WebP 경로"), max_length=255, blank=True)
+    last_error = models.TextField(_("최근 오류"), blank=True)
+    created_at = models.DateTimeField(_("생성일"), auto_now_add=True)
+    finished_at = models.DateTimeField(_("완료일"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("이미지 변환 대기열")
+        verbose_name_plural = _("이미지 변환 대기열")
+        ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.model_label}.{self.field_name} #{self.object_id} ({self.get_status_display()})"
+
+    @classmethod
+    def enqueue(cls, instance, field_name, source_name, *, delete_source=None):
+        """instance.<field_name> 에 저장된 원본(source_name)의 변환 작업 추가 (바로 처리 대상).
+
+        delete_source: None 이면 settings.IMAGE_KEEP_ORIGINAL 을 따름
+        """
+        if delete_source is None:
+            delete_source = not getattr(settings, "IMAGE_KEEP_ORIGINAL", True)
+        return cls.objects.create(
+            model_label=instance._meta.label_lower,
+            object_id=instance.pk,
+            field_name=field_name,
+            source_name=source_name,
+            delete_source=delete_source,
+        )
@@ -0,0 +1,124 @@
+"""수백만 행 테이블용 Admin 페이지네이터.
+
+VisitorLog / OutboundClick / AppDownloadClick / Notification 처럼 큰 테이블의
+changelist 는 기본 Paginator 의 정확한 COUNT(*) 와 깊은 OFFSET 때문에 느리다.
+- 필터 없는 목록: MySQL information_schema 의 추정 행 수 사용 (작은 테이블은 정확히 셈)
+- 필터/검색 목록: FILTERED_COUNT_CAP 까지만 셈 (그 이상은 페이지 수가 잘림)
+- 날짜 역순(또는 정순) 정렬 목록: 페이지 경계 (날짜, pk) 만 보조 인덱스에서 찾고
+  본 행은 그 경계부터 키셋 range scan 으로 읽는다 (OFFSET 만큼 전체 행을 읽지 않음)
+
+사용:
+    class VisitorLogAdmin(LargeTableAdminMixin, ModelAdmin):
+        date_hierarchy = "visited_at"   # keyset_field 기본값
+"""
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+# 추정치가 이보다 작으면 정확한 COUNT(*) 가 충분히 싸다
+ESTIMATE_THRESHOLD = 10000
+# 필터된 목록에서 셀 최대 행 수
+FILTERED_COUNT_CAP = 10000
+
+
+def estimated_row_count(model, using="default"):
+    """MySQL 테이블 통계상의 추정 행 수. MySQL 이 아니거나 조회 실패 시 None"""
+    connection = connections[using]
+    if connection.vendor != "mysql":
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+    except Exception:
+        return None
+    if not row or row[0] is None:
+        return None
+    return int(row[0])
+
+
+class LargeTablePaginator(Paginator):
+    """추정 COUNT + 필터 COUNT 상한 + 날짜 정렬 키셋 페이지 이동"""
+
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True,
+                 *, keyset_field=None, count_cap=FILTERED_COUNT_CAP):
+        super().__init__(object_list, per_page, orphans, allow_empty_first_page)
+        self.keyset_field = keyset_field
+        self.count_cap = count_cap
+
+    @cached_property
+    def count(self):
+        qs = self.object_list
+        if not qs.query.where:
+            estimate = estimated_row_count(qs.model, qs.db)
+            if estimate is not None and estimate > ESTIMATE_THRESHOLD:
+                return estimate
+            return qs.count()
+        # SELECT COUNT(*) FROM (SELECT ... LIMIT cap) — 상한까지만 스캔
+        return qs.order_by()[: self.count_cap].count()
+
+    def _keyset_ordering(self):
+        """정렬이 (±keyset_field[, ±pk]) 이면 (내림차순 여부) 반환, 아니면 None"""
+        if not self.keyset_field:
+            return None
+        ordering = list(self.object_list.query.order_by)
+        if not ordering:
+            return None
+        first = ordering[0]
+        desc = first.startswith("-")
+        if first.lstrip("-") != self.keyset_field:
+            return None
+        sign = "-" if desc else ""
+        if ordering[1:] not in ([], [f"{sign}pk"], [f"{sign}id"]):
+            return None
+        return desc
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        desc = self._keyset_ordering()
+        if bottom == 0 or desc is None:
+            return super().page(number)
+
+        field = self.keyset_field
+        sign = "-" if desc else ""
+        qs = self.object_list.order_by(f"{sign}{field}", f"{sign}pk")
+
+        # 경계 행의 (날짜, pk) 만 조회 → 보조 인덱스만 훑고 본 행은 읽지 않음
+        boundary = list(qs.values_list(field, "pk")[bottom:bottom + 1])
+        if not boundary:
+            return self._get_page([], number, self)
+        value, pk = boundary[0]
+
+        op = "lt" if desc else "gt"
+        pk_op = "lte" if desc else "gte"
+        seek = Q(**{f"{field}__{op}": value}) | Q(**{field: value, f"pk__{pk_op}": pk})
+
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top = self.count
+        return self._get_page(qs.filter(seek)[: top - bottom], number, self)
+
+
+class LargeTableAdminMixin:
+    """대용량 테이블 ModelAdmin 용 mixin.
+
+    - 필터 없는 목록의 전체 COUNT 를 추가로 돌리지 않음 (show_full_result_count=False)
+    - keyset_field 미지정 시 date_hierarchy 필드로 키셋 페이지 이동
+    """
+
+    paginator = LargeTablePaginator
+    show_full_result_count = False
+    keyset_field = None
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        return self.paginator(
+            queryset, per_page, orphans, allow_empty_first_page,
+            keyset_field=self.keyset_field or self.date_hierarchy,
+        )
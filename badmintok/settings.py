@@ -163,6 +163,49 @@ DATABASES = {
 }
 
 
+# 캐시 (gunicorn 워커·관리 명령이 공유)
+# 기본은 외부 서비스 없이 같은 호스트 프로세스끼리 공유되는 SQLite 파일 캐시.
+# CACHE_BACKEND=redis|memcached 로 바꾸면 CACHE_LOCATION 의 서버를 사용한다.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'sqlite')
+if CACHE_BACKEND == 'redis':
+    # redis 패키지 필요
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', 'redis://127.0.0.1:6379/1'),
+        }
+    }
+elif CACHE_BACKEND == 'memcached':
+    # pymemcache 패키지 필요
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', '127.0.0.1:11211'),
+        }
+    }
+elif CACHE_BACKEND == 'locmem':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+else:
+    import tempfile as _tempfile
+    CACHES = {
+        'default': {
+            'BACKEND': 'badmintok.cache_backends.SQLiteCache',
+            'LOCATION': os.environ.get(
+                'CACHE_LOCATION',
+                os.path.join(_tempfile.gettempdir(), 'badmintok-cache.sqlite3'),
+            ),
+        }
+    }
+
+# 조회수는 캐시 버킷에 모았다가 flush_view_counts 명령(운영: view-count-worker 컨테이너, 또는 cron)이 일괄 반영.
+# 워커끼리 캐시가 공유되지 않는 locmem 에서는 조회마다 바로 UPDATE 한다.
+VIEW_COUNT_BUFFER = CACHE_BACKEND != 'locmem'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -210,6 +253,12 @@ STATICFILES_DIRS = [
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# WebPImageField 가 WebP 로 바꿀 때 함께 만드는 폭별 축소본 (px). 바꾼 뒤에는 generate_image_variants 실행
+IMAGE_VARIANT_WIDTHS = (320, 640, 1280)
+# 업로드 이미지의 WebP 변환/축소본 생성을 요청 밖(run_image_worker)에서 처리. False 면 저장 중에 바로 변환
+IMAGE_CONVERSION_ASYNC = True
+# WebP 로 바꾼 뒤에도 원본 파일을 남김 (업로드 응답으로 나간 원본 URL 이 글 본문 등에 남아 있을 수 있음)
+IMAGE_KEEP_ORIGINAL = True
 
 # File upload settings
 # 전체 요청 크기 제한 (이미지 + 폼 데이터 포함)
@@ -657,3 +706,6 @@ FIREBASE_CREDENTIALS_PATH = os.environ.get(
     'FIREBASE_CREDENTIALS_PATH',
     str(BASE_DIR / 'firebase-credentials.json'),
 )
+# 전체 대상 알림(공지 등)을 보낼 FCM topic. 지정하면 토큰 등록 시 구독시키고 (run_push_worker 가 반영,
+# 기존 토큰은 subscribe_broadcast_topic 명령으로 한 번) 전체 발송을 topic 메시지 한 건으로 보낸다. 비우면 토큰 multicast.
+FCM_BROADCAST_TOPIC = os.environ.get('FCM_BROADCAST_TOPIC', '')
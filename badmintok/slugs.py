@@ -0,0 +1,70 @@
+"""게시글/대회 슬러그 중복 번호 할당 (쿼리 1회).
+
+같은 제목(대회 후기, 주간 정리 등)이 많으면 "base", "base-1", "base-2", ... 를 하나씩
+exists() 로 확인하느라 저장 한 번에 쿼리가 N 개 나간다. 여기서는 후보가 가질 수 있는
+접두어들로 이미 쓰인 "base" / "base-숫자" 슬러그를 한 번에 읽고, 빈 번호를 메모리에서 고른다.
+
+길이 제한을 넘으면 번호를 붙이기 전에 base 를 잘라 단어(-) 경계까지 버린다
+("아주-긴-제목-1" 대신 "아주-긴-1"). 번호 자릿수마다 잘린 base 가 다를 수 있어
+접두어는 자릿수별로 모아 OR 로 조회한다.
+
+unique 컬럼(Contest.slug)은 두 요청이 같은 번호를 동시에 고를 수 있으므로
+save_with_slug 가 IntegrityError 시 번호를 다시 골라 재시도한다.
+"""
+import re
+import uuid
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+# 한 번에 살펴볼 최대 번호 (자릿수 4 이하)
+MAX_SUFFIX = 9999
+
+
+def with_suffix(base, number, max_length):
+    """base 에 -number 를 붙인 슬러그 (number 가 0 이면 base 그대로), max_length 이내로 자름"""
+    suffix = f"-{number}" if number else ""
+    if len(base) + len(suffix) > max_length:
+        base = base[:max_length - len(suffix)].rsplit("-", 1)[0]
+    return f"{base}{suffix}"
+
+
+def _stems(base, max_length):
+    """번호 자릿수별로 잘린 base 목록 (0 = 번호 없음)"""
+    stems = {0: with_suffix(base, 0, max_length)}
+    for digits in range(1, len(str(MAX_SUFFIX)) + 1):
+        stems[digits] = with_suffix(base, 10 ** (digits - 1), max_length).rsplit("-", 1)[0]
+    return stems
+
+
+def allocate_slug(queryset, base, *, max_length, field="slug"):
+    """queryset 안에서 쓰이지 않은 base[-n] 슬러그. 이미 쓰인 슬러그는 한 번의 쿼리로 읽는다."""
+    stems = _stems(base, max_length)
+    condition = Q(**{field: stems[0]})
+    for stem in set(list(stems.values())[1:]):
+        # startswith 로 인덱스 범위를 좁히고 정규식으로 "-숫자" 로 끝나는 것만
+        condition |= Q(**{f"{field}__startswith": f"{stem}-", f"{field}__regex": rf"^{re.escape(stem)}-[0-9]+$"})
+    taken = set(queryset.filter(condition).values_list(field, flat=True))
+
+    for number in range(MAX_SUFFIX + 1):
+        slug = with_suffix(base, number, max_length)
+        if slug not in taken:
+            return slug
+    # 번호를 다 썼으면 임의 접미어
+    return with_suffix(base, uuid.uuid4().hex[:8], max_length)
+
+
+def save_with_slug(instance, save, base, *, max_length, attempts=3, field="slug"):
+    """비어 있는 슬러그를 할당해 save() 호출. unique 충돌(동시 저장)이면 다시 골라 재시도."""
+    model = type(instance)
+    queryset = model._default_manager.all()
+    if instance.pk is not None:
+        queryset = queryset.exclude(pk=instance.pk)
+    for attempt in range(attempts):
+        setattr(instance, field, allocate_slug(queryset, base, max_length=max_length, field=field))
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            if attempt == attempts - 1:
+                raise
@@ -0,0 +1,463 @@
+"""관리자 통계 대시보드 집계 + 결과 캐시.
+
+statistics_view 의 집계 결과를 (period_start, period_end, source) 키로 캐시한다.
+- 이미 끝난 기간(어제/지난주 등): 결과가 바뀌지 않으므로 만료 없이 보관
+- 오늘이 포함된 기간: CURRENT_PERIOD_TTL 동안만 보관
+- 과거 로그를 정리(삭제)하는 명령은 invalidate_statistics_cache()로 버전을 올려 전체 무효화
+
+cron 으로 warm_statistics_cache 를 돌려 자주 보는 프리셋을 미리 채워두면
+관리자가 대시보드를 반복해서 열어도 MySQL 집계 쿼리가 다시 돌지 않는다.
+"""
+import json
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import AppDownloadClick, OutboundClick, VisitorLog
+
+
+PERIOD_DAYS = {
+    'day': 1,
+    'week': 7,
+    'month': 30,
+    'year': 365,
+}
+SOURCES = ('all', 'web', 'app')
+
+# 오늘이 포함된 기간의 캐시 유지 시간 (초)
+CURRENT_PERIOD_TTL = 300
+
+_VERSION_KEY = 'stats:version'
+
+
+def _extract_search_terms(referer):
+    """유입 URL에서 검색어 추출 (Google, Naver, Daum 등)"""
+    from urllib.parse import urlparse, parse_qs
+
+    if not referer:
+        return None
+
+    try:
+        parsed = urlparse(referer)
+        domain = parsed.netloc.lower()
+        query_params = parse_qs(parsed.query)
+
+        if 'google' in domain and 'q' in query_params:
+            return query_params['q'][0]
+
+        if 'naver' in domain and 'query' in query_params:
+            return query_params['query'][0]
+
+        if 'daum' in domain and 'q' in query_params:
+            return query_params['q'][0]
+
+        if 'bing' in domain and 'q' in query_params:
+            return query_params['q'][0]
+
+    except Exception:
+        pass
+
+    return None
+
+
+def _calculate_change(current, previous):
+    """변화율 계산 (%)"""
+    if previous == 0:
+        return 100 if current > 0 else 0
+    return round(((current - previous) / previous) * 100, 1)
+
+
+def period_range(period, selected_date):
+    """선택 날짜가 마지막 날인 기간의 [start, end) 와 일수 반환"""
+    chart_days = PERIOD_DAYS[period]
+    period_start = selected_date - timedelta(days=chart_days - 1)
+    period_end = selected_date + timedelta(days=1)
+    return period_start, period_end, chart_days
+
+
+def is_closed_period(period_end, now=None):
+    """기간이 오늘 0시 이전에 끝났으면 True (더 이상 로그가 쌓이지 않음)"""
+    now = now or timezone.localtime()
+    return period_end <= now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _cache_version():
+    version = cache.get(_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(_VERSION_KEY, version, timeout=None)
+    return version
+
+
+def invalidate_statistics_cache():
+    """캐시된 통계 전체 무효화 (버전 키 증가 → 기존 키는 자연 소멸)"""
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        cache.set(_VERSION_KEY, 2, timeout=None)
+
+
+def statistics_cache_key(period_start, period_end, source):
+    """(기간 시작, 기간 끝, 출처 필터) 기반 캐시 키"""
+    return (
+        f"stats:v{_cache_version()}:"
+        f"{period_start.strftime('%Y%m%d')}:{period_end.strftime('%Y%m%d')}:{source}"
+    )
+
+
+def get_statistics_context(period, selected_date, source_param='all', *, force=False):
+    """통계 컨텍스트 반환. 캐시에 있으면 그대로, 없으면(또는 force) 계산 후 저장.
+
+    Args:
+        period: 'day' | 'week' | 'month' | 'year'
+        selected_date: 기간의 마지막 날 0시 (KST aware)
+        source_param: 'all' | 'web' | 'app'
+        force: True면 캐시를 무시하고 다시 계산 (warm 명령용)
+    """
+    period_start, period_end, _ = period_range(period, selected_date)
+    cache_key = statistics_cache_key(period_start, period_end, source_param)
+
+    if not force:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    context = build_statistics_context(period, selected_date, source_param)
+    timeout = None if is_closed_period(period_end) else CURRENT_PERIOD_TTL
+    cache.set(cache_key, context, timeout)
+    return context
+
+
+def build_statistics_context(period, selected_date, source_param='all'):
+    """Jetpack 스타일 통계 대시보드 집계 (캐시 미사용)"""
+    now = timezone.localtime()
+    period_days = PERIOD_DAYS[period]
+    period_start, period_end, chart_days = period_range(period, selected_date)
+
+    prev_date = (selected_date - timedelta(days=chart_days)).strftime('%Y-%m-%d')
+    next_date = (selected_date + timedelta(days=chart_days)).strftime('%Y-%m-%d')
+
+    if period == 'day':
+        date_display = selected_date.strftime('%Y년 %m월 %d일')
+    else:
+        date_display = f"{period_start.strftime('%Y년 %m월 %d일')} - {selected_date.strftime('%m월 %d일')}"
+
+    real_user_filter = (
+        Q(device_type__in=['desktop', 'mobile', 'tablet']) &
+        (Q(user__is_staff=False) | Q(user__isnull=True))
+    )
+
+    base_queryset = VisitorLog.objects.filter(
+        visited_at__gte=period_start,
+        visited_at__lt=period_end
+    ).filter(real_user_filter)
+    if source_param != 'all':
+        base_queryset = base_queryset.filter(source=source_param)
+
+    period_visitors = base_queryset.values('session_key').distinct().count()
+    period_pageviews = base_queryset.count()
+
+    prev_period_start = period_start - timedelta(days=chart_days)
+    prev_period_end = period_start
+
+    prev_base_queryset = VisitorLog.objects.filter(
+        visited_at__gte=prev_period_start,
+        visited_at__lt=prev_period_end
+    ).filter(real_user_filter)
+    if source_param != 'all':
+        prev_base_queryset = prev_base_queryset.filter(source=source_param)
+
+    prev_visitors = prev_base_queryset.values('session_key').distinct().count()
+    prev_pageviews = prev_base_queryset.count()
+
+    visitors_change = _calculate_change(period_visitors, prev_visitors)
+    pageviews_change = _calculate_change(period_pageviews, prev_pageviews)
+
+    # === 신규 가입자 (단일 쿼리로 현재+이전 기간 일괄 처리) ===
+    from django.contrib.auth import get_user_model
+    User = get_user_model()
+
+    all_signups = list(User.objects.filter(
+        is_active=True,
+        date_joined__gte=prev_period_start,
+        date_joined__lt=period_end,
+    ).values_list('date_joined', flat=True))
+
+    period_signups = sum(1 for d in all_signups if d >= period_start)
+    prev_signups = sum(1 for d in all_signups if d < period_start)
+    signups_change = _calculate_change(period_signups, prev_signups)
+
+    signups_dict = {}
+    for d in all_signups:
+        if d >= period_start:
+            day = timezone.localtime(d).date()
+            signups_dict[day] = signups_dict.get(day, 0) + 1
+
+    # === 출처 분리 카운트 (전체 필터일 때만 의미 있음) ===
+    web_qs = VisitorLog.objects.filter(
+        visited_at__gte=period_start, visited_at__lt=period_end,
+        source=VisitorLog.SOURCE_WEB,
+    ).filter(real_user_filter)
+    app_qs = VisitorLog.objects.filter(
+        visited_at__gte=period_start, visited_at__lt=period_end,
+        source=VisitorLog.SOURCE_APP,
+    ).filter(real_user_filter)
+    source_stats = {
+        'web': {
+            'visitors': web_qs.values('session_key').distinct().count(),
+            'pageviews': web_qs.count(),
+        },
+        'app': {
+            'visitors': app_qs.values('session_key').distinct().count(),
+            'pageviews': app_qs.count(),
+        },
+    }
+
+    # === 신규 vs 재방문 (subquery로 IN 리스트 회피) ===
+    period_session_keys_subq = base_queryset.values('session_key').distinct()
+    returning_count = VisitorLog.objects.filter(
+        session_key__in=period_session_keys_subq,
+        visited_at__lt=period_start,
+    ).filter(real_user_filter).values('session_key').distinct().count()
+    new_count = max(0, period_visitors - returning_count)
+    visitor_segment_stats = {
+        'new': new_count,
+        'returning': returning_count,
+        'new_pct': round(new_count / period_visitors * 100, 1) if period_visitors else 0,
+        'returning_pct': round(returning_count / period_visitors * 100, 1) if period_visitors else 0,
+    }
+
+    # === 디바이스 분포 ===
+    device_rows = base_queryset.values('device_type').annotate(visits=Count('id'))
+    device_total = sum(row['visits'] for row in device_rows) or 1
+    _device_labels = {'desktop': '데스크탑', 'mobile': '모바일', 'tablet': '태블릿'}
+    device_stats = []
+    for key in ('mobile', 'desktop', 'tablet'):
+        v = next((r['visits'] for r in device_rows if r['device_type'] == key), 0)
+        device_stats.append({
+            'key': key,
+            'label': _device_labels[key],
+            'visits': v,
+            'pct': round(v / device_total * 100, 1),
+        })
+
+    # === 유입 채널 분류 ===
+    SEARCH_DOMAINS = ('google', 'naver', 'daum', 'bing', 'yahoo')
+    SOCIAL_DOMAINS = ('facebook', 'instagram', 'youtube', 'twitter', 't.co',
+                      'kakao', 'cafe.naver', 'tistory', 'threads')
+
+    def _categorize_channel(domain):
+        if not domain:
+            return 'direct'
+        d = domain.lower()
+        if any(s in d for s in SEARCH_DOMAINS):
+            return 'search'
+        if any(s in d for s in SOCIAL_DOMAINS):
+            return 'social'
+        return 'referral'
+
+    channel_counts = {'direct': 0, 'search': 0, 'social': 0, 'referral': 0}
+    for row in base_queryset.values('referer_domain').annotate(visits=Count('id')):
+        channel_counts[_categorize_channel(row['referer_domain'])] += row['visits']
+    channel_total = sum(channel_counts.values()) or 1
+    _channel_labels = {
+        'direct': '직접 방문',
+        'search': '검색 엔진',
+        'social': '소셜',
+        'referral': '레퍼럴',
+    }
+    channel_stats = [
+        {
+            'key': k,
+            'label': _channel_labels[k],
+            'visits': channel_counts[k],
+            'pct': round(channel_counts[k] / channel_total * 100, 1),
+        }
+        for k in ('direct', 'search', 'social', 'referral')
+    ]
+
+    daily_pageviews = base_queryset.annotate(
+        date=TruncDate('visited_at')
+    ).values('date').annotate(
+        views=Count('id')
+    ).order_by('date')
+
+    daily_visitors = base_queryset.annotate(
+        date=TruncDate('visited_at')
+    ).values('date', 'session_key').distinct().values('date').annotate(
+        visitors=Count('session_key')
+    ).order_by('date')
+
+    pageviews_dict = {item['date']: item['views'] for item in daily_pageviews}
+    visitors_dict = {item['date']: item['visitors'] for item in daily_visitors}
+
+    daily_app_clicks_qs = AppDownloadClick.objects.filter(
+        created_at__gte=period_start,
+        created_at__lt=period_end,
+    ).filter(Q(user__is_staff=False) | Q(user__isnull=True)).annotate(
+        date=TruncDate('created_at')
+    ).values('date').annotate(count=Count('id')).order_by('date')
+    app_clicks_dict = {item['date']: item['count'] for item in daily_app_clicks_qs}
+
+    chart_data = []
+    for i in range(chart_days - 1, -1, -1):
+        day = (selected_date - timedelta(days=i)).date()
+
+        if period == 'year':
+            date_label = day.strftime('%y/%m/%d')
+        else:
+            date_label = day.strftime('%m/%d')
+
+        day_views = pageviews_dict.get(day, 0)
+        day_clicks = app_clicks_dict.get(day, 0)
+        day_ctr = round(day_clicks / day_views * 100, 2) if day_views else 0
+
+        chart_data.append({
+            'label': date_label,
+            'visitors': visitors_dict.get(day, 0),
+            'views': day_views,
+            'signups': signups_dict.get(day, 0),
+            'ctr': day_ctr,
+        })
+
+    top_pages = list(base_queryset.values('url_path').annotate(
+        views=Count('id')
+    ).order_by('-views')[:15])
+
+    # 인기 페이지 url_path → 사람이 읽는 제목 매핑 (표시용; 집계는 url_path 그대로)
+    import re as _re
+    from urllib.parse import unquote as _unquote
+    _static_titles = {
+        '/': '홈',
+        '/badminton-tournament/': '전국 배드민턴 대회 목록',
+        '/badminton-tournament/archive/': '대회 아카이브',
+    }
+    _detail_re = _re.compile(r'^/badminton-tournament/([^/]+)/$')
+    _slugs = set()
+    for _p in top_pages:
+        _m = _detail_re.match(_p['url_path'])
+        if _m and _p['url_path'] not in _static_titles:
+            _slugs.add(_m.group(1)); _slugs.add(_unquote(_m.group(1)))
+    _titles = {}
+    if _slugs:
+        from contests.models import Contest
+        for _slug, _title in Contest.objects.filter(slug__in=list(_slugs)).values_list('slug', 'title'):
+            _titles[_slug] = _title
+    for _p in top_pages:
+        _up = _p['url_path']
+        if _up in _static_titles:
+            _p['title'] = _static_titles[_up]
+        elif _up.startswith('app://'):
+            _p['title'] = '[앱] ' + _up[len('app://'):]
+        else:
+            _m = _detail_re.match(_up)
+            _p['title'] = (_titles.get(_m.group(1)) or _titles.get(_unquote(_m.group(1))) or _up) if _m else _up
+
+    top_referrers = list(base_queryset.filter(
+        referer_domain__isnull=False
+    ).exclude(
+        referer_domain=''
+    ).exclude(
+        referer_domain__icontains='badmintok'  # self-referral(내부 이동) 제외 — 외부 유입원만
+    ).values('referer_domain').annotate(
+        visits=Count('id')
+    ).order_by('-visits')[:15])
+
+    search_engine_domains = ['google', 'naver', 'daum', 'bing']
+    search_referer_q = Q()
+    for domain in search_engine_domains:
+        search_referer_q |= Q(referer_domain__icontains=domain)
+
+    search_logs = base_queryset.filter(
+        referer__isnull=False
+    ).filter(search_referer_q).exclude(
+        referer=''
+    ).values_list('referer', flat=True)[:1000]
+
+    search_terms_count = {}
+    for referer in search_logs:
+        term = _extract_search_terms(referer)
+        if term:
+            search_terms_count[term] = search_terms_count.get(term, 0) + 1
+
+    top_search_terms = sorted(
+        [{'term': k, 'count': v} for k, v in search_terms_count.items()],
+        key=lambda x: x['count'],
+        reverse=True
+    )[:15]
+
+    top_outbound_clicks = list(OutboundClick.objects.filter(
+        clicked_at__gte=period_start,
+        clicked_at__lt=period_end,
+        device_type__in=['desktop', 'mobile', 'tablet']
+    ).filter(
+        Q(user__is_staff=False) | Q(user__isnull=True)
+    ).values('destination_domain').annotate(
+        clicks=Count('id')
+    ).order_by('-clicks')[:15])
+
+    # 앱 다운로드 클릭 통계 (운영자 제외)
+    app_download_qs = AppDownloadClick.objects.filter(
+        created_at__gte=period_start,
+        created_at__lt=period_end,
+    ).filter(Q(user__is_staff=False) | Q(user__isnull=True))
+    app_download_total = app_download_qs.count()
+    app_download_by_os = {
+        row['os']: row['count']
+        for row in app_download_qs.values('os').annotate(count=Count('id'))
+    }
+    prev_app_download_total = AppDownloadClick.objects.filter(
+        created_at__gte=prev_period_start,
+        created_at__lt=prev_period_end,
+    ).filter(Q(user__is_staff=False) | Q(user__isnull=True)).count()
+    current_ctr = (round(app_download_total / period_pageviews * 100, 2)
+                   if period_pageviews else 0)
+    prev_ctr = (round(prev_app_download_total / prev_pageviews * 100, 2)
+                if prev_pageviews else 0)
+    app_download_stats = {
+        'total': app_download_total,
+        'ios': app_download_by_os.get('ios', 0),
+        'android': app_download_by_os.get('android', 0),
+        'other': app_download_by_os.get('other', 0),
+        # CTA 클릭률: 페이지뷰 대비 다운로드 클릭 비율
+        'click_rate_pct': current_ctr,
+        'click_rate_change': _calculate_change(current_ctr, prev_ctr),
+        'impressions': period_pageviews,
+    }
+
+    context = {
+        'site_header': '배드민톡 통계',
+        'site_title': 'Jetpack 스타일 통계',
+        'period': period,
+        'period_days': period_days,
+        'chart_days': chart_days,
+        'source_param': source_param,
+        'source_stats': source_stats,
+        'visitor_segment_stats': visitor_segment_stats,
+        'device_stats': device_stats,
+        'channel_stats': channel_stats,
+        'selected_date': selected_date.strftime('%Y-%m-%d'),
+        'date_display': date_display,
+        'prev_date': prev_date,
+        'next_date': next_date,
+        'today_date': now.strftime('%Y-%m-%d'),
+        'now': now,
+        'period_visitors': period_visitors,
+        'period_pageviews': period_pageviews,
+        'period_signups': period_signups,
+        'visitors_change': visitors_change,
+        'pageviews_change': pageviews_change,
+        'signups_change': signups_change,
+        'chart_data_json': json.dumps(chart_data),
+        'top_pages': top_pages,
+        'top_referrers': top_referrers,
+        'top_search_terms': top_search_terms,
+        'top_outbound_clicks': top_outbound_clicks,
+        'app_download_stats': app_download_stats,
+    }
+
+
+    return context
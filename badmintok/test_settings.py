@@ -13,3 +13,10 @@ DATABASES = {
 
 # 테스트 속도/단순화
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+# 테스트끼리 캐시가 섞이지 않도록 프로세스 메모리 캐시 사용
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
@@ -0,0 +1,528 @@
+import os
+import tempfile
+import time
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.paginator import Paginator
+from django.db.models.functions import Lower
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from rest_framework.request import Request
+
+from badmintok import stats
+from badmintok.api.pagination import cursor_paginate, cursor_response
+from badmintok.cache_backends import SQLiteCache
+from badmintok.chunking import Checkpoint
+from badmintok.fields import variant_name
+from badmintok.models import ImageConversionJob, VisitorLog
+from badmintok.paginator import LargeTablePaginator
+from badmintok.slugs import allocate_slug
+from badmintok import image_jobs, tracking, view_counts
+from badmintok.tracking import dedupe_key, seen_recently
+from band.api.serializers import BandListSerializer
+from band.models import Band
+from community.models import Post
+
+
+class StatisticsCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def test_closed_period_cached_without_expiry(self):
+        yesterday = self.today - timedelta(days=1)
+        with mock.patch.object(stats.cache, "set", wraps=stats.cache.set) as set_:
+            stats.get_statistics_context("day", yesterday)
+        key, _, timeout = set_.call_args.args
+        self.assertIn(yesterday.strftime("%Y%m%d"), key)
+        self.assertIsNone(timeout)
+
+    def test_current_period_uses_short_ttl(self):
+        with mock.patch.object(stats.cache, "set", wraps=stats.cache.set) as set_:
+            stats.get_statistics_context("week", self.today)
+        self.assertEqual(set_.call_args.args[2], stats.CURRENT_PERIOD_TTL)
+
+    def test_cached_result_reused_until_invalidated(self):
+        yesterday = self.today - timedelta(days=1)
+        first = stats.get_statistics_context("day", yesterday)
+        self.assertEqual(first["period_pageviews"], 0)
+
+        log = VisitorLog.objects.create(session_key="s1", url_path="/", device_type="mobile")
+        VisitorLog.objects.filter(pk=log.pk).update(visited_at=yesterday + timedelta(hours=1))
+        self.assertEqual(stats.get_statistics_context("day", yesterday)["period_pageviews"], 0)
+
+        stats.invalidate_statistics_cache()
+        self.assertEqual(stats.get_statistics_context("day", yesterday)["period_pageviews"], 1)
+
+
+class StatisticsViewTest(TestCase):
+    def test_renders_for_staff(self):
+        from django.contrib.auth import get_user_model
+
+        cache.clear()
+        admin = get_user_model().objects.create_superuser(email="a@a.com", password="x")
+        self.client.force_login(admin)
+        resp = self.client.get("/admin/statistics/", {"period": "week", "source": "web"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.context["today_date"], timezone.localtime().strftime("%Y-%m-%d"))
+
+
+class VisitorLogCommandsTest(TestCase):
+    def setUp(self):
+        for i in range(7):
+            VisitorLog.objects.create(session_key=f"s{i}", url_path=f"/page/{i}", device_type="mobile")
+        VisitorLog.objects.create(session_key="b", url_path="/", device_type="bot")
+        VisitorLog.objects.create(session_key="a", url_path="/api/posts/", device_type="desktop")
+
+    def _call(self, *args):
+        out = StringIO()
+        call_command(*args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def test_cleanup_deletes_in_chunks_and_clears_checkpoint(self):
+        path = os.path.join(tempfile.mkdtemp(), "ckpt.json")
+        self._call("cleanup_inflated_visitor_logs", "--batch", "2", "--checkpoint", path)
+        self.assertEqual(VisitorLog.objects.count(), 7)
+        self.assertFalse(VisitorLog.objects.filter(device_type="bot").exists())
+        self.assertFalse(os.path.exists(path))
+
+    def test_cleanup_resumes_after_checkpoint(self):
+        path = os.path.join(tempfile.mkdtemp(), "ckpt.json")
+        bot = VisitorLog.objects.get(device_type="bot")
+        Checkpoint(path).save(bot.pk)
+        self._call("cleanup_inflated_visitor_logs", "--batch", "3", "--checkpoint", path)
+        # 체크포인트 이전(봇)은 건너뛰고 이후(API 경로)만 삭제
+        self.assertTrue(VisitorLog.objects.filter(pk=bot.pk).exists())
+        self.assertFalse(VisitorLog.objects.filter(url_path__startswith="/api/").exists())
+
+    def test_cleanup_dry_run_keeps_rows(self):
+        out = self._call("cleanup_inflated_visitor_logs", "--dry-run", "--batch", "4")
+        self.assertIn("2건", out)
+        self.assertEqual(VisitorLog.objects.count(), 9)
+
+    def test_diagnose_traffic_streams_today(self):
+        today = timezone.localtime().strftime("%Y-%m-%d")
+        out = self._call("diagnose_traffic", "--date", today, "--batch", "2")
+        self.assertIn("총 요청: 9", out)
+        self.assertIn("고유 세션: 9", out)
+
+
+class LargeTablePaginatorTest(TestCase):
+    def setUp(self):
+        base = timezone.now()
+        for i in range(12):
+            log = VisitorLog.objects.create(session_key=f"s{i}", url_path="/", device_type="mobile")
+            # 같은 시각 묶음을 섞어 (날짜, pk) 경계 처리 확인
+            VisitorLog.objects.filter(pk=log.pk).update(visited_at=base - timedelta(minutes=i // 2))
+
+    def test_keyset_pages_match_offset_pages(self):
+        qs = VisitorLog.objects.order_by("-visited_at", "-pk")
+        keyset = LargeTablePaginator(qs, 5, keyset_field="visited_at")
+        offset = Paginator(qs, 5)
+        for number in (1, 2, 3):
+            self.assertEqual(
+                [o.pk for o in keyset.page(number).object_list],
+                [o.pk for o in offset.page(number).object_list],
+            )
+
+    def test_filtered_count_is_capped(self):
+        paginator = LargeTablePaginator(VisitorLog.objects.filter(device_type="mobile"), 5, count_cap=7)
+        self.assertEqual(paginator.count, 7)
+
+    def test_admin_changelist_second_page(self):
+        from django.contrib.auth import get_user_model
+
+        admin = get_user_model().objects.create_superuser(email="a@a.com", password="x")
+        self.client.force_login(admin)
+        from badmintok.admin import VisitorLogAdmin
+
+        with mock.patch.object(VisitorLogAdmin, "list_per_page", 5):
+            resp = self.client.get("/admin/badmintok/visitorlog/", {"p": 2})
+        self.assertEqual(resp.status_code, 200)
+        cl = resp.context["cl"]
+        self.assertEqual(cl.paginator._keyset_ordering(), True)
+        self.assertEqual(len(cl.result_list), 5)
+
+
+class SQLiteCacheTest(TestCase):
+    def setUp(self):
+        path = os.path.join(tempfile.mkdtemp(), "cache.sqlite3")
+        self.cache = SQLiteCache(path, {})
+        # 같은 파일을 여는 다른 워커 역할
+        self.other = SQLiteCache(path, {})
+
+    def test_add_is_shared_between_instances(self):
+        self.assertTrue(self.cache.add("k", {"a": 1}, 30))
+        self.assertFalse(self.other.add("k", "x", 30))
+        self.assertEqual(self.other.get("k"), {"a": 1})
+
+    def test_expired_key_can_be_added_again(self):
+        self.cache.set("k", 1, 30)
+        with mock.patch("badmintok.cache_backends.time.time", return_value=time.time() + 60):
+            self.assertIsNone(self.cache.get("k"))
+            self.assertTrue(self.other.add("k", 2, 30))
+        self.assertEqual(self.cache.get("k"), 2)
+
+    def test_incr_touch_delete(self):
+        self.cache.set("n", 5)
+        self.assertEqual(self.other.incr("n", 3), 8)
+        self.assertEqual(self.cache.get("n"), 8)
+        with self.assertRaises(ValueError):
+            self.cache.incr("missing")
+        self.assertTrue(self.cache.touch("n", 10))
+        self.assertTrue(self.other.delete("n"))
+        self.assertFalse(self.cache.has_key("n"))
+
+
+class VisitDedupeTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_seen_recently_passes_once(self):
+        self.assertFalse(seen_recently("vd", "s1", "/a", seconds=5))
+        self.assertTrue(seen_recently("vd", "s1", "/a", seconds=5))
+        self.assertFalse(seen_recently("vd", "s1", "/b", seconds=5))
+        self.assertLessEqual(len(dedupe_key("vd", "s" * 40, "/" * 500)), 23)
+
+    def test_app_pageview_resend_is_ignored(self):
+        for _ in range(2):
+            resp = self.client.post(
+                "/api/analytics/pageview/", data='{"screen": "home"}', content_type="application/json",
+            )
+            self.assertEqual(resp.status_code, 204)
+        self.assertEqual(VisitorLog.objects.count(), 1)
+
+
+class DashboardCounterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_record_pageview_counts_unique_sessions(self):
+        for session_key in ("s1", "s1", "s2"):
+            tracking.record_pageview(session_key)
+        self.assertEqual(tracking.today_counters(), (2, 3))
+        self.assertEqual(tracking.recent_pageviews(), 3)
+
+    def test_middleware_feeds_counters(self):
+        ua = "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X)"
+        for _ in range(2):
+            resp = self.client.get("/", HTTP_USER_AGENT=ua, REMOTE_ADDR="8.8.8.8")
+            self.assertEqual(resp.status_code, 200)
+        # 두 번째 요청은 5초 dedupe 로 기록되지 않음
+        self.assertEqual(VisitorLog.objects.count(), 1)
+        self.assertEqual(tracking.today_counters(), (1, 1))
+
+    def test_reconcile_overwrites_drift(self):
+        for i in range(3):
+            VisitorLog.objects.create(session_key=f"s{i % 2}", url_path="/", device_type="mobile")
+        VisitorLog.objects.create(session_key="bot", url_path="/", device_type="bot")
+        tracking.record_pageview("s0")
+        call_command("reconcile_visitor_counters", stdout=StringIO())
+        self.assertEqual(tracking.today_counters(), (2, 3))
+        # 보정 후 같은 세션 재방문은 순방문자를 늘리지 않음
+        tracking.record_pageview("s1")
+        self.assertEqual(tracking.today_counters(), (2, 4))
+
+
+class CursorPaginationTest(TestCase):
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+
+        author = get_user_model().objects.create_user(email="u@a.com", password="x")
+        base = timezone.now()
+        for i in range(7):
+            post = Post.objects.create(
+                title=f"글 {i}", content="본문", author=author,
+                source=Post.Source.COMMUNITY, is_pinned=(i == 3),
+            )
+            # 같은 작성 시각 묶음 → pk 동순위 처리 확인
+            Post.objects.filter(pk=post.pk).update(created_at=base - timedelta(minutes=i // 3))
+
+    def test_walks_same_order_as_offset_without_count(self):
+        qs = Post.objects.order_by("-is_pinned", "-created_at")
+        expected = [p.pk for p in qs.order_by("-is_pinned", "-created_at", "-pk")]
+        seen, cursor = [], ""
+        while True:
+            with self.assertNumQueries(1):
+                items, cursor = cursor_paginate(qs, cursor, 3)
+            seen.extend(p.pk for p in items)
+            if cursor is None:
+                break
+        self.assertEqual(seen, expected)
+
+    def test_api_cursor_mode(self):
+        resp = self.client.get("/api/community/posts/", {"cursor": "", "page_size": 5})
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotIn("count", resp.data)
+        self.assertEqual(len(resp.data["results"]), 5)
+        resp = self.client.get("/api/community/posts/", {"cursor": resp.data["next_cursor"], "page_size": 5})
+        self.assertEqual(len(resp.data["results"]), 2)
+        self.assertIsNone(resp.data["next_cursor"])
+
+        bad = self.client.get("/api/community/posts/", {"cursor": "!!not-a-cursor"})
+        self.assertEqual(bad.status_code, 400)
+
+    def test_unsupported_ordering_is_bad_request(self):
+        from rest_framework.test import APIRequestFactory
+
+        from badmintok.api.serializers import PostListSerializer
+
+        request = Request(APIRequestFactory().get("/", {"cursor": ""}))
+        for ordering in ("author__email", Lower("title")):
+            resp = cursor_response(request, Post.objects.order_by(ordering), 3, PostListSerializer)
+            self.assertEqual(resp.status_code, 400)
+
+
+class ViewCounterTest(TestCase):
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+
+        cache.clear()
+        self.author = get_user_model().objects.create_user(email="u@a.com", password="x")
+        self.post = Post.objects.create(
+            title="글", content="본문", author=self.author, source=Post.Source.COMMUNITY,
+        )
+        self.later = time.time() + 180
+
+    def test_views_coalesce_into_one_update_per_flush(self):
+        for viewer in ("a", "b", "a", "c"):
+            view_counts.count_view(self.post, viewer)
+        Post.objects.filter(pk=self.post.pk).update(view_count=10)  # 그 사이 다른 경로의 변경도 보존
+        # 아직 열린 버킷은 반영하지 않음
+        self.assertEqual(view_counts.flush_view_counts(Post), (0, 0))
+        with self.assertNumQueries(3):  # UPDATE + hot 점수 갱신 2
+            self.assertEqual(view_counts.flush_view_counts(Post, now=self.later), (1, 3))
+        self.assertEqual(view_counts.flush_view_counts(Post, now=self.later), (0, 0))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 13)
+        self.assertIsNotNone(self.post.hot_score)
+
+    def test_flush_command_covers_all_models(self):
+        from band.models import Band, BandPost
+
+        band = Band.objects.create(name="b", created_by=self.author)
+        band_post = BandPost.objects.create(band=band, author=self.author, title="t", content="c")
+        view_counts.count_view(band_post)
+        view_counts.count_view(band_post)
+        view_counts.count_view(self.post)
+        with mock.patch("badmintok.view_counts.time.time", return_value=self.later):
+            out = StringIO()
+            call_command("flush_view_counts", stdout=out)
+        self.assertIn("조회 3건", out.getvalue())
+        band_post.refresh_from_db()
+        self.assertEqual(band_post.view_count, 2)
+
+    @mock.patch("django.conf.settings.VIEW_COUNT_BUFFER", False, create=True)
+    def test_unbuffered_mode_updates_immediately(self):
+        self.assertTrue(self.post.increase_view_count("a"))
+        self.assertFalse(self.post.increase_view_count("a"))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 1)
+
+    def test_detail_view_counts_once_per_viewer(self):
+        from community.views import PostDetailView
+
+        self.client.force_login(self.author)
+        with mock.patch.object(
+            PostDetailView, "get_object", autospec=True, side_effect=PostDetailView.get_object,
+        ) as get_object:
+            resp = self.client.get(f"/community/{self.post.slug}/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(get_object.call_count, 1)
+        self.assertEqual(resp.context["post"].view_count, 1)
+        self.client.get(f"/community/{self.post.slug}/")
+        self.client.get(f"/api/community/posts/{self.post.slug}/")
+        view_counts.flush_view_counts(Post, now=self.later)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 1)
+
+
+class SlugAllocationTest(TestCase):
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+
+        self.author = get_user_model().objects.create_user(email="u@a.com", password="x")
+
+    def _post(self, title, slug=""):
+        return Post.objects.create(title=title, slug=slug, content="본문", author=self.author)
+
+    def test_picks_first_free_number_in_one_query(self):
+        for slug in ("대회-후기", "대회-후기-1", "대회-후기-3", "대회-후기-abc", "대회-후기-1-2"):
+            self._post("x", slug)
+        with self.assertNumQueries(1):
+            self.assertEqual(allocate_slug(Post.objects.all(), "대회-후기", max_length=45), "대회-후기-2")
+        self.assertEqual(self._post("대회 후기!").slug, "대회-후기-2")
+
+    def test_truncates_base_at_word_boundary_before_suffix(self):
+        base = "-".join(["가나다라마"] * 7) + "-바사"  # 44자
+        self.assertEqual(allocate_slug(Post.objects.all(), base, max_length=45), base)
+        self._post("x", base)
+        self._post("x", "-".join(["가나다라마"] * 7) + "-1")
+        self.assertEqual(allocate_slug(Post.objects.all(), base, max_length=45), "-".join(["가나다라마"] * 7) + "-2")
+
+
+def png_bytes(width, height):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), "red").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class ImageVariantTest(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        override = override_settings(MEDIA_ROOT=media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        cache.clear()
+        self.owner = get_user_model().objects.create_user(email="img@a.com", password="x")
+
+    def width_of(self, name):
+        with default_storage.open(name, "rb") as file:
+            return Image.open(file).width
+
+    def run_worker(self):
+        return image_jobs.run_once()
+
+    def test_upload_keeps_original_until_worker_converts(self):
+        band = Band.objects.create(
+            name="클럽", created_by=self.owner,
+            cover_image=SimpleUploadedFile("cover.png", png_bytes(2000, 1000), content_type="image/png"),
+            profile_image=SimpleUploadedFile("face.png", png_bytes(200, 200), content_type="image/png"),
+        )
+        original = band.cover_image.name
+        self.assertTrue(original.endswith(".png"))
+        self.assertEqual(ImageConversionJob.objects.filter(status=ImageConversionJob.Status.PENDING).count(), 2)
+        # 변환 전에는 원본 URL 만 내려가고 srcset 은 없음
+        data = BandListSerializer(band).data
+        self.assertTrue(data["cover_image_url"].endswith(".png"))
+        self.assertIsNone(data["cover_image_srcset"])
+
+        stats = self.run_worker()
+        self.assertEqual((stats.claimed, stats.done), (2, 2))
+        band.refresh_from_db()
+        name = band.cover_image.name
+        self.assertEqual(name, os.path.splitext(original)[0] + ".webp")
+        self.assertEqual(variant_name(name, 320), os.path.splitext(name)[0] + "_w320.webp")
+        # 커버는 1200x450 으로 잘린 파일에서 만들어지고, 원본보다 넓은 폭은 늘리지 않음
+        self.assertEqual([self.width_of(variant_name(name, w)) for w in (320, 640, 1280)], [320, 640, 1200])
+        self.assertEqual(self.width_of(variant_name(band.profile_image.name, 640)), 200)
+        self.assertTrue(default_storage.exists(original))  # IMAGE_KEEP_ORIGINAL
+
+        data = BandListSerializer(band).data
+        self.assertEqual(data["cover_image_srcset"]["320"], default_storage.url(variant_name(name, 320)))
+        empty = Band.objects.create(name="빈 클럽", created_by=self.owner)
+        self.assertIsNone(BandListSerializer(empty).data["cover_image_srcset"])
+
+        band.cover_image.delete(save=False)
+        self.assertFalse(default_storage.exists(variant_name(name, 320)))
+
+    def test_srcset_lists_only_existing_variants(self):
+        # 축소본 도입 전에 올라온 WebP — 일부 폭만 파일이 있음
+        name = default_storage.save("band/profiles/legacy.webp", ContentFile(b"webp"))
+        default_storage.save(variant_name(name, 320), ContentFile(b"webp"))
+        band = Band.objects.create(name="옛 클럽", created_by=self.owner, profile_image=name)
+        self.assertEqual(list(band.profile_image.srcset), [320])
+        self.assertEqual(band.profile_image.variant_url(600), band.profile_image.url)
+        # 확인한 결과는 캐시 — 다음 직렬화부터 저장소 조회 없음
+        with mock.patch.object(default_storage, "exists", side_effect=AssertionError):
+            self.assertEqual(list(band.profile_image.srcset), [320])
+
+        default_storage.delete(name)
+        default_storage.save(name, ContentFile(png_bytes(900, 300)))
+        call_command("generate_image_variants", "--field", "band.band.profile_image", stdout=StringIO())
+        self.assertEqual(list(band.profile_image.srcset), [320, 640, 1280])
+        self.assertEqual(band.profile_image.variant_url(600), default_storage.url(variant_name(name, 640)))
+
+    def test_cover_job_queued_after_crop(self):
+        queued = []
+        enqueue = ImageConversionJob.enqueue
+
+        def record(instance, field_name, source_name, **kwargs):
+            queued.append((field_name, self.width_of(source_name)))
+            return enqueue(instance, field_name, source_name, **kwargs)
+
+        with mock.patch.object(ImageConversionJob, "enqueue", side_effect=record):
+            Band.objects.create(
+                name="클럽", created_by=self.owner,
+                cover_image=SimpleUploadedFile("cover.png", png_bytes(2000, 1000), content_type="image/png"),
+            )
+        # 작업은 자른 뒤에 등록되어 바로 처리해도 잘린 파일을 읽음
+        self.assertEqual(queued, [("cover_image", 1200)])
+        self.assertEqual(self.run_worker().done, 1)
+
+    def test_replaced_image_is_not_swapped_in(self):
+        band = Band.objects.create(
+            name="클럽", created_by=self.owner,
+            profile_image=SimpleUploadedFile("a.png", png_bytes(100, 100), content_type="image/png"),
+        )
+        first = band.profile_image.name
+        band.profile_image = SimpleUploadedFile("b.png", png_bytes(100, 100), content_type="image/png")
+        band.save()
+        second = band.profile_image.name
+
+        stats = self.run_worker()
+        self.assertEqual((stats.done, stats.skipped), (1, 1))
+        band.refresh_from_db()
+        self.assertEqual(band.profile_image.name, os.path.splitext(second)[0] + ".webp")
+        skipped = ImageConversionJob.objects.get(source_name=first)
+        self.assertEqual(skipped.status, ImageConversionJob.Status.SKIPPED)
+        self.assertFalse(default_storage.exists(os.path.splitext(first)[0] + ".webp"))
+
+    def test_broken_image_is_retried_then_failed(self):
+        name = default_storage.save("band/profiles/broken.png", ContentFile(b"not an image"))
+        band = Band.objects.create(name="클럽", created_by=self.owner, profile_image=name)
+        job = ImageConversionJob.enqueue(band, "profile_image", name)
+
+        stats = self.run_worker()
+        self.assertEqual(stats.retried, 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (ImageConversionJob.Status.PENDING, 1))
+        self.assertTrue(job.last_error)
+
+        ImageConversionJob.objects.filter(pk=job.pk).update(attempts=image_jobs.MAX_ATTEMPTS - 1)
+        image_jobs.run_once(now=job.next_attempt_at + timedelta(seconds=1))
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImageConversionJob.Status.FAILED)
+        band.refresh_from_db()
+        self.assertEqual(band.profile_image.name, name)
+
+    @override_settings(IMAGE_CONVERSION_ASYNC=False)
+    def test_sync_mode_converts_while_saving(self):
+        band = Band.objects.create(
+            name="클럽", created_by=self.owner,
+            profile_image=SimpleUploadedFile("face.png", png_bytes(200, 200), content_type="image/png"),
+        )
+        self.assertTrue(band.profile_image.name.endswith(".webp"))
+        self.assertTrue(default_storage.exists(variant_name(band.profile_image.name, 320)))
+        self.assertFalse(ImageConversionJob.objects.exists())
+
+    def test_backfill_command_queues_legacy_files(self):
+        name = default_storage.save("band/profiles/legacy.png", ContentFile(png_bytes(900, 300)))
+        band = Band.objects.create(name="옛 클럽", created_by=self.owner, profile_image=name)
+
+        out = StringIO()
+        call_command("generate_image_variants", "--field", "band.band.profile_image", stdout=out)
+        self.assertIn("band.band.profile_image: 0개 파일, 변환 작업 1개 등록", out.getvalue())
+        out = StringIO()
+        call_command("generate_image_variants", "--field", "band.band.profile_image", stdout=out)
+        self.assertIn("변환 작업 0개 등록", out.getvalue())
+        self.assertFalse(ImageConversionJob.objects.get().delete_source)
+
+        self.run_worker()
+        band.refresh_from_db()
+        self.assertEqual(self.width_of(variant_name(band.profile_image.name, 1280)), 900)
+        self.assertTrue(default_storage.exists(name))
+
+        out = StringIO()
+        call_command("generate_image_variants", "--field", "band.band.profile_image", stdout=out)
+        self.assertIn("band.band.profile_image: 0개 파일, 변환 작업 0개 등록", out.getvalue())
@@ -0,0 +1,118 @@
+"""방문 추적 공용 헬퍼 (웹 미들웨어 · 앱 추적 API 공용).
+
+1) 중복 제거는 공유 캐시의 cache.add 한 번으로 처리한다.
+get → set 두 단계는 워커 두 개가 동시에 get 을 통과하면 둘 다 기록되지만,
+add 는 "키가 없을 때만 저장" 이 원자적이라 먼저 도착한 요청 하나만 통과한다.
+키는 세션·경로 원문 대신 짧은 해시를 써서 캐시 메모리/테이블 크기를 줄인다.
+
+2) 관리자 대시보드 "오늘" 타일용 실시간 카운터 (record_pageview 가 기록).
+   - 페이지뷰: 분 단위 버킷 + 일 합계 (cache.incr)
+   - 순방문자: 세션별 "오늘 처음 봄" 마커를 cache.add 로 남기고, 처음일 때만 일 합계 증가
+     (대시보드는 집계 키 하나만 읽음 → VisitorLog DISTINCT 쿼리 없음)
+   캐시 유실·경합으로 생기는 오차는 reconcile_visitor_counters 명령이 DB 기준으로 보정한다.
+"""
+import hashlib
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+# 일 카운터/방문자 마커 보존 시간 (자정 경계 + 보정 여유)
+DAY_COUNTER_TTL = 60 * 60 * 48
+# 분 버킷 보존 시간
+MINUTE_BUCKET_TTL = 60 * 60 * 2
+# 대시보드 "최근 N분" 배지 범위
+RECENT_MINUTES = 5
+
+
+def anon_session_key(ip_address, user_agent, *extra, prefix="anon_", length=30):
+    """세션이 없는 방문자용 IP+UA 합성 세션 키 (VisitorLog.session_key 용)"""
+    parts = [ip_address or "unknown", (user_agent or "")[:200], *extra]
+    fingerprint = "|".join(parts)
+    return prefix + hashlib.md5(fingerprint.encode("utf-8")).hexdigest()[:length]
+
+
+def dedupe_key(namespace, *parts):
+    """namespace + 10바이트 blake2b 해시로 된 짧은 캐시 키"""
+    digest = hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=10).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+def seen_recently(namespace, *parts, seconds=5):
+    """같은 parts 가 seconds 초 안에 이미 들어왔으면 True (처음이면 기록 후 False)"""
+    return not cache.add(dedupe_key(namespace, *parts), 1, timeout=seconds)
+
+
+# ── 대시보드 실시간 카운터 ──
+
+def _day(when):
+    return timezone.localtime(when).strftime("%Y%m%d")
+
+
+def pageview_day_key(day):
+    return f"pv:d:{day}"
+
+
+def visitor_day_key(day):
+    return f"uv:d:{day}"
+
+
+def visitor_marker_key(day, session_key):
+    return dedupe_key(f"uv:{day}", session_key)
+
+
+def _incr(key, timeout, delta=1):
+    """키가 없으면 0 으로 만든 뒤 원자 증가 (다른 워커와 경합해도 유실 없음)"""
+    cache.add(key, 0, timeout=timeout)
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # add 와 incr 사이에 만료/삭제된 경우
+        cache.set(key, delta, timeout=timeout)
+        return delta
+
+
+def is_counted_visit(user, device_type):
+    """대시보드/통계의 '실제 사용자' 기준 (봇·스태프 제외)"""
+    if device_type not in ("desktop", "mobile", "tablet"):
+        return False
+    return user is None or not user.is_staff
+
+
+def counted_visits(start, end):
+    """is_counted_visit 와 같은 기준의 VisitorLog queryset (보정·캐시 미스 시 DB 집계용)"""
+    from django.db.models import Q
+    from .models import VisitorLog
+
+    return VisitorLog.objects.filter(visited_at__gte=start, visited_at__lt=end).filter(
+        Q(device_type__in=["desktop", "mobile", "tablet"]) &
+        (Q(user__is_staff=False) | Q(user__isnull=True))
+    )
+
+
+def record_pageview(session_key, when=None):
+    """VisitorLog 한 건이 기록될 때 호출 — 분 버킷/일 페이지뷰/일 순방문자 갱신"""
+    when = timezone.localtime(when or timezone.now())
+    day = when.strftime("%Y%m%d")
+    try:
+        _incr(f"pv:m:{when:%Y%m%d%H%M}", MINUTE_BUCKET_TTL)
+        _incr(pageview_day_key(day), DAY_COUNTER_TTL)
+        if cache.add(visitor_marker_key(day, session_key), 1, timeout=DAY_COUNTER_TTL):
+            _incr(visitor_day_key(day), DAY_COUNTER_TTL)
+    except Exception:
+        # 카운터 실패가 방문 기록/응답에 영향 주지 않도록 무시 (보정 명령이 복구)
+        pass
+
+
+def today_counters():
+    """(오늘 순방문자, 오늘 페이지뷰). 캐시에 없으면 해당 값은 None"""
+    day = _day(timezone.now())
+    values = cache.get_many([visitor_day_key(day), pageview_day_key(day)])
+    return values.get(visitor_day_key(day)), values.get(pageview_day_key(day))
+
+
+def recent_pageviews(minutes=RECENT_MINUTES):
+    """최근 minutes 분(현재 분 포함) 페이지뷰 합계"""
+    now = timezone.localtime()
+    keys = [f"pv:m:{now - timedelta(minutes=i):%Y%m%d%H%M}" for i in range(minutes)]
+    return sum(cache.get_many(keys).values())
@@ -1,6 +1,7 @@
 """Unfold Admin 콜백 함수"""
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from datetime import timedelta
 
@@ -14,12 +15,18 @@ def environment_callback(request):
 
 def dashboard_callback(request, context):
     """대시보드 콜백 - 통계 및 최근 활동 데이터"""
-    from django.db.models import Count, Q
     from accounts.models import User, Inquiry, Report
     from contests.models import Contest
     from community.models import Post, Comment
     from band.models import Band
-    from badmintok.models import VisitorLog
+    from badmintok.tracking import (
+        DAY_COUNTER_TTL,
+        counted_visits,
+        pageview_day_key,
+        recent_pageviews,
+        today_counters,
+        visitor_day_key,
+    )
 
     # KST 기준 '오늘 0시'를 사용해야 정확한 일별 통계가 됨
     # timezone.now()는 UTC aware → localtime으로 KST aware로 변환
@@ -29,12 +36,6 @@ def dashboard_callback(request, context):
     month_ago = today_start - timedelta(days=30)
     three_days_later = now.date() + timedelta(days=3)
 
-    # 실제 사용자 필터 (봇 제외)
-    real_user_filter = (
-        Q(device_type__in=['desktop', 'mobile', 'tablet']) &
-        (Q(user__is_staff=False) | Q(user__isnull=True))
-    )
-
     # === 통계 데이터 ===
 
     # 사용자 통계
@@ -42,14 +43,16 @@ def dashboard_callback(request, context):
     new_users_today = User.objects.filter(date_joined__gte=today_start).count()
     new_users_week = User.objects.filter(date_joined__gte=week_ago).count()
 
-    # 방문자 통계
-    today_visitors = VisitorLog.objects.filter(
-        visited_at__gte=today_start
-    ).filter(real_user_filter).values('session_key').distinct().count()
-
-    today_pageviews = VisitorLog.objects.filter(
-        visited_at__gte=today_start
-    ).filter(real_user_filter).count()
+    # 방문자 통계: 추적 시점에 캐시에 올린 카운터를 읽음 (reconcile_visitor_counters 로 보정)
+    # 캐시에 없을 때(재시작 직후 등)만 DB 로 세고 카운터를 채워둔다
+    today_visitors, today_pageviews = today_counters()
+    if today_visitors is None or today_pageviews is None:
+        today_qs = counted_visits(today_start, today_start + timedelta(days=1))
+        today_visitors = today_qs.values('session_key').distinct().count()
+        today_pageviews = today_qs.count()
+        cache.add(visitor_day_key(now.strftime('%Y%m%d')), today_visitors, timeout=DAY_COUNTER_TTL)
+        cache.add(pageview_day_key(now.strftime('%Y%m%d')), today_pageviews, timeout=DAY_COUNTER_TTL)
+    recent_pageviews_count = recent_pageviews()
 
     # 대회 통계
     total_contests = Contest.objects.count()
@@ -157,6 +160,7 @@ def dashboard_callback(request, context):
             "visitors": {
                 "today": today_visitors,
                 "pageviews": today_pageviews,
+                "recent": recent_pageviews_count,
             },
             "contests": {
                 "total": total_contests,
@@ -0,0 +1,173 @@
+"""게시글·대회·밴드 게시글 조회수 공용 카운터.
+
+상세 조회마다 view_count 를 읽고 +1 해서 save() 하면 인기 글 한 행에 쓰기가 몰려
+행 잠금 대기가 생기고, 동시에 읽은 요청끼리 서로의 증가분을 덮어쓴다.
+여기서는 조회 1건을 공유 캐시의 분 단위 버킷에만 쌓고, flush_view_counts 명령이
+닫힌 버킷을 모아 UPDATE ... SET view_count = view_count + n 으로 한꺼번에 반영한다.
+
+- 버킷: vc:{모델}:{분}:{pk} 정수 (cache.incr 원자 증가)
+- 버킷 목록: 그 분에 처음 조회된 pk 만 순번 슬롯(vc:{모델}:{분}:n → :s:{i})에 등록
+- flush 는 현재·직전 분을 건너뛰고 (워커 간 시계 차 여유) 그 이전 버킷만 처리.
+  버킷마다 cache.add 로 처리권을 잡아 cron 이 겹쳐 돌아도 두 번 반영되지 않는다.
+- 같은 사용자의 재조회 (기본 3시간) 는 세션 dict 대신 캐시 dedupe 로 거른다.
+
+settings.VIEW_COUNT_BUFFER = False 이면 버킷 없이 바로 F() UPDATE 한다
+(워커끼리 캐시가 공유되지 않는 locmem 환경용).
+
+운영에서는 view-count-worker 컨테이너가 1분마다 flush 한다. cron 예:
+    * * * * * python manage.py flush_view_counts
+"""
+import time
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.dispatch import Signal
+
+from .tracking import anon_session_key, seen_recently
+
+# 같은 사용자의 재조회를 조회수로 치지 않는 시간
+VIEW_DEDUPE_SECONDS = 60 * 60 * 3
+BUCKET_SECONDS = 60
+# flush 가 밀려도 버킷이 사라지지 않도록 넉넉히 보존
+BUCKET_TTL = 60 * 60 * 24
+# flush 가 되돌아볼 최대 버킷 수 (마지막 처리 위치를 잃었을 때)
+MAX_LOOKBACK_BUCKETS = BUCKET_TTL // BUCKET_SECONDS
+
+COUNTED_MODELS = ("community.post", "contests.contest", "band.bandpost")
+
+# flush 로 view_count 가 바뀐 뒤 (sender=모델, pks=바뀐 pk 목록)
+view_counts_flushed = Signal()
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+def _bucket(now=None):
+    return int((now if now is not None else time.time()) // BUCKET_SECONDS)
+
+
+def _count_key(label, bucket, pk):
+    return f"vc:{label}:{bucket}:{pk}"
+
+
+def _slot_counter_key(label, bucket):
+    return f"vc:{label}:{bucket}:n"
+
+
+def _slot_key(label, bucket, index):
+    return f"vc:{label}:{bucket}:s:{index}"
+
+
+def _incr(key, delta=1):
+    """키가 없으면 0 으로 만든 뒤 원자 증가. (새로 만들었는지, 증가 후 값)"""
+    created = cache.add(key, 0, timeout=BUCKET_TTL)
+    try:
+        return created, cache.incr(key, delta)
+    except ValueError:
+        cache.set(key, delta, timeout=BUCKET_TTL)
+        return True, delta
+
+
+def viewer_key(request):
+    """재조회 판별용 조회자 키 (회원 id, 없으면 세션 키, 그것도 없으면 IP+UA)"""
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return f"u{user.pk}"
+    session = getattr(request, "session", None)
+    if session is not None and session.session_key:
+        return session.session_key
+    forwarded = request.META.get("HTTP_X_FORWARDED_FOR")
+    ip = forwarded.split(",")[0].strip() if forwarded else request.META.get("REMOTE_ADDR")
+    return anon_session_key(ip, request.META.get("HTTP_USER_AGENT"))
+
+
+def count_view(obj, viewer=None, *, dedupe_seconds=VIEW_DEDUPE_SECONDS):
+    """obj 조회 1건 기록. viewer 가 dedupe_seconds 안에 이미 본 글이면 무시하고 False.
+
+    DB 반영은 flush 때지만, 이번 응답에서 보이는 obj.view_count 는 바로 +1 한다.
+    """
+    label = _label(obj)
+    if viewer is not None and seen_recently("vv", label, str(obj.pk), viewer, seconds=dedupe_seconds):
+        return False
+
+    if not getattr(settings, "VIEW_COUNT_BUFFER", True):
+        type(obj)._default_manager.filter(pk=obj.pk).update(view_count=F("view_count") + 1)
+        view_counts_flushed.send(sender=type(obj), pks=[obj.pk])
+    else:
+        bucket = _bucket()
+        created, _ = _incr(_count_key(label, bucket, obj.pk))
+        if created:
+            # 이 분에 처음 조회된 글만 목록에 등록
+            _, index = _incr(_slot_counter_key(label, bucket))
+            cache.set(_slot_key(label, bucket, index), obj.pk, timeout=BUCKET_TTL)
+    obj.view_count += 1
+    return True
+
+
+def pending_views(model, bucket):
+    """bucket 에 쌓인 {pk: 증가분}"""
+    label = _label(model)
+    total = cache.get(_slot_counter_key(label, bucket)) or 0
+    if not total:
+        return {}
+    slots = cache.get_many([_slot_key(label, bucket, i) for i in range(1, total + 1)])
+    pks = set(slots.values())
+    counts = cache.get_many([_count_key(label, bucket, pk) for pk in pks])
+    pending = {}
+    for pk in pks:
+        n = counts.get(_count_key(label, bucket, pk))
+        if n:
+            pending[pk] = n
+    return pending
+
+
+def _apply(model, pending):
+    """{pk: n} 을 증가분별 UPDATE 로 반영"""
+    by_delta = defaultdict(list)
+    for pk, n in pending.items():
+        by_delta[n].append(pk)
+    for n, pks in by_delta.items():
+        model._default_manager.filter(pk__in=pks).update(view_count=F("view_count") + n)
+    if pending:
+        view_counts_flushed.send(sender=model, pks=list(pending))
+
+
+def flush_view_counts(model, now=None):
+    """닫힌 버킷을 DB 에 반영. Returns: (처리한 버킷 수, 반영한 조회 수)"""
+    label = _label(model)
+    last_key = f"vc:{label}:last"
+    # 현재 분과 직전 분은 아직 다른 워커가 쓰고 있을 수 있음
+    upto = _bucket(now) - 2
+    oldest = upto - MAX_LOOKBACK_BUCKETS + 1
+    last = cache.get(last_key)
+    start = oldest if last is None else max(last + 1, oldest)
+
+    # 조회가 있었던 버킷만 골라냄 (빈 버킷은 키도 만들지 않음)
+    counters = cache.get_many([_slot_counter_key(label, bucket) for bucket in range(start, upto + 1)])
+    buckets = views = 0
+    for bucket in range(start, upto + 1):
+        if not counters.get(_slot_counter_key(label, bucket)):
+            continue
+        # 버킷 처리권: 겹쳐 실행된 flush 가 같은 버킷을 두 번 반영하지 않도록
+        if not cache.add(f"vc:{label}:{bucket}:done", 1, timeout=BUCKET_TTL):
+            continue
+        pending = pending_views(model, bucket)
+        if not pending:
+            continue
+        _apply(model, pending)
+        cache.delete_many(
+            [_count_key(label, bucket, pk) for pk in pending] + [_slot_counter_key(label, bucket)]
+        )
+        buckets += 1
+        views += sum(pending.values())
+    cache.set(last_key, upto, timeout=None)
+    return buckets, views
+
+
+def flush_all(now=None):
+    """COUNTED_MODELS 전체 flush. Returns: {모델 label: (버킷 수, 조회 수)}"""
+    return {label: flush_view_counts(apps.get_model(label), now=now) for label in COUNTED_MODELS}
@@ -1,13 +1,18 @@
 from django.shortcuts import render, redirect
-from django.db.models import Count, Q, F, Case, When, ExpressionWrapper, FloatField, IntegerField
+from django.db.models import Count, Q, IntegerField
 from django.core.paginator import Paginator
 from django.urls import reverse
 from django.utils import timezone
 from django.http import HttpResponse
-from datetime import timedelta
 from band.models import Band
+from community.categories import category_tree
+from community.hot import top_hot_posts
+from community.search import search_posts
 from community.models import Post, Category, PostImage
+from .api.likes import liked_ids
+from .comment_tree import build_comment_tree
 from .models import BadmintokBanner, Notice
+from .view_counts import viewer_key
 
 
 def home(request):
@@ -55,7 +60,6 @@ def badmintok_tag(request, slug):
 def badmintok_detail(request, slug):
     """배드민톡 게시글 상세 뷰"""
     from django.shortcuts import get_object_or_404
-    from datetime import datetime
     from django.utils import timezone
 
     # 배드민톡 글만 가져오기 (임시저장 및 예약발행 글은 작성자만 볼 수 있음)
@@ -72,42 +76,20 @@ def badmintok_detail(request, slug):
     queryset = Post.objects.filter(base_filter).filter(slug=slug).order_by('-created_at')
     
     # 같은 slug가 여러 개일 경우 최신 글을 가져옴
-    post = queryset.select_related("author", "category").prefetch_related("images", "likes", "categories", "tags").first()
+    post = queryset.select_related("author", "category").prefetch_related("images", "categories", "tags").first()
     
     if not post:
         from django.http import Http404
         raise Http404("게시글을 찾을 수 없습니다.")
 
-    # 세션 기반 조회수 중복 방지 (3시간 제한)
-    session_key = 'viewed_posts'
-    viewed_posts = request.session.get(session_key, {})
-    post_id_str = str(post.id)
-    current_time = datetime.now()
-
-    # 세션에 조회 기록이 있는지 확인
-    should_increase = True
-    if post_id_str in viewed_posts:
-        last_viewed_time = datetime.fromisoformat(viewed_posts[post_id_str])
-        time_diff = current_time - last_viewed_time
-
-        # 3시간(10800초) 이내면 조회수 증가하지 않음
-        if time_diff.total_seconds() < 10800:
-            should_increase = False
-
-    # 조회수 증가 및 세션 업데이트
-    if should_increase:
-        post.increase_view_count()
-        viewed_posts[post_id_str] = current_time.isoformat()
-        request.session[session_key] = viewed_posts
-        request.session.modified = True
+    # 조회수 증가 (같은 사용자 3시간 내 재조회 제외)
+    post.increase_view_count(viewer_key(request))
 
     # 댓글 목록 가져오기
     from community.models import Comment
-    comments = Comment.objects.filter(
-        post=post,
-        is_deleted=False,
-        parent__isnull=True
-    ).select_related("author").prefetch_related("replies__author", "likes").order_by("created_at")
+    comments = build_comment_tree(
+        Comment.objects.filter(post=post, is_deleted=False).select_related("author", "author__profile"), request.user
+    )
 
     # 추천 콘텐츠 가져오기
     recommended_posts = []
@@ -200,6 +182,7 @@ def badmintok_detail(request, slug):
         "post": post,
         "comments": comments,
         "recommended_posts": recommended_posts,
+        "is_liked": bool(liked_ids(request.user, Post, [post.pk])),
     })
 
 
@@ -207,21 +190,10 @@ def badmintok(request):
     """배드민톡 통합 페이지 (뉴스 & 리뷰 & 피드)"""
     from django.utils import timezone
 
-    # 활성화된 배드민톡 탭 가져오기 (상위 카테고리 = 탭)
-    tabs = Category.objects.filter(
-        source=Category.Source.BADMINTOK,
-        parent__isnull=True,
-        is_active=True
-    ).order_by('display_order')
-
-    # 각 탭의 하위 카테고리를 가져오기 (부모별 독립적인 display_order로 정렬)
-    tab_children = {}
-    for tab in tabs:
-        children = Category.objects.filter(
-            parent=tab,
-            is_active=True
-        ).order_by('display_order')  # 부모 내에서 display_order로 정렬
-        tab_children[tab.slug] = children
+    # 활성화된 배드민톡 탭(상위 카테고리)과 탭별 하위 카테고리 (카테고리 트리 캐시, 쿼리 없음)
+    tree = category_tree()
+    tabs = tree.tabs(Category.Source.BADMINTOK)
+    tab_children = tree.tab_children(Category.Source.BADMINTOK)
 
     # 기본 탭 설정 (NEW 탭)
     default_tab = "new"
@@ -259,7 +231,7 @@ def badmintok(request):
         # 모든 배드민톡 글 표시 (카테고리 필터링 없음)
         pass
     else:
-        current_tab = tabs.filter(slug=active_tab).first()
+        current_tab = tree.tab(Category.Source.BADMINTOK, active_tab)
         if current_tab:
             # 뉴스 탭인 경우 하드코딩된 카테고리 목록 사용
             if active_tab == 'news':
@@ -293,12 +265,8 @@ def badmintok(request):
                     posts = posts.filter(Q(category__slug=category) | Q(categories__slug=category)).distinct()
             # 기타 탭인 경우 (상위 카테고리)
             else:
-                # 현재 탭(상위 카테고리)와 그 하위 카테고리들을 가져옴
-                category_slugs = [current_tab.slug]
-
-                # 하위 카테고리 추가
-                child_categories = Category.objects.filter(parent=current_tab, is_active=True)
-                category_slugs.extend([cat.slug for cat in child_categories])
+                # 현재 탭(상위 카테고리)와 그 하위 카테고리들
+                category_slugs = tree.tab_slugs(Category.Source.BADMINTOK, active_tab)
 
                 # 카테고리 필터링
                 posts = posts.filter(
@@ -310,49 +278,30 @@ def badmintok(request):
                     posts = posts.filter(Q(category__slug=category) | Q(categories__slug=category)).distinct()
             # 카테고리가 없는 탭인 경우 모든 글 표시 (필터링 없음)
 
-    # 검색 기능
+    # 검색 기능 (검색 색인 순위순), 없으면 고정글 → 최신순
     search = request.GET.get("search")
     if search:
-        posts = posts.filter(
-            Q(title__icontains=search) | Q(content__icontains=search)
-        )
-    
-    # 정렬
-    posts = posts.order_by("-is_pinned", "-created_at")
+        posts = search_posts(posts, search)
+    else:
+        posts = posts.order_by("-is_pinned", "-created_at")
     
     # 페이지네이션
     paginator = Paginator(posts, 10)
     page_number = request.GET.get("page", 1)
     page_obj = paginator.get_page(page_number)
     
-    # Hot 글 - 최근 30일 내 글 + 복합 점수 + 시간 가중치
-    # 최근 30일 기준일
-    recent_30_days = now - timedelta(days=30)
-    # 최근 7일 기준일 (시간 가중치 적용)
-    recent_7_days = now - timedelta(days=7)
-    
-    hot_posts = Post.objects.filter(
-        is_deleted=False,
-        is_draft=False,
-        source=Post.Source.BADMINTOK
-    ).filter(
-        Q(published_at__lte=now) | Q(published_at__isnull=True)  # published_at이 없거나 현재 시간 이전인 것
-    ).filter(
-        Q(published_at__gte=recent_30_days) | Q(published_at__isnull=True, created_at__gte=recent_30_days)  # 최근 30일 내 글
-    ).select_related("author", "category").prefetch_related("categories").annotate(
-        # 시간 가중치: 최근 7일 내면 1.5배, 그 외는 1.0배
-        time_weight=Case(
-            When(published_at__gte=recent_7_days, then=1.5),
-            When(published_at__isnull=True, created_at__gte=recent_7_days, then=1.5),
-            default=1.0,
-            output_field=FloatField()
-        ),
-        # 복합 점수: (조회수 * 1 + 좋아요 * 2 + 댓글 * 3) * 시간가중치
-        hot_score=ExpressionWrapper(
-            (F('view_count') * 1 + F('like_count') * 2 + F('comment_count') * 3) * F('time_weight'),
-            output_field=FloatField()
-        )
-    ).order_by('-hot_score')[:10]
+    # Hot 글 - 최근 30일 내 글 저장 점수 상위 10개 (community.hot, id 목록 캐시)
+    hot_posts = top_hot_posts(
+        Post.objects.filter(
+            is_deleted=False,
+            is_draft=False,
+            source=Post.Source.BADMINTOK
+        ).filter(
+            Q(published_at__lte=now) | Q(published_at__isnull=True)  # published_at이 없거나 현재 시간 이전인 것
+        ).select_related("author", "category").prefetch_related("categories"),
+        10,
+        cache_key="badmintok",
+    )
 
     # 고정된 공지사항 가져오기 (최신 1개)
     pinned_notice = Notice.objects.filter(is_pinned=True).order_by("-created_at").first()
@@ -396,20 +345,8 @@ def badmintok_create(request):
             fields = ["title", "category", "content"]
     
     # 배드민톡 관련 카테고리 계층 구조 생성
-    # 배드민톡 카테고리만 포함 (상위 카테고리 = 탭)
-    badmintok_categories = Category.objects.filter(
-        source=Category.Source.BADMINTOK,
-        parent__isnull=True,
-        is_active=True
-    )
-
-    # 상위 카테고리(탭)와 하위 카테고리 slug 목록 생성
-    allowed_category_slugs = set()
-    for category in badmintok_categories:
-        allowed_category_slugs.add(category.slug)
-        # 하위 카테고리도 포함
-        child_categories = Category.objects.filter(parent=category, is_active=True)
-        allowed_category_slugs.update(child_categories.values_list('slug', flat=True))
+    # 배드민톡 탭(상위 카테고리)과 하위 카테고리 slug (카테고리 트리 캐시, 쿼리 없음)
+    allowed_category_slugs = category_tree().source_slugs(Category.Source.BADMINTOK)
     
     # allowed_category_slugs가 비어있으면 모든 카테고리 허용
     if allowed_category_slugs:
@@ -570,55 +507,36 @@ def member_reviews(request):
         source=Post.Source.MEMBER_REVIEWS
     ).filter(
         Q(published_at__lte=now) | Q(published_at__isnull=True)  # published_at이 없거나 현재 시간 이전인 것
-    ).select_related("author", "category").prefetch_related("images")
+    ).select_related("author", "category").prefetch_related("images").defer("content")  # 목록은 저장된 요약 필드 사용
     
     # 카테고리 필터링
     if category:
         posts = posts.filter(category__slug=category)
     
-    # 검색 기능
+    # 검색 기능 (검색 색인 순위순), 없으면 고정글 → 최신순
     search = request.GET.get("search")
     if search:
-        posts = posts.filter(
-            Q(title__icontains=search) | Q(content__icontains=search)
-        )
-    
-    # 정렬
-    posts = posts.order_by("-is_pinned", "-created_at")
+        posts = search_posts(posts, search)
+    else:
+        posts = posts.order_by("-is_pinned", "-created_at")
     
     # 페이지네이션
     paginator = Paginator(posts, 10)
     page_number = request.GET.get("page", 1)
     page_obj = paginator.get_page(page_number)
     
-    # Hot 글 - 최근 30일 내 글 + 복합 점수 + 시간 가중치
-    # 최근 30일 기준일
-    recent_30_days = now - timedelta(days=30)
-    # 최근 7일 기준일 (시간 가중치 적용)
-    recent_7_days = now - timedelta(days=7)
-    
-    hot_posts = Post.objects.filter(
-        is_deleted=False,
-        is_draft=False,
-        source=Post.Source.MEMBER_REVIEWS
-    ).filter(
-        Q(published_at__lte=now) | Q(published_at__isnull=True)  # published_at이 없거나 현재 시간 이전인 것
-    ).filter(
-        Q(published_at__gte=recent_30_days) | Q(published_at__isnull=True, created_at__gte=recent_30_days)  # 최근 30일 내 글
-    ).select_related("author", "category").annotate(
-        # 시간 가중치: 최근 7일 내면 1.5배, 그 외는 1.0배
-        time_weight=Case(
-            When(published_at__gte=recent_7_days, then=1.5),
-            When(published_at__isnull=True, created_at__gte=recent_7_days, then=1.5),
-            default=1.0,
-            output_field=FloatField()
-        ),
-        # 복합 점수: (조회수 * 1 + 좋아요 * 2 + 댓글 * 3) * 시간가중치
-        hot_score=ExpressionWrapper(
-            (F('view_count') * 1 + F('like_count') * 2 + F('comment_count') * 3) * F('time_weight'),
-            output_field=FloatField()
-        )
-    ).order_by('-hot_score')[:10]
+    # Hot 글 - 최근 30일 내 글 저장 점수 상위 10개 (community.hot, id 목록 캐시)
+    hot_posts = top_hot_posts(
+        Post.objects.filter(
+            is_deleted=False,
+            is_draft=False,
+            source=Post.Source.MEMBER_REVIEWS
+        ).filter(
+            Q(published_at__lte=now) | Q(published_at__isnull=True)  # published_at이 없거나 현재 시간 이전인 것
+        ).select_related("author", "category"),
+        10,
+        cache_key="member_reviews",
+    )
     
     return render(request, "member_reviews/index.html", {
         "category": category,
@@ -864,7 +782,8 @@ def track_app_pageview(request):
     """
     from django.http import HttpResponse, JsonResponse
     from .models import VisitorLog
-    import json, hashlib
+    from .tracking import anon_session_key, is_counted_visit, record_pageview, seen_recently
+    import json
 
     try:
         try:
@@ -901,19 +820,16 @@ def track_app_pageview(request):
         user_agent = (request.META.get("HTTP_USER_AGENT") or "")[:500]
 
         # 세션 키: 앱은 보통 세션 X → IP+UA+OS 합성
-        fingerprint = f"{ip_address or 'unknown'}|{user_agent[:200]}|{os_value}"
-        session_key = "app_" + hashlib.md5(fingerprint.encode("utf-8")).hexdigest()[:32]
+        session_key = anon_session_key(ip_address, user_agent, os_value, prefix="app_", length=32)
 
         # 중복 전송 dedup: 같은 세션+화면을 5초 내 재전송하면 무시 (앱 onResume/리렌더/재시도 거품 방지)
-        from django.core.cache import cache
-        dedupe_key = f"applog_dedupe:{session_key}:{url_path}"
-        if cache.get(dedupe_key):
+        if seen_recently("ad", session_key, url_path, seconds=5):
             return HttpResponse(status=204)
-        cache.set(dedupe_key, 1, timeout=5)
 
+        user = request.user if request.user.is_authenticated else None
         VisitorLog.objects.create(
             source=VisitorLog.SOURCE_APP,
-            user=request.user if request.user.is_authenticated else None,
+            user=user,
             session_key=session_key,
             ip_address=ip_address,
             url_path=url_path,
@@ -923,6 +839,8 @@ def track_app_pageview(request):
             device_type=device_type,
             app_version=app_version,
         )
+        if is_counted_visit(user, device_type):
+            record_pageview(session_key)
         return HttpResponse(status=204)
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
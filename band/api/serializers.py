@@ -1,10 +1,11 @@
 from rest_framework import serializers
 from band.models import (
     Band, BandMember, BandPost, BandPostImage, BandComment,
-    BandPostLike, BandCommentLike,
     BandVote, BandVoteOption, BandVoteChoice,
     BandSchedule, BandScheduleApplication, BandScheduleImage, BandBookmark
 )
+from badmintok.api.images import ImageSrcsetField
+from badmintok.api.likes import LikedByUserMixin, LikedListSerializer
 from accounts.models import User
 
 
@@ -59,6 +60,8 @@ class BandListSerializer(serializers.ModelSerializer):
     category_labels = serializers.ListField(read_only=True)
     cover_image_url = serializers.SerializerMethodField()
     profile_image_url = serializers.SerializerMethodField()
+    cover_image_srcset = ImageSrcsetField(source='cover_image')
+    profile_image_srcset = ImageSrcsetField(source='profile_image')
     is_bookmarked = serializers.SerializerMethodField()
     member_role = serializers.SerializerMethodField()
     region_display = serializers.SerializerMethodField()
@@ -71,6 +74,7 @@ class BandListSerializer(serializers.ModelSerializer):
             'flash_region_detail', 'is_public', 'join_approval_required',
             'is_approved', 'created_by', 'member_count', 'bookmark_count',
             'post_count', 'category_labels', 'cover_image_url', 'profile_image_url',
+            'cover_image_srcset', 'profile_image_srcset',
             'is_bookmarked', 'member_role', 'created_at', 'updated_at'
         ]
         read_only_fields = fields
@@ -123,6 +127,8 @@ class BandDetailSerializer(serializers.ModelSerializer):
     category_labels = serializers.ListField(read_only=True)
     cover_image_url = serializers.SerializerMethodField()
     profile_image_url = serializers.SerializerMethodField()
+    cover_image_srcset = ImageSrcsetField(source='cover_image')
+    profile_image_srcset = ImageSrcsetField(source='profile_image')
     is_bookmarked = serializers.SerializerMethodField()
     is_member = serializers.SerializerMethodField()
     member_role = serializers.SerializerMethodField()
@@ -139,6 +145,7 @@ class BandDetailSerializer(serializers.ModelSerializer):
             'is_public', 'join_approval_required', 'is_approved',
             'created_by', 'member_count', 'bookmark_count', 'post_count',
             'category_labels', 'cover_image_url', 'profile_image_url',
+            'cover_image_srcset', 'profile_image_srcset',
             'is_bookmarked', 'is_member', 'member_role',
             'is_site_admin', 'can_manage',
             'created_at', 'updated_at'
@@ -292,7 +299,7 @@ class BandVoteSerializer(serializers.ModelSerializer):
         return []
 
 
-class BandPostDetailSerializer(serializers.ModelSerializer):
+class BandPostDetailSerializer(LikedByUserMixin, serializers.ModelSerializer):
     """밴드 게시글 상세 시리얼라이저"""
     author = UserSerializer(read_only=True)
     band_name = serializers.CharField(source='band.name', read_only=True)
@@ -303,6 +310,7 @@ class BandPostDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = BandPost
+        list_serializer_class = LikedListSerializer
         fields = [
             'id', 'band', 'band_name', 'author', 'title', 'content',
             'post_type', 'is_pinned', 'is_notice', 'view_count',
@@ -312,12 +320,6 @@ class BandPostDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
-    def get_is_liked(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return BandPostLike.objects.filter(post=obj, user=request.user).exists()
-        return False
-
     def get_vote(self, obj):
         if obj.post_type == 'vote' and hasattr(obj, 'vote'):
             try:
@@ -670,7 +672,7 @@ class BandPostUpdateSerializer(serializers.ModelSerializer):
         fields = ['title', 'content', 'image_ids']
 
 
-class BandCommentSerializer(serializers.ModelSerializer):
+class BandCommentSerializer(LikedByUserMixin, serializers.ModelSerializer):
     """댓글 시리얼라이저"""
     author = UserSerializer(read_only=True)
     replies = serializers.SerializerMethodField()
@@ -678,6 +680,7 @@ class BandCommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = BandComment
+        list_serializer_class = LikedListSerializer
         fields = [
             'id', 'author', 'content', 'parent', 'like_count',
             'is_liked', 'replies', 'created_at', 'updated_at'
@@ -685,6 +688,8 @@ class BandCommentSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
     def get_replies(self, obj):
+        if hasattr(obj, 'replies_list'):
+            return BandCommentSerializer(obj.replies_list, many=True, context=self.context).data
         if obj.parent is None:
             replies = obj.replies.select_related('author', 'author__profile').all()
             return BandCommentSerializer(
@@ -692,12 +697,6 @@ class BandCommentSerializer(serializers.ModelSerializer):
             ).data
         return []
 
-    def get_is_liked(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return BandCommentLike.objects.filter(comment=obj, user=request.user).exists()
-        return False
-
 
 class BandCommentCreateSerializer(serializers.Serializer):
     """댓글 생성 시리얼라이저"""
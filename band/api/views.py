@@ -5,12 +5,16 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from django.db import transaction
 from django.db.models import Q, Prefetch, Count, Case, When, F, Value, IntegerField
 from django.shortcuts import get_object_or_404
 from django.core.paginator import Paginator
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 
+from badmintok.api.pagination import cursor_requested, cursor_response
+from badmintok.comment_tree import build_comment_tree
+from badmintok.view_counts import viewer_key
 from band.models import (
     Band, BandMember, BandPost, BandPostImage, BandComment,
     BandPostLike, BandCommentLike,
@@ -109,6 +113,10 @@ def band_list(request):
     except (ValueError, TypeError):
         page_size = 10
 
+    # ?cursor= 키셋 모드: COUNT/OFFSET 없이 다음 cursor 만 반환
+    if cursor_requested(request):
+        return cursor_response(request, bands, page_size, BandListSerializer, is_fallback=is_fallback)
+
     paginator = Paginator(bands, page_size)
     page_obj = paginator.get_page(page_number)
 
@@ -138,6 +146,10 @@ def my_joined_bands(request):
 
     page_number = request.GET.get('page', 1)
     page_size = min(int(request.GET.get('page_size', 20) or 20), 100)
+    # ?cursor= 키셋 모드: COUNT/OFFSET 없이 다음 cursor 만 반환
+    if cursor_requested(request):
+        return cursor_response(request, bands.order_by('-created_at'), page_size, BandListSerializer)
+
     paginator = Paginator(bands.order_by('-created_at'), page_size)
     page_obj = paginator.get_page(page_number)
 
@@ -164,6 +176,10 @@ def my_created_bands(request):
 
     page_number = request.GET.get('page', 1)
     page_size = min(int(request.GET.get('page_size', 20) or 20), 100)
+    # ?cursor= 키셋 모드: COUNT/OFFSET 없이 다음 cursor 만 반환
+    if cursor_requested(request):
+        return cursor_response(request, bands.order_by('-created_at'), page_size, BandListSerializer)
+
     paginator = Paginator(bands.order_by('-created_at'), page_size)
     page_obj = paginator.get_page(page_number)
 
@@ -190,6 +206,10 @@ def my_bookmarked_bands(request):
 
     page_number = request.GET.get('page', 1)
     page_size = min(int(request.GET.get('page_size', 20) or 20), 100)
+    # ?cursor= 키셋 모드: COUNT/OFFSET 없이 다음 cursor 만 반환
+    if cursor_requested(request):
+        return cursor_response(request, bands.order_by('-created_at'), page_size, BandListSerializer)
+
     paginator = Paginator(bands.order_by('-created_at'), page_size)
     page_obj = paginator.get_page(page_number)
 
@@ -282,6 +302,10 @@ def band_post_list(request, band_id):
     except (ValueError, TypeError):
         page_size = 10
 
+    # ?cursor= 키셋 모드: COUNT/OFFSET 없이 다음 cursor 만 반환
+    if cursor_requested(request):
+        return cursor_response(request, posts, page_size, BandPostListSerializer)
+
     paginator = Paginator(posts, page_size)
     page_obj = paginator.get_page(page_number)
 
@@ -309,9 +333,8 @@ def band_post_detail(request, band_id, post_id):
         id=post_id
     )
 
-    # 조회수 증가
-    post.view_count += 1
-    post.save(update_fields=['view_count'])
+    # 조회수 증가 (같은 사용자 3시간 내 재조회 제외)
+    post.increase_view_count(viewer_key(request))
 
     serializer = BandPostDetailSerializer(post, context={'request': request})
     return Response(serializer.data, status=status.HTTP_200_OK)
@@ -342,6 +365,10 @@ def band_schedule_list(request, band_id):
     except (ValueError, TypeError):
         page_size = 10
 
+    # ?cursor= 키셋 모드: COUNT/OFFSET 없이 다음 cursor 만 반환
+    if cursor_requested(request):
+        return cursor_response(request, schedules, page_size, BandScheduleListSerializer)
+
     paginator = Paginator(schedules, page_size)
     page_obj = paginator.get_page(page_number)
 
@@ -804,13 +831,11 @@ def band_post_like(request, band_id, post_id):
     like = BandPostLike.objects.filter(post=post, user=request.user).first()
     if like:
         like.delete()
-        post.like_count = max(0, post.like_count - 1)
-        post.save(update_fields=['like_count'])
+        post.refresh_from_db(fields=['like_count'])
         return Response({'message': '좋아요가 취소되었습니다.', 'is_liked': False, 'like_count': post.like_count})
     else:
         BandPostLike.objects.create(post=post, user=request.user)
-        post.like_count += 1
-        post.save(update_fields=['like_count'])
+        post.refresh_from_db(fields=['like_count'])
         return Response({'message': '좋아요를 눌렀습니다.', 'is_liked': True, 'like_count': post.like_count})
 
 
@@ -856,12 +881,10 @@ def band_comment_list(request, band_id, post_id):
     """댓글 목록 API"""
     post = get_object_or_404(BandPost, id=post_id, band_id=band_id)
 
-    # 최상위 댓글만 조회 (대댓글은 serializer에서 nested)
-    comments = BandComment.objects.filter(
-        post=post, parent__isnull=True
-    ).select_related('author', 'author__profile').prefetch_related(
-        Prefetch('replies', queryset=BandComment.objects.select_related('author', 'author__profile'))
-    ).order_by('created_at')
+    # 댓글 전체를 한 번에 읽어 최상위 댓글 아래 replies_list 로 묶음 (serializer에서 nested)
+    comments = build_comment_tree(
+        BandComment.objects.filter(post=post).select_related('author', 'author__profile'), request.user
+    )
 
     serializer = BandCommentSerializer(comments, many=True, context={'request': request})
     return Response({'results': serializer.data}, status=status.HTTP_200_OK)
@@ -892,6 +915,7 @@ def band_comment_create(request, band_id, post_id):
     if parent_id:
         parent = get_object_or_404(BandComment, id=parent_id, post=post)
 
+    # 게시글 댓글 수는 BandComment.save() 가 같은 트랜잭션에서 +1
     comment = BandComment.objects.create(
         post=post,
         author=request.user,
@@ -899,10 +923,6 @@ def band_comment_create(request, band_id, post_id):
         parent=parent
     )
 
-    # 댓글 수 업데이트
-    post.comment_count = post.comments.count()
-    post.save(update_fields=['comment_count'])
-
     result_serializer = BandCommentSerializer(comment, context={'request': request})
     return Response(result_serializer.data, status=status.HTTP_201_CREATED)
 
@@ -955,12 +975,9 @@ def band_comment_delete(request, comment_id):
             if not is_manager:
                 return Response({'error': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
 
+    # 게시글 댓글 수는 삭제 시그널이 대댓글까지 -1
     comment.delete()
 
-    # 댓글 수 업데이트
-    post.comment_count = post.comments.count()
-    post.save(update_fields=['comment_count'])
-
     return Response({'message': '댓글이 삭제되었습니다.'}, status=status.HTTP_200_OK)
 
 
@@ -1486,19 +1503,29 @@ def band_schedule_notice_send(request, band_id, schedule_id):
         if not recipient_ids:
             return Response({'error': '발송 대상 참가자가 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
 
-    # 다른 알림 타입(comment, like 등)과 동일하게 개별 create() 사용
-    # → Notification post_save 시그널이 발화되어 FCM 푸시가 자동 발송됨
-    from notifications.models import Notification
-    title = f'[{band.name}] {schedule.title}'
-    for uid in recipient_ids:
-        Notification.objects.create(
-            user_id=uid,
+    # 발송 건 기록 + 발송 작업만 등록 — 알림 생성/푸시는 run_broadcasts 가 모임별 분당 한도 안에서 처리
+    from notifications.broadcast import start_broadcast
+    from notifications.models import Broadcast, NoticeBatch, Notification
+    recipient_ids = sorted(set(recipient_ids))
+    with transaction.atomic():
+        batch = NoticeBatch.objects.create(
+            sender=request.user,
+            band=band,
+            schedule=schedule,
+            message=message,
+            recipient_ids=recipient_ids,
+            recipient_count=len(recipient_ids),
+        )
+        start_broadcast(
             type=Notification.Type.SCHEDULE_NOTICE,
-            title=title,
+            title=f'[{band.name}] {schedule.title}',
             message=message,
-            related_band_schedule=schedule,
-            related_band=band,
             actor=request.user,
+            audience=Broadcast.Audience.USERS,
+            recipient_ids=recipient_ids,
+            related_band=band,
+            related_band_schedule=schedule,
+            notice_batch=batch,
         )
 
     return Response(
@@ -1574,13 +1601,11 @@ def band_comment_like(request, comment_id):
     like = BandCommentLike.objects.filter(comment=comment, user=request.user).first()
     if like:
         like.delete()
-        comment.like_count = max(0, comment.like_count - 1)
-        comment.save(update_fields=['like_count'])
+        comment.refresh_from_db(fields=['like_count'])
         return Response({'message': '좋아요가 취소되었습니다.', 'is_liked': False, 'like_count': comment.like_count})
     else:
         BandCommentLike.objects.create(comment=comment, user=request.user)
-        comment.like_count += 1
-        comment.save(update_fields=['like_count'])
+        comment.refresh_from_db(fields=['like_count'])
         return Response({'message': '좋아요를 눌렀습니다.', 'is_liked': True, 'like_count': comment.like_count})
 
 
@@ -1,10 +1,12 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from PIL import Image
 import os
 
-from badmintok.fields import WebPImageField
+from badmintok.counters import adjust_counters, deleted_with
+from badmintok.fields import WebPImageField, deferred_conversion, is_webp, save_variants
+from badmintok.view_counts import count_view
 
 
 class Band(models.Model):
@@ -169,63 +171,78 @@ class Band(models.Model):
             # 새 인스턴스인 경우
             cover_image_changed = bool(self.cover_image)
         
-        super().save(*args, **kwargs)
-        
-        # 커버 이미지 리사이즈 (1200x450px, 8:3 비율) - 변경된 경우에만
-        if cover_image_changed and self.cover_image:
-            try:
-                # 이미지 파일이 실제로 존재하는지 확인
-                if not os.path.exists(self.cover_image.path):
-                    return
-                
-                img = Image.open(self.cover_image.path)
-                # RGB 모드로 변환 (JPEG 저장을 위해)
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # 목표 크기: 1200x450px (8:3 비율)
-                target_width = 1200
-                target_height = 450
-                
-                # 현재 이미지 크기
-                current_width, current_height = img.size
-                
-                # 이미 목표 크기와 같으면 스킵
-                if current_width == target_width and current_height == target_height:
-                    return
-                
-                # 비율 유지하며 리사이즈
-                # 8:3 비율로 크롭하거나 리사이즈
-                target_ratio = target_width / target_height  # 8:3 = 2.666...
-                current_ratio = current_width / current_height
-                
-                if current_ratio > target_ratio:
-                    # 너무 넓은 경우: 높이 기준으로 리사이즈 후 가로 크롭
-                    new_height = target_height
-                    new_width = int(current_width * (target_height / current_height))
-                    img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                    # 가운데 기준으로 크롭
-                    left = (new_width - target_width) // 2
-                    img = img.crop((left, 0, left + target_width, target_height))
-                else:
-                    # 너무 좁은 경우: 너비 기준으로 리사이즈 후 세로 크롭
-                    new_width = target_width
-                    new_height = int(current_height * (target_width / current_width))
-                    img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                    # 가운데 기준으로 크롭
-                    top = (new_height - target_height) // 2
-                    img = img.crop((0, top, target_width, top + target_height))
-                
-                # 최종 크기 확인 및 리사이즈
-                if img.size != (target_width, target_height):
-                    img = img.resize((target_width, target_height), Image.Resampling.LANCZOS)
-                
-                # 이미지 저장 (품질 85%)
+        # 원본 업로드의 WebP 변환 작업은 커버를 자른 뒤에 등록 (작업자가 자르기 전 파일을 읽지 않도록)
+        with deferred_conversion(self):
+            super().save(*args, **kwargs)
+
+            # 커버 이미지 리사이즈 (1200x450px, 8:3 비율) - 변경된 경우에만
+            if cover_image_changed and self.cover_image:
+                self._resize_cover_image()
+
+    def _resize_cover_image(self):
+        """저장된 커버 이미지를 1200x450px 로 잘라 같은 파일에 덮어씀"""
+        try:
+            # 이미지 파일이 실제로 존재하는지 확인
+            if not os.path.exists(self.cover_image.path):
+                return
+            
+            img = Image.open(self.cover_image.path)
+            # RGB 모드로 변환 (JPEG 저장을 위해)
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            
+            # 목표 크기: 1200x450px (8:3 비율)
+            target_width = 1200
+            target_height = 450
+            
+            # 현재 이미지 크기
+            current_width, current_height = img.size
+            
+            # 이미 목표 크기와 같으면 스킵
+            if current_width == target_width and current_height == target_height:
+                return
+            
+            # 비율 유지하며 리사이즈
+            # 8:3 비율로 크롭하거나 리사이즈
+            target_ratio = target_width / target_height  # 8:3 = 2.666...
+            current_ratio = current_width / current_height
+            
+            if current_ratio > target_ratio:
+                # 너무 넓은 경우: 높이 기준으로 리사이즈 후 가로 크롭
+                new_height = target_height
+                new_width = int(current_width * (target_height / current_height))
+                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                # 가운데 기준으로 크롭
+                left = (new_width - target_width) // 2
+                img = img.crop((left, 0, left + target_width, target_height))
+            else:
+                # 너무 좁은 경우: 너비 기준으로 리사이즈 후 세로 크롭
+                new_width = target_width
+                new_height = int(current_height * (target_width / current_width))
+                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                # 가운데 기준으로 크롭
+                top = (new_height - target_height) // 2
+                img = img.crop((0, top, target_width, top + target_height))
+            
+            # 최종 크기 확인 및 리사이즈
+            if img.size != (target_width, target_height):
+                img = img.resize((target_width, target_height), Image.Resampling.LANCZOS)
+            
+            # 이미지 저장 (품질 85%)
+            if is_webp(self.cover_image.name):
+                img.save(self.cover_image.path, 'WEBP', quality=85, method=4)
+            else:
                 img.save(self.cover_image.path, 'JPEG', quality=85, optimize=True)
-            except Exception as e:
-                # 이미지 처리 실패 시에도 저장은 진행 (기존 이미지 유지)
-                # 로깅은 필요시 추가 가능
-                pass
+
+            # 이미 WebP 면 저장 때 만든 축소본이 자르기 전 이미지라 다시 생성
+            # (원본은 save() 가 자른 뒤 등록하는 변환 작업이 잘린 파일로 WebP/축소본을 만듦)
+            field = self._meta.get_field('cover_image')
+            if is_webp(self.cover_image.name) and field.variant_widths:
+                save_variants(self.cover_image.storage, self.cover_image.name, field.variant_widths, field.quality)
+        except Exception as e:
+            # 이미지 처리 실패 시에도 저장은 진행 (기존 이미지 유지)
+            # 로깅은 필요시 추가 가능
+            pass
 
 
 class BandMember(models.Model):
@@ -329,6 +346,10 @@ class BandPost(models.Model):
     def __str__(self):
         return f"{self.band.name} - {self.title or self.content[:50]}"
 
+    def increase_view_count(self, viewer=None, **kwargs):
+        """조회수 증가 (공용 카운터에 쌓였다가 flush 때 반영)"""
+        return count_view(self, viewer, **kwargs)
+
 
 class BandPostImage(models.Model):
     """밴드 게시글 이미지 모델"""
@@ -398,6 +419,14 @@ class BandComment(models.Model):
     def __str__(self):
         return f"{self.post} - {self.content[:50]}"
 
+    def save(self, *args, **kwargs):
+        """새 댓글이면 같은 트랜잭션에서 게시글 댓글 수 +1"""
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                adjust_counters(BandPost, self.post_id, comment_count=1)
+
 
 class BandPostLike(models.Model):
     """밴드 게시글 좋아요 모델"""
@@ -427,6 +456,14 @@ class BandPostLike(models.Model):
     def __str__(self):
         return f"{self.post} - {self.user.activity_name}"
 
+    def save(self, *args, **kwargs):
+        """새 좋아요면 같은 트랜잭션에서 게시글 좋아요 수 +1 (중복이면 IntegrityError 로 함께 롤백)"""
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                adjust_counters(BandPost, self.post_id, like_count=1)
+
 
 class BandCommentLike(models.Model):
     """밴드 댓글 좋아요 모델"""
@@ -456,6 +493,14 @@ class BandCommentLike(models.Model):
     def __str__(self):
         return f"{self.comment} - {self.user.activity_name}"
 
+    def save(self, *args, **kwargs):
+        """새 좋아요면 같은 트랜잭션에서 댓글 좋아요 수 +1"""
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                adjust_counters(BandComment, self.comment_id, like_count=1)
+
 
 class BandVote(models.Model):
     """밴드 투표 모델"""
@@ -735,6 +780,33 @@ class BandBookmark(models.Model):
         return f"{self.user.activity_name} - {self.band.name}"
 
 
+# 좋아요/댓글 행이 지워지면 카운터 -1 (생성은 각 모델 save() 에서 +1).
+# 삭제 쿼리와 같은 트랜잭션에서 실행되고, 상위 객체와 함께 지워지는 경우는 건너뛴다.
+from django.db.models.signals import post_delete  # noqa: E402
+from django.dispatch import receiver  # noqa: E402
+
+
+@receiver(post_delete, sender=BandComment)
+def decrease_band_post_comment_count(sender, instance, origin=None, **kwargs):
+    """댓글 삭제 시 게시글 댓글 수 -1 (부모 댓글 삭제로 딸려 지워진 대댓글도 각각 반영)"""
+    if not deleted_with(origin, Band, BandPost):
+        adjust_counters(BandPost, instance.post_id, comment_count=-1)
+
+
+@receiver(post_delete, sender=BandPostLike)
+def decrease_band_post_like_count(sender, instance, origin=None, **kwargs):
+    """게시글 좋아요 취소 시 게시글 좋아요 수 -1"""
+    if not deleted_with(origin, Band, BandPost):
+        adjust_counters(BandPost, instance.post_id, like_count=-1)
+
+
+@receiver(post_delete, sender=BandCommentLike)
+def decrease_band_comment_like_count(sender, instance, origin=None, **kwargs):
+    """댓글 좋아요 취소 시 댓글 좋아요 수 -1"""
+    if not deleted_with(origin, Band, BandPost, BandComment):
+        adjust_counters(BandComment, instance.comment_id, like_count=-1)
+
+
 from band.match_models import (  # noqa: E402,F401
     MatchSession, SessionParticipant, Court, Match, MatchPlayer,
 )
@@ -16,7 +16,9 @@ from .forms import (
     BandForm, BandPostForm, BandCommentForm, BandVoteForm,
     BandScheduleForm, BandScheduleApplicationForm
 )
+from badmintok.comment_tree import build_comment_tree
 from badmintok.models import BadmintokBanner, Notice
+from badmintok.view_counts import viewer_key
 from accounts.permissions import is_site_admin
 
 
@@ -1475,38 +1477,11 @@ def post_create(request, band_id):
 
 def post_detail(request, band_id, post_id):
     """게시글 상세"""
-    from datetime import datetime, timedelta
-    
     band = get_object_or_404(Band, id=band_id)
     post = get_object_or_404(BandPost, id=post_id, band=band)
-    
-    # 조회수 증가 (1시간 내 중복 방지)
-    if request.user.is_authenticated:
-        # 세션에 조회한 게시글 정보 가져오기
-        viewed_posts = request.session.get('viewed_posts', {})
-        current_time = datetime.now().timestamp()
-        
-        # 해당 게시글을 조회한 시간 확인
-        last_viewed = viewed_posts.get(str(post_id))
-        
-        # last_viewed를 float로 변환 (세션에서 문자열로 저장되었을 수 있음)
-        try:
-            if last_viewed is not None:
-                last_viewed = float(last_viewed)
-        except (ValueError, TypeError):
-            last_viewed = None
-        
-        # 조회한 적이 없거나 1시간(3600초) 이상 경과한 경우에만 카운팅
-        if not last_viewed or (current_time - last_viewed) >= 3600:
-            post.view_count += 1
-            post.save(update_fields=["view_count"])
-            # 세션에 조회 시간 업데이트 (float로 명시적으로 저장)
-            viewed_posts[str(post_id)] = float(current_time)
-            request.session['viewed_posts'] = viewed_posts
-    else:
-        # 비로그인 사용자는 접근 불가하지만, 혹시 모를 경우를 대비
-        post.view_count += 1
-        post.save(update_fields=["view_count"])
+
+    # 조회수 증가 (같은 사용자 1시간 내 재조회 제외)
+    post.increase_view_count(viewer_key(request), dedupe_seconds=3600)
     
     # 멤버 여부
     is_member = False
@@ -1521,9 +1496,7 @@ def post_detail(request, band_id, post_id):
         is_liked = BandPostLike.objects.filter(post=post, user=request.user).exists()
     
     # 댓글 목록
-    comments = post.comments.select_related("author").prefetch_related("replies__author").filter(
-        parent=None
-    ).order_by("created_at")
+    comments = build_comment_tree(post.comments.select_related("author"))
     
     # 투표 정보
     vote = None
@@ -1674,17 +1647,16 @@ def post_like(request, band_id, post_id):
     """게시글 좋아요 토글"""
     post = get_object_or_404(BandPost, id=post_id, band_id=band_id)
     
+    # 좋아요 수는 BandPostLike 생성/삭제가 같은 트랜잭션에서 F() 로 증감
     like, created = BandPostLike.objects.get_or_create(post=post, user=request.user)
     
     if created:
-        post.like_count += 1
         is_liked = True
     else:
         like.delete()
-        post.like_count = max(0, post.like_count - 1)
         is_liked = False
     
-    post.save(update_fields=["like_count"])
+    post.refresh_from_db(fields=["like_count"])
     
     return JsonResponse({"is_liked": is_liked, "like_count": post.like_count})
 
@@ -1726,12 +1698,9 @@ def comment_create(request, band_id, post_id):
                     comment.parent = parent_comment
                 except BandComment.DoesNotExist:
                     pass
+            # 게시글 댓글 수는 BandComment.save() 가 +1
             comment.save()
             
-            # 댓글 수 증가
-            post.comment_count += 1
-            post.save(update_fields=["comment_count"])
-            
             messages.success(request, "댓글이 작성되었습니다.")
     
     # 질문 타입이면 FAQ 탭으로 리다이렉트
@@ -1789,10 +1758,7 @@ def comment_delete(request, band_id, post_id, comment_id):
         return redirect("band:post_detail", band_id=band_id, post_id=post_id)
     
     if request.method == "POST":
-        # 댓글 수 감소
-        post.comment_count = max(0, post.comment_count - 1)
-        post.save(update_fields=["comment_count"])
-        
+        # 게시글 댓글 수는 삭제 시그널이 대댓글까지 -1
         comment.delete()
         messages.success(request, "댓글이 삭제되었습니다.")
     
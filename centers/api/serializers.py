@@ -6,6 +6,7 @@
 from rest_framework import serializers
 
 from accounts.permissions import is_site_admin
+from badmintok.api.images import ImageSrcsetField
 from band.api.serializers import UserSerializer
 from band.models import Band, BandBookmark
 
@@ -26,6 +27,8 @@ class CenterSerializer(serializers.ModelSerializer):
     region_display = serializers.CharField(source="get_region_display", read_only=True)
     cover_image_url = serializers.SerializerMethodField()
     profile_image_url = serializers.SerializerMethodField()
+    cover_image_srcset = ImageSrcsetField(source="cover_image")
+    profile_image_srcset = ImageSrcsetField(source="profile_image")
     bookmark_count = serializers.SerializerMethodField()
     is_bookmarked = serializers.SerializerMethodField()
     created_by = UserSerializer(read_only=True)
@@ -49,7 +52,8 @@ class CenterSerializer(serializers.ModelSerializer):
             "id", "name", "region", "region_display",
             "address", "address_detail", "phone", "description",
             "operating_hours", "pricing", "court_count", "amenities",
-            "cover_image_url", "profile_image_url", "latitude", "longitude",
+            "cover_image_url", "profile_image_url", "cover_image_srcset", "profile_image_srcset",
+            "latitude", "longitude",
             "bookmark_count", "is_bookmarked",
             "created_by", "can_manage", "is_site_admin",
             "created_at",
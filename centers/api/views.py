@@ -12,6 +12,7 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from badmintok.api.pagination import cursor_requested, cursor_response
 from band.models import Band, BandBookmark
 from .serializers import CenterSerializer, CenterWriteSerializer
 
@@ -67,6 +68,10 @@ def center_list(request):
     except (ValueError, TypeError):
         page_size = 20
 
+    # ?cursor= 키셋 모드: COUNT/OFFSET 없이 다음 cursor 만 반환
+    if cursor_requested(request):
+        return cursor_response(request, qs, page_size, CenterSerializer, is_fallback=is_fallback)
+
     paginator = Paginator(qs, page_size)
     page_obj = paginator.get_page(page_number)
     serializer = CenterSerializer(page_obj, many=True, context={"request": request})
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.utils import timezone
 from community.models import Post, Comment, Category, PostImage
+from badmintok.api.images import ImageSrcsetField
+from badmintok.api.likes import LikedByUserMixin, LikedListSerializer
 from accounts.models import User
 
 
@@ -41,7 +43,7 @@ class PostImageSerializer(serializers.ModelSerializer):
         return None
 
 
-class CommunityPostListSerializer(serializers.ModelSerializer):
+class CommunityPostListSerializer(LikedByUserMixin, serializers.ModelSerializer):
     """동호인톡 게시글 목록 시리얼라이저"""
     author = UserSerializer(read_only=True)
     category_name = serializers.CharField(source='get_category_display', read_only=True)
@@ -49,72 +51,32 @@ class CommunityPostListSerializer(serializers.ModelSerializer):
     excerpt = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
     thumbnail_url = serializers.SerializerMethodField()
+    thumbnail_srcset = ImageSrcsetField(source='thumbnail')
 
     class Meta:
         model = Post
+        list_serializer_class = LikedListSerializer
         fields = [
             'id', 'title', 'slug', 'author', 'category_name', 'source',
             'created_at', 'updated_at', 'view_count', 'like_count', 'comment_count',
-            'is_pinned', 'first_image', 'excerpt', 'is_liked', 'thumbnail_url'
+            'is_pinned', 'first_image', 'excerpt', 'is_liked', 'thumbnail_url', 'thumbnail_srcset'
         ]
         read_only_fields = fields
 
     def get_first_image(self, obj):
+        """저장된 대표 이미지 URL (첫 첨부 이미지, 없으면 본문 첫 이미지)"""
+        url = obj.first_image_url
+        if not url:
+            return None
         request = self.context.get('request')
-        first_image = obj.images.first()
-        if first_image and first_image.image:
-            if request:
-                return request.build_absolute_uri(first_image.image.url)
-            return first_image.image.url
-        # HTML 콘텐츠에서 첫 번째 이미지 URL 추출 (PostImage가 없는 경우)
-        if obj.content:
-            import re
-            match = re.search(r'<img\s+[^>]*src="([^"]*)"', obj.content)
-            if match:
-                img_url = match.group(1)
-                if request and img_url.startswith('/'):
-                    return request.build_absolute_uri(img_url)
-                return img_url
-        return None
+        if request and url.startswith('/'):
+            return request.build_absolute_uri(url)
+        return url
 
     def get_excerpt(self, obj):
-        """본문에서 발췌문 생성 (100자)"""
-        if obj.content:
-            import re, json
-            content = obj.content.strip()
-            # Editor.js JSON 형식인 경우 텍스트 추출
-            if content.startswith('{') and '"blocks"' in content:
-                try:
-                    data = json.loads(content)
-                    blocks = data.get('blocks', [])
-                    parts = []
-                    for block in blocks:
-                        btype = block.get('type', '')
-                        bdata = block.get('data', {})
-                        if btype in ('paragraph', 'header', 'h2', 'h3', 'h4', 'quote'):
-                            t = re.sub(r'<[^>]+>', '', bdata.get('text', '')).replace('&nbsp;', ' ').strip()
-                            if t:
-                                parts.append(t)
-                        elif btype == 'list':
-                            for item in bdata.get('items', []):
-                                t = re.sub(r'<[^>]+>', '', str(item)).strip()
-                                if t:
-                                    parts.append(t)
-                    text = ' '.join(parts)
-                except (json.JSONDecodeError, KeyError):
-                    text = re.sub(r'<[^>]+>', '', content)
-            else:
-                text = re.sub(r'<[^>]+>', '', content)
-            text = text.strip()
-            return text[:100] + '...' if len(text) > 100 else text
-        return ''
-
-    def get_is_liked(self, obj):
-        """현재 사용자가 좋아요를 눌렀는지 확인"""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.likes.filter(id=request.user.id).exists()
-        return False
+        """저장된 발췌문 (100자)"""
+        text = obj.excerpt
+        return text[:100] + '...' if obj.text_length > 100 else text
 
     def get_thumbnail_url(self, obj):
         request = self.context.get('request')
@@ -125,7 +87,7 @@ class CommunityPostListSerializer(serializers.ModelSerializer):
         return None
 
 
-class CommunityPostDetailSerializer(serializers.ModelSerializer):
+class CommunityPostDetailSerializer(LikedByUserMixin, serializers.ModelSerializer):
     """동호인톡 게시글 상세 시리얼라이저"""
     author = UserSerializer(read_only=True)
     category_name = serializers.CharField(source='get_category_display', read_only=True)
@@ -136,6 +98,7 @@ class CommunityPostDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Post
+        list_serializer_class = LikedListSerializer
         fields = [
             'id', 'title', 'slug', 'content', 'author', 'category', 'category_name',
             'categories_list', 'source', 'created_at', 'updated_at',
@@ -145,13 +108,6 @@ class CommunityPostDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
-    def get_is_liked(self, obj):
-        """현재 사용자가 좋아요를 눌렀는지 확인"""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.likes.filter(id=request.user.id).exists()
-        return False
-
     def get_thumbnail_url(self, obj):
         request = self.context.get('request')
         if obj.thumbnail and hasattr(obj.thumbnail, 'url'):
@@ -259,7 +215,7 @@ class CommunityPostUpdateSerializer(serializers.ModelSerializer):
         return instance
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(LikedByUserMixin, serializers.ModelSerializer):
     """댓글 시리얼라이저"""
     author = UserSerializer(read_only=True)
     is_liked = serializers.SerializerMethodField()
@@ -267,23 +223,20 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
+        list_serializer_class = LikedListSerializer
         fields = [
             'id', 'post', 'author', 'parent', 'content',
             'created_at', 'updated_at', 'like_count', 'is_liked', 'replies'
         ]
         read_only_fields = ['id', 'post', 'author', 'created_at', 'updated_at', 'like_count']
 
-    def get_is_liked(self, obj):
-        """현재 사용자가 좋아요를 눌렀는지 확인"""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.likes.filter(id=request.user.id).exists()
-        return False
+    def liked_children(self, obj):
+        return getattr(obj, 'replies_list', ())
 
     def get_replies(self, obj):
         """대댓글 목록"""
         if hasattr(obj, 'replies_list'):
-            # views.py에서 prefetch한 replies_list 사용
+            # build_comment_tree 가 묶어 둔 replies_list 사용
             replies = obj.replies_list
         else:
             replies = obj.replies.filter(is_deleted=False).order_by('created_at')
@@ -318,12 +271,8 @@ class CommentCreateSerializer(serializers.ModelSerializer):
             except Comment.DoesNotExist:
                 raise serializers.ValidationError({'parent_id': '존재하지 않는 댓글입니다.'})
 
-        comment = Comment.objects.create(**validated_data)
-
-        # 게시글 댓글 수 업데이트
-        post.update_comment_count()
-
-        return comment
+        # 게시글 댓글 수는 Comment.save() 가 같은 트랜잭션에서 +1
+        return Comment.objects.create(**validated_data)
 
 
 class CommentUpdateSerializer(serializers.ModelSerializer):
@@ -2,15 +2,20 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
-from django.db.models import Q, F, Case, When, ExpressionWrapper, FloatField, Prefetch
+from django.db.models import Q, Prefetch
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 from django.core.paginator import Paginator
 from django.views.decorators.csrf import csrf_exempt
-from datetime import timedelta
 import os
 import uuid
 
+from badmintok.api.pagination import cursor_requested, cursor_response
+from badmintok.comment_tree import build_comment_tree
+from badmintok.view_counts import viewer_key
+from community.categories import category_tree
+from community.hot import hot_ordered
+from community.search import search_posts
 from community.models import Post, Comment, Category, PostImage
 from .serializers import (
     CommunityPostListSerializer, CommunityPostDetailSerializer,
@@ -34,9 +39,8 @@ def post_list(request):
     ).filter(
         Q(published_at__lte=now) | Q(published_at__isnull=True)
     ).select_related("author", "category").prefetch_related(
-        Prefetch("images", queryset=PostImage.objects.order_by("order")),
-        "categories", "likes"
-    )
+        "categories"
+    ).defer("content")
     
     # 탭 필터링
     tab = request.GET.get('tab', '')
@@ -45,23 +49,7 @@ def post_list(request):
     if tab:
         # Hot 탭
         if tab == 'hot':
-            recent_30_days = now - timedelta(days=30)
-            recent_7_days = now - timedelta(days=7)
-            
-            posts = posts.annotate(
-                time_weight=Case(
-                    When(published_at__gte=recent_7_days, then=1.5),
-                    When(published_at__isnull=True, created_at__gte=recent_7_days, then=1.5),
-                    default=1.0,
-                    output_field=FloatField()
-                ),
-                hot_score=ExpressionWrapper(
-                    (F('view_count') * 1 + F('like_count') * 2 + F('comment_count') * 3) * F('time_weight'),
-                    output_field=FloatField()
-                )
-            ).filter(
-                Q(published_at__gte=recent_30_days) | Q(published_at__isnull=True, created_at__gte=recent_30_days)
-            ).order_by('-hot_score')
+            posts = hot_ordered(posts)
         # 리뷰 탭
         elif tab == 'reviews':
             reviews_category_slugs = ['community-racket', 'community-shoes', 'community-apparel', 
@@ -74,18 +62,10 @@ def post_list(request):
                 posts = posts.filter(Q(category__slug=category) | Q(categories__slug=category)).distinct()
         # 동적 탭 필터링
         else:
-            current_category = Category.objects.filter(
-                slug=tab,
-                source=Category.Source.COMMUNITY,
-                parent__isnull=True,
-                is_active=True
-            ).first()
+            # 탭 + 하위 카테고리 slug (카테고리 트리 캐시, 쿼리 없음)
+            category_slugs = category_tree().tab_slugs(Category.Source.COMMUNITY, tab)
             
-            if current_category:
-                category_slugs = [current_category.slug]
-                child_categories = Category.objects.filter(parent=current_category, is_active=True)
-                category_slugs.extend([cat.slug for cat in child_categories])
-                
+            if category_slugs:
                 posts = posts.filter(
                     Q(category__slug__in=category_slugs) | Q(categories__slug__in=category_slugs)
                 ).distinct()
@@ -95,27 +75,21 @@ def post_list(request):
     
     # 카테고리 필터링 (탭이 없을 때)
     elif category:
-        try:
-            category_obj = Category.objects.get(slug=category, source=Category.Source.COMMUNITY, is_active=True)
+        tree = category_tree()
+        category_obj = tree.get(slug=category)
+        if category_obj and category_obj.source == Category.Source.COMMUNITY:
             # 부모 카테고리인 경우 하위 카테고리 게시물도 포함
-            category_slugs = [category_obj.slug]
-            child_categories = Category.objects.filter(parent=category_obj, is_active=True)
-            category_slugs.extend([c.slug for c in child_categories])
+            category_slugs = [category_obj.slug] + [c.slug for c in tree.children(category_obj)]
             posts = posts.filter(
                 Q(category__slug__in=category_slugs) | Q(categories__slug__in=category_slugs)
             ).distinct()
-        except Category.DoesNotExist:
-            pass
     
-    # 검색
+    # 검색 (검색 색인 순위순)
     search = request.GET.get('search', '')
     if search:
-        posts = posts.filter(
-            Q(title__icontains=search) | Q(content__icontains=search)
-        )
-    
+        posts = search_posts(posts, search)
     # 정렬 (Hot 탭이 아닐 때만)
-    if tab != 'hot':
+    elif tab != 'hot':
         posts = posts.order_by("-is_pinned", "-created_at")
     
     # 페이지네이션
@@ -130,6 +104,10 @@ def post_list(request):
     except (ValueError, TypeError):
         page_size = 10
     
+    # ?cursor= 키셋 모드: COUNT/OFFSET 없이 다음 cursor 만 반환
+    if cursor_requested(request):
+        return cursor_response(request, posts, page_size, CommunityPostListSerializer)
+
     paginator = Paginator(posts, page_size)
     page_obj = paginator.get_page(page_number)
     
@@ -168,12 +146,12 @@ def post_detail(request, slug):
         .select_related("author", "category")
         .prefetch_related(
             Prefetch("images", queryset=PostImage.objects.order_by("order")),
-            "categories", "likes"
+            "categories"
         )
     )
     
-    # 조회수 증가
-    post.increase_view_count()
+    # 조회수 증가 (같은 사용자 3시간 내 재조회 제외)
+    post.increase_view_count(viewer_key(request))
     
     serializer = CommunityPostDetailSerializer(post, context={'request': request})
     return Response(serializer.data, status=status.HTTP_200_OK)
@@ -286,12 +264,10 @@ def post_like(request, slug):
     if post.likes.filter(id=request.user.id).exists():
         # 좋아요 취소
         post.likes.remove(request.user)
-        post.update_like_count()
         return Response({'message': '좋아요가 취소되었습니다.', 'is_liked': False}, status=status.HTTP_200_OK)
     else:
         # 좋아요 추가
         post.likes.add(request.user)
-        post.update_like_count()
         return Response({'message': '좋아요가 추가되었습니다.', 'is_liked': True}, status=status.HTTP_200_OK)
 
 
@@ -307,23 +283,14 @@ def comment_list(request, slug):
         )
     )
     
-    # 삭제되지 않은 댓글만, 부모 댓글만 (대댓글 제외)
-    comments = Comment.objects.filter(
-        post=post,
-        is_deleted=False,
-        parent__isnull=True
-    ).select_related('author').prefetch_related(
-        'likes',
-        Prefetch('replies', queryset=Comment.objects.filter(is_deleted=False).select_related('author').prefetch_related('likes'))
-    ).order_by('created_at')
-    
-    # 각 댓글의 replies_list 속성 설정
-    for comment in comments:
-        comment.replies_list = comment.replies.filter(is_deleted=False).order_by('created_at')
+    # 삭제되지 않은 댓글 전체를 한 번에 읽어 부모 댓글 아래 replies_list 로 묶음
+    comments = build_comment_tree(
+        Comment.objects.filter(post=post, is_deleted=False).select_related('author'), request.user
+    )
     
     serializer = CommentSerializer(comments, many=True, context={'request': request})
     return Response({
-        'count': comments.count(),
+        'count': len(comments),
         'results': serializer.data
     }, status=status.HTTP_200_OK)
 
@@ -396,11 +363,8 @@ def comment_delete(request, comment_id):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    comment.is_deleted = True
-    comment.save(update_fields=['is_deleted'])
-    
-    # 게시글 댓글 수 업데이트
-    comment.post.update_comment_count()
+    # 게시글 댓글 수도 함께 -1
+    comment.soft_delete()
     
     return Response({'message': '댓글이 삭제되었습니다.'}, status=status.HTTP_200_OK)
 
@@ -418,12 +382,10 @@ def comment_like(request, comment_id):
     if comment.likes.filter(id=request.user.id).exists():
         # 좋아요 취소
         comment.likes.remove(request.user)
-        comment.update_like_count()
         return Response({'message': '좋아요가 취소되었습니다.', 'is_liked': False}, status=status.HTTP_200_OK)
     else:
         # 좋아요 추가
         comment.likes.add(request.user)
-        comment.update_like_count()
         return Response({'message': '좋아요가 추가되었습니다.', 'is_liked': True}, status=status.HTTP_200_OK)
 
 
@@ -0,0 +1,157 @@
+"""카테고리 트리 (탭 · 하위 카테고리 · slug) 프로세스 메모리 캐시.
+
+배드민톡/동호인톡 탭, 하위 카테고리 필터, 글쓰기 폼의 허용 카테고리는 모두 같은 작은
+Category 테이블에서 나오는데, 요청마다 탭 1회 + 탭별 하위 카테고리 N회를 다시 조회했다.
+카테고리는 관리자만 가끔 바꾸므로 활성 카테고리 전체를 한 번 읽어 프로세스 메모리에 트리로
+들고 있고, 바뀌었을 때만 다시 읽는다.
+
+- 트리는 활성(is_active) 카테고리만 담는다. 노드는 불변 CategoryNode (모델 인스턴스를
+  요청 간에 공유하지 않기 위함) — 템플릿은 name / slug 만 쓰므로 그대로 넘겨도 된다.
+- Category(프록시 포함) 저장/삭제 시그널이 공유 캐시의 버전 키를 바꾸고, 각 프로세스는
+  VERSION_CHECK_SECONDS 마다 버전을 확인해 달라졌으면 다시 읽는다.
+  같은 프로세스에서 바뀐 경우는 바로 반영된다.
+- queryset.update() 처럼 시그널을 거치지 않는 변경 뒤에는 invalidate_category_tree() 를 호출한다.
+
+사용:
+    tree = category_tree()
+    tabs = tree.tabs(Category.Source.BADMINTOK)
+    slugs = tree.tab_slugs(Category.Source.COMMUNITY, "free")   # 탭 + 하위 slug, 없는 탭이면 None
+"""
+import threading
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+VERSION_KEY = "community:category_tree:version"
+# 다른 프로세스의 변경을 확인하는 간격 (요청마다 캐시 왕복하지 않도록)
+VERSION_CHECK_SECONDS = 5
+
+
+@dataclass(frozen=True)
+class CategoryNode:
+    """트리에 담기는 카테고리 하나 (활성 카테고리만)"""
+
+    id: int
+    name: str
+    slug: str
+    source: str
+    parent_id: int | None
+    display_order: int
+
+    @property
+    def pk(self):
+        return self.id
+
+    def __str__(self):
+        return self.name
+
+
+class CategoryTree:
+    """활성 카테고리 전체로 만든 조회용 트리 (쿼리 없음)"""
+
+    FIELDS = ("id", "name", "slug", "source", "parent_id", "display_order")
+
+    def __init__(self, rows):
+        nodes = sorted((CategoryNode(**row) for row in rows), key=lambda n: (n.display_order, n.name))
+        self._nodes = nodes
+        self._by_id = {node.id: node for node in nodes}
+        self._by_slug = {node.slug: node for node in nodes}
+        self._children = defaultdict(list)
+        self._roots = defaultdict(list)
+        for node in nodes:
+            if node.parent_id is None:
+                self._roots[node.source].append(node)
+            elif node.parent_id in self._by_id:
+                # 비활성 부모 아래 카테고리는 어느 탭에도 나오지 않음
+                self._children[node.parent_id].append(node)
+
+    def all(self):
+        """활성 카테고리 전체 (display_order, name 순)"""
+        return list(self._nodes)
+
+    def get(self, slug=None, pk=None):
+        """slug 또는 id 로 활성 카테고리 하나 (없으면 None)"""
+        if slug is not None:
+            return self._by_slug.get(slug)
+        try:
+            return self._by_id.get(int(pk))
+        except (TypeError, ValueError):
+            return None
+
+    def tabs(self, source):
+        """source 의 최상위 카테고리(탭) 목록"""
+        return list(self._roots.get(source, ()))
+
+    def tab(self, source, slug):
+        """source 의 탭 하나 (없거나 하위 카테고리 slug 면 None)"""
+        node = self._by_slug.get(slug)
+        if node is None or node.parent_id is not None or node.source != source:
+            return None
+        return node
+
+    def children(self, node):
+        """탭(노드)의 하위 카테고리 목록"""
+        return list(self._children.get(node.id, ()))
+
+    def tab_children(self, source):
+        """{탭 slug: 하위 카테고리 목록} — 탭/하위 필터 템플릿용"""
+        return {tab.slug: self.children(tab) for tab in self.tabs(source)}
+
+    def tab_slugs(self, source, slug):
+        """탭 slug 와 그 하위 slug 목록 (글 필터용). 해당 탭이 없으면 None"""
+        tab = self.tab(source, slug)
+        if tab is None:
+            return None
+        return [tab.slug] + [child.slug for child in self.children(tab)]
+
+    def source_slugs(self, source):
+        """source 의 모든 탭과 그 하위 카테고리 slug 집합 (글쓰기 폼 허용 목록)"""
+        slugs = set()
+        for tab in self.tabs(source):
+            slugs.add(tab.slug)
+            slugs.update(child.slug for child in self.children(tab))
+        return slugs
+
+
+_lock = threading.Lock()
+# 트리는 불변이라 스레드끼리 공유한다
+_cached = {"tree": None, "version": None, "checked_at": 0.0}
+
+
+def _current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _load():
+    from .models import Category
+
+    return CategoryTree(Category.objects.filter(is_active=True).values(*CategoryTree.FIELDS))
+
+
+def category_tree():
+    """현재 카테고리 트리. 버전이 바뀌었을 때만 DB 를 다시 읽는다."""
+    tree = _cached["tree"]
+    now = time.monotonic()
+    if tree is not None and now - _cached["checked_at"] < VERSION_CHECK_SECONDS:
+        return tree
+
+    version = _current_version()
+    if tree is None or version != _cached["version"]:
+        tree = _load()
+    with _lock:
+        _cached.update(tree=tree, version=version, checked_at=now)
+    return tree
+
+
+def invalidate_category_tree():
+    """카테고리가 바뀜 — 이 프로세스는 바로, 다른 프로세스는 다음 버전 확인 때 다시 읽음"""
+    cache.set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+    with _lock:
+        _cached["tree"] = None
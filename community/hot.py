@@ -0,0 +1,85 @@
+"""Hot(인기) 글 점수 저장/갱신 로직 (동호인톡·배드민톡 공용).
+
+점수 = (조회수 + 좋아요 × 2 + 댓글 × 3) × 시간 가중치
+- 기준 시각(published_at, 없으면 created_at)이 최근 BOOST_DAYS 일 이내면 × BOOST_WEIGHT
+- HOT_WINDOW_DAYS 일이 지난 글은 점수 NULL (hot 목록에서 빠짐)
+
+점수는 Post.hot_score 에 저장되고 (source, -hot_score) 인덱스로 정렬한다.
+- 조회/좋아요/댓글 수가 바뀔 때 Post 메서드가 해당 글 점수만 다시 계산
+- 시간이 지나며 바뀌는 가중치/기간 만료는 refresh_hot_scores 명령이 주기적으로 반영
+  (운영: hot-score-worker 컨테이너). 명령이 밀려도 기간이 지난 글이 남지 않도록
+  hot_ordered 는 기간 조건을 함께 건다.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Case, ExpressionWrapper, F, FloatField, Q, Value, When
+from django.utils import timezone
+
+
+HOT_WINDOW_DAYS = 30
+BOOST_DAYS = 7
+BOOST_WEIGHT = 1.5
+# 사이드바/메인 "인기글 TOP N" id 목록 캐시 시간
+TOP_CACHE_TTL = 60
+
+
+def compute_hot_score(view_count, like_count, comment_count, reference_time, now=None):
+    """글 하나의 hot 점수. 기간이 지났으면 None"""
+    if reference_time is None:
+        return None
+    now = now or timezone.now()
+    if reference_time < now - timedelta(days=HOT_WINDOW_DAYS):
+        return None
+    weight = BOOST_WEIGHT if reference_time >= now - timedelta(days=BOOST_DAYS) else 1.0
+    return float((view_count + like_count * 2 + comment_count * 3) * weight)
+
+
+def _since_q(since):
+    """기준 시각(published_at, 없으면 created_at) >= since"""
+    return Q(published_at__gte=since) | Q(published_at__isnull=True, created_at__gte=since)
+
+
+def refresh_hot_scores(queryset=None, now=None):
+    """기간 내 글 점수를 UPDATE 한 번으로 재계산하고, 기간이 지난 글은 NULL 로 내림.
+
+    Returns:
+        (재계산한 글 수, 기간 만료로 제외한 글 수)
+    """
+    from .models import Post
+
+    queryset = queryset if queryset is not None else Post.objects.all()
+    now = now or timezone.now()
+    window_q = _since_q(now - timedelta(days=HOT_WINDOW_DAYS))
+    base = F("view_count") + F("like_count") * 2 + F("comment_count") * 3
+
+    updated = queryset.filter(window_q).update(
+        hot_score=Case(
+            When(_since_q(now - timedelta(days=BOOST_DAYS)),
+                 then=ExpressionWrapper(base * Value(BOOST_WEIGHT), output_field=FloatField())),
+            default=ExpressionWrapper(base * Value(1.0), output_field=FloatField()),
+            output_field=FloatField(),
+        )
+    )
+    expired = queryset.filter(hot_score__isnull=False).exclude(window_q).update(hot_score=None)
+    return updated, expired
+
+
+def hot_ordered(queryset, now=None):
+    """hot 탭 정렬 (저장된 점수 인덱스 사용). 점수가 아직 남아 있어도 HOT_WINDOW_DAYS 가 지난 글은 제외"""
+    now = now or timezone.now()
+    return queryset.filter(
+        _since_q(now - timedelta(days=HOT_WINDOW_DAYS)), hot_score__isnull=False
+    ).order_by("-hot_score", "-pk")
+
+
+def top_hot_posts(queryset, limit=10, *, cache_key):
+    """hot 상위 limit 개 (id 목록만 TOP_CACHE_TTL 초 캐시, 본문은 매번 queryset 으로 조회)"""
+    key = f"hot:top:{cache_key}:{limit}"
+    ids = cache.get(key)
+    if ids is None:
+        ids = list(hot_ordered(queryset).values_list("pk", flat=True)[:limit])
+        cache.set(key, ids, TOP_CACHE_TTL)
+    # 캐시 이후 삭제/비공개된 글은 queryset 필터로 빠짐
+    posts = {post.pk: post for post in queryset.filter(pk__in=ids)}
+    return [posts[pk] for pk in ids if pk in posts]
@@ -0,0 +1,70 @@
+"""기존 게시글의 목록용 요약 필드(excerpt, first_image_url, text_length) 채우기.
+
+새로 저장되는 글은 Post.save() 가 계산하고 도입 전 글은 마이그레이션(0028_fill_post_summaries)이 채우므로,
+본문 추출 규칙(community.text)이나 이미지 URL 규칙을 바꾼 뒤에 다시 계산할 때 실행한다.
+글을 PK 구간 단위로 읽어 bulk_update 하므로 저장 시그널(검색 색인 등)은 돌지 않는다.
+
+사용 예:
+    python manage.py backfill_post_summaries
+    python manage.py backfill_post_summaries --batch 200 --sleep 0.1
+    python manage.py backfill_post_summaries --checkpoint /tmp/post_summaries.json
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import Prefetch
+
+from badmintok.chunking import Checkpoint, IdRangeWalker
+from community.models import Post, PostImage
+
+
+SUMMARY_FIELDS = ["excerpt", "first_image_url", "text_length"]
+
+
+class Command(BaseCommand):
+    help = "게시글 excerpt / first_image_url / text_length 일괄 계산"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=500,
+            help="한 번에 처리할 PK 구간 폭 (기본 500)",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="구간 사이 대기 초 (운영 부하 완화, 기본 0)",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            default="",
+            help="마지막 처리 PK를 기록할 JSON 파일 경로 (중단 후 재개용)",
+        )
+
+    def handle(self, *args, **options):
+        checkpoint = Checkpoint(options["checkpoint"]) if options["checkpoint"] else None
+        walker = IdRangeWalker(
+            Post.objects.all(),
+            chunk_size=options["batch"],
+            checkpoint=checkpoint,
+            sleep=options["sleep"],
+            stdout=self.stdout,
+        )
+
+        updated = 0
+        for chunk in walker:
+            posts = list(
+                chunk.queryset.only("id", "content", *SUMMARY_FIELDS).prefetch_related(
+                    Prefetch("images", queryset=PostImage.objects.order_by("order", "created_at"))
+                )
+            )
+            for post in posts:
+                post.refresh_content_summary(images=post.images.all())
+            Post.objects.bulk_update(posts, SUMMARY_FIELDS, batch_size=200)
+            updated += len(posts)
+            walker.add_rows(len(posts))
+
+        if checkpoint:
+            checkpoint.clear()
+        self.stdout.write(self.style.SUCCESS(f"완료: 게시글 {updated:,}건 갱신"))
@@ -0,0 +1,21 @@
+"""Post.hot_score 시간 감쇠 반영.
+
+조회/좋아요/댓글 변화는 즉시 점수에 반영되지만, 시간이 지나며 바뀌는 부분
+(7일 가중치 해제, 30일 기간 만료)은 글이 다시 건드려지지 않으면 반영되지 않는다.
+이 명령이 기간 내 글 점수를 UPDATE 한 번으로 재계산하고 기간이 지난 글은 hot 목록에서 뺀다.
+
+운영(docker-compose.prod.yml)에서는 hot-score-worker 컨테이너가 1시간마다 실행한다.
+컨테이너 없이 돌릴 때는 cron으로 매시 실행:
+    0 * * * * python manage.py refresh_hot_scores
+"""
+from django.core.management.base import BaseCommand
+
+from community.hot import refresh_hot_scores
+
+
+class Command(BaseCommand):
+    help = "게시글 hot 점수 재계산 (시간 가중치/기간 만료 반영)"
+
+    def handle(self, *args, **options):
+        updated, expired = refresh_hot_scores()
+        self.stdout.write(self.style.SUCCESS(f"재계산 {updated:,}건 · 기간 만료 {expired:,}건"))
@@ -0,0 +1,73 @@
+"""게시글 검색 색인(PostSearchToken) 전체 재생성.
+
+평소에는 Post 저장 시그널이 글 단위로 색인을 갱신하므로 cron 이 필요 없다.
+도입 전 글은 마이그레이션(0027_fill_post_search_tokens)이 색인한다.
+다음 경우에 한 번 실행:
+    - 토큰화 규칙(community.search) 변경 후
+    - update()/raw SQL 로 제목·본문을 일괄 수정해 시그널이 돌지 않은 경우
+
+글을 PK 구간 단위로 나눠 (제목, 본문)만 읽어 색인하므로 메모리 사용이 일정하다.
+중단돼도 --checkpoint 파일로 이어서 실행된다.
+
+사용 예:
+    python manage.py reindex_post_search
+    python manage.py reindex_post_search --batch 200 --sleep 0.1
+    python manage.py reindex_post_search --checkpoint /tmp/post_search.json
+"""
+from django.core.management.base import BaseCommand
+
+from badmintok.chunking import Checkpoint, IdRangeWalker
+from community.models import Post
+from community.search import index_posts
+
+
+class Command(BaseCommand):
+    help = "게시글 검색 색인을 PK 구간 단위로 다시 만든다"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=500,
+            help="한 번에 색인할 PK 구간 폭 (기본 500)",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="구간 사이 대기 초 (운영 부하 완화, 기본 0)",
+        )
+        parser.add_argument(
+            "--start-id",
+            type=int,
+            default=None,
+            help="이 PK 이후부터 처리 (체크포인트가 있으면 체크포인트 우선)",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            default="",
+            help="마지막 처리 PK를 기록할 JSON 파일 경로 (중단 후 재개용)",
+        )
+
+    def handle(self, *args, **options):
+        checkpoint = Checkpoint(options["checkpoint"]) if options["checkpoint"] else None
+        walker = IdRangeWalker(
+            Post.objects.all(),
+            chunk_size=options["batch"],
+            start_after=options["start_id"],
+            checkpoint=checkpoint,
+            sleep=options["sleep"],
+            stdout=self.stdout,
+        )
+
+        posts = tokens = 0
+        for chunk in walker:
+            batch = list(chunk.queryset.only("id", "title", "content"))
+            tokens += index_posts(batch)
+            posts += len(batch)
+            walker.add_rows(len(batch))
+
+        if checkpoint:
+            checkpoint.clear()
+        self.stdout.write(self.style.SUCCESS(f"완료: 게시글 {posts:,}건 · 토큰 {tokens:,}개 색인"))
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:32
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, ExpressionWrapper, F, FloatField, Q, Value, When
+from django.utils import timezone
+
+
+def fill_hot_scores(apps, schema_editor):
+    # 최근 30일 글의 초기 점수 채우기 (이후에는 refresh_hot_scores 명령이 갱신)
+    # community.hot 이 나중에 바뀌어도 이 마이그레이션 결과가 달라지지 않도록 당시 계산식을 그대로 옮겨 둠
+    Post = apps.get_model("community", "Post")
+    now = timezone.now()
+
+    def since_q(since):
+        return Q(published_at__gte=since) | Q(published_at__isnull=True, created_at__gte=since)
+
+    base = F("view_count") + F("like_count") * 2 + F("comment_count") * 3
+    Post.objects.filter(since_q(now - timedelta(days=30))).update(
+        hot_score=Case(
+            When(since_q(now - timedelta(days=7)),
+                 then=ExpressionWrapper(base * Value(1.5), output_field=FloatField())),
+            default=ExpressionWrapper(base * Value(1.0), output_field=FloatField()),
+            output_field=FloatField(),
+        )
+    )
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0022_tag_post_tags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='hot_score',
+            field=models.FloatField(blank=True, editable=False, help_text='hot 탭 정렬용 저장 점수 (최근 30일 밖이면 비어 있음, community.hot 참고)', null=True, verbose_name='인기 점수'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['source', '-hot_score'], name='community_p_source_e5ad1f_idx'),
+        ),
+        migrations.RunPython(fill_hot_scores, noop),
+    ]
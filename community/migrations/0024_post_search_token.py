@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0023_post_hot_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=2, verbose_name='토큰')),
+                ('weight', models.PositiveIntegerField(default=1, verbose_name='가중치')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='community.post', verbose_name='게시글')),
+            ],
+            options={
+                'verbose_name': '검색 토큰',
+                'verbose_name_plural': '검색 토큰',
+                'indexes': [models.Index(fields=['token', 'post'], name='community_p_token_fd85fa_idx')],
+                'constraints': [models.UniqueConstraint(fields=('post', 'token'), name='uniq_post_search_token')],
+            },
+        ),
+    ]
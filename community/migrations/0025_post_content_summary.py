@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0024_post_search_token'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=200, verbose_name='발췌문'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='first_image_url',
+            field=models.CharField(blank=True, editable=False, max_length=500, verbose_name='대표 이미지 URL'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_length',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='본문 글자 수'),
+        ),
+    ]
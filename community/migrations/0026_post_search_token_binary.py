@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:00
+
+import badmintok.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0025_post_content_summary'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='postsearchtoken',
+            name='token',
+            field=badmintok.fields.BinaryCharField(max_length=2, verbose_name='토큰'),
+        ),
+    ]
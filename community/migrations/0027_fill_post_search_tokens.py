@@ -0,0 +1,123 @@
+"""기존 게시글의 검색 색인(PostSearchToken) 채우기.
+
+색인은 글 저장 시그널로만 갱신되므로 도입 전에 쓴 글은 reindex_post_search 를 돌리기 전까지
+검색되지 않았다. 여기서 한 번 채운다.
+community.search / community.text 가 나중에 바뀌어도 결과가 달라지지 않도록 당시 토큰화 규칙을 옮겨 둠
+(규칙을 바꾼 뒤에는 reindex_post_search 명령으로 다시 색인).
+토큰 컬럼을 바이트 비교로 바꾼 뒤(0026) 실행해야 "fé"/"fe" 같은 토큰이 unique 제약에 걸리지 않는다.
+"""
+import html
+import json
+import re
+import unicodedata
+from collections import Counter
+
+from django.db import migrations
+
+TITLE_WEIGHT = 5
+BODY_WEIGHT_CAP = 20
+CHUNK_SIZE = 500
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+_TEXT_BLOCKS = ("paragraph", "header", "h2", "h3", "h4", "quote")
+
+
+def _strip_tags(value):
+    return html.unescape(_TAG_RE.sub(" ", str(value))).replace("\xa0", " ")
+
+
+def _list_items(items):
+    for item in items:
+        if isinstance(item, dict):
+            yield item.get("content", "")
+            yield from _list_items(item.get("items", []))
+        else:
+            yield item
+
+
+def _content_to_text(content):
+    if not content:
+        return ""
+    content = content.strip()
+    parts = None
+    if content.startswith("{") and '"blocks"' in content:
+        try:
+            blocks = json.loads(content).get("blocks", [])
+        except (ValueError, AttributeError):
+            blocks = None
+        if blocks is not None:
+            parts = []
+            for block in blocks:
+                btype = block.get("type", "")
+                bdata = block.get("data") or {}
+                if btype in _TEXT_BLOCKS:
+                    parts.append(_strip_tags(bdata.get("text", "")))
+                    if btype == "quote":
+                        parts.append(_strip_tags(bdata.get("caption", "")))
+                elif btype == "list":
+                    parts.extend(_strip_tags(item) for item in _list_items(bdata.get("items", [])))
+                elif btype == "table":
+                    for row in bdata.get("content", []):
+                        parts.extend(_strip_tags(cell) for cell in row)
+                elif btype == "image":
+                    parts.append(_strip_tags(bdata.get("caption", "")))
+    if parts is None:
+        parts = [_strip_tags(content)]
+    return _SPACE_RE.sub(" ", " ".join(parts)).strip()
+
+
+def _words(text):
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    words, current = [], []
+    for ch in text:
+        if ch.isalnum():
+            current.append(ch)
+        elif current:
+            words.append("".join(current))
+            current = []
+    if current:
+        words.append("".join(current))
+    return words
+
+
+def _tokenize(text):
+    tokens = Counter()
+    for word in _words(text):
+        for i in range(len(word) - 1):
+            tokens[word[i:i + 2]] += 1
+    return tokens
+
+
+def fill_search_tokens(apps, schema_editor):
+    Post = apps.get_model("community", "Post")
+    PostSearchToken = apps.get_model("community", "PostSearchToken")
+
+    last_pk = 0
+    while True:
+        posts = list(
+            Post.objects.filter(pk__gt=last_pk).order_by("pk").values_list("pk", "title", "content")[:CHUNK_SIZE]
+        )
+        if not posts:
+            return
+        rows = []
+        for pk, title, content in posts:
+            weights = {token: n * TITLE_WEIGHT for token, n in _tokenize(title).items()}
+            for token, n in _tokenize(_content_to_text(content)).items():
+                weights[token] = weights.get(token, 0) + min(n, BODY_WEIGHT_CAP)
+            rows.extend(PostSearchToken(post_id=pk, token=token, weight=weight) for token, weight in weights.items())
+        pks = [pk for pk, _title, _content in posts]
+        PostSearchToken.objects.filter(post_id__in=pks).delete()
+        PostSearchToken.objects.bulk_create(rows, batch_size=1000)
+        last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0026_post_search_token_binary'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_search_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,124 @@
+"""기존 게시글의 목록용 요약 필드(excerpt, first_image_url, text_length) 채우기.
+
+0025 에서 컬럼만 추가했으므로 그 전에 쓴 글은 backfill_post_summaries 를 돌리기 전까지
+목록에 발췌문/대표 이미지가 비어 보였다. 여기서 한 번 채운다.
+community.text 가 나중에 바뀌어도 결과가 달라지지 않도록 당시 추출 규칙을 옮겨 둠
+(규칙을 바꾼 뒤에는 backfill_post_summaries 명령으로 다시 계산).
+"""
+import html
+import json
+import re
+
+from django.db import migrations
+
+CHUNK_SIZE = 500
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+_IMG_SRC_RE = re.compile(r'<img[^>]+src=["\']([^"\']+)["\']', re.IGNORECASE)
+_TEXT_BLOCKS = ("paragraph", "header", "h2", "h3", "h4", "quote")
+
+
+def _strip_tags(value):
+    return html.unescape(_TAG_RE.sub(" ", str(value))).replace("\xa0", " ")
+
+
+def _list_items(items):
+    for item in items:
+        if isinstance(item, dict):
+            yield item.get("content", "")
+            yield from _list_items(item.get("items", []))
+        else:
+            yield item
+
+
+def _blocks(content):
+    if content.startswith("{") and '"blocks"' in content:
+        try:
+            return json.loads(content).get("blocks", [])
+        except (ValueError, AttributeError):
+            return None
+    return None
+
+
+def _content_to_text(content):
+    if not content:
+        return ""
+    content = content.strip()
+    blocks = _blocks(content)
+    parts = None
+    if blocks is not None:
+        parts = []
+        for block in blocks:
+            btype = block.get("type", "")
+            bdata = block.get("data") or {}
+            if btype in _TEXT_BLOCKS:
+                parts.append(_strip_tags(bdata.get("text", "")))
+                if btype == "quote":
+                    parts.append(_strip_tags(bdata.get("caption", "")))
+            elif btype == "list":
+                parts.extend(_strip_tags(item) for item in _list_items(bdata.get("items", [])))
+            elif btype == "table":
+                for row in bdata.get("content", []):
+                    parts.extend(_strip_tags(cell) for cell in row)
+            elif btype == "image":
+                parts.append(_strip_tags(bdata.get("caption", "")))
+    if parts is None:
+        parts = [_strip_tags(content)]
+    return _SPACE_RE.sub(" ", " ".join(parts)).strip()
+
+
+def _first_content_image(content):
+    if not content:
+        return ""
+    content = content.strip()
+    for block in _blocks(content) or []:
+        if block.get("type") == "image":
+            data = block.get("data") or {}
+            url = (data.get("file") or {}).get("url") or data.get("url") or ""
+            if url and not url.startswith("data:"):
+                return url
+    for url in _IMG_SRC_RE.findall(html.unescape(content)):
+        if not url.startswith("data:"):
+            return url
+    return ""
+
+
+def fill_post_summaries(apps, schema_editor):
+    Post = apps.get_model("community", "Post")
+    PostImage = apps.get_model("community", "PostImage")
+
+    last_pk = 0
+    while True:
+        posts = list(
+            Post.objects.filter(pk__gt=last_pk).order_by("pk").only("id", "content")[:CHUNK_SIZE]
+        )
+        if not posts:
+            return
+        pks = [post.pk for post in posts]
+        first_images = {}
+        for image in PostImage.objects.filter(post_id__in=pks).order_by("-order", "-created_at"):
+            # 역순으로 덮어써서 글마다 order, created_at 이 가장 앞선 이미지만 남김
+            first_images[image.post_id] = image
+        for post in posts:
+            text = _content_to_text(post.content)
+            post.excerpt = text[:200]
+            post.text_length = len(text)
+            image = first_images.get(post.pk)
+            if image and image.image:
+                post.first_image_url = image.image.url[:500]
+            else:
+                post.first_image_url = _first_content_image(post.content)[:500]
+        Post.objects.bulk_update(posts, ["excerpt", "first_image_url", "text_length"], batch_size=200)
+        last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0027_fill_post_search_tokens'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_post_summaries, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,13 @@
+from collections import Counter
+
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
-from badmintok.fields import WebPImageField
+from badmintok.counters import adjust_counters, counter_delta, deleted_with
+from badmintok.fields import BinaryCharField, WebPImageField
+from badmintok.slugs import allocate_slug
+from badmintok.view_counts import count_view, view_counts_flushed
 
 
 class Category(models.Model):
@@ -176,6 +181,14 @@ class Post(models.Model):
     view_count = models.PositiveIntegerField(_("조회수"), default=0)
     like_count = models.PositiveIntegerField(_("좋아요 수"), default=0)
     comment_count = models.PositiveIntegerField(_("댓글 수"), default=0)
+    # 목록 표시용 본문 요약 (저장 시 content 에서 계산 → 목록은 content 를 읽지 않음)
+    excerpt = models.CharField(_("발췌문"), max_length=200, blank=True, editable=False)
+    first_image_url = models.CharField(_("대표 이미지 URL"), max_length=500, blank=True, editable=False)
+    text_length = models.PositiveIntegerField(_("본문 글자 수"), default=0, editable=False)
+    hot_score = models.FloatField(
+        _("인기 점수"), null=True, blank=True, editable=False,
+        help_text=_("hot 탭 정렬용 저장 점수 (최근 30일 밖이면 비어 있음, community.hot 참고)")
+    )
     
     # 좋아요 (ManyToMany로 처리)
     likes = models.ManyToManyField(
@@ -207,6 +220,7 @@ class Post(models.Model):
             models.Index(fields=["category", "-created_at"]),
             models.Index(fields=["author"]),
             models.Index(fields=["-view_count"]),  # hot 글 조회를 위한 인덱스
+            models.Index(fields=["source", "-hot_score"]),  # hot 탭 정렬 (저장 점수)
             models.Index(fields=["source", "-created_at"]),  # source별 조회를 위한 인덱스
             models.Index(fields=["slug"]),  # slug 조회를 위한 인덱스
             models.Index(fields=["published_at"]),  # 발행 시간 조회를 위한 인덱스
@@ -219,20 +233,57 @@ class Post(models.Model):
         """카테고리 표시명 반환 (하위 호환성)"""
         return self.category.name if self.category else ""
     
-    def increase_view_count(self):
-        """조회수 증가"""
-        self.view_count += 1
-        self.save(update_fields=["view_count"])
+    def increase_view_count(self, viewer=None, **kwargs):
+        """조회수 증가 (공용 카운터에 쌓였다가 flush 때 반영, hot 점수도 그때 갱신)"""
+        return count_view(self, viewer, **kwargs)
     
-    def update_like_count(self):
-        """좋아요 수 업데이트"""
-        self.like_count = self.likes.count()
-        self.save(update_fields=["like_count"])
-    
-    def update_comment_count(self):
-        """댓글 수 업데이트"""
-        self.comment_count = self.comments.filter(is_deleted=False).count()
-        self.save(update_fields=["comment_count"])
+    @classmethod
+    def adjust_counts(cls, pk, **deltas):
+        """좋아요/댓글 수를 F() 로 증감하고 그 글의 hot 점수만 다시 계산 (전체 재집계 없음)"""
+        if adjust_counters(Post, pk, **deltas):
+            from .hot import refresh_hot_scores
+            refresh_hot_scores(Post.objects.filter(pk=pk))
+
+    @property
+    def list_excerpt(self):
+        """웹 목록용 짧은 발췌문 (80자 초과 시 15단어)"""
+        if self.text_length > 80:
+            return " ".join(self.excerpt.split()[:15]) + "..."
+        return self.excerpt
+
+    def refresh_first_image_url(self, images=None):
+        """첫 첨부 이미지(PostImage), 없으면 본문 첫 이미지 URL.
+
+        images: 순서대로 정렬된 PostImage 목록 (일괄 처리 시 prefetch 결과 전달, 없으면 조회)
+        """
+        from .text import first_content_image
+
+        if images is not None:
+            first = next(iter(images), None)
+        else:
+            first = self.images.order_by("order", "created_at").first() if self.pk else None
+        if first and first.image:
+            self.first_image_url = first.image.url[:500]
+        else:
+            self.first_image_url = first_content_image(self.content)[:500]
+
+    def refresh_content_summary(self, images=None):
+        """content 로부터 excerpt / text_length / first_image_url 재계산 (저장은 호출 측에서)"""
+        from .text import content_to_text
+
+        text = content_to_text(self.content)
+        self.excerpt = text[:200]
+        self.text_length = len(text)
+        self.refresh_first_image_url(images)
+
+    def refresh_hot_score(self, now=None):
+        """현재 카운터로 hot_score 재계산 (저장은 호출 측에서)"""
+        from .hot import compute_hot_score
+
+        self.hot_score = compute_hot_score(
+            self.view_count, self.like_count, self.comment_count,
+            self.published_at or self.created_at, now=now,
+        )
 
     def generate_slug(self):
         """제목으로부터 슬러그 자동 생성 (한글 지원)"""
@@ -256,30 +307,27 @@ class Post(models.Model):
         """저장 시 슬러그 자동 생성 및 발행 시간 처리"""
         # 슬러그가 비어있으면 자동 생성
         if not self.slug and self.title:
-            base_slug = self.generate_slug()
-            
-            # 슬러그 중복 방지: 같은 슬러그가 이미 존재하면 번호 추가
-            slug = base_slug
-            counter = 1
-            while Post.objects.filter(slug=slug).exclude(pk=self.pk if self.pk else None).exists():
-                # 슬러그 끝에 번호 추가 (예: "my-post-1", "my-post-2")
-                suffix = f"-{counter}"
-                # 슬러그 길이 제한 (45자) 고려
-                max_base_length = 45 - len(suffix)
-                if len(base_slug) > max_base_length:
-                    truncated_base = base_slug[:max_base_length].rsplit('-', 1)[0]
-                    slug = f"{truncated_base}{suffix}"
-                else:
-                    slug = f"{base_slug}{suffix}"
-                counter += 1
-            
-            self.slug = slug
+            # 슬러그 중복 방지: 이미 쓰인 번호를 한 번에 읽어 빈 번호 추가 (예: "my-post-1", "my-post-2")
+            others = Post.objects.exclude(pk=self.pk) if self.pk else Post.objects.all()
+            self.slug = allocate_slug(others, self.generate_slug(), max_length=45)
 
         # 발행 시간이 설정되지 않았으면 현재 시간으로 설정
         if not self.published_at:
             from django.utils import timezone
             self.published_at = timezone.now()
 
+        # 전체 저장 시 hot 점수도 함께 갱신 (발행 시간 변경 반영)
+        if kwargs.get("update_fields") is None:
+            self.refresh_hot_score()
+
+        # 본문이 저장될 때 목록용 요약 필드 갱신
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self.refresh_content_summary()
+        elif "content" in update_fields:
+            self.refresh_content_summary()
+            kwargs["update_fields"] = {*update_fields, "excerpt", "text_length", "first_image_url"}
+
         super().save(*args, **kwargs)
 
 
@@ -415,14 +463,26 @@ class Comment(models.Model):
     def __str__(self):
         return f"{self.post.title} - {self.author.activity_name}의 댓글"
     
+    def save(self, *args, **kwargs):
+        """새 댓글이면 같은 트랜잭션에서 게시글 댓글 수 +1"""
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding and not self.is_deleted:
+                Post.adjust_counts(self.post_id, comment_count=1)
+    
     def is_reply(self):
         """대댓글인지 확인"""
         return self.parent is not None
     
-    def update_like_count(self):
-        """좋아요 수 업데이트"""
-        self.like_count = self.likes.count()
-        self.save(update_fields=["like_count"])
+    def soft_delete(self):
+        """삭제 표시 (행은 남김). 이번에 처음 삭제된 경우에만 게시글 댓글 수 -1"""
+        with transaction.atomic():
+            changed = Comment.objects.filter(pk=self.pk, is_deleted=False).update(is_deleted=True)
+            if changed:
+                Post.adjust_counts(self.post_id, comment_count=-1)
+        self.is_deleted = True
+        return bool(changed)
 
 
 class PostShare(models.Model):
@@ -455,45 +515,158 @@ class PostShare(models.Model):
         return f"{self.post.title} - {self.user.activity_name}이 공유"
 
 
-# Signal을 사용하여 자동으로 통계 업데이트
-from django.db.models.signals import post_save, post_delete
-from django.dispatch import receiver
-
-
-@receiver(post_save, sender=Comment)
-def update_post_comment_count_on_save(sender, instance, **kwargs):
-    """댓글 저장/수정 시 게시글 댓글 수 업데이트"""
-    if not instance.is_deleted:
-        instance.post.update_comment_count()
-
-
-@receiver(post_delete, sender=Comment)
-def update_post_comment_count_on_delete(sender, instance, **kwargs):
-    """댓글 삭제 시 게시글 댓글 수 업데이트"""
-    instance.post.update_comment_count()
-
-
-@receiver(post_save, sender=Post.likes.through)
-def update_post_like_count_on_save(sender, instance, **kwargs):
-    """좋아요 추가 시 게시글 좋아요 수 업데이트"""
-    instance.post.update_like_count()
+class PostSearchToken(models.Model):
+    """게시글 검색용 2-gram 역색인 (community.search 참고)
 
+    제목·본문 텍스트를 2글자 단위로 잘라 글마다 토큰 하나당 한 행을 둔다.
+    weight = 제목 출현 수 × 제목 가중치 + 본문 출현 수 (순위 계산용)
+    """
 
-@receiver(post_delete, sender=Post.likes.through)
-def update_post_like_count_on_delete(sender, instance, **kwargs):
-    """좋아요 제거 시 게시글 좋아요 수 업데이트"""
-    instance.post.update_like_count()
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="search_tokens",
+        verbose_name=_("게시글")
+    )
+    # 서로 다른 토큰("fé"/"fe")이 unique 제약에서 같은 값으로 취급되지 않도록 바이트 비교
+    token = BinaryCharField(_("토큰"), max_length=2)
+    weight = models.PositiveIntegerField(_("가중치"), default=1)
 
+    class Meta:
+        verbose_name = _("검색 토큰")
+        verbose_name_plural = _("검색 토큰")
+        constraints = [
+            models.UniqueConstraint(fields=["post", "token"], name="uniq_post_search_token"),
+        ]
+        indexes = [
+            models.Index(fields=["token", "post"]),
+        ]
 
-@receiver(post_save, sender=Comment.likes.through)
-def update_comment_like_count_on_save(sender, instance, **kwargs):
-    """댓글 좋아요 추가 시 댓글 좋아요 수 업데이트"""
-    instance.comment.update_like_count()
+    def __str__(self):
+        return f"{self.post_id}:{self.token}"
 
 
-@receiver(post_delete, sender=Comment.likes.through)
-def update_comment_like_count_on_delete(sender, instance, **kwargs):
-    """댓글 좋아요 제거 시 댓글 좋아요 수 업데이트"""
-    instance.comment.update_like_count()
+# Signal을 사용하여 자동으로 통계 업데이트
+# 카운터는 F() 증감만 하고 (전체 재집계 없음), 어긋난 값은 reconcile_counters 명령이 맞춘다.
+# 댓글 생성은 Comment.save(), 소프트 삭제는 Comment.soft_delete() 가 처리한다.
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
 
 
+@receiver(post_delete, sender=Comment)
+def decrease_post_comment_count(sender, instance, origin=None, **kwargs):
+    """댓글 행 삭제 시 게시글 댓글 수 -1 (이미 소프트 삭제된 댓글은 집계에서 빠져 있음)"""
+    if instance.is_deleted or deleted_with(origin, Post):
+        return
+    Post.adjust_counts(instance.post_id, comment_count=-1)
+
+
+def _removed_like_targets(through, instance, reverse, pk_set, target):
+    """remove/clear 로 실제 지워질 좋아요 행의 대상(게시글/댓글) pk 목록 (삭제 전 조회)"""
+    if reverse:
+        rows = through.objects.filter(user_id=instance.pk)
+        if pk_set is not None:
+            rows = rows.filter(**{f"{target}_id__in": pk_set})
+    else:
+        rows = through.objects.filter(**{f"{target}_id": instance.pk})
+        if pk_set is not None:
+            rows = rows.filter(user_id__in=pk_set)
+    return list(rows.values_list(f"{target}_id", flat=True))
+
+
+def _sync_like_counts(sender, instance, action, reverse, pk_set, target, adjust):
+    """좋아요 m2m 변경을 카운터 증감으로 반영.
+
+    자동 생성 through 모델은 post_save/post_delete 가 오지 않으므로 m2m_changed 만 쓴다.
+    add 의 pk_set 은 실제로 새로 들어간 행만 담기지만 remove/clear 는 그렇지 않아
+    pre_* 에서 지워질 행을 먼저 읽어 둔다. (모두 add()/remove() 의 트랜잭션 안)
+    """
+    stash = f"_removed_{sender._meta.model_name}"
+    if action == "post_add" and pk_set:
+        if reverse:
+            for pk in pk_set:
+                adjust(pk, 1)
+        else:
+            adjust(instance.pk, len(pk_set))
+    elif action in ("pre_remove", "pre_clear"):
+        setattr(instance, stash, _removed_like_targets(sender, instance, reverse, pk_set, target))
+    elif action in ("post_remove", "post_clear"):
+        for pk, n in Counter(instance.__dict__.pop(stash, ())).items():
+            adjust(pk, -n)
+
+
+def _adjust_post_likes(pk, delta):
+    Post.adjust_counts(pk, like_count=delta)
+
+
+def _adjust_comment_likes(pk, delta):
+    adjust_counters(Comment, pk, like_count=delta)
+
+
+@receiver(m2m_changed, sender=Post.likes.through)
+def sync_post_like_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """게시글 좋아요 추가/취소 시 게시글 좋아요 수 증감"""
+    _sync_like_counts(sender, instance, action, reverse, pk_set, "post", _adjust_post_likes)
+
+
+@receiver(m2m_changed, sender=Comment.likes.through)
+def sync_comment_like_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """댓글 좋아요 추가/취소 시 댓글 좋아요 수 증감"""
+    _sync_like_counts(sender, instance, action, reverse, pk_set, "comment", _adjust_comment_likes)
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def release_likes_of_deleted_user(sender, instance, **kwargs):
+    """탈퇴 사용자의 좋아요 행은 시그널 없이 함께 지워지므로 좋아요한 글/댓글 카운터를 미리 -1"""
+    liked_posts = Post.objects.filter(likes=instance)
+    if liked_posts.update(like_count=counter_delta("like_count", -1)):
+        from .hot import refresh_hot_scores
+        refresh_hot_scores(Post.objects.filter(likes=instance))
+    Comment.objects.filter(likes=instance).update(like_count=counter_delta("like_count", -1))
+
+
+@receiver(post_save, sender=Post)
+def update_post_search_index(sender, instance, update_fields=None, raw=False, **kwargs):
+    """제목/본문이 저장될 때 검색 색인 갱신 (카운터만 저장하는 경우는 건너뜀)"""
+    if raw:
+        return
+    if update_fields is not None and not {"title", "content"} & set(update_fields):
+        return
+    from .search import index_posts
+    index_posts([instance])
+
+
+@receiver(post_save, sender=PostImage)
+@receiver(post_delete, sender=PostImage)
+def update_post_first_image(sender, instance, raw=False, **kwargs):
+    """첨부 이미지가 바뀌면 게시글 대표 이미지 URL 갱신 (update() 로 저장 시그널 재실행 방지)"""
+    if raw:
+        return
+    post = Post.objects.filter(pk=instance.post_id).only("id", "content").first()
+    if post is None:
+        return
+    post.refresh_first_image_url()
+    Post.objects.filter(pk=post.pk).update(first_image_url=post.first_image_url)
+
+
+@receiver(view_counts_flushed, sender=Post)
+def refresh_hot_scores_after_views(sender, pks, **kwargs):
+    """조회수 flush 로 바뀐 글의 hot 점수를 UPDATE 한 번으로 갱신"""
+    from .hot import refresh_hot_scores
+    refresh_hot_scores(Post.objects.filter(pk__in=pks))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=BadmintokCategory)
+@receiver(post_save, sender=CommunityCategory)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=BadmintokCategory)
+@receiver(post_delete, sender=CommunityCategory)
+def invalidate_category_tree_on_change(sender, **kwargs):
+    """카테고리 트리 캐시 무효화 (프록시 모델 저장은 sender 가 프록시라 각각 연결).
+
+    커밋 전 다른 프로세스가 옛 데이터로 다시 읽어 갈 수 있어 커밋 후 한 번 더 버전을 바꾼다.
+    """
+    from .categories import invalidate_category_tree
+    invalidate_category_tree()
+    transaction.on_commit(invalidate_category_tree)
@@ -0,0 +1,101 @@
+"""게시글 검색 (2-gram 역색인).
+
+title/content icontains 는 HTML·Editor.js 원문 전체를 매 요청 풀스캔하고 순위도 없다.
+여기서는 MySQL ngram FULLTEXT 파서와 같은 방식으로 제목·본문 순수 텍스트를
+2글자 토큰으로 잘라 PostSearchToken 에 색인하고,
+- 검색어의 모든 2-gram 을 가진 글만 (token, post) 인덱스로 찾고
+- 토큰 가중치 합(제목 출현은 TITLE_WEIGHT 배)으로 순위를 매긴다.
+
+색인은 Post 저장 시그널(index_posts)로 갱신되며, 전체 재색인은 reindex_post_search 명령.
+DB 종류와 무관하게 동작하도록 별도 테이블로 관리한다 (테스트 SQLite 포함).
+"""
+import unicodedata
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Sum
+
+from .text import content_to_text
+
+
+TITLE_WEIGHT = 5
+# 본문에서 같은 토큰이 너무 많이 반복돼 순위를 독점하지 않도록 상한
+BODY_WEIGHT_CAP = 20
+BULK_BATCH = 1000
+
+
+def _words(text):
+    """NFKC + 소문자 정규화 후 문자/숫자 연속 구간 목록"""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    words, current = [], []
+    for ch in text:
+        if ch.isalnum():
+            current.append(ch)
+        elif current:
+            words.append("".join(current))
+            current = []
+    if current:
+        words.append("".join(current))
+    return words
+
+
+def tokenize(text):
+    """2-gram 토큰 Counter (한 글자 단어는 색인하지 않음)"""
+    tokens = Counter()
+    for word in _words(text):
+        for i in range(len(word) - 1):
+            tokens[word[i:i + 2]] += 1
+    return tokens
+
+
+def document_tokens(title, content):
+    """글 하나의 {토큰: weight}"""
+    weights = {token: n * TITLE_WEIGHT for token, n in tokenize(title).items()}
+    for token, n in tokenize(content_to_text(content)).items():
+        weights[token] = weights.get(token, 0) + min(n, BODY_WEIGHT_CAP)
+    return weights
+
+
+def index_posts(posts):
+    """글 목록의 검색 색인을 다시 만든다 (기존 토큰 삭제 후 bulk_create)"""
+    from .models import PostSearchToken
+
+    posts = [post for post in posts if post.pk]
+    if not posts:
+        return 0
+    rows = [
+        PostSearchToken(post_id=post.pk, token=token, weight=weight)
+        for post in posts
+        for token, weight in document_tokens(post.title, post.content).items()
+    ]
+    with transaction.atomic():
+        PostSearchToken.objects.filter(post_id__in=[post.pk for post in posts]).delete()
+        PostSearchToken.objects.bulk_create(rows, batch_size=BULK_BATCH)
+    return len(rows)
+
+
+def search_posts(queryset, query):
+    """queryset 을 검색어로 거르고 순위(search_rank) 순으로 정렬.
+
+    검색어가 한 글자뿐이라 2-gram 이 없으면 제목 icontains 로 대체한다.
+    """
+    from .models import PostSearchToken
+
+    grams = set(tokenize(query))
+    if not grams:
+        query = (query or "").strip()
+        if not query:
+            return queryset.order_by("-is_pinned", "-created_at")
+        return queryset.filter(title__icontains=query).order_by("-is_pinned", "-created_at")
+
+    matches = (
+        PostSearchToken.objects.filter(token__in=grams)
+        .values("post_id")
+        .annotate(hits=Count("token"), rank=Sum("weight"))
+        .filter(hits=len(grams))
+    )
+    return queryset.filter(
+        pk__in=matches.values("post_id")
+    ).annotate(
+        search_rank=Subquery(matches.filter(post_id=OuterRef("pk")).values("rank")[:1])
+    ).order_by("-search_rank", "-created_at")
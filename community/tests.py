@@ -1,3 +1,450 @@
+import time
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+from unittest import mock
+
+from django.apps import apps as django_apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from badmintok.api.likes import liked_ids
+from badmintok.comment_tree import build_comment_tree
+from badmintok.view_counts import flush_view_counts
+from community import categories as category_cache
+from band.models import Band, BandComment, BandCommentLike, BandPost, BandPostLike
+from community.hot import hot_ordered, refresh_hot_scores, top_hot_posts
+from community.models import BadmintokCategory, Category, Comment, Post, PostImage, PostSearchToken
+from community.search import search_posts, tokenize
+from community.text import content_to_text
+
+
+class HotScoreTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = get_user_model().objects.create_user(email="u@a.com", password="x")
+
+    def _post(self, title, days_ago=0, **counts):
+        post = Post.objects.create(
+            title=title, content="본문", author=self.author, source=Post.Source.COMMUNITY,
+            published_at=timezone.now() - timedelta(days=days_ago), **counts,
+        )
+        return post
+
+    def test_score_stored_on_save_and_counter_update(self):
+        post = self._post("새 글", view_count=10, like_count=1)
+        self.assertEqual(post.hot_score, (10 + 2) * 1.5)
+        post.increase_view_count()
+        flush_view_counts(Post, now=time.time() + 180)
+        post.refresh_from_db()
+        self.assertEqual(post.hot_score, (11 + 2) * 1.5)
+
+    def test_refresh_applies_decay_and_expiry(self):
+        fresh = self._post("최근", view_count=10)
+        older = self._post("열흘 전", days_ago=10, view_count=10)
+        old = self._post("오래된 글", days_ago=40, view_count=100)
+        # 저장 시점 이후 시간이 흐른 상황을 시뮬레이션
+        Post.objects.update(hot_score=999)
+
+        refresh_hot_scores()
+        scores = dict(Post.objects.values_list("pk", "hot_score"))
+        self.assertEqual(scores[fresh.pk], 15.0)
+        self.assertEqual(scores[older.pk], 10.0)
+        self.assertIsNone(scores[old.pk])
+        self.assertEqual(list(hot_ordered(Post.objects.all())), [fresh, older])
+
+    def test_hot_tab_api_orders_by_stored_score(self):
+        low = self._post("조회 적음", view_count=1)
+        high = self._post("조회 많음", days_ago=3, view_count=50)
+        self._post("기간 밖", days_ago=31, view_count=500)
+        resp = self.client.get("/api/community/posts/", {"tab": "hot"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([p["id"] for p in resp.data["results"]], [high.pk, low.pk])
+
+    def test_expired_post_leaves_hot_list_without_refresh(self):
+        fresh = self._post("최근", view_count=1)
+        stale = self._post("한때 인기", view_count=500)
+        # 점수를 받은 뒤 refresh_hot_scores 없이 기간이 지난 상황
+        Post.objects.filter(pk=stale.pk).update(published_at=timezone.now() - timedelta(days=31))
+        self.assertEqual(list(hot_ordered(Post.objects.all())), [fresh])
+        self.assertEqual(top_hot_posts(Post.objects.all(), cache_key="test"), [fresh])
+
+    def test_refresh_command(self):
+        self._post("글", view_count=3)
+        out = StringIO()
+        call_command("refresh_hot_scores", stdout=out)
+        self.assertIn("재계산 1건", out.getvalue())
+
+
+class PostSearchTest(TestCase):
+    def setUp(self):
+        self.author = get_user_model().objects.create_user(email="u@a.com", password="x")
+
+    def _post(self, title, content):
+        return Post.objects.create(title=title, content=content, author=self.author, source=Post.Source.COMMUNITY)
+
+    def test_tokenize_and_editorjs_text(self):
+        self.assertEqual(set(tokenize("요넥스 A")), {"요넥", "넥스"})
+        content = '{"blocks": [{"type": "paragraph", "data": {"text": "<b>라켓</b>&nbsp;후기"}},' \
+                  ' {"type": "list", "data": {"items": ["가볍다"]}}]}'
+        self.assertEqual(content_to_text(content), "라켓 후기 가볍다")
+
+    def test_index_follows_title_and_content_saves_only(self):
+        post = self._post("요넥스 라켓", "<p>가볍다</p>")
+        self.assertTrue(PostSearchToken.objects.filter(post=post, token="라켓").exists())
+        with self.assertNumQueries(1):
+            post.save(update_fields=["view_count"])
+        post.title = "빅터 라켓"
+        post.save()
+        self.assertFalse(PostSearchToken.objects.filter(post=post, token="요넥").exists())
+        post.delete()
+        self.assertFalse(PostSearchToken.objects.exists())
+
+    def test_accent_and_case_variant_tokens_stay_distinct(self):
+        # utf8mb4_unicode_ci 에서는 "fé" = "fe" 라 unique 제약에 걸리던 조합
+        post = self._post("Café cafe", "<p>ＡＢ ab</p>")
+        tokens = set(PostSearchToken.objects.filter(post=post).values_list("token", flat=True))
+        self.assertTrue({"fé", "fe", "ca", "ab"} <= tokens)
+        self.assertEqual(list(search_posts(Post.objects.all(), "café")), [post])
+        # MySQL 에서는 토큰 컬럼을 바이트 비교(utf8mb4_bin)로 만듦
+        field = PostSearchToken._meta.get_field("token")
+        mysql = mock.Mock(vendor="mysql")
+        mysql.data_types = {"CharField": "varchar(%(max_length)s)"}
+        mysql.data_type_check_constraints = {}
+        mysql.ops.cast_data_types = {}
+        self.assertEqual(field.db_parameters(mysql)["collation"], "utf8mb4_bin")
+        self.assertIsNone(field.db_parameters(connection)["collation"])
+
+    def test_search_ranks_title_matches_first(self):
+        body_only = self._post("오늘 후기", "<p>요넥스 라켓을 샀다</p>")
+        title_hit = self._post("요넥스 라켓 리뷰", "<p>좋다</p>")
+        self._post("빅터 신발", "<p>편하다</p>")
+        # HTML 태그 안 문자열은 검색되지 않음
+        self._post("이미지", '<img src="/media/racket.png">')
+
+        found = list(search_posts(Post.objects.all(), "요넥스 라켓"))
+        self.assertEqual(found, [title_hit, body_only])
+        self.assertEqual(list(search_posts(Post.objects.all(), "racket")), [])
+
+    def test_api_search_and_reindex_command(self):
+        post = self._post("셔틀콕 추천", "<p>내구성</p>")
+        PostSearchToken.objects.all().delete()
+        out = StringIO()
+        call_command("reindex_post_search", "--batch", "1", stdout=out)
+        self.assertIn("게시글 1건", out.getvalue())
+        resp = self.client.get("/api/community/posts/", {"search": "셔틀콕"})
+        self.assertEqual([p["id"] for p in resp.data["results"]], [post.pk])
+
+
+class PostContentSummaryTest(TestCase):
+    def setUp(self):
+        self.author = get_user_model().objects.create_user(email="u@a.com", password="x")
+
+    def _post(self, content, **kwargs):
+        return Post.objects.create(title="글", content=content, author=self.author, **kwargs)
+
+    def test_summary_computed_on_save(self):
+        post = self._post('<p>가나다 ' + "라" * 150 + '</p><img src="data:image/png;base64,AA"><img src="/media/a.webp">')
+        self.assertEqual(post.text_length, 154)
+        self.assertEqual(len(post.excerpt), 154)
+        self.assertEqual(post.first_image_url, "/media/a.webp")
+
+        post.content = '{"blocks": [{"type": "image", "data": {"file": {"url": "/media/b.webp"}}},' \
+                       ' {"type": "paragraph", "data": {"text": "짧은 글"}}]}'
+        post.save(update_fields=["content"])
+        post.refresh_from_db()
+        self.assertEqual((post.excerpt, post.text_length, post.first_image_url), ("짧은 글", 4, "/media/b.webp"))
+        self.assertEqual(post.list_excerpt, "짧은 글")
+
+    def test_attached_image_takes_precedence(self):
+        post = self._post('<img src="/media/content.webp">')
+        image = PostImage.objects.create(post=post, image="community/post_images/x.webp", order=0)
+        post.refresh_from_db()
+        self.assertTrue(post.first_image_url.endswith("community/post_images/x.webp"))
+        image.delete()
+        post.refresh_from_db()
+        self.assertEqual(post.first_image_url, "/media/content.webp")
+
+    def test_list_api_does_not_load_content(self):
+        self._post("<p>" + "본문 " * 60 + "</p>", source=Post.Source.COMMUNITY)
+        with mock.patch.object(Post, "refresh_from_db", side_effect=AssertionError("content loaded")):
+            resp = self.client.get("/api/community/posts/")
+        excerpt = resp.data["results"][0]["excerpt"]
+        self.assertTrue(excerpt.endswith("..."))
+        self.assertEqual(len(excerpt), 103)
+
+    def test_backfill_command(self):
+        post = self._post("<p>내용</p>")
+        Post.objects.filter(pk=post.pk).update(excerpt="", text_length=0)
+        call_command("backfill_post_summaries", stdout=StringIO())
+        post.refresh_from_db()
+        self.assertEqual((post.excerpt, post.text_length), ("내용", 2))
+
+    def test_fill_migration(self):
+        fill_post_summaries = import_module("community.migrations.0028_fill_post_summaries").fill_post_summaries
+        post = self._post('<p>내용</p><img src="/media/content.webp">')
+        PostImage.objects.create(post=post, image="community/post_images/b.webp", order=1)
+        PostImage.objects.create(post=post, image="community/post_images/a.webp", order=0)
+        Post.objects.filter(pk=post.pk).update(excerpt="", text_length=0, first_image_url="")
+        fill_post_summaries(django_apps, None)
+        post.refresh_from_db()
+        self.assertEqual((post.excerpt, post.text_length), ("내용", 2))
+        self.assertTrue(post.first_image_url.endswith("community/post_images/a.webp"))
+
+
+class LikedIdsTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.author = User.objects.create_user(email="u@a.com", password="x")
+        self.reader = User.objects.create_user(email="r@a.com", password="x")
+        self.posts = [
+            Post.objects.create(title=f"글 {i}", content="본문", author=self.author, source=Post.Source.COMMUNITY)
+            for i in range(4)
+        ]
+        self.posts[1].likes.add(self.reader)
+        self.posts[3].likes.add(self.reader, self.author)
+
+    def _like_queries(self, queries):
+        table = Post.likes.through._meta.db_table
+        return [q for q in queries if table in q["sql"]]
+
+    def test_post_list_resolves_is_liked_in_one_query(self):
+        self.client.force_login(self.reader)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get("/api/community/posts/")
+        liked = {row["id"] for row in resp.data["results"] if row["is_liked"]}
+        self.assertEqual(liked, {self.posts[1].pk, self.posts[3].pk})
+        self.assertEqual(len(self._like_queries(ctx.captured_queries)), 1)
+
+    def test_comment_tree_resolves_replies_in_same_query(self):
+        post = self.posts[0]
+        parent = Comment.objects.create(post=post, author=self.author, content="댓글")
+        replies = [Comment.objects.create(post=post, author=self.author, parent=parent, content="답") for _ in range(3)]
+        replies[2].likes.add(self.reader)
+        self.client.force_login(self.reader)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(f"/api/community/posts/{post.slug}/comments/")
+        self.assertEqual([r["is_liked"] for r in resp.data["results"][0]["replies"]], [False, False, True])
+        table = Comment.likes.through._meta.db_table
+        self.assertEqual(len([q for q in ctx.captured_queries if table in q["sql"]]), 1)
+
+        resp = self.client.get(reverse("community:detail", args=[post.slug]))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([r.liked_by_user for r in resp.context["comments"][0].replies_list], [False, False, True])
+        self.assertFalse(resp.context["is_liked"])
+
+    def test_band_post_reverse_like_model(self):
+        band = Band.objects.create(name="b", created_by=self.author)
+        posts = [BandPost.objects.create(band=band, author=self.author, title="t", content="c") for _ in range(2)]
+        BandPostLike.objects.create(post=posts[0], user=self.reader)
+        self.assertEqual(liked_ids(self.reader, BandPost, [p.pk for p in posts]), {posts[0].pk})
+        self.assertEqual(liked_ids(AnonymousUser(), BandPost, [p.pk for p in posts]), set())
+
+
+class CommentTreeTest(TestCase):
+    def setUp(self):
+        self.author = get_user_model().objects.create_user(email="u@a.com", password="x")
+        self.post = Post.objects.create(title="글", content="본문", author=self.author, source=Post.Source.COMMUNITY)
+
+    def _comment(self, parent=None, **kwargs):
+        return Comment.objects.create(post=self.post, author=self.author, parent=parent, content="c", **kwargs)
+
+    def test_tree_groups_replies_under_root(self):
+        first, second = self._comment(), self._comment()
+        reply = self._comment(first)
+        nested = self._comment(reply)
+        self._comment(second, is_deleted=True)
+        orphan_parent = self._comment(is_deleted=True)
+        self._comment(orphan_parent)
+        first.likes.add(self.author)
+
+        with self.assertNumQueries(2):
+            roots = build_comment_tree(
+                Comment.objects.filter(post=self.post, is_deleted=False).select_related("author"), self.author
+            )
+        self.assertEqual(roots, [first, second])
+        self.assertEqual(roots[0].replies_list, [reply, nested])
+        self.assertEqual(roots[1].replies_list, [])
+        self.assertEqual([c.liked_by_user for c in roots], [True, False])
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_comments(self):
+        self.client.force_login(self.author)
+        api_url = f"/api/community/posts/{self.post.slug}/comments/"
+        web_url = reverse("community:detail", args=[self.post.slug])
+        parent = self._comment()
+        self._comment(parent)
+        before = self._count_queries(api_url), self._count_queries(web_url)
+        for _ in range(5):
+            self._comment(self._comment())
+        self.assertEqual((self._count_queries(api_url), self._count_queries(web_url)), before)
+
+
+class CounterMaintenanceTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.author = User.objects.create_user(email="u@a.com", password="x")
+        self.reader = User.objects.create_user(email="r@a.com", password="x")
+        self.post = Post.objects.create(title="글", content="본문", author=self.author, source=Post.Source.COMMUNITY)
+
+    def _counts(self, obj, *fields):
+        obj.refresh_from_db(fields=list(fields))
+        return tuple(getattr(obj, field) for field in fields)
+
+    def _count_queries(self, ctx):
+        return [q for q in ctx.captured_queries if "COUNT(" in q["sql"].upper()]
+
+    def test_like_toggle_adjusts_without_recount(self):
+        self.client.force_login(self.reader)
+        url = f"/api/community/posts/{self.post.slug}/like/"
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(url)
+        self.assertEqual(self._counts(self.post, "like_count"), (1,))
+        self.assertEqual(self._count_queries(ctx), [])
+        self.assertIsNotNone(Post.objects.get(pk=self.post.pk).hot_score)
+
+        self.client.post(url)
+        self.assertEqual(self._counts(self.post, "like_count"), (0,))
+        # 역방향 add / 사용자 탈퇴(cascade)도 반영
+        self.reader.liked_posts.add(self.post)
+        self.assertEqual(self._counts(self.post, "like_count"), (1,))
+        self.reader.delete()
+        self.assertEqual(self._counts(self.post, "like_count"), (0,))
+
+    def test_comment_create_soft_delete_and_delete(self):
+        parent = Comment.objects.create(post=self.post, author=self.author, content="c")
+        reply = Comment.objects.create(post=self.post, author=self.author, parent=parent, content="r")
+        Comment.objects.create(post=self.post, author=self.author, content="x", is_deleted=True)
+        self.assertEqual(self._counts(self.post, "comment_count"), (2,))
+
+        self.assertTrue(reply.soft_delete())
+        self.assertFalse(reply.soft_delete())
+        self.assertEqual(self._counts(self.post, "comment_count"), (1,))
+        # 소프트 삭제된 대댓글은 이미 빠져 있으므로 부모 삭제로 한 번만 감소
+        parent.delete()
+        self.assertEqual(self._counts(self.post, "comment_count"), (0,))
+
+        parent = Comment.objects.create(post=self.post, author=self.author, content="c")
+        parent.likes.add(self.author, self.reader)
+        self.assertEqual(self._counts(parent, "like_count"), (2,))
+        parent.likes.clear()
+        self.assertEqual(self._counts(parent, "like_count"), (0,))
+
+    def test_decrement_clamps_at_zero(self):
+        Post.objects.filter(pk=self.post.pk).update(like_count=0)
+        self.post.likes.add(self.reader)
+        Post.objects.filter(pk=self.post.pk).update(like_count=0)
+        self.post.likes.remove(self.reader)
+        self.assertEqual(self._counts(self.post, "like_count"), (0,))
+
+    def test_band_counters(self):
+        band = Band.objects.create(name="b", created_by=self.author)
+        post = BandPost.objects.create(band=band, author=self.author, title="t", content="c")
+        self.client.force_login(self.reader)
+        resp = self.client.post(f"/api/bands/{band.pk}/posts/{post.pk}/like/")
+        self.assertEqual(resp.data["like_count"], 1)
+        comment = BandComment.objects.create(post=post, author=self.author, content="c")
+        BandComment.objects.create(post=post, author=self.author, parent=comment, content="r")
+        BandCommentLike.objects.create(comment=comment, user=self.reader)
+        self.assertEqual(self._counts(post, "like_count", "comment_count"), (1, 2))
+        self.assertEqual(self._counts(comment, "like_count"), (1,))
+
+        comment.delete()
+        self.assertEqual(self._counts(post, "comment_count"), (0,))
+        resp = self.client.post(f"/api/bands/{band.pk}/posts/{post.pk}/like/")
+        self.assertEqual(resp.data["like_count"], 0)
+
+    def test_reconcile_command_fixes_drift(self):
+        self.post.likes.add(self.reader)
+        Comment.objects.create(post=self.post, author=self.author, content="c")
+        other = Post.objects.create(title="글2", content="본문", author=self.author, source=Post.Source.COMMUNITY)
+        Post.objects.filter(pk=self.post.pk).update(like_count=5, comment_count=0)
+        band = Band.objects.create(name="b", created_by=self.author)
+        band_post = BandPost.objects.create(band=band, author=self.author, title="t", content="c")
+        BandPostLike.objects.create(post=band_post, user=self.reader)
+        BandPost.objects.filter(pk=band_post.pk).update(like_count=-3)
+
+        out = StringIO()
+        call_command("reconcile_counters", "--dry-run", stdout=out)
+        self.assertEqual(self._counts(self.post, "like_count"), (5,))
+        self.assertIn(f"community.post #{self.post.pk}", out.getvalue())
+
+        call_command("reconcile_counters", "--batch", "1", stdout=StringIO())
+        self.assertEqual(self._counts(self.post, "like_count", "comment_count"), (1, 1))
+        self.assertEqual(self._counts(other, "like_count", "comment_count"), (0, 0))
+        self.assertEqual(self._counts(band_post, "like_count"), (1,))
+        # (조회 0 + 좋아요 1 × 2 + 댓글 1 × 3) × 최근 가중치 1.5
+        self.assertEqual(Post.objects.get(pk=self.post.pk).hot_score, 7.5)
+
+
+class CategoryTreeTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        category_cache.invalidate_category_tree()
+        self.author = get_user_model().objects.create_user(email="u@a.com", password="x")
+        self.tabs = [
+            Category.objects.create(name=f"탭{i}", slug=f"tab{i}", source=Category.Source.BADMINTOK, display_order=i)
+            for i in range(3)
+        ]
+        for tab in self.tabs:
+            Category.objects.create(name=f"{tab.name}-하위", slug=f"{tab.slug}-child", parent=tab,
+                                    source=Category.Source.BADMINTOK)
+
+    def _category_queries(self, url):
+        table = Category._meta.db_table
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        return resp, [q for q in ctx.captured_queries if f'"{table}"' in q["sql"] and "JOIN" not in q["sql"]]
+
+    def test_tabs_served_from_tree(self):
+        self._category_queries(reverse("badmintok"))
+        resp, queries = self._category_queries(reverse("badmintok") + "?tab=tab1")
+        self.assertEqual(queries, [])
+        self.assertEqual([tab.slug for tab in resp.context["tabs"]], ["tab0", "tab1", "tab2"])
+        self.assertEqual([c.slug for c in resp.context["tab_children"]["tab1"]], ["tab1-child"])
+
+    def test_tab_filter_includes_children(self):
+        post = Post.objects.create(title="글", content="본문", author=self.author, source=Post.Source.BADMINTOK,
+                                   category=Category.objects.get(slug="tab1-child"))
+        Post.objects.create(title="다른 글", content="본문", author=self.author, source=Post.Source.BADMINTOK,
+                            category=self.tabs[2])
+        resp = self.client.get("/api/badmintok/posts/?tab=tab1")
+        self.assertEqual([row["id"] for row in resp.data["results"]], [post.pk])
+
+    def test_save_and_delete_invalidate(self):
+        tree = category_cache.category_tree()
+        self.assertEqual(tree.tab_slugs(Category.Source.BADMINTOK, "tab0"), ["tab0", "tab0-child"])
+
+        # 프록시 모델 저장도 무효화
+        child = BadmintokCategory.objects.get(slug="tab0-child")
+        child.is_active = False
+        child.save()
+        self.assertEqual(category_cache.category_tree().tab_slugs(Category.Source.BADMINTOK, "tab0"), ["tab0"])
+
+        self.tabs[1].delete()
+        tree = category_cache.category_tree()
+        self.assertIsNone(tree.tab(Category.Source.BADMINTOK, "tab1"))
+        self.assertIsNone(tree.get(slug="tab1-child"))
 
-# Create your tests here.
+    def test_other_process_change_seen_after_version_check(self):
+        tree = category_cache.category_tree()
+        Category.objects.filter(slug="tab2").update(name="바뀐 탭")
+        # 다른 프로세스의 저장: 공유 캐시 버전만 바뀜
+        cache.set(category_cache.VERSION_KEY, "other-process")
+        self.assertIs(category_cache.category_tree(), tree)
+        with mock.patch.object(category_cache.time, "monotonic",
+                               return_value=time.monotonic() + category_cache.VERSION_CHECK_SECONDS + 1):
+            tree = category_cache.category_tree()
+        self.assertEqual(tree.get(slug="tab2").name, "바뀐 탭")
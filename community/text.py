@@ -0,0 +1,82 @@
+"""게시글 본문(HTML 또는 Editor.js JSON)에서 순수 텍스트 추출."""
+import html
+import json
+import re
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+# 텍스트를 담는 Editor.js 블록
+_TEXT_BLOCKS = ("paragraph", "header", "h2", "h3", "h4", "quote")
+
+
+def _strip_tags(value):
+    return html.unescape(_TAG_RE.sub(" ", str(value))).replace("\xa0", " ")
+
+
+def _list_items(items):
+    # Editor.js list 는 문자열 목록 또는 {"content": ..., "items": [...]} 중첩 목록
+    for item in items:
+        if isinstance(item, dict):
+            yield item.get("content", "")
+            yield from _list_items(item.get("items", []))
+        else:
+            yield item
+
+
+def content_to_text(content):
+    """본문을 공백 하나로 이어진 순수 텍스트로 변환"""
+    if not content:
+        return ""
+    content = content.strip()
+    parts = None
+    # Editor.js JSON 형식인 경우 텍스트 블록만 추출
+    if content.startswith("{") and '"blocks"' in content:
+        try:
+            blocks = json.loads(content).get("blocks", [])
+        except (ValueError, AttributeError):
+            blocks = None
+        if blocks is not None:
+            parts = []
+            for block in blocks:
+                btype = block.get("type", "")
+                bdata = block.get("data") or {}
+                if btype in _TEXT_BLOCKS:
+                    parts.append(_strip_tags(bdata.get("text", "")))
+                    if btype == "quote":
+                        parts.append(_strip_tags(bdata.get("caption", "")))
+                elif btype == "list":
+                    parts.extend(_strip_tags(item) for item in _list_items(bdata.get("items", [])))
+                elif btype == "table":
+                    for row in bdata.get("content", []):
+                        parts.extend(_strip_tags(cell) for cell in row)
+                elif btype == "image":
+                    parts.append(_strip_tags(bdata.get("caption", "")))
+    if parts is None:
+        parts = [_strip_tags(content)]
+    return _SPACE_RE.sub(" ", " ".join(parts)).strip()
+
+
+_IMG_SRC_RE = re.compile(r'<img[^>]+src=["\']([^"\']+)["\']', re.IGNORECASE)
+
+
+def first_content_image(content):
+    """본문의 첫 이미지 URL (Editor.js image 블록 또는 HTML <img>). base64 이미지는 제외"""
+    if not content:
+        return ""
+    content = content.strip()
+    if content.startswith("{") and '"blocks"' in content:
+        try:
+            blocks = json.loads(content).get("blocks", [])
+        except (ValueError, AttributeError):
+            blocks = []
+        for block in blocks:
+            if block.get("type") == "image":
+                data = block.get("data") or {}
+                url = (data.get("file") or {}).get("url") or data.get("url") or ""
+                if url and not url.startswith("data:"):
+                    return url
+    for url in _IMG_SRC_RE.findall(html.unescape(content)):
+        if not url.startswith("data:"):
+            return url
+    return ""
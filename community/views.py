@@ -1,6 +1,6 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
-from django.db.models import Count, Q, Max, F, Case, When, ExpressionWrapper, FloatField
+from django.db.models import Count, Q, Max
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
@@ -12,13 +12,18 @@ from django.contrib.admin.views.decorators import staff_member_required
 from django.core.files.storage import default_storage
 from django.conf import settings
 from django.utils import timezone
-from datetime import datetime, timedelta
 import logging
 import os
 import uuid
 
+from .categories import category_tree
+from .hot import hot_ordered, top_hot_posts
+from .search import search_posts
 from .models import Category, Post, Comment, PostImage
+from badmintok.api.likes import liked_ids
+from badmintok.comment_tree import build_comment_tree
 from badmintok.models import BadmintokBanner, Notice
+from badmintok.view_counts import viewer_key
 
 logger = logging.getLogger(__name__)
 
@@ -50,28 +55,9 @@ class PostListView(ListView):
         active_tab = self.request.GET.get("tab", "")
         category = self.request.GET.get("category", "")
 
-        # Hot 탭인 경우 인기글만 표시
+        # Hot 탭인 경우 인기글만 표시 (최근 30일 글, 저장된 hot_score 순 — community.hot 참고)
         if active_tab == "hot":
-            # Hot 글 - 최근 30일 내 글 + 복합 점수 + 시간 가중치
-            recent_30_days = now - timedelta(days=30)
-            recent_7_days = now - timedelta(days=7)
-
-            queryset = queryset.annotate(
-                # 시간 가중치: 최근 7일 내면 1.5배, 그 외는 1.0배
-                time_weight=Case(
-                    When(published_at__gte=recent_7_days, then=1.5),
-                    When(published_at__isnull=True, created_at__gte=recent_7_days, then=1.5),
-                    default=1.0,
-                    output_field=FloatField()
-                ),
-                # 복합 점수: (조회수 * 1 + 좋아요 * 2 + 댓글 * 3) * 시간가중치
-                hot_score=ExpressionWrapper(
-                    (F('view_count') * 1 + F('like_count') * 2 + F('comment_count') * 3) * F('time_weight'),
-                    output_field=FloatField()
-                )
-            ).filter(
-                Q(published_at__gte=recent_30_days) | Q(published_at__isnull=True, created_at__gte=recent_30_days)  # 최근 30일 내 글
-            ).order_by('-hot_score')
+            queryset = hot_ordered(queryset)
         elif active_tab:
             # 리뷰 탭인 경우 하드코딩된 카테고리 목록 사용
             if active_tab == 'reviews':
@@ -85,22 +71,10 @@ class PostListView(ListView):
                     queryset = queryset.filter(Q(category__slug=category) | Q(categories__slug=category)).distinct()
             # 동적 탭 필터링 (Category 기반)
             else:
-                # 상위 카테고리(탭) 찾기
-                current_category = Category.objects.filter(
-                    slug=active_tab,
-                    source=Category.Source.COMMUNITY,
-                    parent__isnull=True,
-                    is_active=True
-                ).first()
-
-                if current_category:
-                    # 현재 카테고리와 그 하위 카테고리들을 가져옴
-                    category_slugs = [current_category.slug]
-
-                    # 하위 카테고리 추가
-                    child_categories = Category.objects.filter(parent=current_category, is_active=True)
-                    category_slugs.extend([cat.slug for cat in child_categories])
+                # 상위 카테고리(탭)와 그 하위 카테고리 slug (카테고리 트리 캐시)
+                category_slugs = category_tree().tab_slugs(Category.Source.COMMUNITY, active_tab)
 
+                if category_slugs:
                     # 카테고리 필터링
                     queryset = queryset.filter(
                         Q(category__slug__in=category_slugs) | Q(categories__slug__in=category_slugs)
@@ -113,85 +87,48 @@ class PostListView(ListView):
             # 탭이 없는 경우 일반 카테고리 필터링
             if category:
                 # slug로 먼저 시도, 없으면 id로 시도
-                try:
-                    category_obj = Category.objects.get(slug=category, is_active=True)
-                    queryset = queryset.filter(category=category_obj)
-                except Category.DoesNotExist:
-                    try:
-                        category_obj = Category.objects.get(id=category, is_active=True)
-                        queryset = queryset.filter(category=category_obj)
-                    except Category.DoesNotExist:
-                        pass
+                tree = category_tree()
+                category_obj = tree.get(slug=category) or tree.get(pk=category)
+                if category_obj:
+                    queryset = queryset.filter(category_id=category_obj.id)
         
-        # 검색 기능
+        # 검색 기능 (검색 색인 순위순, community.search 참고)
         search = self.request.GET.get("search")
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | Q(content__icontains=search)
-            )
+            queryset = search_posts(queryset, search)
+        # 정렬: 고정글 먼저, 그 다음 최신순 (Hot 탭은 점수순 유지)
+        elif active_tab != "hot":
+            queryset = queryset.order_by("-is_pinned", "-created_at")
         
-        # 정렬: 고정글 먼저, 그 다음 최신순
-        queryset = queryset.order_by("-is_pinned", "-created_at")
-        
-        # content 필드는 템플릿에서 직접 사용하지 않고 서버에서 excerpt 추출에만 사용
-        # excerpt 추출을 위해 content가 필요하므로 defer를 사용하지 않음
-        # 템플릿에서는 서버에서 추출한 excerpt와 image_url만 사용하므로 
-        # 템플릿 렌더링 시 content 필드 파싱 오버헤드는 없음
+        # 목록은 저장된 요약 필드(list_excerpt, first_image_url)만 사용하므로 본문은 읽지 않음
+        queryset = queryset.defer("content")
         
         return queryset
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        # 활성화된 동호인톡 탭 가져오기 (상위 카테고리 = 탭)
-        tabs = Category.objects.filter(
-            source=Category.Source.COMMUNITY,
-            parent__isnull=True,
-            is_active=True
-        ).order_by('display_order')
-        context["tabs"] = tabs
-
-        # 각 탭의 하위 카테고리를 가져오기 (부모별 독립적인 display_order로 정렬)
-        tab_children = {}
-        for tab in tabs:
-            children = Category.objects.filter(
-                parent=tab,
-                is_active=True
-            ).order_by('display_order')  # 부모 내에서 display_order로 정렬
-            tab_children[tab.slug] = children
-        context["tab_children"] = tab_children
+        # 활성화된 동호인톡 탭(상위 카테고리)과 탭별 하위 카테고리 (카테고리 트리 캐시, 쿼리 없음)
+        tree = category_tree()
+        context["tabs"] = tree.tabs(Category.Source.COMMUNITY)
+        context["tab_children"] = tree.tab_children(Category.Source.COMMUNITY)
 
         context["active_tab"] = self.request.GET.get("tab", "")
         context["current_category"] = self.request.GET.get("category", "")
         context["search_query"] = self.request.GET.get("search", "")
         
-        # Hot 글 - 최근 30일 내 글 + 복합 점수 + 시간 가중치
+        # Hot 글 - 최근 30일 내 글 저장 점수 상위 10개 (id 목록 캐시)
         now = timezone.now()
-        # 최근 30일 기준일
-        recent_30_days = now - timedelta(days=30)
-        # 최근 7일 기준일 (시간 가중치 적용)
-        recent_7_days = now - timedelta(days=7)
-        
-        hot_posts = Post.objects.filter(
-            is_deleted=False,
-            source__in=[Post.Source.COMMUNITY, Post.Source.MEMBER_REVIEWS]
-        ).filter(
-            Q(published_at__lte=now) | Q(published_at__isnull=True)  # published_at이 없거나 현재 시간 이전인 것
-        ).filter(
-            Q(published_at__gte=recent_30_days) | Q(published_at__isnull=True, created_at__gte=recent_30_days)  # 최근 30일 내 글
-        ).select_related("author", "category").annotate(
-            # 시간 가중치: 최근 7일 내면 1.5배, 그 외는 1.0배
-            time_weight=Case(
-                When(published_at__gte=recent_7_days, then=1.5),
-                default=1.0,
-                output_field=FloatField()
-            ),
-            # 복합 점수: (조회수 * 1 + 좋아요 * 2 + 댓글 * 3) * 시간가중치
-            hot_score=ExpressionWrapper(
-                (F('view_count') * 1 + F('like_count') * 2 + F('comment_count') * 3) * F('time_weight'),
-                output_field=FloatField()
-            )
-        ).order_by('-hot_score')[:10]
+        hot_posts = top_hot_posts(
+            Post.objects.filter(
+                is_deleted=False,
+                source__in=[Post.Source.COMMUNITY, Post.Source.MEMBER_REVIEWS]
+            ).filter(
+                Q(published_at__lte=now) | Q(published_at__isnull=True)  # published_at이 없거나 현재 시간 이전인 것
+            ).select_related("author", "category").defer("content"),
+            10,
+            cache_key="community",
+        )
         context["hot_posts"] = hot_posts
         
         # admin에서 설정한 배너 이미지 목록
@@ -243,70 +180,6 @@ class PostListView(ListView):
             
             context["pagination_page_range"] = page_range
 
-        # 서버 측 최적화: 게시물 excerpt 및 이미지 URL 추출
-        import re
-        import html
-        from django.utils.html import strip_tags
-
-        # 메인 게시물 리스트 최적화
-        posts = context.get('posts', [])
-        for post in posts:
-            if hasattr(post, 'content') and post.content:
-                # HTML 엔티티 디코딩 후 태그 제거 및 excerpt 추출
-                unescaped_content = html.unescape(post.content)
-                text_content = strip_tags(unescaped_content)
-                if len(text_content) > 80:
-                    # 80자 초과 시 15단어로 제한
-                    words = text_content.split()[:15]
-                    post.excerpt = ' '.join(words) + '...'
-                else:
-                    post.excerpt = text_content
-
-                # 첫 번째 이미지 URL 추출 (base64 제외)
-                pattern = r'<img[^>]+src=["\']([^"\']+)["\']'
-                match = re.search(pattern, unescaped_content, re.IGNORECASE)
-                if match:
-                    url = match.group(1)
-                    # base64 이미지는 제외 (성능 이슈 방지)
-                    if not url.startswith('data:'):
-                        post.content_image_url = url
-                    else:
-                        post.content_image_url = None
-                else:
-                    post.content_image_url = None
-            else:
-                post.excerpt = ""
-                post.content_image_url = None
-
-        # Hot 게시물 리스트 최적화
-        hot_posts = context.get('hot_posts', [])
-        for post in hot_posts:
-            if hasattr(post, 'content') and post.content:
-                # HTML 엔티티 디코딩 후 태그 제거 및 excerpt 추출
-                unescaped_content = html.unescape(post.content)
-                text_content = strip_tags(unescaped_content)
-                if len(text_content) > 80:
-                    words = text_content.split()[:15]
-                    post.excerpt = ' '.join(words) + '...'
-                else:
-                    post.excerpt = text_content
-
-                # 첫 번째 이미지 URL 추출 (base64 제외)
-                pattern = r'<img[^>]+src=["\']([^"\']+)["\']'
-                match = re.search(pattern, unescaped_content, re.IGNORECASE)
-                if match:
-                    url = match.group(1)
-                    # base64 이미지는 제외 (성능 이슈 방지)
-                    if not url.startswith('data:'):
-                        post.content_image_url = url
-                    else:
-                        post.content_image_url = None
-                else:
-                    post.content_image_url = None
-            else:
-                post.excerpt = ""
-                post.content_image_url = None
-
         return context
 
 
@@ -342,7 +215,7 @@ class PostDetailView(DetailView):
         if not self.request.user.is_authenticated or not self.request.user.is_staff:
             queryset = queryset.filter(is_draft=False, published_at__lte=now)
 
-        return queryset.select_related("author", "category").prefetch_related("images", "likes")
+        return queryset.select_related("author", "category").prefetch_related("images")
     
     def get_object(self, queryset=None):
         # queryset이 없으면 get_queryset()에서 가져옴
@@ -364,47 +237,24 @@ class PostDetailView(DetailView):
             from django.http import Http404
             raise Http404("No %s found matching the query" % (queryset.model._meta.verbose_name))
         
-        # 세션 기반 조회수 중복 방지 (3시간 제한)
-        session_key = 'viewed_posts'
-        viewed_posts = self.request.session.get(session_key, {})
-        post_id_str = str(post.id)
-        current_time = datetime.now()
-        
-        # 세션에 조회 기록이 있는지 확인
-        should_increase = True
-        if post_id_str in viewed_posts:
-            last_viewed_time = datetime.fromisoformat(viewed_posts[post_id_str])
-            time_diff = current_time - last_viewed_time
-            
-            # 3시간(10800초) 이내면 조회수 증가하지 않음
-            if time_diff.total_seconds() < 10800:
-                should_increase = False
-        
-        # 조회수 증가 및 세션 업데이트
-        if should_increase:
-            post.increase_view_count()
-            viewed_posts[post_id_str] = current_time.isoformat()
-            self.request.session[session_key] = viewed_posts
-            self.request.session.modified = True
-        
+        # 조회수 증가 (같은 사용자 3시간 내 재조회 제외)
+        post.increase_view_count(viewer_key(self.request))
+
         return post
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        post = self.get_object()
+        post = self.object
         
         # 댓글 목록 (대댓글 제외)
-        context["comments"] = Comment.objects.filter(
-            post=post,
-            is_deleted=False,
-            parent__isnull=True
-        ).select_related("author").prefetch_related("replies__author", "likes").order_by("created_at")
-        
+        # 댓글 트리 (댓글 전체 1회 + 좋아요 여부 1회)
+        user = self.request.user
+        context["comments"] = build_comment_tree(
+            Comment.objects.filter(post=post, is_deleted=False).select_related("author", "author__profile"), user
+        )
+
         # 좋아요 여부
-        if self.request.user.is_authenticated:
-            context["is_liked"] = post.likes.filter(id=self.request.user.id).exists()
-        else:
-            context["is_liked"] = False
+        context["is_liked"] = bool(liked_ids(user, Post, [post.pk]))
         
         return context
 
@@ -418,20 +268,8 @@ class PostCreateView(LoginRequiredMixin, CreateView):
 
     def get_form(self, form_class=None):
         form = super().get_form(form_class)
-        # 동호인톡 활성 카테고리만 포함 (상위 카테고리 = 탭)
-        community_categories = Category.objects.filter(
-            source=Category.Source.COMMUNITY,
-            parent__isnull=True,
-            is_active=True
-        )
-
-        # 상위 카테고리(탭)와 하위 카테고리 slug 목록 생성
-        allowed_category_slugs = set()
-        for category in community_categories:
-            allowed_category_slugs.add(category.slug)
-            # 하위 카테고리도 포함
-            child_categories = Category.objects.filter(parent=category, is_active=True)
-            allowed_category_slugs.update(child_categories.values_list('slug', flat=True))
+        # 동호인톡 탭(상위 카테고리)과 하위 카테고리 slug (카테고리 트리 캐시, 쿼리 없음)
+        allowed_category_slugs = category_tree().source_slugs(Category.Source.COMMUNITY)
 
         # hot 카테고리는 제외하고, allowed_category_slugs가 비어있으면 모든 카테고리 허용
         if allowed_category_slugs:
@@ -462,20 +300,8 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         context['submit_token'] = submit_token
         
         # 계층 구조로 카테고리 정리
-        # 동호인톡 활성 카테고리만 포함 (상위 카테고리 = 탭)
-        community_categories = Category.objects.filter(
-            source=Category.Source.COMMUNITY,
-            parent__isnull=True,
-            is_active=True
-        )
-
-        # 상위 카테고리(탭)와 하위 카테고리 slug 목록 생성
-        allowed_category_slugs = set()
-        for category in community_categories:
-            allowed_category_slugs.add(category.slug)
-            # 하위 카테고리도 포함
-            child_categories = Category.objects.filter(parent=category, is_active=True)
-            allowed_category_slugs.update(child_categories.values_list('slug', flat=True))
+        # 동호인톡 탭(상위 카테고리)과 하위 카테고리 slug (카테고리 트리 캐시, 쿼리 없음)
+        allowed_category_slugs = category_tree().source_slugs(Category.Source.COMMUNITY)
 
         # allowed_category_slugs가 비어있으면 모든 카테고리 허용
         if allowed_category_slugs:
@@ -573,20 +399,8 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         context['submit_token'] = submit_token
         
         # 계층 구조로 카테고리 정리
-        # 동호인톡 활성 카테고리만 포함 (상위 카테고리 = 탭)
-        community_categories = Category.objects.filter(
-            source=Category.Source.COMMUNITY,
-            parent__isnull=True,
-            is_active=True
-        )
-
-        # 상위 카테고리(탭)와 하위 카테고리 slug 목록 생성
-        allowed_category_slugs = set()
-        for category in community_categories:
-            allowed_category_slugs.add(category.slug)
-            # 하위 카테고리도 포함
-            child_categories = Category.objects.filter(parent=category, is_active=True)
-            allowed_category_slugs.update(child_categories.values_list('slug', flat=True))
+        # 동호인톡 탭(상위 카테고리)과 하위 카테고리 slug (카테고리 트리 캐시, 쿼리 없음)
+        allowed_category_slugs = category_tree().source_slugs(Category.Source.COMMUNITY)
 
         # allowed_category_slugs가 비어있으면 모든 카테고리 허용
         if allowed_category_slugs:
@@ -646,20 +460,8 @@ class PostUpdateView(LoginRequiredMixin, UpdateView):
 
     def get_form(self, form_class=None):
         form = super().get_form(form_class)
-        # 동호인톡 활성 카테고리만 포함 (상위 카테고리 = 탭)
-        community_categories = Category.objects.filter(
-            source=Category.Source.COMMUNITY,
-            parent__isnull=True,
-            is_active=True
-        )
-
-        # 상위 카테고리(탭)와 하위 카테고리 slug 목록 생성
-        allowed_category_slugs = set()
-        for category in community_categories:
-            allowed_category_slugs.add(category.slug)
-            # 하위 카테고리도 포함
-            child_categories = Category.objects.filter(parent=category, is_active=True)
-            allowed_category_slugs.update(child_categories.values_list('slug', flat=True))
+        # 동호인톡 탭(상위 카테고리)과 하위 카테고리 slug (카테고리 트리 캐시, 쿼리 없음)
+        allowed_category_slugs = category_tree().source_slugs(Category.Source.COMMUNITY)
 
         # hot 카테고리는 제외하고, allowed_category_slugs가 비어있으면 모든 카테고리 허용
         if allowed_category_slugs:
@@ -681,20 +483,8 @@ class PostUpdateView(LoginRequiredMixin, UpdateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # 계층 구조로 카테고리 정리
-        # 동호인톡 활성 카테고리만 포함 (상위 카테고리 = 탭)
-        community_categories = Category.objects.filter(
-            source=Category.Source.COMMUNITY,
-            parent__isnull=True,
-            is_active=True
-        )
-
-        # 상위 카테고리(탭)와 하위 카테고리 slug 목록 생성
-        allowed_category_slugs = set()
-        for category in community_categories:
-            allowed_category_slugs.add(category.slug)
-            # 하위 카테고리도 포함
-            child_categories = Category.objects.filter(parent=category, is_active=True)
-            allowed_category_slugs.update(child_categories.values_list('slug', flat=True))
+        # 동호인톡 탭(상위 카테고리)과 하위 카테고리 slug (카테고리 트리 캐시, 쿼리 없음)
+        allowed_category_slugs = category_tree().source_slugs(Category.Source.COMMUNITY)
 
         # allowed_category_slugs가 비어있으면 모든 카테고리 허용
         if allowed_category_slugs:
@@ -779,8 +569,8 @@ class PostLikeView(LoginRequiredMixin, View):
             post.likes.add(request.user)
             liked = True
 
-        post.update_like_count()
-        post.refresh_from_db()
+        # 카운터는 시그널이 F() 로 증감 — 응답용 값만 다시 읽음
+        post.refresh_from_db(fields=["like_count"])
 
         # AJAX 요청인 경우 JSON 응답
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -1003,20 +793,12 @@ def badmintok_post_editor(request, post_id=None):
 
     # 카테고리 목록 (계층 구조)
     # Category 기반으로 동적으로 카테고리 가져오기 (상위 카테고리 = 탭)
-    badmintok_categories = Category.objects.filter(
-        source=Category.Source.BADMINTOK,
-        parent__isnull=True,
-        is_active=True
-    )
-
-    # 상위 카테고리(탭)와 그 하위 카테고리들을 모두 수집
+    # 상위 카테고리(탭)와 그 하위 카테고리들을 모두 수집 (카테고리 트리 캐시, 쿼리 없음)
+    tree = category_tree()
     category_ids = set()
-    for category in badmintok_categories:
-        # 상위 카테고리 추가
-        category_ids.add(category.id)
-        # 하위 카테고리들 추가
-        child_categories = Category.objects.filter(parent=category, is_active=True)
-        category_ids.update(child_categories.values_list('id', flat=True))
+    for tab in tree.tabs(Category.Source.BADMINTOK):
+        category_ids.add(tab.id)
+        category_ids.update(child.id for child in tree.children(tab))
 
     # 수집한 카테고리들을 가져옴
     all_categories = Category.objects.filter(
@@ -1176,9 +958,8 @@ class CommentDeleteView(LoginRequiredMixin, View):
             post_slug = comment.post.slug
             post_source = comment.post.source
 
-            # 소프트 삭제
-            comment.is_deleted = True
-            comment.save()
+            # 소프트 삭제 (게시글 댓글 수도 함께 -1)
+            comment.soft_delete()
 
             logger.info(f"Comment {comment_id} deleted by user {request.user.id}")
 
@@ -1223,8 +1004,7 @@ class CommentLikeView(LoginRequiredMixin, View):
             comment.likes.add(request.user)
             liked = True
 
-        comment.update_like_count()
-        comment.refresh_from_db()
+        comment.refresh_from_db(fields=["like_count"])
 
         # AJAX 요청인 경우 JSON 응답
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -2,6 +2,8 @@ from rest_framework import serializers
 from django.db.models import Prefetch
 from django.utils.text import slugify
 from contests.models import Contest, ContestCategory, ContestPrize, ContestSchedule, ContestImage, Sponsor
+from badmintok.api.images import ImageSrcsetField, image_srcset
+from badmintok.api.likes import LikedByUserMixin, LikedListSerializer
 from accounts.models import User
 
 
@@ -66,10 +68,11 @@ class ContestPrizeSerializer(serializers.ModelSerializer):
 class ContestImageSerializer(serializers.ModelSerializer):
     """대회 이미지 시리얼라이저"""
     image_url = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField(source='image')
 
     class Meta:
         model = ContestImage
-        fields = ['id', 'image_url', 'order']
+        fields = ['id', 'image_url', 'image_srcset', 'order']
         read_only_fields = fields
 
     def get_image_url(self, obj):
@@ -81,7 +84,7 @@ class ContestImageSerializer(serializers.ModelSerializer):
         return None
 
 
-class ContestListSerializer(serializers.ModelSerializer):
+class ContestListSerializer(LikedByUserMixin, serializers.ModelSerializer):
     """대회 목록 시리얼라이저"""
     category_name = serializers.CharField(source='category.name', read_only=True, allow_null=True)
     sponsor = serializers.CharField(source='sponsor.name', read_only=True, allow_null=True)
@@ -91,37 +94,42 @@ class ContestListSerializer(serializers.ModelSerializer):
     d_day_display = serializers.CharField(source='get_d_day_display', read_only=True)
     is_liked = serializers.SerializerMethodField()
     first_image = serializers.SerializerMethodField()
+    first_image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Contest
+        list_serializer_class = LikedListSerializer
         fields = [
             'id', 'slug', 'title', 'category_name', 'is_qualifying',
             'schedule_start', 'schedule_end', 'period_display',
             'registration_start', 'registration_end', 'registration_period_display',
             'region', 'region_detail', 'sponsor',
-            'd_day', 'd_day_display', 'view_count', 'is_liked', 'first_image',
+            'd_day', 'd_day_display', 'view_count', 'is_liked', 'first_image', 'first_image_srcset',
             'created_at', 'updated_at'
         ]
         read_only_fields = fields
 
-    def get_is_liked(self, obj):
-        """현재 사용자가 좋아요를 눌렀는지 확인"""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.likes.filter(id=request.user.id).exists()
-        return False
+    def _first_image(self, obj):
+        # first_image / first_image_srcset 가 같은 행을 쓰므로 객체에 한 번만 조회해 둠
+        if not hasattr(obj, '_first_image_cache'):
+            obj._first_image_cache = obj.images.first()
+        return obj._first_image_cache
 
     def get_first_image(self, obj):
         request = self.context.get('request')
-        first_image = obj.images.first()
+        first_image = self._first_image(obj)
         if first_image and first_image.image:
             if request:
                 return request.build_absolute_uri(first_image.image.url)
             return first_image.image.url
         return None
 
+    def get_first_image_srcset(self, obj):
+        first_image = self._first_image(obj)
+        return image_srcset(first_image.image if first_image else None, self.context.get('request'))
+
 
-class ContestDetailSerializer(serializers.ModelSerializer):
+class ContestDetailSerializer(LikedByUserMixin, serializers.ModelSerializer):
     """대회 상세 시리얼라이저"""
     category = ContestCategorySerializer(read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True, allow_null=True)
@@ -146,6 +154,7 @@ class ContestDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Contest
+        list_serializer_class = LikedListSerializer
         fields = [
             'id', 'slug', 'title', 'category', 'category_name', 'is_qualifying',
             'schedule_start', 'schedule_end', 'period_display',
@@ -163,13 +172,6 @@ class ContestDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
-    def get_is_liked(self, obj):
-        """현재 사용자가 좋아요를 눌렀는지 확인"""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.likes.filter(id=request.user.id).exists()
-        return False
-
     def get_pdf_url(self, obj):
         request = self.context.get('request')
         if obj.pdf_file and hasattr(obj.pdf_file, 'url'):
@@ -14,6 +14,8 @@ from datetime import date, timedelta
 
 logger = logging.getLogger(__name__)
 
+from badmintok.api.pagination import cursor_requested, cursor_response
+from badmintok.view_counts import viewer_key
 from contests.models import Contest, ContestCategory, ContestSchedule, ContestImage, ContestPrize
 from .serializers import (
     ContestListSerializer, ContestDetailSerializer,
@@ -71,7 +73,6 @@ def contest_list(request):
     ).prefetch_related(
         Prefetch('images', queryset=ContestImage.objects.order_by('order')),
         Prefetch('schedules', queryset=ContestSchedule.objects.order_by('date')),
-        'likes'
     )
 
     # 필터링
@@ -182,6 +183,10 @@ def contest_list(request):
     except (ValueError, TypeError):
         page_size = 10
 
+    # ?cursor= 키셋 모드: COUNT/OFFSET 없이 다음 cursor 만 반환
+    if cursor_requested(request):
+        return cursor_response(request, contests, page_size, ContestListSerializer)
+
     paginator = Paginator(contests, page_size)
     page_obj = paginator.get_page(page_number)
 
@@ -214,14 +219,12 @@ def contest_detail(request, slug):
             Prefetch('images', queryset=ContestImage.objects.order_by('order')),
             Prefetch('schedules', queryset=ContestSchedule.objects.order_by('date')),
             'prizes',
-            'likes'
         ),
         slug=slug
     )
 
-    # 조회수 증가
-    contest.view_count += 1
-    contest.save(update_fields=['view_count'])
+    # 조회수 증가 (같은 사용자 3시간 내 재조회 제외)
+    contest.increase_view_count(viewer_key(request))
 
     serializer = ContestDetailSerializer(contest, context={'request': request})
     return Response(serializer.data, status=status.HTTP_200_OK)
@@ -281,7 +284,6 @@ def hot_contests(request):
         'category', 'sponsor'
     ).prefetch_related(
         Prefetch('images', queryset=ContestImage.objects.order_by('order')),
-        'likes'
     ).order_by('-view_count', 'schedule_start')[:10]
 
     serializer = ContestListSerializer(contests, many=True, context={'request': request})
@@ -8,6 +8,8 @@ from django.db import models
 from django.utils.text import slugify
 
 from badmintok.fields import WebPImageField
+from badmintok.slugs import save_with_slug
+from badmintok.view_counts import count_view
 
 
 class ContestCategory(models.Model):
@@ -417,20 +419,17 @@ class Contest(models.Model):
 
         return data
 
-    def increase_view_count(self):
-        """조회수 증가"""
-        self.view_count += 1
-        self.save(update_fields=["view_count"])
+    def increase_view_count(self, viewer=None, **kwargs):
+        """조회수 증가 (공용 카운터에 쌓였다가 flush 때 반영)"""
+        return count_view(self, viewer, **kwargs)
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            base_slug = slugify(self.title, allow_unicode=True)
-            slug = base_slug
-            counter = 1
-            while Contest.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+            # 빈 번호를 한 번에 골라 저장, 동시 저장으로 unique 충돌 시 다시 고름
+            return save_with_slug(
+                self, lambda: super(Contest, self).save(*args, **kwargs),
+                slugify(self.title, allow_unicode=True), max_length=self._meta.get_field("slug").max_length,
+            )
         super().save(*args, **kwargs)
 
     def clean(self):
@@ -1,3 +1,29 @@
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from badmintok import slugs
+from contests.models import Contest
+
+
+class ContestSlugTest(TestCase):
+    def _contest(self, title="2026 배드민톡 오픈"):
+        return Contest.objects.create(title=title, schedule_start="2026-07-01")
+
+    def test_duplicate_titles_get_numbered_slugs(self):
+        self.assertEqual(
+            [self._contest().slug for _ in range(3)],
+            ["2026-배드민톡-오픈", "2026-배드민톡-오픈-1", "2026-배드민톡-오픈-2"],
+        )
+
+    def test_retries_when_concurrent_save_took_the_slug(self):
+        self._contest()
+        real = slugs.allocate_slug
+        # 첫 번째 할당은 다른 요청이 먼저 가져간 슬러그를 고른 상황
+        stale = iter(["2026-배드민톡-오픈"])
+        with mock.patch.object(
+            slugs, "allocate_slug", side_effect=lambda *a, **kw: next(stale, None) or real(*a, **kw),
+        ):
+            contest = self._contest()
+        self.assertEqual(contest.slug, "2026-배드민톡-오픈-1")
+        self.assertEqual(Contest.objects.count(), 2)
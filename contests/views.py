@@ -1,5 +1,5 @@
 import json
-from datetime import datetime, date, timedelta
+from datetime import date, timedelta
 import logging
 
 from django.contrib.auth.decorators import login_required
@@ -10,7 +10,9 @@ from django.views.decorators.http import require_POST
 from django.views.generic import DetailView, ListView
 
 from .models import Contest, ContestCategory, Sponsor
+from badmintok.api.likes import liked_ids
 from badmintok.models import BadmintokBanner
+from badmintok.view_counts import viewer_key
 
 logger = logging.getLogger(__name__)
 
@@ -336,23 +338,8 @@ class ContestDetailView(DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         contest = context["contest"]
-        # 세션 기반 조회수 중복 방지 (3시간 제한)
-        session_key = "viewed_contests"
-        viewed_contests = self.request.session.get(session_key, {})
-        contest_id_str = str(contest.id)
-        current_time = datetime.now()
-
-        should_increase = True
-        if contest_id_str in viewed_contests:
-            last_viewed_time = datetime.fromisoformat(viewed_contests[contest_id_str])
-            if (current_time - last_viewed_time).total_seconds() < 10800:
-                should_increase = False
-
-        if should_increase:
-            contest.increase_view_count()
-            viewed_contests[contest_id_str] = current_time.isoformat()
-            self.request.session[session_key] = viewed_contests
-            self.request.session.modified = True
+        # 조회수 증가 (같은 사용자 3시간 내 재조회 제외)
+        contest.increase_view_count(viewer_key(self.request))
         schedule_entries = contest.schedules.all()
         context["schedule_entries"] = schedule_entries
 
@@ -370,6 +357,9 @@ class ContestDetailView(DetailView):
         # 대회 이미지들 가져오기 (순서대로)
         context["contest_images"] = contest.images.all().order_by('order', 'id')
 
+        # 좋아요 여부
+        context["is_liked"] = bool(liked_ids(self.request.user, Contest, [contest.pk]))
+
         # === SEO: title / description / body / canonical / OG image / JSON-LD ===
         import json as _json
         from django.urls import reverse as _reverse
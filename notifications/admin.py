@@ -1,13 +1,105 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.utils import timezone
 from unfold.admin import ModelAdmin
 
-from .models import Notification
+from badmintok.paginator import LargeTableAdminMixin
+
+from .models import Broadcast, NoticeBatch, Notification, NotificationArchive, PushOutbox
 
 
 @admin.register(Notification)
-class NotificationAdmin(ModelAdmin):
+class NotificationAdmin(LargeTableAdminMixin, ModelAdmin):
     list_display = ("user", "type", "title", "is_read", "created_at")
     list_filter = ("type", "is_read", "created_at")
     search_fields = ("title", "message", "user__activity_name")
     readonly_fields = ("created_at",)
     ordering = ("-created_at",)
+    keyset_field = "created_at"
+    list_select_related = ("user",)
+
+
+@admin.register(Broadcast)
+class BroadcastAdmin(ModelAdmin):
+    list_display = ("title", "type", "audience", "status", "progress", "notified_count", "total_count", "pushed_count", "created_at", "finished_at")
+    list_filter = ("status", "type", "audience")
+    search_fields = ("title",)
+    readonly_fields = (
+        "type", "title", "message", "audience", "recipient_ids", "related_notice", "related_community_post",
+        "related_band", "related_band_schedule", "actor",
+        "status", "total_count", "notified_count", "pushed_count", "last_user_id", "error",
+        "created_at", "started_at", "finished_at", "updated_at",
+    )
+    ordering = ("-created_at",)
+    actions = ["retry_failed"]
+
+    def has_add_permission(self, request):
+        # 공지사항/배드민톡 글/모임 일정 등 저장 시 자동 등록
+        return False
+
+    @admin.display(description="진행률")
+    def progress(self, obj):
+        return f"{obj.progress}%"
+
+    @admin.action(description="실패한 작업 다시 시도 (마지막 처리 사용자 다음부터)")
+    def retry_failed(self, request, queryset):
+        updated = queryset.filter(status=Broadcast.Status.FAILED).update(status=Broadcast.Status.PENDING, error="")
+        self.message_user(request, f"{updated}건을 다시 대기 상태로 바꿨습니다.", messages.SUCCESS)
+
+
+@admin.register(PushOutbox)
+class PushOutboxAdmin(LargeTableAdminMixin, ModelAdmin):
+    list_display = ("title", "user", "status", "attempts", "next_attempt_at", "created_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("title",)
+    readonly_fields = (
+        "user", "notification", "title", "body", "data", "status", "attempts",
+        "next_attempt_at", "locked_until", "last_error", "created_at", "sent_at",
+    )
+    ordering = ("-id",)
+    keyset_field = "id"
+    list_select_related = ("user",)
+    actions = ["retry_failed"]
+
+    def has_add_permission(self, request):
+        # 알림 저장 시 자동 등록
+        return False
+
+    @admin.action(description="실패한 푸시 다시 보내기")
+    def retry_failed(self, request, queryset):
+        updated = queryset.filter(status=PushOutbox.Status.FAILED).update(
+            status=PushOutbox.Status.PENDING, attempts=0, next_attempt_at=timezone.now(), last_error=""
+        )
+        self.message_user(request, f"{updated}건을 다시 대기 상태로 바꿨습니다.", messages.SUCCESS)
+
+
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(LargeTableAdminMixin, ModelAdmin):
+    list_display = ("title", "user", "type", "created_at", "archived_at")
+    list_filter = ("type",)
+    search_fields = ("title",)
+    readonly_fields = (
+        "notification_id", "user", "type", "title", "message", "actor_id", "data", "created_at", "archived_at",
+    )
+    ordering = ("-id",)
+    keyset_field = "id"
+    list_select_related = ("user",)
+
+    def has_add_permission(self, request):
+        # prune_notifications 가 보존 기간 지난 알림을 옮겨 둠
+        return False
+
+
+@admin.register(NoticeBatch)
+class NoticeBatchAdmin(LargeTableAdminMixin, ModelAdmin):
+    list_display = ("message", "sender", "band", "recipient_count", "read_count", "created_at")
+    search_fields = ("message",)
+    readonly_fields = (
+        "sender", "band", "schedule", "message", "recipient_ids", "recipient_count", "read_count", "created_at",
+    )
+    ordering = ("-id",)
+    keyset_field = "id"
+    list_select_related = ("sender", "band")
+
+    def has_add_permission(self, request):
+        # 일정 쪽지 발송 API 가 만듦
+        return False
@@ -17,6 +17,7 @@ class NotificationSerializer(serializers.ModelSerializer):
             "title",
             "message",
             "actor_name",
+            "actor_count",
             "link",
             "is_read",
             "created_at",
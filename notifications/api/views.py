@@ -6,7 +6,10 @@ from django.core.paginator import Paginator
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 
-from notifications.models import Notification, DeviceToken
+from badmintok.api.pagination import cursor_requested, cursor_response
+from notifications.models import Notification, DeviceToken, NoticeBatch
+from notifications.push import invalidate_tokens
+from notifications.unread import mark_all_read, unread_count
 from .serializers import NotificationSerializer
 
 
@@ -33,6 +36,10 @@ def notification_list(request):
     # 페이지네이션
     page_number = request.GET.get("page", 1)
     page_size = min(int(request.GET.get("page_size", 20)), 100)
+    if cursor_requested(request):
+        # 앱 무한 스크롤: 최신순(created_at, pk) 키셋, COUNT 없음
+        return cursor_response(request, notifications, page_size, NotificationSerializer)
+
     paginator = Paginator(notifications, page_size)
     page_obj = paginator.get_page(page_number)
 
@@ -52,45 +59,33 @@ def notification_list(request):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def notification_sent(request):
-    """보낸 쪽지(내가 발송한 일정 안내) 목록. 동시 발송분은 하나로 묶어 수신자 표기."""
-    from collections import OrderedDict
-    sent = Notification.objects.filter(
-        actor=request.user, type=Notification.Type.SCHEDULE_NOTICE
-    ).select_related(
-        "user", "user__profile", "related_band", "related_band_schedule"
-    ).order_by("-created_at")
-
-    # (초 단위 시각, 메시지, 일정) 기준 그룹핑
-    groups = OrderedDict()
-    for n in sent:
-        key = (n.created_at.replace(microsecond=0), n.message, n.related_band_schedule_id)
-        g = groups.get(key)
-        if g is None:
-            g = {
-                "message": n.message,
-                "created_at": n.created_at,
-                "band_id": n.related_band_id,
-                "band_name": n.related_band.name if n.related_band else None,
-                "schedule_id": n.related_band_schedule_id,
-                "schedule_title": n.related_band_schedule.title if n.related_band_schedule else None,
-                "recipients": [],
-            }
-            groups[key] = g
-        if n.user:
-            g["recipients"].append({
-                "id": n.user.id,
-                "name": getattr(n.user, "activity_name", "") or getattr(n.user, "real_name", ""),
-            })
-
-    grouped = list(groups.values())
-    for g in grouped:
-        g["recipient_count"] = len(g["recipients"])
+    """보낸 쪽지(내가 발송한 일정 안내) 목록. 발송 건(NoticeBatch) 단위로 수신자 / 읽은 수 표기."""
+    batches = NoticeBatch.objects.filter(sender=request.user).select_related("band", "schedule")
 
     page_number = request.GET.get("page", 1)
     page_size = min(int(request.GET.get("page_size", 20)), 100)
-    paginator = Paginator(grouped, page_size)
+    paginator = Paginator(batches, page_size)
     page_obj = paginator.get_page(page_number)
 
+    results = [
+        {
+            "id": batch.id,
+            "message": batch.message,
+            "created_at": batch.created_at,
+            "band_id": batch.band_id,
+            "band_name": batch.band.name if batch.band else None,
+            "schedule_id": batch.schedule_id,
+            "schedule_title": batch.schedule.title if batch.schedule else None,
+            "recipients": [
+                {"id": user.id, "name": getattr(user, "activity_name", "") or getattr(user, "real_name", "")}
+                for user in batch.recipients
+            ],
+            "recipient_count": batch.recipient_count,
+            "read_count": batch.read_count,
+        }
+        for batch in NoticeBatch.load_recipients(page_obj)
+    ]
+
     return Response({
         "count": paginator.count,
         "page_size": page_size,
@@ -98,7 +93,7 @@ def notification_sent(request):
         "total_pages": paginator.num_pages,
         "next": page_obj.next_page_number() if page_obj.has_next() else None,
         "previous": page_obj.previous_page_number() if page_obj.has_previous() else None,
-        "results": list(page_obj),
+        "results": results,
     })
 
 
@@ -111,8 +106,7 @@ def notification_read(request, notification_id):
     except Notification.DoesNotExist:
         return Response({"error": "알림을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
 
-    notification.is_read = True
-    notification.save(update_fields=["is_read"])
+    notification.mark_read()
 
     return Response({"message": "읽음 처리되었습니다."})
 
@@ -121,9 +115,7 @@ def notification_read(request, notification_id):
 @permission_classes([IsAuthenticated])
 def notification_read_all(request):
     """모든 알림 읽음 처리 API"""
-    count = Notification.objects.filter(
-        user=request.user, is_read=False
-    ).update(is_read=True)
+    count = mark_all_read(request.user)
 
     return Response({"message": f"{count}개의 알림이 읽음 처리되었습니다.", "count": count})
 
@@ -131,10 +123,8 @@ def notification_read_all(request):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def notification_unread_count(request):
-    """읽지 않은 알림 개수 API"""
-    count = Notification.objects.filter(
-        user=request.user, is_read=False
-    ).count()
+    """읽지 않은 알림 개수 API (알림 카운터 — 캐시 우선)"""
+    count = unread_count(request.user.pk)
 
     return Response({"unread_count": count})
 
@@ -158,6 +148,10 @@ def device_token_register(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    # 다른 계정에서 쓰던 토큰이면 이전 소유자 캐시도 비움 (저장 시그널은 새 소유자만 비운다)
+    previous_owner = DeviceToken.objects.filter(token=token).values_list("user_id", flat=True).first()
+    if previous_owner is not None and previous_owner != request.user.pk:
+        invalidate_tokens([previous_owner])
     obj, created = DeviceToken.objects.update_or_create(
         token=token,
         defaults={
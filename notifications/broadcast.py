@@ -0,0 +1,274 @@
+"""여러 사용자 대상 알림 일괄 발송 (공지사항 · 배드민톡 새 글 · 모임 일정/쪽지/가입 신청).
+
+사용자마다 Notification.objects.create() 를 부르면 행마다 알림·카운터·푸시 대기열 쓰기가
+따로 일어나, 수신자가 많으면 저장 요청(공지 등록, 큰 모임의 번개 등록 등)이 수 초~수 분 걸린다.
+여기서는
+- 저장 요청에서는 Broadcast 행만 만들고 (start_broadcast)
+- run_broadcasts 명령이 수신 대상(Broadcast.Audience)의 사용자 id 를 id 순 청크로 읽어 청크마다
+  알림을 bulk_create 하고 (시그널 없음 → 행별 푸시 없음) 그 청크의 토큰을 FCM multicast
+  500개씩 보낸다 (run_broadcast).
+- 청크마다 알림 생성 · 알림 카운터 증가 · 진행 위치(last_user_id) 갱신을 한 트랜잭션으로 묶어
+  중단 후 다시 돌려도 같은 사용자에게 알림이 두 번 생기지 않는다. 푸시는 커밋 뒤에 보낸다.
+- 모임 단위 발송은 모임마다 분당 BAND_RATE_LIMIT 건까지만 만든다. 한도에 걸린 작업은
+  진행 위치를 남긴 채 대기로 돌아가 다음 실행에서 이어간다 (큰 모임 하나가 다른 발송을 막지 않도록).
+- 전체 대상(ALL) 작업은 settings.FCM_BROADCAST_TOPIC 이 있으면 청크마다 multicast 하지 않고
+  알림을 다 만든 뒤 topic 메시지 한 건으로 보낸다 (이때 pushed_count 는 세지 않는다).
+  topic 은 활성 계정의 활성 토큰만 구독하므로 대상이 recipients() 와 같지만, 발생자를 뺄 수는 없어
+  발생자에게 활성 토큰이 있으면 topic 대신 multicast 로 보낸다 (_push_topic).
+
+cron으로 1분마다 실행:
+    * * * * * python manage.py run_broadcasts
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from band.models import BandBookmark, BandMember
+
+from .models import Broadcast, Notification
+from .push import broadcast_topic, send_multicast, send_to_topic, user_tokens
+from .unread import adjust_counts
+
+logger = logging.getLogger(__name__)
+
+# 청크 하나의 수신자 수 (알림 bulk_create 단위)
+CHUNK_SIZE = 1000
+# RUNNING 상태로 이 시간 넘게 진행이 없으면 작업자가 죽은 것으로 보고 이어서 처리
+STALE_AFTER = timedelta(minutes=10)
+# 모임 하나에 분당 만들 수 있는 알림 수 (settings.BROADCAST_BAND_RATE_LIMIT 로 조정)
+BAND_RATE_LIMIT = getattr(settings, "BROADCAST_BAND_RATE_LIMIT", 3000)
+
+
+def start_broadcast(*, type, title, message="", actor=None, audience=Broadcast.Audience.ALL, **related):
+    """발송 작업 등록 (알림 생성/푸시는 run_broadcasts 가 처리).
+
+    related: related_notice / related_band / related_band_schedule 등, 지정 수신자면 recipient_ids,
+             일정 쪽지면 notice_batch
+    """
+    return Broadcast.objects.create(
+        type=type, title=title, message=message, actor=actor, audience=audience, **related
+    )
+
+
+def recipients(broadcast):
+    """수신 대상 사용자 — id 오름차순. 지정 수신자가 아니면 발생자 제외"""
+    users = get_user_model().objects.all()
+    audience = broadcast.audience
+    if audience == Broadcast.Audience.USERS:
+        return users.filter(pk__in=broadcast.recipient_ids).order_by("pk")
+
+    if audience == Broadcast.Audience.BAND:
+        band_id = broadcast.related_band_id
+        users = users.filter(
+            Q(pk__in=BandBookmark.objects.filter(band_id=band_id).values("user_id"))
+            | Q(pk__in=BandMember.objects.filter(band_id=band_id, status="active").values("user_id"))
+        )
+    elif audience == Broadcast.Audience.BAND_MANAGERS:
+        users = users.filter(
+            pk__in=BandMember.objects.filter(
+                band_id=broadcast.related_band_id, role__in=["owner", "admin"], status="active"
+            ).values("user_id")
+        )
+    else:
+        users = users.filter(is_active=True)
+    if broadcast.actor_id:
+        users = users.exclude(pk=broadcast.actor_id)
+    return users.order_by("pk")
+
+
+def _push_topic(broadcast):
+    """이 작업을 topic 메시지로 보낼 때 그 topic (multicast 로 보내야 하면 빈 문자열)"""
+    if broadcast.audience != Broadcast.Audience.ALL:
+        return ""
+    if broadcast.actor_id and user_tokens([broadcast.actor_id])[broadcast.actor_id]:
+        # 발생자 기기도 topic 을 구독하고 있어 topic 으로는 발생자를 뺄 수 없음
+        return ""
+    return broadcast_topic()
+
+
+def push_data(broadcast):
+    """multicast data payload (수신자 공통 — 알림별 id 는 없음)"""
+    return {
+        "type": broadcast.type,
+        "related_notice_id": broadcast.related_notice_id,
+        "related_community_post_id": broadcast.related_community_post_id,
+        "related_band_id": broadcast.related_band_id,
+        "related_band_schedule_id": broadcast.related_band_schedule_id,
+    }
+
+
+def take_band_quota(band_id, wanted, now=None):
+    """이번 분에 band_id 로 만들 수 있는 알림 수 (최대 wanted) 를 가져감.
+
+    분 단위 캐시 버킷에 cache.incr 로 쌓는다 — 작업자가 여럿이어도 모임 합계로 센다.
+    """
+    bucket = int((now if now is not None else time.time()) // 60)
+    key = f"broadcast:band:{band_id}:{bucket}"
+    cache.add(key, 0, timeout=120)
+    try:
+        used = cache.incr(key, wanted)
+    except ValueError:
+        # 그 사이 만료됨
+        cache.set(key, wanted, timeout=120)
+        used = wanted
+    allowed = max(0, min(wanted, BAND_RATE_LIMIT - (used - wanted)))
+    if allowed < wanted:
+        cache.decr(key, wanted - allowed)
+    return allowed
+
+
+def return_band_quota(band_id, unused, now=None):
+    """take_band_quota 로 가져갔지만 쓰지 않은 수를 같은 분 버킷에 돌려줌 (작은 발송이 한도를 먹지 않도록)"""
+    if unused <= 0:
+        return
+    bucket = int((now if now is not None else time.time()) // 60)
+    try:
+        cache.decr(f"broadcast:band:{band_id}:{bucket}", unused)
+    except ValueError:
+        # 버킷이 이미 만료됨
+        pass
+
+
+def claim(broadcast_id, now=None):
+    """대기 중이거나 멈춘(STALE_AFTER) 작업을 RUNNING 으로 잡음. 다른 작업자가 잡았으면 None"""
+    now = now or timezone.now()
+    claimable = Q(status=Broadcast.Status.PENDING) | Q(
+        status=Broadcast.Status.RUNNING, updated_at__lt=now - STALE_AFTER
+    )
+    if not Broadcast.objects.filter(claimable, pk=broadcast_id).update(
+        status=Broadcast.Status.RUNNING, updated_at=now
+    ):
+        return None
+    broadcast = Broadcast.objects.get(pk=broadcast_id)
+    if broadcast.started_at is None:
+        broadcast.started_at = now
+        broadcast.total_count = recipients(broadcast).filter(pk__gt=broadcast.last_user_id).count()
+        broadcast.save(update_fields=["started_at", "total_count"])
+    return broadcast
+
+
+def _notifications(broadcast, user_ids):
+    return [
+        Notification(
+            user_id=user_id,
+            type=broadcast.type,
+            title=broadcast.title,
+            message=broadcast.message,
+            related_notice_id=broadcast.related_notice_id,
+            related_community_post_id=broadcast.related_community_post_id,
+            related_band_id=broadcast.related_band_id,
+            related_band_schedule_id=broadcast.related_band_schedule_id,
+            notice_batch_id=broadcast.notice_batch_id,
+            actor_id=broadcast.actor_id,
+        )
+        for user_id in user_ids
+    ]
+
+
+def _stamp_sent_at(broadcast, user_ids, since):
+    """방금 만든 알림의 생성 시각을 발송 등록 시각으로 맞춤.
+
+    보낸 쪽지 목록은 (발송자, 초 단위 생성 시각, 내용, 일정) 으로 한 번의 발송을 묶는데,
+    청크가 분당 한도로 몇 분에 걸쳐 나뉘어도 같은 발송으로 보이도록 한다.
+    created_at 은 auto_now_add 라 bulk_create 에서 지정할 수 없어 UPDATE 로 바꾼다.
+    """
+    Notification.objects.filter(
+        user_id__in=user_ids,
+        type=broadcast.type,
+        actor_id=broadcast.actor_id,
+        related_band_schedule_id=broadcast.related_band_schedule_id,
+        created_at__gte=since,
+    ).update(created_at=broadcast.created_at)
+
+
+def run_broadcast(broadcast, *, chunk_size=CHUNK_SIZE):
+    """claim 한 작업을 처리. 청크마다 진행 상황을 저장하고 끝나면 DONE.
+
+    모임 단위 작업이 분당 한도에 걸리면 PENDING 으로 돌려놓고 멈춘다 (다음 실행에서 이어서).
+    Returns: 이번 실행에서 알림을 만든 사용자 수
+    """
+    data = push_data(broadcast)
+    rate_limited = broadcast.related_band_id is not None and broadcast.audience != Broadcast.Audience.ALL
+    topic = _push_topic(broadcast)
+    cursor = broadcast.last_user_id
+    total = 0
+    try:
+        while True:
+            quota_time = time.time()
+            limit = take_band_quota(broadcast.related_band_id, chunk_size, quota_time) if rate_limited else chunk_size
+            if not limit:
+                Broadcast.objects.filter(pk=broadcast.pk).update(
+                    status=Broadcast.Status.PENDING, updated_at=timezone.now()
+                )
+                return total
+            user_ids = list(
+                recipients(broadcast).filter(pk__gt=cursor).values_list("pk", flat=True)[:limit]
+            )
+            if rate_limited:
+                return_band_quota(broadcast.related_band_id, limit - len(user_ids), quota_time)
+            if not user_ids:
+                break
+            with transaction.atomic():
+                chunk_started = timezone.now()
+                Notification.objects.bulk_create(_notifications(broadcast, user_ids), batch_size=500)
+                if broadcast.type == Notification.Type.SCHEDULE_NOTICE:
+                    _stamp_sent_at(broadcast, user_ids, chunk_started)
+                adjust_counts(user_ids, broadcast.type, total=1, unread=1)
+                cursor = user_ids[-1]
+                Broadcast.objects.filter(pk=broadcast.pk).update(
+                    last_user_id=cursor,
+                    notified_count=F("notified_count") + len(user_ids),
+                    updated_at=timezone.now(),
+                )
+            total += len(user_ids)
+            pushed = 0 if topic else send_multicast(
+                user_ids, title=broadcast.title, body=broadcast.message, data=data
+            )
+            if pushed:
+                Broadcast.objects.filter(pk=broadcast.pk).update(pushed_count=F("pushed_count") + pushed)
+            if len(user_ids) < limit:
+                # 마지막 청크 — 빈 청크를 확인하러 한 번 더 조회하지 않음
+                break
+    except Exception as exc:
+        logger.exception("알림 일괄 발송 실패 (broadcast %s): %s", broadcast.pk, exc)
+        Broadcast.objects.filter(pk=broadcast.pk).update(
+            status=Broadcast.Status.FAILED, error=str(exc)[:1000], updated_at=timezone.now()
+        )
+        raise
+
+    if topic:
+        send_to_topic(topic, title=broadcast.title, body=broadcast.message, data=data)
+    Broadcast.objects.filter(pk=broadcast.pk).update(
+        status=Broadcast.Status.DONE, finished_at=timezone.now(), updated_at=timezone.now()
+    )
+    return total
+
+
+def run_pending(*, chunk_size=CHUNK_SIZE, limit=None):
+    """대기/멈춘 작업을 생성 순으로 처리. Returns: [(broadcast, 알림 생성 수)]"""
+    now = timezone.now()
+    candidates = Broadcast.objects.filter(
+        Q(status=Broadcast.Status.PENDING)
+        | Q(status=Broadcast.Status.RUNNING, updated_at__lt=now - STALE_AFTER)
+    ).order_by("created_at").values_list("pk", flat=True)
+    if limit:
+        candidates = candidates[:limit]
+
+    results = []
+    for broadcast_id in list(candidates):
+        broadcast = claim(broadcast_id)
+        if broadcast is None:
+            continue
+        try:
+            results.append((broadcast, run_broadcast(broadcast, chunk_size=chunk_size)))
+        except Exception:
+            # 실패는 run_broadcast 가 기록 — 다음 작업은 계속
+            results.append((broadcast, None))
+    return results
@@ -0,0 +1,80 @@
+"""좋아요/댓글처럼 자주 생기는 알림 묶기.
+
+인기 글 하나에 좋아요·댓글이 몰리면 이벤트마다 알림 행과 푸시가 하나씩 생겨 알림 테이블과
+사용자의 기기가 거의 같은 알림으로 가득 찬다. 여기서는 같은 수신자 · 같은 대상(group_key)의
+읽지 않은 알림이 COLLAPSE_WINDOW 안에 있으면 새 행을 만들지 않고 그 행을
+"A님 외 N명이 …" 로 고쳐 맨 위로 올린다 (created_at 갱신).
+
+- 읽은 뒤 생긴 이벤트나 창이 지난 이벤트는 새 알림으로 시작한다
+- 같은 사람이 연달아 만든 이벤트(좋아요 취소 후 다시 좋아요 등)는 세지 않는다.
+  중간에 다른 사람이 끼면 다시 세므로 "외 N명" 은 대략값이다
+- 묶인 알림의 푸시는 사용자마다 PUSH_THROTTLE_SECONDS 에 한 번만 보낸다
+  (새 묶음의 첫 알림은 바로 보내고 그때부터 창이 시작된다)
+- 읽지 않은 알림에만 합치므로 읽지 않은 수 카운터는 바뀌지 않는다
+
+사용:
+    notify_collapsed(
+        user=post.author, type=Notification.Type.LIKE, group_key=f"like:band_post:{post.pk}",
+        actor=liker, title="{actor}님이 회원님의 글을 좋아합니다.",
+        grouped_title="{actor}님 외 {others}명이 회원님의 글을 좋아합니다.",
+        message=post.title[:100], related_band_post=post,
+    )
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Notification, PushOutbox
+
+COLLAPSE_WINDOW = timedelta(hours=6)
+PUSH_THROTTLE_SECONDS = 10 * 60
+
+
+def _push_allowed(user_id):
+    """사용자의 묶음 알림 푸시 창이 비어 있으면 잡고 True"""
+    return cache.add(f"notifications:collapse_push:{user_id}", 1, timeout=PUSH_THROTTLE_SECONDS)
+
+
+def notify_collapsed(*, user, type, group_key, actor, title, grouped_title, message="", **related):
+    """group_key 로 묶이는 알림 생성 또는 기존 알림에 합치기.
+
+    Args:
+        title: 한 건일 때 제목 ("{actor}" 자리에 활동명)
+        grouped_title: 묶였을 때 제목 ("{actor}", "{others}" = 나머지 인원)
+        related: related_band_post 등 연결 대상 (새 알림일 때만 사용)
+    Returns: 만들거나 갱신한 Notification
+    """
+    now = timezone.now()
+    name = actor.activity_name
+    with transaction.atomic():
+        existing = (
+            Notification.objects.select_for_update()
+            .filter(user=user, group_key=group_key, is_read=False, created_at__gte=now - COLLAPSE_WINDOW)
+            .order_by("-created_at")
+            .first()
+        )
+        if existing is None:
+            _push_allowed(user.pk)
+            return Notification.objects.create(
+                user=user,
+                type=type,
+                group_key=group_key,
+                actor=actor,
+                title=title.format(actor=name),
+                message=message,
+                **related,
+            )
+        if existing.actor_id == actor.pk:
+            return existing
+
+        existing.actor = actor
+        existing.actor_count += 1
+        existing.title = grouped_title.format(actor=name, others=existing.actor_count - 1)
+        existing.message = message
+        existing.created_at = now
+        existing.save(update_fields=["actor", "actor_count", "title", "message", "created_at"])
+        if _push_allowed(user.pk):
+            PushOutbox.enqueue(existing)
+    return existing
@@ -0,0 +1,90 @@
+"""발송 건(NoticeBatch) 도입 전에 보낸 일정 쪽지를 발송 건으로 묶어 연결한다.
+
+예전 보낸 쪽지 목록과 같은 기준(발송자, 초 단위 시각, 내용, 일정)으로 묶어 NoticeBatch 를 만들고
+알림의 notice_batch 를 채운다. 발송자(사용자) PK 구간 단위로 처리하며, 이미 연결된 알림은
+건너뛰므로 다시 돌려도 된다. 도입 직후 한 번만 실행하면 된다.
+
+사용 예:
+    python manage.py backfill_notice_batches
+    python manage.py backfill_notice_batches --batch 200 --checkpoint /tmp/notice_batches.json
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from badmintok.chunking import Checkpoint, IdRangeWalker
+from notifications.models import NoticeBatch, Notification
+
+
+class Command(BaseCommand):
+    help = "기존 일정 쪽지를 발송 건(NoticeBatch)으로 묶기"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=500,
+            help="한 번에 처리할 발송자 PK 구간 폭 (기본 500)",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="구간 사이 대기 초 (운영 부하 완화, 기본 0)",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            default="",
+            help="마지막 처리 PK를 기록할 JSON 파일 경로 (중단 후 재개용)",
+        )
+
+    def handle(self, *args, **options):
+        checkpoint = Checkpoint(options["checkpoint"]) if options["checkpoint"] else None
+        walker = IdRangeWalker(
+            get_user_model().objects.all(),
+            chunk_size=options["batch"],
+            checkpoint=checkpoint,
+            sleep=options["sleep"],
+            stdout=self.stdout,
+        )
+
+        created = 0
+        for chunk in walker:
+            rows = Notification.objects.filter(
+                actor_id__in=chunk.queryset.values("pk"),
+                type=Notification.Type.SCHEDULE_NOTICE,
+                notice_batch__isnull=True,
+            ).order_by("actor_id", "created_at", "pk").values_list(
+                "pk", "actor_id", "user_id", "is_read", "message", "created_at",
+                "related_band_id", "related_band_schedule_id",
+            )
+            groups = {}
+            for pk, actor_id, user_id, is_read, message, created_at, band_id, schedule_id in rows.iterator():
+                key = (actor_id, created_at.replace(microsecond=0), message, schedule_id)
+                group = groups.setdefault(key, {"band_id": band_id, "created_at": created_at, "rows": []})
+                group["rows"].append((pk, user_id, is_read))
+
+            with transaction.atomic():
+                for (actor_id, _second, message, schedule_id), group in groups.items():
+                    recipient_ids = sorted({user_id for _pk, user_id, _is_read in group["rows"]})
+                    batch = NoticeBatch.objects.create(
+                        sender_id=actor_id,
+                        band_id=group["band_id"],
+                        schedule_id=schedule_id,
+                        message=message,
+                        recipient_ids=recipient_ids,
+                        recipient_count=len(recipient_ids),
+                        read_count=sum(1 for _pk, _user_id, is_read in group["rows"] if is_read),
+                    )
+                    # auto_now_add 는 생성 때 현재 시각이 들어가므로 원래 발송 시각으로 되돌림
+                    NoticeBatch.objects.filter(pk=batch.pk).update(created_at=group["created_at"])
+                    Notification.objects.filter(pk__in=[pk for pk, _user_id, _is_read in group["rows"]]).update(
+                        notice_batch=batch
+                    )
+            created += len(groups)
+            walker.add_rows(len(groups))
+
+        if checkpoint:
+            checkpoint.clear()
+        self.stdout.write(self.style.SUCCESS(f"완료: 발송 건 {created:,}개 생성"))
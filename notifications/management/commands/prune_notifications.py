@@ -0,0 +1,86 @@
+"""보존 기간이 지난 읽은 알림을 유형별 정책대로 삭제/보관한다 (notifications.retention).
+
+알림 PK 구간 단위로 끝까지 훑으며 구간마다 짧은 트랜잭션으로 처리하고, 진행률과 체크포인트를 남긴다.
+묶음 알림(notify_collapsed)은 새 알림이 합쳐질 때 created_at 이 갱신되므로 PK 순서가 시간 순서가 아니다.
+그래서 새 행을 만나도 멈추지 않고, 구간마다 가장 짧은 보존 기간보다 오래된 행만 골라 본다.
+일정이 끝난 일정 쪽지(읽음 여부 무관)는 기존 cleanup_schedule_notices 가 따로 정리한다.
+
+cron으로 하루 한 번 새벽에 실행:
+    50 4 * * * python manage.py prune_notifications --sleep 0.05
+
+사용 예:
+    python manage.py prune_notifications --dry-run
+    python manage.py prune_notifications --batch 2000 --checkpoint /tmp/prune_notifications.json
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from badmintok.chunking import Checkpoint, IdRangeWalker
+from notifications.models import Notification
+from notifications.retention import policies, prune
+
+
+class Command(BaseCommand):
+    help = "보존 기간이 지난 읽은 알림 정리 (유형별 삭제/보관)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=5000,
+            help="한 번에 처리할 알림 PK 구간 폭 (기본 5000)",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="구간 사이 대기 초 (운영 부하 완화, 기본 0)",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            default="",
+            help="마지막 처리 PK를 기록할 JSON 파일 경로 (중단 후 재개용)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="지우지 않고 정리 대상 수만 출력",
+        )
+
+    def handle(self, *args, **options):
+        active = policies()
+        if not active:
+            self.stdout.write("적용할 보존 정책이 없습니다.")
+            return
+        for type, policy in active.items():
+            action = "보관 후 삭제" if policy.archive else "삭제"
+            self.stdout.write(f"  {Notification.Type(type).label}: 읽은 뒤 {policy.days}일 지나면 {action}")
+
+        now = timezone.now()
+        newest_cutoff = now - timedelta(days=min(policy.days for policy in active.values()))
+        checkpoint = Checkpoint(options["checkpoint"]) if options["checkpoint"] else None
+        walker = IdRangeWalker(
+            Notification.objects.filter(created_at__lt=newest_cutoff),
+            bounds_queryset=Notification.objects.all(),
+            chunk_size=options["batch"],
+            checkpoint=checkpoint,
+            sleep=options["sleep"],
+            stdout=self.stdout,
+        )
+
+        totals = Counter()
+        for chunk in walker:
+            counts = prune(chunk.queryset, active, now, dry_run=options["dry_run"])
+            totals.update(counts)
+            walker.add_rows(sum(counts.values()))
+
+        if checkpoint:
+            checkpoint.clear()
+        for type, n in sorted(totals.items()):
+            self.stdout.write(f"  {Notification.Type(type).label}: {n:,}건")
+        verb = "정리 대상" if options["dry_run"] else "정리"
+        self.stdout.write(self.style.SUCCESS(f"완료: {verb} {sum(totals.values()):,}건"))
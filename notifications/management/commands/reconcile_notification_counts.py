@@ -0,0 +1,76 @@
+"""사용자별 · 유형별 알림 카운터(NotificationCounter)를 실제 알림 개수로 보정.
+
+알림 카운터는 생성/읽음/삭제 때 증감만 하므로 (notifications.unread) 관리자 화면 수정,
+queryset.update() 같은 우회 경로로 조금씩 어긋날 수 있다.
+이 명령은 사용자 PK 구간 단위로 카운터와 실제 개수(GROUP BY 1회)를 비교해 어긋난 것만 고치고
+그 사용자들의 캐시를 지운다. 카운터 도입 전부터 있던 알림은 마이그레이션
+(0016_fill_notification_counters)이 채운다.
+
+cron으로 하루 한 번 새벽에 실행:
+    40 4 * * * python manage.py reconcile_notification_counts --sleep 0.05
+
+사용 예:
+    python manage.py reconcile_notification_counts
+    python manage.py reconcile_notification_counts --batch 2000 --dry-run
+    python manage.py reconcile_notification_counts --checkpoint /tmp/reconcile_notification_counts.json
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from badmintok.chunking import Checkpoint, IdRangeWalker
+from notifications.unread import reconcile_users
+
+
+class Command(BaseCommand):
+    help = "알림 카운터(받은 수/읽지 않은 수)를 실제 개수와 비교해 어긋난 것만 보정"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=1000,
+            help="한 번에 처리할 사용자 PK 구간 폭 (기본 1000)",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="구간 사이 대기 초 (운영 부하 완화, 기본 0)",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            default="",
+            help="마지막 처리 사용자 PK를 기록할 JSON 파일 경로 (중단 후 재개용)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="고치지 않고 어긋난 카운터만 출력",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        checkpoint = Checkpoint(options["checkpoint"]) if options["checkpoint"] else None
+        walker = IdRangeWalker(
+            get_user_model().objects.all(),
+            chunk_size=options["batch"],
+            checkpoint=checkpoint,
+            sleep=options["sleep"],
+            stdout=self.stdout,
+        )
+
+        total = 0
+        for chunk in walker:
+            fixed = reconcile_users(chunk.queryset.values_list("pk", flat=True), apply=not dry_run)
+            for (user_id, type), (before, real) in sorted(fixed.items()):
+                self.stdout.write(
+                    f"  user #{user_id} {type}: 받은 {before[0]} → {real[0]}, 안 읽음 {before[1]} → {real[1]}"
+                )
+            total += len(fixed)
+            walker.add_rows(len(fixed))
+
+        if checkpoint:
+            checkpoint.clear()
+        verb = "어긋난 카운터" if dry_run else "보정"
+        self.stdout.write(self.style.SUCCESS(f"완료: {verb} {total:,}건"))
@@ -0,0 +1,51 @@
+"""등록된 알림 일괄 발송 작업(Broadcast)을 처리한다.
+
+공지사항 · 배드민톡 새 글 · 모임 일정 등록 · 일정 쪽지 · 가입/참가 신청 때는 작업만 등록되고,
+이 명령이 수신 대상을 id 순 청크로 나눠 알림을 bulk_create 하고 FCM multicast(토큰 500개씩)로
+푸시한다. 모임 단위 발송은 모임마다 분당 한도까지만 만들고 나머지는 다음 실행에서 이어간다.
+진행 상황은 관리자 "알림 일괄 발송" 목록에서 볼 수 있다.
+겹쳐 실행돼도 작업마다 처리권을 잡으므로 같은 작업을 두 작업자가 돌리지 않고,
+중단된 작업(10분 넘게 진행 없음)은 마지막 처리 사용자 다음부터 이어서 처리한다.
+
+운영(docker-compose.prod.yml)에서는 broadcast-worker 컨테이너가 15초 간격으로 반복 실행한다.
+컨테이너 없이 돌릴 때는 cron으로 1분마다 실행:
+    * * * * * python manage.py run_broadcasts
+
+사용 예:
+    python manage.py run_broadcasts
+    python manage.py run_broadcasts --chunk 500 --limit 1
+"""
+from django.core.management.base import BaseCommand
+
+from notifications.broadcast import CHUNK_SIZE, run_pending
+
+
+class Command(BaseCommand):
+    help = "대기 중인 알림 일괄 발송 작업 처리 (청크 bulk_create + FCM multicast)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk",
+            type=int,
+            default=CHUNK_SIZE,
+            help=f"청크 하나의 수신자 수 (기본 {CHUNK_SIZE})",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=0,
+            help="이번 실행에서 처리할 최대 작업 수 (기본 0: 전부)",
+        )
+
+    def handle(self, *args, **options):
+        results = run_pending(chunk_size=max(options["chunk"], 1), limit=options["limit"] or None)
+        for broadcast, created in results:
+            if created is None:
+                self.stdout.write(self.style.ERROR(f"#{broadcast.pk} {broadcast.title}: 실패"))
+                continue
+            broadcast.refresh_from_db()
+            self.stdout.write(
+                f"#{broadcast.pk} {broadcast.title}: 알림 {created:,}건 생성, "
+                f"푸시 누적 {broadcast.pushed_count:,}건"
+            )
+        self.stdout.write(self.style.SUCCESS(f"완료: 작업 {len(results)}건"))
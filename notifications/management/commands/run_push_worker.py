@@ -0,0 +1,120 @@
+"""푸시 발송 대기열(PushOutbox)을 처리한다.
+
+알림이 저장될 때 같은 트랜잭션에 대기열 행이 쌓이고, 이 명령이 SKIP LOCKED 로 행을
+나눠 잡아 FCM 으로 모아 보낸다 (내용이 같은 건은 multicast, 나머지는 send_each).
+일시 오류는 지수 백오프로 재시도하고 6번 실패하면 관리자 "푸시 발송 대기열"에 실패로 남는다.
+여러 개를 겹쳐 실행해도 같은 행을 두 번 보내지 않는다.
+묶음마다 전체 발송 topic 구독/해제 대기열(TopicOutbox)도 함께 반영한다.
+
+묶음마다 처리량(건/초)과 지연(대기열에 들어온 뒤 발송까지 걸린 시간)을 출력한다.
+
+운영(docker-compose.prod.yml)에서는 push-worker 컨테이너가 --max-seconds 55 로 끊임없이 반복 실행한다.
+컨테이너 없이 돌릴 때는 cron으로 1분마다, 다음 실행 직전까지 대기열을 계속 비우도록 실행:
+    * * * * * python manage.py run_push_worker --max-seconds 55
+
+사용 예:
+    python manage.py run_push_worker                 # 대기열을 비우고 종료
+    python manage.py run_push_worker --batch 200 --max-seconds 55 --idle-sleep 2
+    python manage.py run_push_worker --stats         # 대기열 현황만 출력
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications import push
+from notifications.outbox import BATCH_SIZE, backlog, purge_sent, run_once, sync_topic
+
+
+class Command(BaseCommand):
+    help = "푸시 발송 대기열 처리 (SKIP LOCKED 로 나눠 잡아 FCM 일괄 발송, 실패 시 백오프 재시도)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=BATCH_SIZE,
+            help=f"한 번에 잡아 보낼 행 수 (기본 {BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--max-seconds",
+            type=float,
+            default=0,
+            help="이 시간 동안 대기열이 비어도 기다리며 계속 처리 (기본 0: 비면 바로 종료)",
+        )
+        parser.add_argument(
+            "--idle-sleep",
+            type=float,
+            default=1.0,
+            help="대기열이 비었을 때 다시 확인하기까지 대기 초 (기본 1)",
+        )
+        parser.add_argument(
+            "--purge-days",
+            type=int,
+            default=7,
+            help="종료 전에 이 일수가 지난 발송 완료 행 삭제 (기본 7, 0이면 삭제 안 함)",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="발송하지 않고 대기열 현황만 출력",
+        )
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self._write_backlog()
+            return
+
+        if not push.is_enabled():
+            self.stdout.write(self.style.WARNING("FCM 비활성 — 대기열을 그대로 둡니다."))
+            return
+
+        started = time.monotonic()
+        deadline = started + options["max_seconds"]
+        claimed = sent = retried = failed = topic_synced = 0
+        max_lag = 0.0
+        while True:
+            stats = run_once(max(options["batch"], 1))
+            synced = sync_topic()
+            topic_synced += synced
+            if synced:
+                self.stdout.write(f"  topic 구독 변경 {synced:,}건 반영")
+            if not stats.claimed:
+                if synced:
+                    continue
+                if time.monotonic() + options["idle_sleep"] >= deadline:
+                    break
+                time.sleep(options["idle_sleep"])
+                continue
+
+            claimed += stats.claimed
+            sent += stats.sent
+            retried += stats.retried
+            failed += stats.failed
+            max_lag = max(max_lag, stats.max_lag)
+            rate = stats.claimed / stats.elapsed if stats.elapsed else 0
+            self.stdout.write(
+                f"  {stats.claimed:,}건: 완료 {stats.sent:,} / 재시도 {stats.retried:,} / 실패 {stats.failed:,}, "
+                f"토큰 {stats.delivered:,}/{stats.tokens:,} 성공, {rate:,.0f}건/초, "
+                f"지연 평균 {stats.avg_lag:.1f}초 · 최대 {stats.max_lag:.1f}초"
+            )
+            if options["max_seconds"] and time.monotonic() >= deadline:
+                break
+
+        if options["purge_days"]:
+            purged = purge_sent(options["purge_days"])
+            if purged:
+                self.stdout.write(f"발송 완료 {purged:,}건 삭제 ({options['purge_days']}일 경과)")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"완료: {claimed:,}건 처리 (발송 {sent:,} / 재시도 대기 {retried:,} / 실패 {failed:,}), "
+            f"topic 구독 변경 {topic_synced:,}건, {elapsed:.1f}초, 최대 지연 {max_lag:.1f}초"
+        ))
+
+    def _write_backlog(self):
+        stats = backlog()
+        self.stdout.write(
+            f"보낼 차례 {stats['due']:,}건 (가장 오래된 것 {stats['oldest_lag']:.0f}초 전), "
+            f"재시도 대기 {stats['waiting_retry']:,}건, 실패 {stats['failed']:,}건, "
+            f"topic 구독 변경 대기 {stats['topic_pending']:,}건"
+        )
@@ -0,0 +1,80 @@
+"""이미 등록된 기기 토큰을 전체 발송 FCM topic(settings.FCM_BROADCAST_TOPIC)에 구독시킨다.
+
+topic 구독은 토큰 등록/삭제 때 대기열(TopicOutbox)을 거쳐 run_push_worker 가 반영하므로,
+topic 을 처음 켜거나 이름을 바꾸기 전부터 있던 토큰은 구독되어 있지 않다.
+이 명령이 활성 계정의 활성 토큰을 DeviceToken PK 구간 단위로 읽어 FCM 요청 하나에 1000개씩 구독시킨다.
+같은 토큰을 다시 구독해도 결과는 같으므로 여러 번 돌려도 된다.
+
+topic 을 켜거나 바꾼 뒤 한 번 실행:
+    python manage.py subscribe_broadcast_topic
+
+사용 예:
+    python manage.py subscribe_broadcast_topic --dry-run
+    python manage.py subscribe_broadcast_topic --batch 5000 --sleep 0.2 --checkpoint /tmp/subscribe_topic.json
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from badmintok.chunking import Checkpoint, IdRangeWalker
+from notifications import push
+from notifications.models import DeviceToken
+
+
+class Command(BaseCommand):
+    help = "기존 활성 기기 토큰을 전체 발송 FCM topic 에 구독"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=push.TOPIC_BATCH,
+            help=f"한 번에 처리할 토큰 PK 구간 폭 (기본 {push.TOPIC_BATCH})",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="구간 사이 대기 초 (FCM 요청 간격, 기본 0)",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            default="",
+            help="마지막 처리 토큰 PK를 기록할 JSON 파일 경로 (중단 후 재개용)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="구독하지 않고 대상 토큰 수만 출력",
+        )
+
+    def handle(self, *args, **options):
+        topic = push.broadcast_topic()
+        if not topic:
+            raise CommandError("FCM_BROADCAST_TOPIC 이 설정되어 있지 않습니다.")
+        dry_run = options["dry_run"]
+        if not dry_run and not push.is_enabled():
+            raise CommandError("FCM 비활성 — 서비스 계정 설정을 확인하세요.")
+
+        checkpoint = Checkpoint(options["checkpoint"]) if options["checkpoint"] else None
+        walker = IdRangeWalker(
+            DeviceToken.objects.filter(is_active=True, user__is_active=True),
+            bounds_queryset=DeviceToken.objects.all(),
+            chunk_size=options["batch"],
+            checkpoint=checkpoint,
+            sleep=options["sleep"],
+            stdout=self.stdout,
+        )
+
+        total = 0
+        for chunk in walker:
+            tokens = list(chunk.queryset.values_list("token", flat=True))
+            if tokens and not dry_run and not push.subscribe_broadcast_topic(tokens):
+                # 체크포인트는 이전 구간까지만 남아 있으므로 다시 돌리면 이 구간부터 이어서 처리
+                raise CommandError(f"FCM topic({topic}) 구독 요청 실패 — 로그를 확인하세요.")
+            total += len(tokens)
+            walker.add_rows(len(tokens))
+
+        if checkpoint:
+            checkpoint.clear()
+        verb = "구독 대상" if dry_run else "구독"
+        self.stdout.write(self.style.SUCCESS(f"완료: topic({topic}) {verb} {total:,}개"))
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('badmintok', '0014_promotion'),
+        ('community', '0025_post_content_summary'),
+        ('notifications', '0008_alter_notification_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Broadcast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(choices=[('comment', '댓글'), ('reply', '답글'), ('notice', '공지사항'), ('band', '모임'), ('schedule', '일정'), ('schedule_notice', '일정 알림'), ('application', '참가신청'), ('membership', '가입'), ('like', '좋아요'), ('badmintok_post', '배드민톡 새 글'), ('inquiry', '문의 답변'), ('match_next_game', '다음 경기'), ('partner_request', '파트너 신청'), ('partner_approved', '파트너 확정')], max_length=20, verbose_name='알림 유형')),
+                ('title', models.CharField(max_length=200, verbose_name='제목')),
+                ('message', models.TextField(blank=True, verbose_name='내용')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '발송 중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=10, verbose_name='상태')),
+                ('total_count', models.PositiveIntegerField(default=0, verbose_name='대상 수')),
+                ('notified_count', models.PositiveIntegerField(default=0, verbose_name='알림 생성 수')),
+                ('pushed_count', models.PositiveIntegerField(default=0, verbose_name='푸시 성공 수')),
+                ('last_user_id', models.PositiveBigIntegerField(default=0, verbose_name='마지막 처리 사용자 id')),
+                ('error', models.TextField(blank=True, verbose_name='오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='시작일')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='완료일')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='최근 진행')),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='발생자')),
+                ('related_community_post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='broadcasts', to='community.post', verbose_name='관련 커뮤니티 게시글')),
+                ('related_notice', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='broadcasts', to='badmintok.notice', verbose_name='관련 공지사항')),
+            ],
+            options={
+                'verbose_name': '전체 알림 발송',
+                'verbose_name_plural': '전체 알림 발송',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='notificatio_status_8883ac_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:06
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0009_broadcast'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PushOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200, verbose_name='제목')),
+                ('body', models.TextField(blank=True, verbose_name='내용')),
+                ('data', models.JSONField(blank=True, default=dict, verbose_name='data payload')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('sending', '발송 중'), ('sent', '발송 완료'), ('failed', '실패')], default='pending', max_length=10, verbose_name='상태')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='다음 시도')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='처리 기한')),
+                ('last_error', models.TextField(blank=True, verbose_name='최근 오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='발송일')),
+                ('notification', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='push_outbox', to='notifications.notification', verbose_name='알림')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='수신자')),
+            ],
+            options={
+                'verbose_name': '푸시 발송 대기열',
+                'verbose_name_plural': '푸시 발송 대기열',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='notificatio_status_0eac0f_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0010_push_outbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(choices=[('comment', '댓글'), ('reply', '답글'), ('notice', '공지사항'), ('band', '모임'), ('schedule', '일정'), ('schedule_notice', '일정 알림'), ('application', '참가신청'), ('membership', '가입'), ('like', '좋아요'), ('badmintok_post', '배드민톡 새 글'), ('inquiry', '문의 답변'), ('match_next_game', '다음 경기'), ('partner_request', '파트너 신청'), ('partner_approved', '파트너 확정')], max_length=20, verbose_name='알림 유형')),
+                ('total_count', models.PositiveIntegerField(default=0, verbose_name='받은 알림 수')),
+                ('unread_count', models.PositiveIntegerField(default=0, verbose_name='읽지 않은 알림 수')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='사용자')),
+            ],
+            options={
+                'verbose_name': '알림 카운터',
+                'verbose_name_plural': '알림 카운터',
+                'constraints': [models.UniqueConstraint(fields=('user', 'type'), name='uniq_notification_counter_user_type')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('band', '0038_matchsession_auto'),
+        ('notifications', '0011_notification_counter'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='broadcast',
+            options={'ordering': ['-created_at'], 'verbose_name': '알림 일괄 발송', 'verbose_name_plural': '알림 일괄 발송'},
+        ),
+        migrations.AddField(
+            model_name='broadcast',
+            name='audience',
+            field=models.CharField(choices=[('all', '전체 활성 사용자'), ('band', '모임 멤버 + 북마크'), ('band_managers', '모임장/관리자'), ('users', '지정 사용자')], default='all', max_length=20, verbose_name='수신 대상'),
+        ),
+        migrations.AddField(
+            model_name='broadcast',
+            name='recipient_ids',
+            field=models.JSONField(blank=True, default=list, verbose_name='지정 수신자'),
+        ),
+        migrations.AddField(
+            model_name='broadcast',
+            name='related_band',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='broadcasts', to='band.band', verbose_name='관련 밴드'),
+        ),
+        migrations.AddField(
+            model_name='broadcast',
+            name='related_band_schedule',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='broadcasts', to='band.bandschedule', verbose_name='관련 밴드 일정'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0012_broadcast_audience'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='actor_count',
+            field=models.PositiveIntegerField(default=1, verbose_name='묶인 수'),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='group_key',
+            field=models.CharField(blank=True, max_length=100, verbose_name='묶음 키'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'group_key'], name='notificatio_user_id_3c2861_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0013_notification_group'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notification_id', models.PositiveBigIntegerField(verbose_name='원래 알림 id')),
+                ('type', models.CharField(choices=[('comment', '댓글'), ('reply', '답글'), ('notice', '공지사항'), ('band', '모임'), ('schedule', '일정'), ('schedule_notice', '일정 알림'), ('application', '참가신청'), ('membership', '가입'), ('like', '좋아요'), ('badmintok_post', '배드민톡 새 글'), ('inquiry', '문의 답변'), ('match_next_game', '다음 경기'), ('partner_request', '파트너 신청'), ('partner_approved', '파트너 확정')], max_length=20, verbose_name='알림 유형')),
+                ('title', models.CharField(max_length=200, verbose_name='제목')),
+                ('message', models.TextField(blank=True, verbose_name='내용')),
+                ('actor_id', models.PositiveBigIntegerField(blank=True, null=True, verbose_name='발생자 id')),
+                ('data', models.JSONField(blank=True, default=dict, verbose_name='연결 대상')),
+                ('created_at', models.DateTimeField(verbose_name='생성일')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='보관일')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='수신자')),
+            ],
+            options={
+                'verbose_name': '보관된 알림',
+                'verbose_name_plural': '보관된 알림',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='notificatio_user_id_fbf7c9_idx')],
+            },
+        ),
+    ]
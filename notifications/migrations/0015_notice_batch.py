@@ -0,0 +1,50 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('band', '0038_matchsession_auto'),
+        ('notifications', '0014_notification_archive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NoticeBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('message', models.TextField(verbose_name='내용')),
+                ('recipient_ids', models.JSONField(blank=True, default=list, verbose_name='수신자')),
+                ('recipient_count', models.PositiveIntegerField(default=0, verbose_name='수신자 수')),
+                ('read_count', models.PositiveIntegerField(default=0, verbose_name='읽은 수')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='발송일')),
+                ('band', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notice_batches', to='band.band', verbose_name='밴드')),
+                ('schedule', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notice_batches', to='band.bandschedule', verbose_name='일정')),
+                ('sender', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notice_batches', to=settings.AUTH_USER_MODEL, verbose_name='발송자')),
+            ],
+            options={
+                'verbose_name': '쪽지 발송 건',
+                'verbose_name_plural': '쪽지 발송 건',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='broadcast',
+            name='notice_batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='broadcasts', to='notifications.noticebatch', verbose_name='쪽지 발송 건'),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='notice_batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notifications', to='notifications.noticebatch', verbose_name='쪽지 발송 건'),
+        ),
+        migrations.AddIndex(
+            model_name='noticebatch',
+            index=models.Index(fields=['sender', '-created_at'], name='notificatio_sender__080c9f_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+"""카운터 도입 전부터 있던 알림으로 NotificationCounter 채우기.
+
+카운터는 알림 생성/읽음/삭제 때 증감만 하므로, 채우지 않으면 기존 알림의 배지/받은 쪽지 수가
+reconcile_notification_counts 를 돌리기 전까지 0 으로 보인다.
+알림의 사용자 id 구간마다 (사용자, 유형) 별 실제 개수를 GROUP BY 로 세어 카운터를 덮어쓴다.
+"""
+from django.db import migrations
+from django.db.models import Count, Max, Q
+
+USER_CHUNK = 1000
+
+
+def fill_counters(apps, schema_editor):
+    Notification = apps.get_model("notifications", "Notification")
+    NotificationCounter = apps.get_model("notifications", "NotificationCounter")
+
+    last_user_id = Notification.objects.aggregate(n=Max("user_id"))["n"] or 0
+    for start in range(0, last_user_id + 1, USER_CHUNK):
+        user_range = {"user_id__gte": start, "user_id__lt": start + USER_CHUNK}
+        rows = [
+            NotificationCounter(user_id=user_id, type=type, total_count=total, unread_count=unread)
+            for user_id, type, total, unread in Notification.objects.filter(**user_range)
+            .order_by()
+            .values_list("user_id", "type")
+            .annotate(total=Count("pk"), unread=Count("pk", filter=Q(is_read=False)))
+            .values_list("user_id", "type", "total", "unread")
+        ]
+        NotificationCounter.objects.filter(**user_range).delete()
+        NotificationCounter.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0015_notice_batch'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
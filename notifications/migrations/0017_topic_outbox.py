@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0016_fill_notification_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TopicOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=255, verbose_name='FCM 토큰')),
+                ('subscribe', models.BooleanField(help_text='False 면 구독 해제', verbose_name='구독')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+            ],
+            options={
+                'verbose_name': 'topic 구독 대기열',
+                'verbose_name_plural': 'topic 구독 대기열',
+            },
+        ),
+    ]
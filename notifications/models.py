@@ -1,5 +1,7 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -96,7 +98,23 @@ class Notification(models.Model):
         verbose_name=_("발생자"),
     )
 
+    # 일정 쪽지의 발송 건 (보낸 쪽지 목록 / 읽음 수 집계용)
+    notice_batch = models.ForeignKey(
+        "NoticeBatch",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="notifications",
+        verbose_name=_("쪽지 발송 건"),
+    )
+
+    # 좋아요/댓글처럼 자주 생기는 알림을 한 행으로 묶는 키 (notifications.collapse), 묶지 않으면 빈 값
+    group_key = models.CharField(_("묶음 키"), max_length=100, blank=True)
+    # 묶인 이벤트 수 ("A님 외 N명")
+    actor_count = models.PositiveIntegerField(_("묶인 수"), default=1)
+
     is_read = models.BooleanField(_("읽음 여부"), default=False)
+    # 묶인 알림은 마지막 이벤트 시각으로 갱신된다
     created_at = models.DateTimeField(_("생성일"), auto_now_add=True)
 
     class Meta:
@@ -106,11 +124,111 @@ class Notification(models.Model):
         indexes = [
             models.Index(fields=["user", "-created_at"]),
             models.Index(fields=["user", "is_read"]),
+            models.Index(fields=["user", "group_key"]),
         ]
 
     def __str__(self):
         return f"[{self.get_type_display()}] {self.title} → {self.user}"
 
+    def save(self, *args, **kwargs):
+        # 새 알림은 같은 트랜잭션에서 유형별 카운터를 올리고 푸시 대기열에 넣는다 (발송은 run_push_worker)
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                from .unread import adjust_counts
+
+                adjust_counts([self.user_id], self.type, total=1, unread=0 if self.is_read else 1)
+                PushOutbox.enqueue(self)
+
+    def mark_read(self):
+        """읽음 처리. 실제로 안 읽은 상태였을 때만 카운터를 내림. Returns: 바뀌었는지"""
+        from .unread import adjust_counts
+
+        with transaction.atomic():
+            changed = Notification.objects.filter(pk=self.pk, is_read=False).update(is_read=True)
+            if changed:
+                adjust_counts([self.user_id], self.type, unread=-1)
+                if self.notice_batch_id:
+                    NoticeBatch.objects.filter(pk=self.notice_batch_id).update(read_count=F("read_count") + 1)
+        self.is_read = True
+        return bool(changed)
+
+    def push_data(self):
+        """FCM data payload — 앱 라우팅용 type / notification_id / related_* id"""
+        return {
+            "type": self.type,
+            "notification_id": self.id,
+            "related_band_id": self.related_band_id,
+            "related_band_schedule_id": self.related_band_schedule_id,
+            "related_band_post_id": self.related_band_post_id,
+            "related_community_post_id": self.related_community_post_id,
+            "related_notice_id": self.related_notice_id,
+            "related_inquiry_id": self.related_inquiry_id,
+        }
+
+
+class NotificationArchive(models.Model):
+    """보존 기간이 지나 알림 테이블에서 옮긴 읽은 알림 (notifications.retention).
+
+    연결 대상은 FK 대신 id 만 data 에 남긴다 (대상이 지워져도 기록은 유지).
+    """
+
+    notification_id = models.PositiveBigIntegerField(_("원래 알림 id"))
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("수신자"),
+    )
+    type = models.CharField(_("알림 유형"), max_length=20, choices=Notification.Type.choices)
+    title = models.CharField(_("제목"), max_length=200)
+    message = models.TextField(_("내용"), blank=True)
+    actor_id = models.PositiveBigIntegerField(_("발생자 id"), null=True, blank=True)
+    data = models.JSONField(_("연결 대상"), default=dict, blank=True)
+    created_at = models.DateTimeField(_("생성일"))
+    archived_at = models.DateTimeField(_("보관일"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("보관된 알림")
+        verbose_name_plural = _("보관된 알림")
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at"]),
+        ]
+
+    def __str__(self):
+        return f"[{self.get_type_display()}] {self.title} → {self.user_id}"
+
+
+class NotificationCounter(models.Model):
+    """사용자별 · 유형별 받은 알림 수와 읽지 않은 알림 수 (비정규화 카운터).
+
+    알림 생성/읽음/삭제 때 F() 로 증감하고 (notifications.unread), 배지 API 와
+    마이페이지는 COUNT 대신 이 값을 공유 캐시를 거쳐 읽는다.
+    어긋난 값은 reconcile_notification_counts 명령이 실제 개수로 맞춘다.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("사용자"),
+    )
+    type = models.CharField(_("알림 유형"), max_length=20, choices=Notification.Type.choices)
+    total_count = models.PositiveIntegerField(_("받은 알림 수"), default=0)
+    unread_count = models.PositiveIntegerField(_("읽지 않은 알림 수"), default=0)
+
+    class Meta:
+        verbose_name = _("알림 카운터")
+        verbose_name_plural = _("알림 카운터")
+        constraints = [
+            models.UniqueConstraint(fields=["user", "type"], name="uniq_notification_counter_user_type"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} / {self.type}: {self.unread_count}/{self.total_count}"
+
 
 class DeviceToken(models.Model):
     """FCM 디바이스 토큰"""
@@ -143,3 +261,257 @@ class DeviceToken(models.Model):
 
     def __str__(self):
         return f"{self.user} / {self.platform} / {self.token[:16]}..."
+
+
+class Broadcast(models.Model):
+    """여러 사용자 대상 알림 발송 작업 (공지사항 · 배드민톡 새 글 · 모임 일정/쪽지/가입 신청).
+
+    저장 요청에서는 이 행만 만들고, run_broadcasts 명령이 수신자를 id 순으로 나눠
+    알림을 bulk_create 하고 FCM multicast 로 푸시한다 (notifications.broadcast).
+    진행 상황(처리한 마지막 사용자 id, 생성/푸시 수)은 청크마다 이 행에 기록된다.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("대기")
+        RUNNING = "running", _("발송 중")
+        DONE = "done", _("완료")
+        FAILED = "failed", _("실패")
+
+    class Audience(models.TextChoices):
+        ALL = "all", _("전체 활성 사용자")
+        BAND = "band", _("모임 멤버 + 북마크")
+        BAND_MANAGERS = "band_managers", _("모임장/관리자")
+        USERS = "users", _("지정 사용자")
+
+    type = models.CharField(_("알림 유형"), max_length=20, choices=Notification.Type.choices)
+    title = models.CharField(_("제목"), max_length=200)
+    message = models.TextField(_("내용"), blank=True)
+    audience = models.CharField(_("수신 대상"), max_length=20, choices=Audience.choices, default=Audience.ALL)
+    # Audience.USERS 일 때의 수신자 id 목록
+    recipient_ids = models.JSONField(_("지정 수신자"), default=list, blank=True)
+    related_band = models.ForeignKey(
+        "band.Band",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="broadcasts",
+        verbose_name=_("관련 밴드"),
+    )
+    related_band_schedule = models.ForeignKey(
+        "band.BandSchedule",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="broadcasts",
+        verbose_name=_("관련 밴드 일정"),
+    )
+    related_notice = models.ForeignKey(
+        "badmintok.Notice",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="broadcasts",
+        verbose_name=_("관련 공지사항"),
+    )
+    related_community_post = models.ForeignKey(
+        "community.Post",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="broadcasts",
+        verbose_name=_("관련 커뮤니티 게시글"),
+    )
+    notice_batch = models.ForeignKey(
+        "NoticeBatch",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="broadcasts",
+        verbose_name=_("쪽지 발송 건"),
+    )
+    # 발생자 (수신자에서 제외)
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("발생자"),
+    )
+
+    status = models.CharField(_("상태"), max_length=10, choices=Status.choices, default=Status.PENDING)
+    total_count = models.PositiveIntegerField(_("대상 수"), default=0)
+    notified_count = models.PositiveIntegerField(_("알림 생성 수"), default=0)
+    pushed_count = models.PositiveIntegerField(_("푸시 성공 수"), default=0)
+    last_user_id = models.PositiveBigIntegerField(_("마지막 처리 사용자 id"), default=0)
+    error = models.TextField(_("오류"), blank=True)
+    created_at = models.DateTimeField(_("생성일"), auto_now_add=True)
+    started_at = models.DateTimeField(_("시작일"), null=True, blank=True)
+    finished_at = models.DateTimeField(_("완료일"), null=True, blank=True)
+    # 청크마다 갱신 — 오래 멈춘 RUNNING 작업 재개 판단용
+    updated_at = models.DateTimeField(_("최근 진행"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("알림 일괄 발송")
+        verbose_name_plural = _("알림 일괄 발송")
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"[{self.get_type_display()}] {self.title} ({self.get_status_display()})"
+
+    @property
+    def progress(self):
+        """진행률 (0~100)"""
+        if self.status == self.Status.DONE:
+            return 100
+        if not self.total_count:
+            return 0
+        return min(100, self.notified_count * 100 // self.total_count)
+
+
+class NoticeBatch(models.Model):
+    """일정 쪽지 발송 건 (모임장 → 참가자 한 번 보낸 것).
+
+    수신자별 알림은 run_broadcasts 가 나중에 청크로 만들고 각 알림이 notice_batch 로 이 행을 가리킨다.
+    보낸 쪽지 목록은 이 행만 읽고, 읽음 수는 수신자가 읽을 때 조건부 UPDATE 로 올린다.
+    """
+
+    sender = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="notice_batches",
+        verbose_name=_("발송자"),
+    )
+    band = models.ForeignKey(
+        "band.Band",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="notice_batches",
+        verbose_name=_("밴드"),
+    )
+    schedule = models.ForeignKey(
+        "band.BandSchedule",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="notice_batches",
+        verbose_name=_("일정"),
+    )
+    message = models.TextField(_("내용"))
+    recipient_ids = models.JSONField(_("수신자"), default=list, blank=True)
+    recipient_count = models.PositiveIntegerField(_("수신자 수"), default=0)
+    read_count = models.PositiveIntegerField(_("읽은 수"), default=0)
+    created_at = models.DateTimeField(_("발송일"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("쪽지 발송 건")
+        verbose_name_plural = _("쪽지 발송 건")
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["sender", "-created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.sender} → {self.recipient_count}명: {self.message[:30]}"
+
+    @staticmethod
+    def load_recipients(batches):
+        """발송 건마다 recipients (수신자 User 목록, 탈퇴자 제외) 를 붙인다 — 페이지 전체에 쿼리 한 번"""
+        from django.contrib.auth import get_user_model
+
+        batches = list(batches)
+        users = get_user_model().objects.select_related("profile").in_bulk(
+            {uid for batch in batches for uid in batch.recipient_ids}
+        )
+        for batch in batches:
+            batch.recipients = [users[uid] for uid in batch.recipient_ids if uid in users]
+        return batches
+
+
+class PushOutbox(models.Model):
+    """푸시 발송 대기열.
+
+    알림 저장과 같은 트랜잭션에 한 행씩 기록되고, run_push_worker 명령이
+    SELECT ... FOR UPDATE SKIP LOCKED 로 행을 나눠 잡아 발송한다 (notifications.outbox).
+    일시 오류는 지수 백오프로 재시도하고, MAX_ATTEMPTS 를 넘기면 실패로 남긴다.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("대기")
+        SENDING = "sending", _("발송 중")
+        SENT = "sent", _("발송 완료")
+        FAILED = "failed", _("실패")
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("수신자"),
+    )
+    notification = models.ForeignKey(
+        Notification,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="push_outbox",
+        verbose_name=_("알림"),
+    )
+    title = models.CharField(_("제목"), max_length=200)
+    body = models.TextField(_("내용"), blank=True)
+    data = models.JSONField(_("data payload"), default=dict, blank=True)
+
+    status = models.CharField(_("상태"), max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(_("시도 횟수"), default=0)
+    next_attempt_at = models.DateTimeField(_("다음 시도"), default=timezone.now)
+    # 작업자가 잡은 행의 처리 기한 — 지나면 작업자가 죽은 것으로 보고 다시 잡는다
+    locked_until = models.DateTimeField(_("처리 기한"), null=True, blank=True)
+    last_error = models.TextField(_("최근 오류"), blank=True)
+    created_at = models.DateTimeField(_("생성일"), auto_now_add=True)
+    sent_at = models.DateTimeField(_("발송일"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("푸시 발송 대기열")
+        verbose_name_plural = _("푸시 발송 대기열")
+        ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.title} → {self.user_id} ({self.get_status_display()})"
+
+    @classmethod
+    def enqueue(cls, notification):
+        """알림 하나의 푸시를 대기열에 추가"""
+        return cls.objects.create(
+            user_id=notification.user_id,
+            notification=notification,
+            title=notification.title,
+            body=notification.message or "",
+            data={k: v for k, v in notification.push_data().items() if v is not None},
+        )
+
+
+class TopicOutbox(models.Model):
+    """전체 발송 FCM topic 구독/해제 대기열.
+
+    토큰 등록/삭제, 계정 비활성화 때 한 행씩 기록되고 run_push_worker 가 모아서
+    구독/해제 요청을 보낸다 (notifications.outbox.sync_topic). 요청 스레드에서 FCM 을 부르지 않기 위함.
+    토큰 행이 지워진 뒤에도 해제해야 하므로 DeviceToken 을 참조하지 않고 토큰 문자열을 들고 있다.
+    """
+
+    token = models.CharField(_("FCM 토큰"), max_length=255)
+    subscribe = models.BooleanField(_("구독"), help_text=_("False 면 구독 해제"))
+    created_at = models.DateTimeField(_("생성일"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("topic 구독 대기열")
+        verbose_name_plural = _("topic 구독 대기열")
+
+    def __str__(self):
+        action = "구독" if self.subscribe else "해제"
+        return f"{self.token[:16]}... {action}"
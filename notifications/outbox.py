@@ -0,0 +1,206 @@
+"""푸시 발송 대기열(PushOutbox) 처리.
+
+알림 post_save 에서 FCM 을 바로 부르면 Firebase 가 느리거나 장애일 때 요청이 그만큼
+멈추고, 실패한 푸시는 다시 보낼 방법이 없었다. 이제 알림 저장과 같은 트랜잭션에
+PushOutbox 행만 쓰고 (Notification.save), run_push_worker 명령이
+- 보낼 때가 된 행을 SELECT ... FOR UPDATE SKIP LOCKED 로 잡아 SENDING 으로 바꾸고 (claim)
+  — 작업자 여러 개가 겹쳐 돌아도 같은 행을 두 번 잡지 않는다
+- 수신자 토큰을 캐시(push.user_tokens)에서 한 번에 읽어 내용이 같은 건은 multicast, 나머지는 send_each 로 모아 보내고
+- 일시 오류가 난 행은 지수 백오프(BACKOFF_BASE × 2^(시도-1), 최대 BACKOFF_MAX)로 다시 대기시킨다.
+  MAX_ATTEMPTS 번 실패하면 FAILED 로 남긴다.
+
+재시도는 행 단위라 사용자의 기기 중 일부만 실패해도 그 사용자의 기기 전부에 다시 보낸다.
+SENDING 상태로 LEASE 를 넘긴 행(작업자 중단)은 다시 잡힌다.
+
+전체 발송 topic 구독/해제도 요청에서 FCM 을 부르지 않고 TopicOutbox 에 쌓아 같은 작업자가
+TOPIC_BATCH 개씩 모아 보낸다 (queue_topic_changes / sync_topic).
+"""
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from . import push
+from .models import PushOutbox, TopicOutbox
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 잡는 행 수
+BATCH_SIZE = 500
+# 잡은 행을 이 시간 안에 처리하지 못하면 다른 작업자가 다시 잡는다
+LEASE = timedelta(minutes=5)
+# topic 구독 변경을 한 번에 반영할 행 수
+TOPIC_BATCH = push.TOPIC_BATCH
+MAX_ATTEMPTS = 6
+BACKOFF_BASE = timedelta(seconds=30)
+BACKOFF_MAX = timedelta(hours=1)
+
+
+@dataclass
+class BatchStats:
+    """run_once 한 번의 결과 (처리량/지연 측정용)"""
+
+    claimed: int = 0
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+    tokens: int = 0
+    delivered: int = 0
+    # 행이 대기열에 들어온 뒤 발송 시도까지 걸린 시간 (초)
+    lags: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def max_lag(self):
+        return max(self.lags, default=0.0)
+
+    @property
+    def avg_lag(self):
+        return sum(self.lags) / len(self.lags) if self.lags else 0.0
+
+
+def backoff(attempts):
+    """attempts 번째 실패 뒤 다음 시도까지 대기 시간"""
+    return min(BACKOFF_BASE * (2 ** max(attempts - 1, 0)), BACKOFF_MAX)
+
+
+def _due(now):
+    return Q(status=PushOutbox.Status.PENDING, next_attempt_at__lte=now) | Q(
+        status=PushOutbox.Status.SENDING, locked_until__lt=now
+    )
+
+
+def claim(limit=BATCH_SIZE, now=None):
+    """보낼 때가 된 행을 최대 limit 개 잡아 SENDING 으로 바꿈 (다른 작업자가 잠근 행은 건너뜀)"""
+    now = now or timezone.now()
+    with transaction.atomic():
+        rows = list(
+            PushOutbox.objects.select_for_update(skip_locked=True)
+            .filter(_due(now))
+            .order_by("pk")[:limit]
+        )
+        if rows:
+            PushOutbox.objects.filter(pk__in=[row.pk for row in rows]).update(
+                status=PushOutbox.Status.SENDING,
+                locked_until=now + LEASE,
+                attempts=F("attempts") + 1,
+            )
+    for row in rows:
+        row.status = PushOutbox.Status.SENDING
+        row.attempts += 1
+    return rows
+
+
+def deliver(rows, now=None):
+    """잡은 행들을 발송하고 결과(발송 완료 / 재시도 대기 / 실패)를 기록"""
+    now = now or timezone.now()
+    stats = BatchStats(claimed=len(rows), lags=[(now - row.created_at).total_seconds() for row in rows])
+    if not rows:
+        return stats
+
+    tokens = push.user_tokens(row.user_id for row in rows)
+
+    items, owners = [], []
+    for row in rows:
+        for token in tokens[row.user_id]:
+            items.append((token, row.title, row.body, row.data))
+            owners.append(row)
+    stats.tokens = len(items)
+    stats.delivered, retry = push.send_batch(items) if items else (0, {})
+
+    errors = {}
+    for idx, error in retry.items():
+        errors.setdefault(owners[idx].pk, error)
+
+    # 토큰이 없는 사용자 행도 더 보낼 곳이 없으므로 발송 완료로 처리
+    sent = [row.pk for row in rows if row.pk not in errors]
+    if sent:
+        PushOutbox.objects.filter(pk__in=sent).update(
+            status=PushOutbox.Status.SENT, sent_at=now, locked_until=None, last_error=""
+        )
+    stats.sent = len(sent)
+
+    for row in rows:
+        if row.pk not in errors:
+            continue
+        if row.attempts >= MAX_ATTEMPTS:
+            changes = {"status": PushOutbox.Status.FAILED}
+            stats.failed += 1
+            logger.warning("푸시 발송 포기 (outbox %s, %d회 실패): %s", row.pk, row.attempts, errors[row.pk])
+        else:
+            changes = {"status": PushOutbox.Status.PENDING, "next_attempt_at": now + backoff(row.attempts)}
+            stats.retried += 1
+        PushOutbox.objects.filter(pk=row.pk).update(
+            locked_until=None, last_error=errors[row.pk][:1000], **changes
+        )
+    return stats
+
+
+def run_once(batch_size=BATCH_SIZE):
+    """한 묶음 잡아 발송. 잡을 행이 없으면 claimed == 0"""
+    started = time.monotonic()
+    stats = deliver(claim(batch_size))
+    stats.elapsed = time.monotonic() - started
+    return stats
+
+
+def backlog(now=None):
+    """대기열 현황: 보낼 때가 된 행 수, 가장 오래 기다린 행의 대기 시간(초), 재시도 대기, 실패 수, topic 구독 변경 대기 수"""
+    now = now or timezone.now()
+    due = PushOutbox.objects.filter(_due(now)).aggregate(n=Count("pk"), oldest=Min("created_at"))
+    return {
+        "due": due["n"],
+        "oldest_lag": (now - due["oldest"]).total_seconds() if due["oldest"] else 0.0,
+        "waiting_retry": PushOutbox.objects.filter(
+            status=PushOutbox.Status.PENDING, next_attempt_at__gt=now
+        ).count(),
+        "failed": PushOutbox.objects.filter(status=PushOutbox.Status.FAILED).count(),
+        "topic_pending": TopicOutbox.objects.count(),
+    }
+
+
+def purge_sent(days, *, chunk_size=5000):
+    """days 일 지난 발송 완료 행 삭제 (청크 단위). Returns: 삭제한 행 수"""
+    cutoff = timezone.now() - timedelta(days=days)
+    total = 0
+    while True:
+        pks = list(
+            PushOutbox.objects.filter(status=PushOutbox.Status.SENT, sent_at__lt=cutoff)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:chunk_size]
+        )
+        if not pks:
+            return total
+        total += PushOutbox.objects.filter(pk__in=pks).delete()[0]
+
+
+def queue_topic_changes(tokens, *, subscribe):
+    """토큰들의 전체 발송 topic 구독(subscribe=True)/해제를 대기열에 기록 (topic 미설정이면 아무것도 안 함)"""
+    tokens = list(tokens)
+    if not tokens or not push.broadcast_topic():
+        return
+    TopicOutbox.objects.bulk_create([TopicOutbox(token=token, subscribe=subscribe) for token in tokens])
+
+
+def sync_topic(limit=TOPIC_BATCH):
+    """topic 구독 변경 대기열을 한 묶음 FCM 에 반영.
+
+    같은 토큰이 여러 번 쌓였으면 마지막 요청만 보낸다. 순서가 뒤집히지 않도록 SKIP LOCKED 없이
+    잠가서, 겹쳐 돈 작업자는 앞 묶음이 끝날 때까지 기다린다.
+    Returns: 반영한 행 수 (FCM 요청 오류면 0 — 행을 남겨 다음 반복에서 다시 시도)
+    """
+    with transaction.atomic():
+        rows = list(TopicOutbox.objects.select_for_update().order_by("pk")[:limit])
+        if not rows:
+            return 0
+        latest = {row.token: row.subscribe for row in rows}
+        subscribe = [token for token, wanted in latest.items() if wanted]
+        unsubscribe = [token for token, wanted in latest.items() if not wanted]
+        if not (push.unsubscribe_broadcast_topic(unsubscribe) and push.subscribe_broadcast_topic(subscribe)):
+            return 0
+        TopicOutbox.objects.filter(pk__in=[row.pk for row in rows]).delete()
+    return len(rows)
@@ -5,18 +5,37 @@ Firebase Admin SDK를 lazy-init 방식으로 초기화한다.
   패키지가 설치되어 있지 않으면 발송은 silent no-op 처리되어 서버 정상 동작에는
   영향을 주지 않는다.
 - 발송 실패 시 invalid 토큰은 자동 비활성화하여 다음 발송 사이클에서 제외된다.
+- 같은 내용을 여러 사용자에게 보낼 때는 send_multicast 로 토큰 500개씩 보낸다.
+- 알림별 푸시는 PushOutbox 대기열을 거쳐 run_push_worker 가 send_batch 로 모아 보낸다.
+- 사용자별 활성 토큰 목록은 공유 캐시에 두고 (user_tokens) 토큰 등록/삭제/비활성화 때 지운다.
+- settings.FCM_BROADCAST_TOPIC 을 지정하면 토큰 등록/삭제 · 계정 비활성화 때 구독 변경을
+  TopicOutbox 대기열에 넣어 run_push_worker 가 반영하고 (outbox.sync_topic), 전체 대상 발송은
+  토큰 목록 대신 topic 메시지 하나로 보낸다 (send_to_topic). 도입 전 토큰은 subscribe_broadcast_topic 명령으로 구독.
 """
 
 from __future__ import annotations
 
+import json
 import logging
 import os
+from collections import defaultdict
 from typing import Iterable
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 
 logger = logging.getLogger(__name__)
 
+# FCM multicast 요청 하나에 실을 수 있는 최대 토큰 수
+MULTICAST_BATCH = 500
+# FCM topic 구독/해제 요청 하나에 실을 수 있는 최대 토큰 수
+TOPIC_BATCH = 1000
+# 이 오류로 실패한 토큰은 더 이상 유효하지 않으므로 비활성화
+INVALID_TOKEN_ERRORS = ("registration-token-not-registered", "invalid-argument", "invalid-registration-token")
+# 사용자별 활성 토큰 목록 캐시 유지 시간 (등록/삭제/비활성화 때는 바로 지움)
+TOKEN_CACHE_TIMEOUT = 60 * 60
+
 _initialized = False
 _messaging = None
 
@@ -52,14 +71,60 @@ def _init_firebase():
         _messaging = None
 
 
-def _active_tokens(user_ids: Iterable[int]) -> list[tuple[int, str]]:
-    """주어진 user_id 들에 대해 활성 디바이스 토큰을 (user_id, token) 튜플로 반환."""
+def is_enabled() -> bool:
+    """FCM 발송 가능 여부 (서비스 계정/패키지가 없으면 False)"""
+    _init_firebase()
+    return _messaging is not None
+
+
+def broadcast_topic() -> str:
+    """전체 대상 발송용 FCM topic 이름 (설정하지 않았으면 빈 문자열)"""
+    return getattr(settings, "FCM_BROADCAST_TOPIC", "") or ""
+
+
+def _token_cache_key(user_id: int) -> str:
+    return f"notifications:tokens:{user_id}"
+
+
+def invalidate_tokens(user_ids: Iterable[int]) -> None:
+    """사용자들의 토큰 캐시 삭제 (지금 한 번, 커밋 뒤 한 번)"""
+    keys = [_token_cache_key(uid) for uid in set(user_ids)]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    # 커밋 전에 다른 요청이 옛 목록을 다시 채웠을 수 있음
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def user_tokens(user_ids: Iterable[int]) -> dict[int, list[str]]:
+    """{user_id: [활성 토큰]} — 캐시 우선, 없는 사용자만 한 번에 조회 (토큰 없는 사용자도 캐시)."""
     from notifications.models import DeviceToken
 
-    qs = DeviceToken.objects.filter(
-        user_id__in=list(user_ids), is_active=True
-    ).values_list("token", "user_id")
-    return [(uid, tok) for tok, uid in qs]
+    user_ids = list(dict.fromkeys(user_ids))
+    cached = cache.get_many([_token_cache_key(uid) for uid in user_ids])
+    result = {}
+    missing = []
+    for uid in user_ids:
+        tokens = cached.get(_token_cache_key(uid))
+        if tokens is None:
+            missing.append(uid)
+        else:
+            result[uid] = tokens
+
+    if missing:
+        loaded = {uid: [] for uid in missing}
+        for uid, token in DeviceToken.objects.filter(
+            user_id__in=missing, is_active=True
+        ).order_by("pk").values_list("user_id", "token"):
+            loaded[uid].append(token)
+        cache.set_many({_token_cache_key(uid): tokens for uid, tokens in loaded.items()}, TOKEN_CACHE_TIMEOUT)
+        result.update(loaded)
+    return result
+
+
+def _active_tokens(user_ids: Iterable[int]) -> list[tuple[int, str]]:
+    """주어진 user_id 들에 대해 활성 디바이스 토큰을 (user_id, token) 튜플로 반환."""
+    return [(uid, token) for uid, tokens in user_tokens(user_ids).items() for token in tokens]
 
 
 def send_to_user(user_id: int, *, title: str, body: str = "", data: dict | None = None) -> int:
@@ -74,54 +139,186 @@ def send_to_users(
     body: str = "",
     data: dict | None = None,
 ) -> int:
-    """여러 사용자에게 푸시 발송. 토큰 단위로 send_each 호출.
+    """여러 사용자에게 같은 내용의 푸시 발송 (send_multicast 와 같음).
 
     반환값: 성공적으로 발송된 토큰 수.
     """
-    _init_firebase()
-    if _messaging is None:
-        return 0
+    return send_multicast(user_ids, title=title, body=body, data=data)
 
-    rows = _active_tokens(user_ids)
-    if not rows:
-        return 0
 
+def _data_payload(data: dict | None) -> dict:
     # FCM data payload는 모든 값이 문자열이어야 한다.
-    data_payload = {k: str(v) for k, v in (data or {}).items() if v is not None}
+    return {k: str(v) for k, v in (data or {}).items() if v is not None}
 
-    messages = []
-    token_list = []
-    for _uid, token in rows:
-        token_list.append(token)
-        messages.append(
-            _messaging.Message(
-                token=token,
-                notification=_messaging.Notification(title=title, body=body or None),
-                data=data_payload or None,
-            )
-        )
 
-    try:
-        response = _messaging.send_each(messages)
-    except Exception as exc:
-        logger.exception("FCM 발송 중 예외: %s", exc)
-        return 0
+def _handle_responses(token_list: list[str], responses, failed: dict | None = None) -> int:
+    """send_each 계열 응답 처리: 성공 수 반환, invalid 토큰은 비활성화.
 
+    failed 를 넘기면 일시 오류로 실패한 응답의 {위치: 오류 메시지} 를 채운다 (재시도용).
+    """
     invalid_tokens: list[str] = []
     success = 0
-    for idx, resp in enumerate(response.responses):
+    for idx, resp in enumerate(responses):
         if resp.success:
             success += 1
         else:
             err_code = getattr(getattr(resp, "exception", None), "code", "")
-            if err_code in ("registration-token-not-registered", "invalid-argument", "invalid-registration-token"):
+            if err_code in INVALID_TOKEN_ERRORS:
                 invalid_tokens.append(token_list[idx])
             else:
                 logger.warning("FCM 발송 실패 (%s): %s", token_list[idx][:16], resp.exception)
+                if failed is not None:
+                    failed[idx] = str(resp.exception)
 
     if invalid_tokens:
         from notifications.models import DeviceToken
-        DeviceToken.objects.filter(token__in=invalid_tokens).update(is_active=False)
+        invalid = DeviceToken.objects.filter(token__in=invalid_tokens)
+        owners = list(invalid.values_list("user_id", flat=True))
+        invalid.update(is_active=False)
+        invalidate_tokens(owners)
         logger.info("FCM invalid 토큰 %d개 비활성화", len(invalid_tokens))
 
     return success
+
+
+def send_multicast(
+    user_ids: Iterable[int],
+    *,
+    title: str,
+    body: str = "",
+    data: dict | None = None,
+) -> int:
+    """여러 사용자에게 같은 내용을 MULTICAST_BATCH 토큰씩 multicast 발송 (전체 공지 등).
+
+    토큰마다 Message 를 만들지 않고 요청 하나에 토큰 500개를 싣는다.
+    data 는 모든 수신자에게 같으므로 알림별 id 는 담지 않는다.
+    반환값: 성공적으로 발송된 토큰 수.
+    """
+    _init_firebase()
+    if _messaging is None:
+        return 0
+
+    tokens = [token for _uid, token in _active_tokens(user_ids)]
+    if not tokens:
+        return 0
+
+    notification = _messaging.Notification(title=title, body=body or None)
+    data_payload = _data_payload(data) or None
+    success = 0
+    for start in range(0, len(tokens), MULTICAST_BATCH):
+        batch = tokens[start:start + MULTICAST_BATCH]
+        message = _messaging.MulticastMessage(tokens=batch, notification=notification, data=data_payload)
+        try:
+            response = _messaging.send_each_for_multicast(message)
+        except Exception as exc:
+            logger.exception("FCM multicast 발송 중 예외: %s", exc)
+            continue
+        success += _handle_responses(batch, response.responses)
+    return success
+
+
+def send_to_topic(topic: str, *, title: str, body: str = "", data: dict | None = None) -> bool:
+    """topic 구독자 전체에게 푸시 한 건 발송 (토큰 수와 무관하게 요청 하나). 성공 여부 반환."""
+    _init_firebase()
+    if _messaging is None or not topic:
+        return False
+    message = _messaging.Message(
+        topic=topic,
+        notification=_messaging.Notification(title=title, body=body or None),
+        data=_data_payload(data) or None,
+    )
+    try:
+        _messaging.send(message)
+    except Exception as exc:
+        logger.exception("FCM topic(%s) 발송 중 예외: %s", topic, exc)
+        return False
+    return True
+
+
+def _update_topic(method: str, tokens: list[str]) -> bool:
+    topic = broadcast_topic()
+    if not tokens or not topic:
+        return True
+    if not is_enabled():
+        return False
+    for start in range(0, len(tokens), TOPIC_BATCH):
+        batch = tokens[start:start + TOPIC_BATCH]
+        try:
+            response = getattr(_messaging, method)(batch, topic)
+        except Exception as exc:
+            logger.exception("FCM topic(%s) %s 중 예외: %s", topic, method, exc)
+            return False
+        # 토큰별 실패(만료 등)는 다시 보내도 같으므로 기록만 한다
+        if getattr(response, "failure_count", 0):
+            logger.warning("FCM topic(%s) %s 실패 %d건", topic, method, response.failure_count)
+    return True
+
+
+def subscribe_broadcast_topic(tokens: list[str]) -> bool:
+    """토큰들을 전체 발송 topic 에 구독 (topic 미설정이면 아무것도 안 함). 요청 오류면 False"""
+    return _update_topic("subscribe_to_topic", tokens)
+
+
+def unsubscribe_broadcast_topic(tokens: list[str]) -> bool:
+    """토큰들의 전체 발송 topic 구독 해제. 요청 오류면 False"""
+    return _update_topic("unsubscribe_from_topic", tokens)
+
+
+def send_batch(items: list[tuple[str, str, str, dict | None]]) -> tuple[int, dict[int, str]]:
+    """내용이 제각각인 푸시 여러 건을 한꺼번에 발송 (푸시 대기열 작업자용).
+
+    items: (token, title, body, data) 목록. 내용(title/body/data)이 같은 건끼리는
+    multicast 로 묶고, 나머지는 send_each 로 MULTICAST_BATCH 건씩 모아 보낸다.
+    invalid 토큰은 비활성화하고 재시도 대상에서 뺀다.
+    반환값: (성공 수, 일시 오류로 다시 보내야 할 {items 위치: 오류 메시지})
+    """
+    _init_firebase()
+    if _messaging is None:
+        return 0, {}
+
+    groups: dict[tuple, list[int]] = defaultdict(list)
+    for idx, (_token, title, body, data) in enumerate(items):
+        groups[(title, body or "", json.dumps(_data_payload(data), sort_keys=True))].append(idx)
+
+    success = 0
+    retry: dict[int, str] = {}
+    singles: list[int] = []
+
+    def send(call, indices):
+        nonlocal success
+        try:
+            response = call()
+        except Exception as exc:
+            logger.exception("FCM 일괄 발송 중 예외: %s", exc)
+            retry.update((i, str(exc)) for i in indices)
+            return
+        failed: dict[int, str] = {}
+        success += _handle_responses([items[i][0] for i in indices], response.responses, failed)
+        retry.update((indices[pos], error) for pos, error in failed.items())
+
+    for (title, body, data_json), indices in groups.items():
+        if len(indices) == 1:
+            singles.extend(indices)
+            continue
+        notification = _messaging.Notification(title=title, body=body or None)
+        data_payload = json.loads(data_json) or None
+        for start in range(0, len(indices), MULTICAST_BATCH):
+            batch = indices[start:start + MULTICAST_BATCH]
+            message = _messaging.MulticastMessage(
+                tokens=[items[i][0] for i in batch], notification=notification, data=data_payload
+            )
+            send(lambda: _messaging.send_each_for_multicast(message), batch)
+
+    for start in range(0, len(singles), MULTICAST_BATCH):
+        batch = singles[start:start + MULTICAST_BATCH]
+        messages = [
+            _messaging.Message(
+                token=items[i][0],
+                notification=_messaging.Notification(title=items[i][1], body=items[i][2] or None),
+                data=_data_payload(items[i][3]) or None,
+            )
+            for i in batch
+        ]
+        send(lambda: _messaging.send_each(messages), batch)
+
+    return success, retry
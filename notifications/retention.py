@@ -0,0 +1,125 @@
+"""알림 보존 기간 정책 — 오래된 읽은 알림 삭제 / 보관.
+
+알림 행은 한 번도 지워지지 않아 (cleanup_schedule_notices 는 일정 쪽지만 정리) 전체 발송·좋아요
+알림이 계속 쌓였다. 유형마다 보존 일수를 두고, 그보다 오래된 읽은 알림을
+- 삭제하거나 (대부분)
+- NotificationArchive 로 옮긴 뒤 삭제한다 (archive=True, 문의 답변 등 기록이 필요한 유형)
+읽지 않은 알림은 건드리지 않는다. prune_notifications 명령이 PK 구간 단위로 호출한다.
+
+삭제 때 행마다 카운터를 내리지 않고 (unread.adjusted_by_caller) 구간마다
+(유형, 사용자) 별로 모아 받은 알림 수를 한 번에 내린다.
+
+정책은 settings.NOTIFICATION_RETENTION = {유형: 일수 또는 None(보존)} 으로 일수만 바꿀 수 있다.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, replace
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Notification, NotificationArchive
+from .unread import adjust_counts, adjusted_by_caller
+
+Type = Notification.Type
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """읽은 알림을 days 일 보존. archive 면 지우기 전에 NotificationArchive 로 옮김"""
+
+    days: int
+    archive: bool = False
+
+
+DEFAULT_POLICIES = {
+    Type.LIKE: RetentionPolicy(30),
+    Type.COMMENT: RetentionPolicy(90),
+    Type.REPLY: RetentionPolicy(90),
+    Type.NOTICE: RetentionPolicy(30),
+    Type.BADMINTOK_POST: RetentionPolicy(30),
+    Type.BAND: RetentionPolicy(90),
+    Type.SCHEDULE: RetentionPolicy(60),
+    Type.SCHEDULE_NOTICE: RetentionPolicy(60),
+    Type.APPLICATION: RetentionPolicy(90),
+    Type.MEMBERSHIP: RetentionPolicy(90),
+    Type.MATCH_NEXT_GAME: RetentionPolicy(7),
+    Type.PARTNER_REQUEST: RetentionPolicy(30),
+    Type.PARTNER_APPROVED: RetentionPolicy(30),
+    Type.INQUIRY: RetentionPolicy(180, archive=True),
+}
+
+
+def policies():
+    """{유형: RetentionPolicy} — settings.NOTIFICATION_RETENTION 의 일수 반영, None 이면 제외"""
+    overrides = getattr(settings, "NOTIFICATION_RETENTION", {})
+    result = {}
+    for type, policy in DEFAULT_POLICIES.items():
+        days = overrides.get(type, policy.days)
+        if days is not None:
+            result[type] = replace(policy, days=days)
+    return result
+
+
+def expired_condition(active_policies, now):
+    """정책상 정리 대상(읽은 알림 + 유형별 보존 기간 지남) 조건"""
+    condition = Q(pk__in=[])
+    for type, policy in active_policies.items():
+        condition |= Q(type=type, created_at__lt=now - timedelta(days=policy.days))
+    return condition & Q(is_read=True)
+
+
+def _archive_rows(rows):
+    NotificationArchive.objects.bulk_create([
+        NotificationArchive(
+            notification_id=row.pk,
+            user_id=row.user_id,
+            type=row.type,
+            title=row.title,
+            message=row.message,
+            actor_id=row.actor_id,
+            data={k: v for k, v in row.push_data().items() if v is not None and k not in ("type", "notification_id")},
+            created_at=row.created_at,
+        )
+        for row in rows
+    ], batch_size=500)
+
+
+def prune(queryset, active_policies, now, *, dry_run=False):
+    """queryset (보통 PK 구간 하나) 안의 정리 대상 알림을 삭제/보관.
+
+    Returns: {유형: 처리 수}
+    """
+    rows = list(
+        queryset.filter(expired_condition(active_policies, now)).only(
+            "pk", "user_id", "type", "title", "message", "actor_id", "created_at",
+            "related_band_id", "related_band_schedule_id", "related_band_post_id",
+            "related_community_post_id", "related_notice_id", "related_inquiry_id",
+        )
+    )
+    by_type = defaultdict(list)
+    for row in rows:
+        by_type[row.type].append(row)
+    if dry_run or not rows:
+        return {type: len(items) for type, items in by_type.items()}
+
+    with transaction.atomic():
+        archived = [row for row in rows if active_policies[row.type].archive]
+        if archived:
+            _archive_rows(archived)
+        with adjusted_by_caller():
+            # 푸시 대기열 등 딸린 행은 collector 가 함께 지운다
+            Notification.objects.filter(pk__in=[row.pk for row in rows]).delete()
+
+        for type, items in by_type.items():
+            per_user = defaultdict(int)
+            for row in items:
+                per_user[row.user_id] += 1
+            # 같은 개수끼리 묶어 UPDATE 한 번
+            by_count = defaultdict(list)
+            for user_id, n in per_user.items():
+                by_count[n].append(user_id)
+            for n, user_ids in by_count.items():
+                adjust_counts(user_ids, type, total=-n)
+    return {type: len(items) for type, items in by_type.items()}
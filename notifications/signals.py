@@ -1,49 +1,70 @@
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
-from band.models import BandComment, BandSchedule, BandScheduleApplication, BandMember, BandPostLike, BandBookmark
+from band.models import BandComment, BandSchedule, BandScheduleApplication, BandMember, BandPostLike
 from band.match_models import PartnerRequest
 from community.models import Comment as CommunityComment, Post as CommunityPost
+from badmintok.counters import deleted_with
 from badmintok.models import Notice
 from accounts.models import Inquiry
-from notifications.models import Notification
+from notifications.broadcast import start_broadcast
+from notifications.collapse import notify_collapsed
+from notifications.models import Broadcast, DeviceToken, Notification
+from notifications.outbox import queue_topic_changes
+from notifications.push import invalidate_tokens
+from notifications.unread import adjust_counts, is_adjusted_by_caller
 
 
-# ─── FCM 푸시 자동 발송 ───
-@receiver(post_save, sender=Notification)
-def send_fcm_on_notification(sender, instance, created, **kwargs):
-    """Notification 생성 시점마다 FCM 푸시 자동 발송.
+# FCM 푸시는 Notification.save 가 PushOutbox 대기열에 넣고 run_push_worker 가 발송한다.
 
-    - 토큰이 없거나 Firebase 미설정이면 silent no-op
-    - 알림 데이터에 type/notification_id/related_* id를 함께 실어 앱 라우팅용으로 사용
-    """
-    if not created:
+
+@receiver(post_delete, sender=Notification)
+def release_notification_count(sender, instance, origin=None, **kwargs):
+    """알림 삭제 시 받은/읽지 않은 알림 카운터 감소 (사용자 탈퇴면 카운터도 함께 삭제됨)"""
+    if deleted_with(origin, get_user_model()) or is_adjusted_by_caller():
         return
-    from notifications.push import send_to_user
-
-    data = {
-        "type": instance.type,
-        "notification_id": instance.id,
-        "related_band_id": instance.related_band_id,
-        "related_band_schedule_id": instance.related_band_schedule_id,
-        "related_band_post_id": instance.related_band_post_id,
-        "related_community_post_id": instance.related_community_post_id,
-        "related_notice_id": instance.related_notice_id,
-        "related_inquiry_id": instance.related_inquiry_id,
-    }
-    send_to_user(
-        instance.user_id,
-        title=instance.title,
-        body=instance.message or "",
-        data=data,
-    )
+    adjust_counts([instance.user_id], instance.type, total=-1, unread=0 if instance.is_read else -1)
+
+
+@receiver(post_save, sender=DeviceToken)
+@receiver(post_delete, sender=DeviceToken)
+def invalidate_device_tokens(sender, instance, **kwargs):
+    """토큰 등록/갱신/삭제 시 소유자의 토큰 캐시 삭제"""
+    invalidate_tokens([instance.user_id])
+
+
+@receiver(post_save, sender=DeviceToken)
+def queue_topic_subscription(sender, instance, **kwargs):
+    """토큰 등록/갱신 시 전체 발송 topic 구독 (비활성 토큰이면 해제) — run_push_worker 가 반영"""
+    queue_topic_changes([instance.token], subscribe=instance.is_active)
+
+
+@receiver(post_delete, sender=DeviceToken)
+def queue_topic_unsubscription(sender, instance, **kwargs):
+    """토큰 삭제(로그아웃, 계정 삭제) 시 전체 발송 topic 구독 해제"""
+    queue_topic_changes([instance.token], subscribe=False)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def deactivate_device_tokens(sender, instance, **kwargs):
+    """계정 비활성화(탈퇴) 시 기기 토큰을 끄고 topic 구독 해제 (개별 푸시 · 전체 발송 모두 제외)"""
+    if instance.is_active:
+        return
+    tokens = list(DeviceToken.objects.filter(user=instance, is_active=True).values_list("token", flat=True))
+    if not tokens:
+        return
+    DeviceToken.objects.filter(token__in=tokens).update(is_active=False)
+    invalidate_tokens([instance.pk])
+    queue_topic_changes(tokens, subscribe=False)
 
 
 # ─── 밴드 댓글/답글 ───
 
 @receiver(post_save, sender=BandComment)
 def notify_on_band_comment(sender, instance, created, **kwargs):
-    """밴드 댓글/답글 생성 시 알림"""
+    """밴드 댓글/답글 생성 시 알림 (같은 글/댓글의 읽지 않은 알림에 묶음)"""
     if not created:
         return
 
@@ -55,27 +76,31 @@ def notify_on_band_comment(sender, instance, created, **kwargs):
         recipient = comment.parent.author
         if recipient == author:
             return
-        Notification.objects.create(
+        notify_collapsed(
             user=recipient,
             type=Notification.Type.REPLY,
-            title=f"{author.activity_name}님이 회원님의 댓글에 답글을 남겼습니다.",
+            group_key=f"reply:band_comment:{comment.parent_id}",
+            actor=author,
+            title="{actor}님이 회원님의 댓글에 답글을 남겼습니다.",
+            grouped_title="{actor}님 외 {others}명이 회원님의 댓글에 답글을 남겼습니다.",
             message=comment.content[:100],
             related_band_post=post,
             related_band=post.band,
-            actor=author,
         )
     else:
         recipient = post.author
         if recipient == author:
             return
-        Notification.objects.create(
+        notify_collapsed(
             user=recipient,
             type=Notification.Type.COMMENT,
-            title=f"{author.activity_name}님이 회원님의 글에 댓글을 남겼습니다.",
+            group_key=f"comment:band_post:{post.pk}",
+            actor=author,
+            title="{actor}님이 회원님의 글에 댓글을 남겼습니다.",
+            grouped_title="{actor}님 외 {others}명이 회원님의 글에 댓글을 남겼습니다.",
             message=comment.content[:100],
             related_band_post=post,
             related_band=post.band,
-            actor=author,
         )
 
 
@@ -87,53 +112,37 @@ def notify_on_notice(sender, instance, created, **kwargs):
     if not created:
         return
 
-    from accounts.models import User
-
-    # 개별 create()로 post_save 시그널을 발화시켜 FCM 푸시 자동 발송
-    users = User.objects.filter(is_active=True).exclude(id=instance.author_id)
-    for user in users:
-        Notification.objects.create(
-            user=user,
-            type=Notification.Type.NOTICE,
-            title=f"[공지] {instance.title}",
-            message="",
-            related_notice=instance,
-            actor=instance.author,
-        )
+    # 발송 작업만 등록 — 알림 생성/FCM multicast 는 run_broadcasts 가 청크 단위로 처리
+    start_broadcast(
+        type=Notification.Type.NOTICE,
+        title=f"[공지] {instance.title}",
+        message="",
+        related_notice=instance,
+        actor=instance.author,
+    )
 
 
 # ─── 번개/일정 등록 ───
 
 @receiver(post_save, sender=BandSchedule)
 def notify_on_schedule_created(sender, instance, created, **kwargs):
-    """번개/일정 등록 시 북마크한 사용자에게 알림"""
+    """번개/일정 등록 시 모임 북마크 사용자 + 활성 멤버에게 알림 (등록자 제외)"""
     if not created:
         return
 
     schedule = instance
     band = schedule.band
-    creator = schedule.created_by
-
-    # 해당 모임을 북마크한 사용자 + 활성 멤버
-    bookmark_user_ids = BandBookmark.objects.filter(band=band).values_list('user_id', flat=True)
-    member_user_ids = BandMember.objects.filter(band=band, status='active').values_list('user_id', flat=True)
-    recipient_ids = set(bookmark_user_ids) | set(member_user_ids)
-    recipient_ids.discard(creator.id)
 
-    if not recipient_ids:
-        return
-
-    # 개별 create()로 post_save 시그널을 발화시켜 FCM 푸시 자동 발송
-    for uid in recipient_ids:
-        Notification.objects.create(
-            user_id=uid,
-            type=Notification.Type.SCHEDULE,
-            title=f"[{band.name}] 새 일정: {schedule.title}",
-            message="",
-            related_band_schedule=schedule,
-            related_band=band,
-            actor=creator,
-        )
+    # 발송 작업만 등록 — 수신자 조회/알림 생성/푸시는 run_broadcasts 가 모임별 분당 한도 안에서 처리
+    start_broadcast(
+        type=Notification.Type.SCHEDULE,
+        title=f"[{band.name}] 새 일정: {schedule.title}",
+        message="",
+        actor=schedule.created_by,
+        audience=Broadcast.Audience.BAND,
+        related_band=band,
+        related_band_schedule=schedule,
+    )
 
 
 # ─── 일정 참가 신청/승인/거절 ───
@@ -147,22 +156,16 @@ def notify_on_schedule_application(sender, instance, created, **kwargs):
     applicant = app.user
 
     if created:
-        # 참가 신청 → 모임장/관리자에게 알림
-        managers = BandMember.objects.filter(
-            band=band, role__in=['owner', 'admin'], status='active'
-        ).exclude(user=applicant).values_list('user_id', flat=True)
-
-        # 개별 create()로 post_save 시그널을 발화시켜 FCM 푸시 자동 발송
-        for uid in managers:
-            Notification.objects.create(
-                user_id=uid,
-                type=Notification.Type.APPLICATION,
-                title=f"{applicant.activity_name}님이 [{schedule.title}]에 참가 신청했습니다.",
-                message="",
-                related_band_schedule=schedule,
-                related_band=band,
-                actor=applicant,
-            )
+        # 참가 신청 → 모임장/관리자에게 알림 (신청자 제외, run_broadcasts 가 발송)
+        start_broadcast(
+            type=Notification.Type.APPLICATION,
+            title=f"{applicant.activity_name}님이 [{schedule.title}]에 참가 신청했습니다.",
+            message="",
+            actor=applicant,
+            audience=Broadcast.Audience.BAND_MANAGERS,
+            related_band=band,
+            related_band_schedule=schedule,
+        )
     else:
         # 승인/거절 → 신청자에게 알림
         if app.status == 'approved':
@@ -197,21 +200,15 @@ def notify_on_membership(sender, instance, created, **kwargs):
     user = member.user
 
     if created and member.status == 'pending':
-        # 가입 신청 → 모임장/관리자에게 알림
-        managers = BandMember.objects.filter(
-            band=band, role__in=['owner', 'admin'], status='active'
-        ).exclude(user=user).values_list('user_id', flat=True)
-
-        # 개별 create()로 post_save 시그널을 발화시켜 FCM 푸시 자동 발송
-        for uid in managers:
-            Notification.objects.create(
-                user_id=uid,
-                type=Notification.Type.MEMBERSHIP,
-                title=f"{user.activity_name}님이 [{band.name}] 가입을 신청했습니다.",
-                message="",
-                related_band=band,
-                actor=user,
-            )
+        # 가입 신청 → 모임장/관리자에게 알림 (신청자 제외, run_broadcasts 가 발송)
+        start_broadcast(
+            type=Notification.Type.MEMBERSHIP,
+            title=f"{user.activity_name}님이 [{band.name}] 가입을 신청했습니다.",
+            message="",
+            actor=user,
+            audience=Broadcast.Audience.BAND_MANAGERS,
+            related_band=band,
+        )
 
     elif not created and member.status == 'active':
         # 승인 → 신청자에게 알림
@@ -228,7 +225,7 @@ def notify_on_membership(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=CommunityComment)
 def notify_on_community_comment(sender, instance, created, **kwargs):
-    """커뮤니티 댓글/답글 생성 시 알림"""
+    """커뮤니티 댓글/답글 생성 시 알림 (같은 글/댓글의 읽지 않은 알림에 묶음)"""
     if not created:
         return
 
@@ -240,25 +237,29 @@ def notify_on_community_comment(sender, instance, created, **kwargs):
         recipient = comment.parent.author
         if recipient == author:
             return
-        Notification.objects.create(
+        notify_collapsed(
             user=recipient,
             type=Notification.Type.REPLY,
-            title=f"{author.activity_name}님이 회원님의 댓글에 답글을 남겼습니다.",
+            group_key=f"reply:comment:{comment.parent_id}",
+            actor=author,
+            title="{actor}님이 회원님의 댓글에 답글을 남겼습니다.",
+            grouped_title="{actor}님 외 {others}명이 회원님의 댓글에 답글을 남겼습니다.",
             message=comment.content[:100],
             related_community_post=post,
-            actor=author,
         )
     else:
         recipient = post.author
         if recipient == author:
             return
-        Notification.objects.create(
+        notify_collapsed(
             user=recipient,
             type=Notification.Type.COMMENT,
-            title=f"{author.activity_name}님이 회원님의 글에 댓글을 남겼습니다.",
+            group_key=f"comment:post:{post.pk}",
+            actor=author,
+            title="{actor}님이 회원님의 글에 댓글을 남겼습니다.",
+            grouped_title="{actor}님 외 {others}명이 회원님의 글에 댓글을 남겼습니다.",
             message=comment.content[:100],
             related_community_post=post,
-            actor=author,
         )
 
 
@@ -266,7 +267,7 @@ def notify_on_community_comment(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=BandPostLike)
 def notify_on_band_post_like(sender, instance, created, **kwargs):
-    """밴드 게시글 좋아요 알림"""
+    """밴드 게시글 좋아요 알림 (같은 글의 읽지 않은 좋아요 알림에 묶음)"""
     if not created:
         return
 
@@ -277,14 +278,16 @@ def notify_on_band_post_like(sender, instance, created, **kwargs):
     if recipient == liker:
         return
 
-    Notification.objects.create(
+    notify_collapsed(
         user=recipient,
         type=Notification.Type.LIKE,
-        title=f"{liker.activity_name}님이 회원님의 글을 좋아합니다.",
+        group_key=f"like:band_post:{post.pk}",
+        actor=liker,
+        title="{actor}님이 회원님의 글을 좋아합니다.",
+        grouped_title="{actor}님 외 {others}명이 회원님의 글을 좋아합니다.",
         message=post.title[:100],
         related_band_post=post,
         related_band=post.band,
-        actor=liker,
     )
 
 
@@ -297,6 +300,7 @@ def notify_on_badmintok_post(sender, instance, created, **kwargs):
     - 동호인톡 등 다른 source는 대상 외
     - 임시저장 / 삭제된 게시물은 대상 외
     - 작성자 본인은 수신자에서 제외
+    - 저장 요청에서는 발송 작업만 등록 (notifications.broadcast)
     - WP 매거진 동기화로 생성된 글은 전체 푸시 제외(대량 발송 방지)
     """
     if getattr(instance, "_skip_sync_notify", False):
@@ -308,17 +312,13 @@ def notify_on_badmintok_post(sender, instance, created, **kwargs):
     if instance.is_draft or instance.is_deleted:
         return
 
-    from accounts.models import User
-    users = User.objects.filter(is_active=True).exclude(id=instance.author_id)
-    for user in users:
-        Notification.objects.create(
-            user=user,
-            type=Notification.Type.BADMINTOK_POST,
-            title="📢 배드민톡 새 글",
-            message=instance.title,
-            related_community_post=instance,
-            actor=instance.author,
-        )
+    start_broadcast(
+        type=Notification.Type.BADMINTOK_POST,
+        title="📢 배드민톡 새 글",
+        message=instance.title,
+        related_community_post=instance,
+        actor=instance.author,
+    )
 
 
 # ─── 문의 답변 ───
@@ -349,27 +349,37 @@ def notify_on_inquiry_answer(sender, instance, created, **kwargs):
 
 # ─── 좋아요 (동호인톡 게시글) ───
 
-@receiver(post_save, sender=CommunityPost.likes.through)
-def notify_on_community_post_like(sender, instance, created, **kwargs):
-    """동호인톡(커뮤니티) 게시글 좋아요 알림"""
-    if not created:
-        return
-
-    post = instance.post
-    liker = instance.user
-    recipient = post.author
+@receiver(m2m_changed, sender=CommunityPost.likes.through)
+def notify_on_community_post_like(sender, instance, action, reverse, pk_set, **kwargs):
+    """동호인톡(커뮤니티) 게시글 좋아요 알림 (같은 글의 읽지 않은 좋아요 알림에 묶음).
 
-    if recipient == liker:
+    자동 생성 through 모델은 post_save 를 보내지 않으므로 m2m_changed 의 post_add 로 받는다.
+    pk_set 에는 실제로 추가된 것만 들어 있다.
+    """
+    if action != "post_add" or not pk_set:
         return
 
-    Notification.objects.create(
-        user=recipient,
-        type=Notification.Type.LIKE,
-        title=f"{liker.activity_name}님이 회원님의 글을 좋아합니다.",
-        message=post.title[:100],
-        related_community_post=post,
-        actor=liker,
-    )
+    if reverse:
+        likers = [instance]
+        posts = CommunityPost.objects.filter(pk__in=pk_set).select_related("author")
+    else:
+        likers = get_user_model().objects.filter(pk__in=pk_set)
+        posts = [instance]
+
+    for post in posts:
+        for liker in likers:
+            if post.author_id == liker.pk:
+                continue
+            notify_collapsed(
+                user=post.author,
+                type=Notification.Type.LIKE,
+                group_key=f"like:post:{post.pk}",
+                actor=liker,
+                title="{actor}님이 회원님의 글을 좋아합니다.",
+                grouped_title="{actor}님 외 {others}명이 회원님의 글을 좋아합니다.",
+                message=post.title[:100],
+                related_community_post=post,
+            )
 
 
 # ─── 대진(번개 자동 대진) ───
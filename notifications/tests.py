@@ -1,3 +1,713 @@
+import time
+from datetime import timedelta
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from band.models import (
+    Band, BandBookmark, BandComment, BandMember, BandPost, BandPostLike, BandSchedule, BandScheduleApplication,
+)
+from badmintok.models import Notice
+from community.models import Post
+from notifications import broadcast, collapse, outbox, push, retention, unread
+from notifications.models import (
+    Broadcast, DeviceToken, NoticeBatch, Notification, NotificationArchive, NotificationCounter, PushOutbox,
+    TopicOutbox,
+)
+
+
+class FakeMessaging:
+    """firebase_admin.messaging 대역 — 요청을 기록하고 지정한 토큰은 실패시킨다.
+
+    invalid: 등록 해제된 토큰, unavailable: 일시 오류 토큰, down: True 면 요청 자체가 예외
+    """
+
+    def __init__(self, invalid=(), unavailable=()):
+        self.invalid = set(invalid)
+        self.unavailable = set(unavailable)
+        self.down = False
+        self.batches = []
+        self.sent = []
+        self.topics = []
+        self.subscriptions = {}
+
+    def Notification(self, **kwargs):
+        return SimpleNamespace(**kwargs)
+
+    def Message(self, **kwargs):
+        return SimpleNamespace(**kwargs)
+
+    def MulticastMessage(self, tokens, **kwargs):
+        return SimpleNamespace(tokens=tokens, **kwargs)
+
+    def _response(self, token):
+        if token in self.invalid:
+            error = SimpleNamespace(code="registration-token-not-registered")
+        elif token in self.unavailable:
+            error = SimpleNamespace(code="unavailable")
+        else:
+            self.sent.append(token)
+            return SimpleNamespace(success=True, exception=None)
+        return SimpleNamespace(success=False, exception=error)
+
+    def send_each_for_multicast(self, message):
+        if self.down:
+            raise ConnectionError("fcm down")
+        self.batches.append(list(message.tokens))
+        return SimpleNamespace(responses=[self._response(token) for token in message.tokens])
+
+    def send_each(self, messages):
+        if self.down:
+            raise ConnectionError("fcm down")
+        self.batches.append([message.token for message in messages])
+        return SimpleNamespace(responses=[self._response(message.token) for message in messages])
+
+    def send(self, message):
+        if self.down:
+            raise ConnectionError("fcm down")
+        self.topics.append(message.topic)
+        return "projects/test/messages/1"
+
+    def subscribe_to_topic(self, tokens, topic):
+        self.subscriptions.setdefault(topic, set()).update(tokens)
+        return SimpleNamespace(failure_count=0)
+
+    def unsubscribe_from_topic(self, tokens, topic):
+        self.subscriptions.setdefault(topic, set()).difference_update(tokens)
+        return SimpleNamespace(failure_count=0)
+
+
+class BroadcastTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.admin = User.objects.create_user(email="admin@a.com", password="x")
+        self.users = [User.objects.create_user(email=f"u{i}@a.com", password="x") for i in range(5)]
+        User.objects.create_user(email="off@a.com", password="x", is_active=False)
+        for user in self.users:
+            DeviceToken.objects.create(user=user, token=f"tok-{user.pk}")
+        self.fcm = FakeMessaging(invalid={f"tok-{self.users[0].pk}"})
+        patches = [
+            mock.patch.object(push, "_init_firebase", lambda: None),
+            mock.patch.object(push, "_messaging", self.fcm),
+            mock.patch.object(push, "MULTICAST_BATCH", 2),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_notice_save_only_registers_job(self):
+        with self.assertNumQueries(2):
+            notice = Notice.objects.create(title="점검 안내", content="본문", author=self.admin)
+        job = Broadcast.objects.get()
+        self.assertEqual((job.status, job.related_notice_id, job.actor_id), (Broadcast.Status.PENDING, notice.pk, self.admin.pk))
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(self.fcm.batches, [])
+
+    def test_run_fans_out_in_chunks_with_multicast(self):
+        Notice.objects.create(title="점검 안내", content="본문", author=self.admin)
+        call_command("run_broadcasts", "--chunk", "3", stdout=StringIO())
+
+        job = Broadcast.objects.get()
+        self.assertEqual(job.status, Broadcast.Status.DONE)
+        self.assertEqual((job.total_count, job.notified_count, job.pushed_count), (5, 5, 4))
+        self.assertEqual(job.progress, 100)
+        self.assertEqual(
+            set(Notification.objects.values_list("user_id", flat=True)), {user.pk for user in self.users}
+        )
+        # 청크(3명, 2명) 마다 토큰 2개씩 multicast
+        self.assertEqual([len(batch) for batch in self.fcm.batches], [2, 1, 2])
+        self.assertFalse(DeviceToken.objects.get(user=self.users[0]).is_active)
+
+    def test_badmintok_post_skips_other_sources_and_drafts(self):
+        Post.objects.create(title="동호인 글", content="c", author=self.admin, source=Post.Source.COMMUNITY)
+        Post.objects.create(title="임시", content="c", author=self.admin, source=Post.Source.BADMINTOK, is_draft=True)
+        post = Post.objects.create(title="새 글", content="c", author=self.admin, source=Post.Source.BADMINTOK)
+        self.assertEqual(list(Broadcast.objects.values_list("related_community_post_id", flat=True)), [post.pk])
+
+    def test_stale_job_resumes_after_last_user(self):
+        notice = Notice.objects.create(title="점검 안내", content="본문", author=self.admin)
+        job = Broadcast.objects.get()
+        # 첫 두 명까지 처리하고 작업자가 죽은 상태
+        done = self.users[:2]
+        Notification.objects.bulk_create(
+            [Notification(user=user, type=Notification.Type.NOTICE, title=job.title, related_notice=notice) for user in done]
+        )
+        Broadcast.objects.filter(pk=job.pk).update(
+            status=Broadcast.Status.RUNNING, last_user_id=done[-1].pk, notified_count=2,
+            started_at=timezone.now(), updated_at=timezone.now() - broadcast.STALE_AFTER * 2,
+        )
+        self.assertEqual([(b.pk, n) for b, n in broadcast.run_pending()], [(job.pk, 3)])
+        self.assertEqual(Notification.objects.count(), 5)
+        self.assertEqual(Broadcast.objects.get().notified_count, 5)
+        # 이미 끝난 작업은 다시 잡지 않음
+        self.assertEqual(broadcast.run_pending(), [])
+
+
+class PushOutboxTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.users = [User.objects.create_user(email=f"p{i}@a.com", password="x") for i in range(3)]
+        for user in self.users:
+            DeviceToken.objects.create(user=user, token=f"tok-{user.pk}")
+        self.fcm = FakeMessaging()
+        for patcher in (
+            mock.patch.object(push, "_init_firebase", lambda: None),
+            mock.patch.object(push, "_messaging", self.fcm),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def notify(self, user, title="새 댓글"):
+        return Notification.objects.create(user=user, type=Notification.Type.COMMENT, title=title, message="내용")
+
+    def test_notification_only_enqueues(self):
+        notification = self.notify(self.users[0])
+        row = PushOutbox.objects.get()
+        self.assertEqual((row.status, row.notification_id, row.user_id), (PushOutbox.Status.PENDING, notification.pk, self.users[0].pk))
+        self.assertEqual(row.data["notification_id"], notification.pk)
+        self.assertEqual(self.fcm.batches, [])
+        # 알림 수정은 다시 넣지 않음
+        notification.is_read = True
+        notification.save()
+        self.assertEqual(PushOutbox.objects.count(), 1)
+
+    def test_worker_batches_and_marks_sent(self):
+        for user in self.users:
+            self.notify(user)
+        DeviceToken.objects.create(user=self.users[0], token="tok-extra")
+
+        out = StringIO()
+        call_command("run_push_worker", stdout=out)
+        # 기기 두 대인 사용자는 같은 내용이라 multicast, 나머지 알림은 send_each 한 번에 모아 보냄
+        self.assertEqual([len(batch) for batch in self.fcm.batches], [2, 2])
+        self.assertEqual(sorted(self.fcm.sent), sorted(["tok-extra"] + [f"tok-{u.pk}" for u in self.users]))
+        self.assertFalse(PushOutbox.objects.exclude(status=PushOutbox.Status.SENT).exists())
+        self.assertIn("완료: 3건 처리", out.getvalue())
+
+    def test_same_payload_goes_multicast(self):
+        items = [(f"tok-{user.pk}", "점검", "", {"type": "notice"}) for user in self.users]
+        items.append(("tok-solo", "다른 글", "", None))
+        success, retry = push.send_batch(items)
+        self.assertEqual((success, retry), (4, {}))
+        self.assertEqual(sorted(len(batch) for batch in self.fcm.batches), [1, 3])
+
+    def test_transient_failure_backs_off_then_fails(self):
+        self.notify(self.users[0])
+        self.notify(self.users[1])
+        self.fcm.unavailable = {f"tok-{self.users[0].pk}"}
+
+        stats = outbox.run_once()
+        self.assertEqual((stats.claimed, stats.sent, stats.retried), (2, 1, 1))
+        row = PushOutbox.objects.get(user=self.users[0])
+        self.assertEqual((row.status, row.attempts), (PushOutbox.Status.PENDING, 1))
+        self.assertGreater(row.next_attempt_at, timezone.now())
+        # 백오프 동안은 잡히지 않음
+        self.assertEqual(outbox.run_once().claimed, 0)
+
+        self.fcm.down = True
+        for attempt in range(2, outbox.MAX_ATTEMPTS + 1):
+            PushOutbox.objects.filter(pk=row.pk).update(next_attempt_at=timezone.now())
+            outbox.run_once()
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), (PushOutbox.Status.FAILED, outbox.MAX_ATTEMPTS))
+        self.assertIn("fcm down", row.last_error)
+        self.assertEqual(outbox.backlog()["failed"], 1)
+
+    def test_claim_skips_leased_rows_until_expired(self):
+        self.notify(self.users[0])
+        self.assertEqual(len(outbox.claim()), 1)
+        self.assertEqual(outbox.claim(), [])
+        # 작업자가 죽어 처리 기한이 지나면 다시 잡힘
+        later = timezone.now() + outbox.LEASE * 2
+        self.assertEqual([row.attempts for row in outbox.claim(now=later)], [2])
+
+
+class UnreadCounterTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(email="r@a.com", password="x")
+        self.other = User.objects.create_user(email="s@a.com", password="x")
+        self.client.force_login(self.user)
+        cache.clear()
+
+    def notify(self, type=Notification.Type.COMMENT, user=None):
+        return Notification.objects.create(user=user or self.user, type=type, title="알림")
+
+    def test_counts_follow_create_read_and_delete(self):
+        first = self.notify()
+        self.notify()
+        self.notify(Notification.Type.SCHEDULE_NOTICE)
+        self.notify(user=self.other)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(unread.unread_count(self.user.pk), 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(unread.unread_count(self.user.pk, Notification.Type.SCHEDULE_NOTICE), 1)
+
+        self.client.post(reverse("api:notifications_api:notification_read", args=[first.pk]))
+        self.client.post(reverse("api:notifications_api:notification_read", args=[first.pk]))
+        response = self.client.get(reverse("api:notifications_api:notification_unread_count"))
+        self.assertEqual(response.json()["unread_count"], 2)
+
+        Notification.objects.filter(pk=first.pk).delete()
+        self.assertEqual(unread.received_count(self.user.pk, Notification.Type.COMMENT), 1)
+        self.assertEqual(unread.unread_count(self.user.pk), 2)
+
+    def test_read_all_by_type_keeps_other_types(self):
+        self.notify()
+        self.notify(Notification.Type.SCHEDULE_NOTICE)
+        self.notify(Notification.Type.SCHEDULE_NOTICE)
+        self.assertEqual(unread.mark_all_read(self.user, type=Notification.Type.SCHEDULE_NOTICE), 2)
+        self.assertEqual(unread.counts(self.user.pk), {
+            Notification.Type.COMMENT: (1, 1),
+            Notification.Type.SCHEDULE_NOTICE: (2, 0),
+        })
+
+        response = self.client.post(reverse("api:notifications_api:notification_read_all"))
+        self.assertEqual(response.json()["count"], 1)
+        self.assertEqual(unread.unread_count(self.user.pk), 0)
+
+    def test_broadcast_chunk_counts_every_recipient(self):
+        notice = Notice.objects.create(title="공지", content="c", author=self.other)
+        broadcast.run_pending()
+        self.assertEqual(unread.unread_count(self.user.pk, Notification.Type.NOTICE), 1)
+        self.assertEqual(Notification.objects.get(user=self.user).related_notice, notice)
+
+    def test_reconcile_fixes_drift(self):
+        self.notify()
+        self.notify(user=self.other)
+        # 카운터를 거치지 않는 변경
+        Notification.objects.filter(user=self.user).update(is_read=True)
+        NotificationCounter.objects.filter(user=self.other).delete()
+        self.assertEqual(unread.unread_count(self.user.pk), 1)
+
+        out = StringIO()
+        call_command("reconcile_notification_counts", "--dry-run", stdout=out)
+        self.assertIn("어긋난 카운터 2건", out.getvalue())
+        self.assertEqual(unread.unread_count(self.user.pk), 1)
+
+        call_command("reconcile_notification_counts", stdout=StringIO())
+        self.assertEqual(unread.unread_count(self.user.pk), 0)
+        self.assertEqual(unread.counts(self.other.pk), {Notification.Type.COMMENT: (1, 1)})
+        self.assertEqual(unread.reconcile_users([self.user.pk, self.other.pk]), {})
+
+
+class BandFanoutTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.owner = User.objects.create_user(email="owner@a.com", password="x")
+        self.members = [User.objects.create_user(email=f"m{i}@a.com", password="x") for i in range(4)]
+        self.fan = User.objects.create_user(email="fan@a.com", password="x")
+        self.band = Band.objects.create(name="번개클럽", created_by=self.owner)
+        BandMember.objects.create(band=self.band, user=self.owner, role="owner", status="active")
+        for user in self.members:
+            BandMember.objects.create(band=self.band, user=user, status="active")
+        BandBookmark.objects.create(band=self.band, user=self.fan)
+        BandBookmark.objects.create(band=self.band, user=self.members[0])
+        Broadcast.objects.all().delete()
+        cache.clear()
+
+    def create_schedule(self):
+        return BandSchedule.objects.create(
+            band=self.band, title="번개", start_datetime=timezone.now(), created_by=self.owner
+        )
+
+    def test_schedule_save_only_registers_job(self):
+        # 일정 INSERT + 발송 작업 INSERT
+        with self.assertNumQueries(2):
+            schedule = self.create_schedule()
+        self.assertFalse(Notification.objects.filter(type=Notification.Type.SCHEDULE).exists())
+
+        broadcast.run_pending()
+        recipients = set(
+            Notification.objects.filter(type=Notification.Type.SCHEDULE, related_band_schedule=schedule)
+            .values_list("user_id", flat=True)
+        )
+        self.assertEqual(recipients, {user.pk for user in self.members} | {self.fan.pk})
+
+    def test_band_rate_limit_pauses_and_resumes(self):
+        self.create_schedule()
+        with mock.patch.object(broadcast, "BAND_RATE_LIMIT", 3):
+            [(job, created)] = broadcast.run_pending(chunk_size=2)
+            self.assertEqual(created, 3)
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.notified_count), (Broadcast.Status.PENDING, 3))
+
+            # 같은 분에는 더 만들지 않음
+            self.assertEqual([n for _job, n in broadcast.run_pending(chunk_size=2)], [0])
+            # 다음 분 버킷
+            with mock.patch.object(broadcast.time, "time", return_value=time.time() + 60):
+                self.assertEqual([n for _job, n in broadcast.run_pending(chunk_size=2)], [2])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.notified_count), (Broadcast.Status.DONE, 5))
+        self.assertEqual(Notification.objects.filter(type=Notification.Type.SCHEDULE).count(), 5)
+
+    def test_schedule_notice_send_returns_before_fanout(self):
+        schedule = self.create_schedule()
+        for user in self.members[:2]:
+            BandScheduleApplication.objects.create(schedule=schedule, user=user, status="approved")
+        Broadcast.objects.all().delete()
+        self.client.force_login(self.owner)
+
+        response = self.client.post(
+            f"/api/bands/{self.band.pk}/schedules/{schedule.pk}/notices/", {"message": "늦지 마세요"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["recipient_count"], 2)
+        self.assertFalse(Notification.objects.filter(type=Notification.Type.SCHEDULE_NOTICE).exists())
+
+        broadcast.run_pending()
+        notices = Notification.objects.filter(type=Notification.Type.SCHEDULE_NOTICE)
+        self.assertEqual(sorted(notices.values_list("user_id", flat=True)), [u.pk for u in self.members[:2]])
+        self.assertEqual(set(notices.values_list("message", "actor_id")), {("늦지 마세요", self.owner.pk)})
+        self.assertEqual(unread.unread_count(self.members[0].pk, Notification.Type.SCHEDULE_NOTICE), 1)
+
+    def test_small_jobs_return_unused_band_quota(self):
+        self.create_schedule()
+        self.create_schedule()
+        with mock.patch.object(broadcast, "BAND_RATE_LIMIT", 12):
+            broadcast.run_pending()
+        self.assertEqual(Notification.objects.filter(type=Notification.Type.SCHEDULE).count(), 10)
+
+    def test_rate_limited_notice_stays_one_sent_group(self):
+        schedule = self.create_schedule()
+        for user in self.members[:3]:
+            BandScheduleApplication.objects.create(schedule=schedule, user=user, status="approved")
+        Broadcast.objects.all().delete()
+        self.client.force_login(self.owner)
+        self.client.post(
+            f"/api/bands/{self.band.pk}/schedules/{schedule.pk}/notices/", {"message": "늦지 마세요"},
+            content_type="application/json",
+        )
+        job = Broadcast.objects.get()
+        with mock.patch.object(broadcast, "BAND_RATE_LIMIT", 2):
+            broadcast.run_pending(chunk_size=2)
+            with mock.patch.object(broadcast.time, "time", return_value=time.time() + 60):
+                broadcast.run_pending(chunk_size=2)
+
+        notices = Notification.objects.filter(type=Notification.Type.SCHEDULE_NOTICE)
+        self.assertEqual(notices.count(), 3)
+        self.assertEqual(set(notices.values_list("created_at", flat=True)), {job.created_at})
+        response = self.client.get(reverse("accounts:mypage"))
+        self.assertEqual(response.context["sent_notices_count"], 1)
+
+    def test_sent_notices_listed_per_batch_with_read_count(self):
+        schedule = self.create_schedule()
+        for user in self.members[:3]:
+            BandScheduleApplication.objects.create(schedule=schedule, user=user, status="approved")
+        self.client.force_login(self.owner)
+        url = f"/api/bands/{self.band.pk}/schedules/{schedule.pk}/notices/"
+        self.client.post(url, {"message": "첫 안내"}, content_type="application/json")
+        self.client.post(
+            url, {"message": "개별 안내", "recipient_user_id": self.members[0].pk}, content_type="application/json"
+        )
+        broadcast.run_pending()
+        first, single = NoticeBatch.objects.order_by("pk")
+        self.assertEqual(first.notifications.count(), 3)
+
+        first.notifications.get(user=self.members[0]).mark_read()
+        unread.mark_all_read(self.members[1])
+        unread.mark_all_read(self.members[1])
+
+        # 세션/사용자 + 발송 건 COUNT + 발송 건 페이지 + 수신자 한 번 (+ 세션 저장)
+        with self.assertNumQueries(8):
+            response = self.client.get(reverse("api:notifications_api:notification_sent"))
+        results = response.json()["results"]
+        self.assertEqual(response.json()["count"], 2)
+        self.assertEqual(
+            [(r["message"], r["recipient_count"], r["read_count"]) for r in results],
+            [("개별 안내", 1, 0), ("첫 안내", 3, 2)],
+        )
+        self.assertEqual([r["id"] for r in results[1]["recipients"]], [u.pk for u in self.members[:3]])
+
+        response = self.client.get(reverse("accounts:mypage_sent_notices"))
+        self.assertEqual([batch.pk for batch in response.context["notices_page"]], [single.pk, first.pk])
+
+    def test_backfill_groups_legacy_notices(self):
+        schedule = self.create_schedule()
+        for user in self.members[:2]:
+            Notification.objects.create(
+                user=user, actor=self.owner, type=Notification.Type.SCHEDULE_NOTICE, title="안내",
+                message="옛 안내", related_band=self.band, related_band_schedule=schedule,
+            )
+        Notification.objects.filter(user=self.members[0], type=Notification.Type.SCHEDULE_NOTICE).update(is_read=True)
+
+        call_command("backfill_notice_batches", stdout=StringIO())
+        call_command("backfill_notice_batches", stdout=StringIO())
+        batch = NoticeBatch.objects.get()
+        self.assertEqual((batch.sender_id, batch.recipient_count, batch.read_count), (self.owner.pk, 2, 1))
+        self.assertFalse(Notification.objects.filter(type=Notification.Type.SCHEDULE_NOTICE, notice_batch=None).exists())
+
+    def test_membership_request_goes_to_managers(self):
+        admin = self.members[1]
+        BandMember.objects.filter(band=self.band, user=admin).update(role="admin")
+        BandMember.objects.create(band=self.band, user=self.fan, status="pending")
+        broadcast.run_pending()
+        self.assertEqual(
+            sorted(Notification.objects.filter(type=Notification.Type.MEMBERSHIP).values_list("user_id", flat=True)),
+            sorted([self.owner.pk, admin.pk]),
+        )
+
+
+class CollapseTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.author = User.objects.create_user(email="writer@a.com", password="x")
+        self.author.activity_name = "작성자"
+        self.author.save()
+        self.fans = []
+        for i in range(4):
+            fan = User.objects.create_user(email=f"f{i}@a.com", password="x")
+            fan.activity_name = f"팬{i}"
+            fan.save()
+            self.fans.append(fan)
+        self.band = Band.objects.create(name="클럽", created_by=self.author)
+        self.post = BandPost.objects.create(band=self.band, author=self.author, title="후기", content="c")
+        cache.clear()
+
+    def likes(self):
+        return Notification.objects.filter(user=self.author, type=Notification.Type.LIKE)
+
+    def test_likes_merge_into_one_row_with_throttled_push(self):
+        for fan in self.fans:
+            BandPostLike.objects.create(post=self.post, user=fan)
+
+        notification = self.likes().get()
+        self.assertEqual(notification.actor_count, 4)
+        self.assertEqual(notification.actor, self.fans[-1])
+        self.assertEqual(notification.title, "팬3님 외 3명이 회원님의 글을 좋아합니다.")
+        self.assertEqual(unread.unread_count(self.author.pk, Notification.Type.LIKE), 1)
+        # 첫 알림만 푸시, 이어진 묶음 갱신은 사용자 창(PUSH_THROTTLE_SECONDS) 안이라 생략
+        self.assertEqual(PushOutbox.objects.filter(user=self.author).count(), 1)
+
+        cache.clear()
+        BandPostLike.objects.filter(user=self.fans[0]).delete()
+        BandPostLike.objects.create(post=self.post, user=self.fans[0])
+        self.assertEqual(self.likes().get().actor_count, 5)
+        self.assertEqual(PushOutbox.objects.filter(user=self.author).count(), 2)
+
+    def test_read_or_expired_starts_new_notification(self):
+        BandPostLike.objects.create(post=self.post, user=self.fans[0])
+        self.likes().get().mark_read()
+        BandPostLike.objects.create(post=self.post, user=self.fans[1])
+        Notification.objects.filter(user=self.author).update(created_at=timezone.now() - collapse.COLLAPSE_WINDOW * 2)
+        BandPostLike.objects.create(post=self.post, user=self.fans[2])
+        self.assertEqual(list(self.likes().values_list("actor_count", flat=True)), [1, 1, 1])
+
+    def test_comments_group_per_post_and_same_actor_not_counted(self):
+        other = BandPost.objects.create(band=self.band, author=self.author, title="다른 글", content="c")
+        BandComment.objects.create(post=self.post, author=self.fans[0], content="첫 댓글")
+        BandComment.objects.create(post=self.post, author=self.fans[0], content="또 댓글")
+        BandComment.objects.create(post=self.post, author=self.fans[1], content="저도요")
+        BandComment.objects.create(post=other, author=self.fans[2], content="여기도")
+
+        rows = Notification.objects.filter(user=self.author, type=Notification.Type.COMMENT)
+        merged = rows.get(related_band_post=self.post)
+        self.assertEqual((merged.actor_count, merged.message), (2, "저도요"))
+        self.assertEqual(rows.get(related_band_post=other).actor_count, 1)
+
+    def test_community_like_via_m2m_add(self):
+        post = Post.objects.create(title="글", content="c", author=self.author, source=Post.Source.COMMUNITY)
+        post.likes.add(self.fans[0], self.fans[1])
+        post.likes.add(self.fans[1])
+        post.likes.add(self.author)
+        notification = self.likes().get(related_community_post=post)
+        self.assertEqual(notification.actor_count, 2)
+
+
+class RetentionTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(email="keep@a.com", password="x")
+        self.client.force_login(self.user)
+        cache.clear()
+
+    def notify(self, type=Notification.Type.LIKE, days_ago=0, is_read=True):
+        notification = Notification.objects.create(user=self.user, type=type, title="알림")
+        if is_read:
+            notification.mark_read()
+        Notification.objects.filter(pk=notification.pk).update(
+            created_at=timezone.now() - timedelta(days=days_ago)
+        )
+        return notification
+
+    def test_prunes_old_read_rows_and_adjusts_counters(self):
+        old = self.notify(days_ago=40)
+        self.notify(days_ago=40)
+        fresh = self.notify(days_ago=5)
+        unread_old = self.notify(days_ago=40, is_read=False)
+        comment = self.notify(Notification.Type.COMMENT, days_ago=40)
+
+        out = StringIO()
+        call_command("prune_notifications", "--dry-run", stdout=out)
+        self.assertIn("정리 대상 2건", out.getvalue())
+        self.assertEqual(Notification.objects.count(), 5)
+
+        call_command("prune_notifications", "--batch", "2", stdout=StringIO())
+        self.assertEqual(
+            set(Notification.objects.values_list("pk", flat=True)), {fresh.pk, unread_old.pk, comment.pk}
+        )
+        self.assertFalse(Notification.objects.filter(pk=old.pk).exists())
+        self.assertEqual(unread.counts(self.user.pk), {
+            Notification.Type.LIKE: (2, 1),
+            Notification.Type.COMMENT: (1, 0),
+        })
+        self.assertEqual(unread.reconcile_users([self.user.pk], apply=False), {})
+
+    def test_refreshed_row_does_not_stop_pruning(self):
+        # 묶음 알림처럼 created_at 이 갱신된 앞쪽 행 뒤에도 오래된 행이 남아 있음
+        refreshed = self.notify(days_ago=0)
+        old = [self.notify(days_ago=40) for _ in range(3)]
+        call_command("prune_notifications", "--batch", "1", stdout=StringIO())
+        self.assertEqual(list(Notification.objects.values_list("pk", flat=True)), [refreshed.pk])
+        self.assertFalse(Notification.objects.filter(pk__in=[n.pk for n in old]).exists())
+
+    def test_archive_policy_keeps_copy(self):
+        inquiry = self.notify(Notification.Type.INQUIRY, days_ago=200)
+        counts = retention.prune(Notification.objects.all(), retention.policies(), timezone.now())
+        self.assertEqual(counts, {Notification.Type.INQUIRY: 1})
+        archived = NotificationArchive.objects.get()
+        self.assertEqual((archived.notification_id, archived.user_id), (inquiry.pk, self.user.pk))
+        self.assertFalse(Notification.objects.exists())
+
+    def test_settings_override_disables_type(self):
+        self.notify(days_ago=400)
+        with self.settings(NOTIFICATION_RETENTION={Notification.Type.LIKE: None}):
+            self.assertNotIn(Notification.Type.LIKE, retention.policies())
+            call_command("prune_notifications", stdout=StringIO())
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_inbox_cursor_pages_without_count(self):
+        created = [self.notify(days_ago=i, is_read=False) for i in range(5)]
+        url = reverse("api:notifications_api:notification_list")
+        seen = []
+        cursor = ""
+        while True:
+            response = self.client.get(url, {"cursor": cursor, "page_size": 2})
+            data = response.json()
+            self.assertNotIn("count", data)
+            seen += [item["id"] for item in data["results"]]
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(seen, [n.pk for n in created])
+
+        response = self.client.get(url, {"is_read": "false", "page_size": 2})
+        self.assertEqual((response.json()["count"], response.json()["total_pages"]), (5, 3))
+
+    def test_inbox_page_count_ignores_missing_counters(self):
+        # 카운터가 아직 채워지지 않은 사용자도 페이지 모드는 실제 개수로 끝까지 넘김
+        created = [self.notify(days_ago=i) for i in range(5)]
+        NotificationCounter.objects.filter(user=self.user).delete()
+        url = reverse("api:notifications_api:notification_list")
+        response = self.client.get(url, {"page_size": 2, "page": 3})
+        data = response.json()
+        self.assertEqual((data["count"], data["total_pages"]), (5, 3))
+        self.assertEqual([item["id"] for item in data["results"]], [created[-1].pk])
+
+
+class DeviceTokenCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(email="phone@a.com", password="x")
+        self.other = User.objects.create_user(email="tablet@a.com", password="x")
+        DeviceToken.objects.create(user=self.user, token="tok-a")
+        self.fcm = FakeMessaging(invalid={"tok-a"})
+        patches = [
+            mock.patch.object(push, "_init_firebase", lambda: None),
+            mock.patch.object(push, "_messaging", self.fcm),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client.force_login(self.user)
+
+    def register(self, token):
+        return self.client.post(
+            reverse("api:notifications_api:device_token_register"), {"token": token, "platform": "android"}
+        )
+
+    def test_tokens_cached_until_register_or_unregister(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                push.user_tokens([self.user.pk, self.other.pk]), {self.user.pk: ["tok-a"], self.other.pk: []}
+            )
+        with self.assertNumQueries(0):
+            push.user_tokens([self.user.pk, self.other.pk])
+
+        self.register("tok-b")
+        self.assertEqual(push.user_tokens([self.user.pk]), {self.user.pk: ["tok-a", "tok-b"]})
+        self.client.post(reverse("api:notifications_api:device_token_unregister"), {"token": "tok-b"})
+        self.assertEqual(push.user_tokens([self.user.pk]), {self.user.pk: ["tok-a"]})
+
+    def test_token_moving_to_another_account_clears_previous_owner(self):
+        push.user_tokens([self.user.pk, self.other.pk])
+        self.client.force_login(self.other)
+        self.register("tok-a")
+        self.assertEqual(
+            push.user_tokens([self.user.pk, self.other.pk]), {self.user.pk: [], self.other.pk: ["tok-a"]}
+        )
+
+    def test_invalid_token_dropped_from_cache(self):
+        DeviceToken.objects.create(user=self.user, token="tok-b")
+        self.assertEqual(push.send_to_users([self.user.pk, self.other.pk], title="알림"), 1)
+        # 같은 내용은 토큰별 Message 대신 multicast 한 번
+        self.assertEqual(self.fcm.batches, [["tok-a", "tok-b"]])
+        self.assertEqual(push.user_tokens([self.user.pk]), {self.user.pk: ["tok-b"]})
+
+    def test_site_wide_broadcast_uses_topic(self):
+        with self.settings(FCM_BROADCAST_TOPIC="all-users"):
+            self.register("tok-b")
+            # 등록 요청에서는 대기열에만 쌓고 작업자가 구독
+            self.assertEqual(self.fcm.subscriptions, {})
+            self.assertEqual(outbox.sync_topic(), 1)
+            self.assertEqual(self.fcm.subscriptions, {"all-users": {"tok-b"}})
+            Notice.objects.create(title="점검 안내", content="본문", author=self.other)
+            broadcast.run_pending()
+        self.assertEqual(self.fcm.topics, ["all-users"])
+        self.assertEqual(self.fcm.batches, [])
+        self.assertEqual(Notification.objects.filter(type=Notification.Type.NOTICE).count(), 1)
+
+    def test_actor_with_device_gets_no_topic_push(self):
+        DeviceToken.objects.create(user=self.other, token="tok-o")
+        with self.settings(FCM_BROADCAST_TOPIC="all-users"):
+            Notice.objects.create(title="점검 안내", content="본문", author=self.user)
+            broadcast.run_pending()
+        # topic 으로는 작성자 기기를 뺄 수 없어 multicast (작성자 토큰 제외)
+        self.assertEqual(self.fcm.topics, [])
+        self.assertEqual(self.fcm.batches, [["tok-o"]])
+
+    def test_unregister_and_deactivation_unsubscribe(self):
+        DeviceToken.objects.create(user=self.other, token="tok-o")
+        with self.settings(FCM_BROADCAST_TOPIC="all-users"):
+            call_command("subscribe_broadcast_topic", stdout=StringIO())
+            self.assertEqual(self.fcm.subscriptions, {"all-users": {"tok-a", "tok-o"}})
+
+            self.register("tok-b")
+            self.client.post(reverse("api:notifications_api:device_token_unregister"), {"token": "tok-b"})
+            self.other.is_active = False
+            self.other.save()
+            # 같은 토큰의 구독 → 해제는 마지막 요청만 반영
+            self.assertEqual(outbox.sync_topic(), 3)
+        self.assertEqual(self.fcm.subscriptions, {"all-users": {"tok-a"}})
+        self.assertFalse(DeviceToken.objects.get(token="tok-o").is_active)
+        self.assertEqual(push.user_tokens([self.other.pk]), {self.other.pk: []})
 
-# Create your tests here.
+    def test_topic_changes_kept_while_fcm_down(self):
+        with self.settings(FCM_BROADCAST_TOPIC="all-users"):
+            self.register("tok-b")
+            with mock.patch.object(self.fcm, "subscribe_to_topic", side_effect=ConnectionError("fcm down")):
+                self.assertEqual(outbox.sync_topic(), 0)
+            self.assertEqual(TopicOutbox.objects.count(), 1)
+            self.assertEqual(outbox.sync_topic(), 1)
+        self.assertFalse(TopicOutbox.objects.exists())
@@ -0,0 +1,194 @@
+"""사용자별 · 유형별 알림 수 (받은 수 / 읽지 않은 수) 카운터.
+
+앱은 배지용 notification_unread_count 를 자주 폴링하고, 마이페이지는 렌더마다 받은 쪽지 /
+읽지 않은 쪽지를 COUNT 로 다시 셌다. 알림이 수천 건 쌓인 사용자일수록 느려지므로
+NotificationCounter 에 (사용자, 유형) 별로 개수를 들고 있고
+- 알림 생성 (Notification.save, 전체 발송 bulk_create) 때 +1
+- 읽음 (Notification.mark_read, mark_all_read) 때 실제로 바뀐 행 수만큼 -n
+- 삭제 (post_delete) 때 -1 (사용자 탈퇴로 함께 지워지는 경우 제외)
+을 알림 행을 쓰는 트랜잭션 안에서 F() 로 반영한다 (badmintok.counters).
+읽기는 공유 캐시의 사용자별 dict 를 먼저 보고, 없으면 카운터 행(사용자당 유형 수만큼)을
+읽어 채운다. 카운터가 바뀌면 캐시를 바로, 그리고 커밋 뒤 한 번 더 지운다.
+
+배포 전부터 있던 알림은 마이그레이션(0016_fill_notification_counters)이 채우고,
+queryset.update(is_read=True) 처럼 이 모듈을 거치지 않는 변경은 reconcile_notification_counts 명령이 실제 개수로 맞춘다.
+
+사용:
+    unread_count(user.id)                                   # 전체 읽지 않은 수
+    unread_count(user.id, Notification.Type.SCHEDULE_NOTICE)
+    mark_all_read(user, type=Notification.Type.SCHEDULE_NOTICE)
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from badmintok.counters import counter_delta
+
+from .models import NoticeBatch, Notification, NotificationCounter
+
+CACHE_TIMEOUT = 60 * 60
+
+_local = threading.local()
+
+
+def _cache_key(user_id):
+    return f"notifications:counts:{user_id}"
+
+
+def invalidate(user_ids):
+    """사용자들의 캐시된 카운트 삭제 (지금 한 번, 커밋 뒤 한 번)"""
+    keys = [_cache_key(user_id) for user_id in user_ids]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    # 커밋 전에 다른 요청이 옛 값을 다시 채웠을 수 있음
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def adjust_counts(user_ids, type, *, total=0, unread=0):
+    """user_ids 사용자들의 type 카운터를 증감 (알림 행을 쓰는 트랜잭션 안에서 호출)"""
+    user_ids = list(user_ids)
+    changes = {field: delta for field, delta in (("total_count", total), ("unread_count", unread)) if delta}
+    if not user_ids or not changes:
+        return
+    counters = NotificationCounter.objects.filter(user_id__in=user_ids, type=type)
+    if any(delta > 0 for delta in changes.values()):
+        # 처음 받는 유형이면 0 인 행부터 (이미 있으면 무시)
+        NotificationCounter.objects.bulk_create(
+            [NotificationCounter(user_id=user_id, type=type) for user_id in user_ids],
+            ignore_conflicts=True,
+        )
+    counters.update(**{field: counter_delta(field, delta) for field, delta in changes.items()})
+    invalidate(user_ids)
+
+
+@contextmanager
+def adjusted_by_caller():
+    """이 블록 안의 알림 삭제는 post_delete 에서 카운터를 건드리지 않는다.
+
+    대량 삭제(보존 기간 정리 등)에서 호출한 쪽이 (사용자, 유형) 별로 모아 한 번에 반영할 때 쓴다.
+    """
+    previous = getattr(_local, "suppressed", False)
+    _local.suppressed = True
+    try:
+        yield
+    finally:
+        _local.suppressed = previous
+
+
+def is_adjusted_by_caller():
+    """adjusted_by_caller() 블록 안인지"""
+    return getattr(_local, "suppressed", False)
+
+
+def counts(user_id):
+    """{유형: (받은 수, 읽지 않은 수)} — 캐시 우선, 없으면 카운터 행에서"""
+    key = _cache_key(user_id)
+    data = cache.get(key)
+    if data is None:
+        data = {
+            type: (total, unread)
+            for type, total, unread in NotificationCounter.objects.filter(user_id=user_id).values_list(
+                "type", "total_count", "unread_count"
+            )
+        }
+        cache.set(key, data, CACHE_TIMEOUT)
+    return data
+
+
+def unread_count(user_id, type=None):
+    """읽지 않은 알림 수 (type 없으면 전체)"""
+    data = counts(user_id)
+    if type is not None:
+        return data.get(type, (0, 0))[1]
+    return sum(unread for _total, unread in data.values())
+
+
+def received_count(user_id, type=None):
+    """받은 알림 수 (type 없으면 전체)"""
+    data = counts(user_id)
+    if type is not None:
+        return data.get(type, (0, 0))[0]
+    return sum(total for total, _unread in data.values())
+
+
+def mark_all_read(user, type=None):
+    """user 의 읽지 않은 알림(type 지정 시 그 유형만)을 모두 읽음 처리. Returns: 처리한 수
+
+    유형마다 UPDATE 한 번 (일정 쪽지는 발송 건마다 한 번) — 바뀐 행 수만큼만 카운터를 내리므로
+    동시에 들어온 알림과도 맞는다.
+    """
+    unread = Notification.objects.filter(user=user, is_read=False)
+    if type is not None:
+        unread = unread.filter(type=type)
+    types = set(unread.order_by().values_list("type", flat=True).distinct())
+    # 일정 쪽지는 발송 건마다 읽은 수를 올려야 하므로 발송 건 단위로 먼저 처리
+    batches = set(
+        unread.exclude(notice_batch=None).order_by().values_list("notice_batch_id", "type").distinct()
+    )
+
+    changed = defaultdict(int)
+    with transaction.atomic():
+        for batch_id, notification_type in batches:
+            n = unread.filter(notice_batch_id=batch_id).update(is_read=True)
+            if n:
+                NoticeBatch.objects.filter(pk=batch_id).update(read_count=F("read_count") + n)
+            changed[notification_type] += n
+        for notification_type in types:
+            changed[notification_type] += unread.filter(type=notification_type).update(is_read=True)
+            adjust_counts([user.pk], notification_type, unread=-changed[notification_type])
+    return sum(changed.values())
+
+
+def reconcile_users(user_ids, *, apply=True):
+    """사용자들의 카운터를 실제 알림 개수와 비교해 어긋난 것만 고친다.
+
+    Returns: {(user_id, 유형): ((이전 받은 수, 이전 읽지 않은 수), (실제 받은 수, 실제 읽지 않은 수))}
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return {}
+    # 현재 값을 먼저 읽는다: 그 사이 바뀐 카운터는 아래 조건부 UPDATE 가 건너뛴다
+    current = {
+        (user_id, type): (total, unread)
+        for user_id, type, total, unread in NotificationCounter.objects.filter(user_id__in=user_ids).values_list(
+            "user_id", "type", "total_count", "unread_count"
+        )
+    }
+    actual = {
+        (user_id, type): (total, unread)
+        for user_id, type, total, unread in Notification.objects.filter(user_id__in=user_ids)
+        .order_by()
+        .values_list("user_id", "type")
+        .annotate(total=Count("pk"), unread=Count("pk", filter=Q(is_read=False)))
+        .values_list("user_id", "type", "total", "unread")
+    }
+
+    fixed = {}
+    missing = []
+    for key in current.keys() | actual.keys():
+        before, real = current.get(key), actual.get(key, (0, 0))
+        if before == real:
+            continue
+        user_id, type = key
+        values = {"total_count": real[0], "unread_count": real[1]}
+        if apply:
+            if before is None:
+                missing.append(NotificationCounter(user_id=user_id, type=type, **values))
+            elif not NotificationCounter.objects.filter(
+                user_id=user_id, type=type, total_count=before[0], unread_count=before[1]
+            ).update(**values):
+                # 읽은 뒤 다른 요청이 증감했으면 덮어쓰지 않음 (다음 실행에서 다시 확인)
+                continue
+        fixed[key] = (before or (0, 0), real)
+
+    if missing:
+        # 그 사이 다른 요청이 먼저 만든 행은 무시된다 (다음 실행에서 다시 확인)
+        NotificationCounter.objects.bulk_create(missing, ignore_conflicts=True)
+    if apply and fixed:
+        invalidate({user_id for user_id, _type in fixed})
+    return fixed